@@ -17,7 +17,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # app.models内のすべてのモデルをインポートしてBaseに登録
 from app.db.session import Base
-from app.models import user, salon_board_setting, current_task
+from app.models import user, salon_board_setting, current_task, task_event
 
 # app.core.configから設定をインポート
 from app.core.config import settings
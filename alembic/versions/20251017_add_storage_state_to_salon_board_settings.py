@@ -0,0 +1,32 @@
+"""add encrypted storage state columns to salon_board_settings
+
+Revision ID: 20251017_add_storage_state
+Revises: 20251017_add_task_events
+Create Date: 2025-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_storage_state"
+down_revision = "20251017_add_task_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "salon_board_settings",
+        sa.Column("encrypted_storage_state", sa.Text(), nullable=True),
+    )
+    op.add_column(
+        "salon_board_settings",
+        sa.Column("storage_state_updated_at", sa.TIMESTAMP(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("salon_board_settings", "storage_state_updated_at")
+    op.drop_column("salon_board_settings", "encrypted_storage_state")
@@ -0,0 +1,34 @@
+"""allow STYLE_TIMING events in task_events
+
+Revision ID: 20251017_add_style_timing
+Revises: 20251017_add_storage_state
+Create Date: 2025-10-17
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_style_timing"
+down_revision = "20251017_add_storage_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("task_events_event_type_check", "task_events", type_="check")
+    op.create_check_constraint(
+        "task_events_event_type_check",
+        "task_events",
+        "event_type IN ('SUCCESS', 'ERROR', 'MANUAL_UPLOAD', 'STYLE_TIMING')",
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM task_events WHERE event_type = 'STYLE_TIMING'")
+    op.drop_constraint("task_events_event_type_check", "task_events", type_="check")
+    op.create_check_constraint(
+        "task_events_event_type_check",
+        "task_events",
+        "event_type IN ('SUCCESS', 'ERROR', 'MANUAL_UPLOAD')",
+    )
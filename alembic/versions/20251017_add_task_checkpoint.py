@@ -0,0 +1,34 @@
+"""add checkpoint index to current_tasks for chunked style posts
+
+Revision ID: 20251017_add_task_checkpoint
+Revises: 20251017_add_task_queue
+Create Date: 2025-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_task_checkpoint"
+down_revision = "20251017_add_task_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 分割実行する投稿タスクの処理済みの行数（続きはこの行から再開する）
+    op.add_column(
+        "current_tasks",
+        sa.Column("checkpoint_index", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_check_constraint(
+        "current_tasks_checkpoint_index_check",
+        "current_tasks",
+        "checkpoint_index >= 0",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("current_tasks_checkpoint_index_check", "current_tasks", type_="check")
+    op.drop_column("current_tasks", "checkpoint_index")
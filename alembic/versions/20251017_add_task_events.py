@@ -0,0 +1,151 @@
+"""add append-only task_events table and drop JSON blob columns
+
+Revision ID: 20251017_add_task_events
+Revises: 20250130_add_success_info
+Create Date: 2025-10-17
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_task_events"
+down_revision = "20250130_add_success_info"
+branch_labels = None
+depends_on = None
+
+
+current_tasks_table = sa.table(
+    "current_tasks",
+    sa.column("id", sa.UUID()),
+    sa.column("error_info_json", sa.Text()),
+    sa.column("success_info_json", sa.Text()),
+)
+
+task_events_table = sa.table(
+    "task_events",
+    sa.column("task_id", sa.UUID()),
+    sa.column("event_type", sa.String()),
+    sa.column("row_number", sa.Integer()),
+    sa.column("payload_json", sa.Text()),
+)
+
+
+def _decode_entries(raw):
+    """JSON配列文字列をdictのリストに変換（不正な値は無視）"""
+    if not raw:
+        return []
+    try:
+        decoded = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(decoded, list):
+        return []
+    return [entry for entry in decoded if isinstance(entry, dict)]
+
+
+def _row_number(entry):
+    try:
+        return int(entry.get("row_number") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(length=20), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("payload_json", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.CheckConstraint(
+            "event_type IN ('SUCCESS', 'ERROR', 'MANUAL_UPLOAD')",
+            name="task_events_event_type_check",
+        ),
+        sa.ForeignKeyConstraint(["task_id"], ["current_tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_events_task_id_event_type",
+        "task_events",
+        ["task_id", "event_type"],
+        unique=False,
+    )
+
+    # 既存のJSON blobをイベント行へ移行
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            current_tasks_table.c.id,
+            current_tasks_table.c.error_info_json,
+            current_tasks_table.c.success_info_json,
+        )
+    ).fetchall()
+
+    events = []
+    for task_id, error_info_json, success_info_json in rows:
+        for entry in _decode_entries(error_info_json):
+            event_type = "MANUAL_UPLOAD" if entry.get("error_category") == "IMAGE_UPLOAD_ABORTED" else "ERROR"
+            events.append({
+                "task_id": task_id,
+                "event_type": event_type,
+                "row_number": _row_number(entry),
+                "payload_json": json.dumps(entry, ensure_ascii=False),
+            })
+        for entry in _decode_entries(success_info_json):
+            events.append({
+                "task_id": task_id,
+                "event_type": "SUCCESS",
+                "row_number": _row_number(entry),
+                "payload_json": json.dumps(entry, ensure_ascii=False),
+            })
+    if events:
+        op.bulk_insert(task_events_table, events)
+
+    op.drop_column("current_tasks", "success_info_json")
+    op.drop_column("current_tasks", "error_info_json")
+
+
+def downgrade() -> None:
+    op.add_column("current_tasks", sa.Column("error_info_json", sa.Text(), nullable=True))
+    op.add_column("current_tasks", sa.Column("success_info_json", sa.Text(), nullable=True))
+
+    # イベント行をJSON blobへ書き戻す
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            task_events_table.c.task_id,
+            task_events_table.c.event_type,
+            task_events_table.c.payload_json,
+        ).order_by(sa.text("id"))
+    ).fetchall()
+
+    errors_by_task = {}
+    successes_by_task = {}
+    for task_id, event_type, payload_json in rows:
+        try:
+            payload = json.loads(payload_json)
+        except (TypeError, ValueError):
+            continue
+        target = successes_by_task if event_type == "SUCCESS" else errors_by_task
+        target.setdefault(task_id, []).append(payload)
+
+    for task_id in set(errors_by_task) | set(successes_by_task):
+        values = {}
+        if task_id in errors_by_task:
+            values["error_info_json"] = json.dumps(errors_by_task[task_id], ensure_ascii=False)
+        if task_id in successes_by_task:
+            values["success_info_json"] = json.dumps(successes_by_task[task_id], ensure_ascii=False)
+        bind.execute(
+            current_tasks_table.update()
+            .where(current_tasks_table.c.id == task_id)
+            .values(**values)
+        )
+
+    op.drop_index("ix_task_events_task_id_event_type", table_name="task_events")
+    op.drop_table("task_events")
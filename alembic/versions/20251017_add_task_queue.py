@@ -0,0 +1,72 @@
+"""allow multiple tasks per user with a QUEUED state
+
+Revision ID: 20251017_add_task_queue
+Revises: 20251017_add_lower_email_index
+Create Date: 2025-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_task_queue"
+down_revision = "20251017_add_lower_email_index"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUS_CONDITION = "status IN ('PROCESSING', 'CANCELLING')"
+
+
+def upgrade() -> None:
+    op.add_column("current_tasks", sa.Column("queue_position", sa.Integer(), nullable=True))
+    op.add_column("current_tasks", sa.Column("task_name", sa.String(length=100), nullable=True))
+    op.add_column("current_tasks", sa.Column("task_kwargs_json", sa.Text(), nullable=True))
+
+    op.drop_constraint("current_tasks_status_check", "current_tasks", type_="check")
+    op.create_check_constraint(
+        "current_tasks_status_check",
+        "current_tasks",
+        "status IN ('QUEUED', 'PROCESSING', 'CANCELLING', 'SUCCESS', 'FAILURE')",
+    )
+
+    # ユーザー単位のUNIQUEは実行中のタスクのみに限定する
+    op.drop_index("ix_current_tasks_user_id", table_name="current_tasks")
+    op.create_index("ix_current_tasks_user_id", "current_tasks", ["user_id"], unique=False)
+    op.create_index(
+        "uq_current_tasks_active_user",
+        "current_tasks",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text(ACTIVE_STATUS_CONDITION),
+    )
+
+
+def downgrade() -> None:
+    # 順番待ちのタスクと、ユーザーごとに最新以外のタスクを削除してからUNIQUEに戻す
+    op.execute("DELETE FROM current_tasks WHERE status = 'QUEUED'")
+    op.execute(
+        "DELETE FROM current_tasks WHERE id IN ("
+        " SELECT id FROM ("
+        "  SELECT id, ROW_NUMBER() OVER ("
+        "   PARTITION BY user_id"
+        "   ORDER BY CASE WHEN " + ACTIVE_STATUS_CONDITION + " THEN 0 ELSE 1 END, created_at DESC"
+        "  ) AS rank FROM current_tasks"
+        " ) ranked WHERE rank > 1"
+        ")"
+    )
+
+    op.drop_index("uq_current_tasks_active_user", table_name="current_tasks")
+    op.drop_index("ix_current_tasks_user_id", table_name="current_tasks")
+    op.create_index("ix_current_tasks_user_id", "current_tasks", ["user_id"], unique=True)
+
+    op.drop_constraint("current_tasks_status_check", "current_tasks", type_="check")
+    op.create_check_constraint(
+        "current_tasks_status_check",
+        "current_tasks",
+        "status IN ('PROCESSING', 'CANCELLING', 'SUCCESS', 'FAILURE')",
+    )
+
+    op.drop_column("current_tasks", "task_kwargs_json")
+    op.drop_column("current_tasks", "task_name")
+    op.drop_column("current_tasks", "queue_position")
@@ -0,0 +1,25 @@
+"""add expression index on lower(users.email)
+
+Revision ID: 20251017_add_lower_email_index
+Revises: 20251017_add_style_timing
+Create Date: 2025-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20251017_add_lower_email_index"
+down_revision = "20251017_add_style_timing"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ユーザー取得は func.lower(email) で比較するため、email の通常のインデックスは使われない
+    op.create_index("ix_users_lower_email", "users", [sa.text("lower(email)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_lower_email", table_name="users")
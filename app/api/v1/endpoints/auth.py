@@ -6,19 +6,18 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.rate_limit import limiter
 from app.core.security import create_access_token, verify_password, get_current_user
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.crud import user as crud_user
 from app.schemas.token import Token
 from app.schemas.user import User
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
 
 def _normalize_email(email: str) -> str:
@@ -31,7 +30,7 @@ def _normalize_email(email: str) -> str:
 async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ログイン（トークン取得）
@@ -49,7 +48,7 @@ async def login(
     normalized_email = _normalize_email(form_data.username)
 
     # ユーザー取得
-    user = crud_user.get_user_by_email(db, email=normalized_email)
+    user = await crud_user.get_user_by_email_async(db, email=normalized_email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,8 +56,8 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # パスワード検証
-    if not verify_password(form_data.password, user.hashed_password):
+    # パスワード検証（bcryptはCPUを使うためスレッドプールで実行）
+    if not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
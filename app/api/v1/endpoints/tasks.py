@@ -1,10 +1,13 @@
 """
 タスク管理エンドポイント
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError, ProgrammingError
-from typing import Any, Dict, List, Set
+from sqlalchemy.exc import ProgrammingError
+from typing import Any, Dict, List, Optional, Set
 from datetime import datetime, timezone
 import json
 import os
@@ -12,51 +15,38 @@ import shutil
 import uuid
 from pathlib import Path
 from uuid import UUID
-import pandas as pd
-from slowapi import Limiter
-
-from app.db.session import get_db
-from app.core.security import get_current_user
+import aiofiles.os
+from redis.exceptions import RedisError
+
+from app.db.session import get_async_db, get_db
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.core.redis_client import get_async_redis
+from app.core.security import create_stream_token, get_current_user, get_user_from_stream_token_async
+from app.core import cancellation, task_queue, task_stream
+from app.core.timing_report import summarize_style_timings
+from app.services.style_data import StyleDataError, load_style_rows, style_records_path, write_style_records
+from app.services.upload_ingest import (
+    UPLOAD_KIND_IMAGE,
+    UploadBudget,
+    UploadContentError,
+    UploadTooLargeError,
+    safe_filename,
+    save_upload,
+    style_data_kind,
+)
 from app.crud import current_task as crud_task, salon_board_setting as crud_setting
+from app.schemas.token import StreamToken
 from app.schemas.user import User
-from app.schemas.task import TaskStatus, ErrorReport
-from app.services.tasks import process_style_post_task, delete_styles_task
-from app.core.celery_app import celery_app
+from app.schemas.task import TaskStatus, ErrorReport, TimingReport, TaskQueue, TaskQueueMove, TaskHistory
+from app.core.celery_app import DELETE_STYLES_TASK, PROCESS_STYLE_POST_TASK, celery_app
 
 router = APIRouter()
 
 
-def get_user_id_for_rate_limit(request: Request) -> str:
-    """
-    レート制限用のユーザーID取得関数
-
-    認証済みユーザーのIDを返す。未認証の場合はIPアドレスを返す。
-    """
-    # リクエストのstateからユーザー情報を取得（get_current_user依存注入後に利用可能）
-    # 注: この関数はデコレータで使用されるため、依存注入前に呼ばれる可能性がある
-    # その場合はIPアドレスにフォールバック
-    try:
-        # Authorizationヘッダーが存在する場合のみユーザーIDベースでレート制限
-        auth_header = request.headers.get("Authorization")
-        if auth_header:
-            # トークンからユーザー情報を取得してユーザーIDを返す
-            # ただし、ここでは簡易的にIPアドレスを使用
-            # 本来はトークンを解析してユーザーIDを取得すべき
-            from slowapi.util import get_remote_address
-            return get_remote_address(request)
-        else:
-            from slowapi.util import get_remote_address
-            return get_remote_address(request)
-    except Exception:
-        from slowapi.util import get_remote_address
-        return get_remote_address(request)
-
-
-limiter = Limiter(key_func=get_user_id_for_rate_limit)
-
-# アップロードディレクトリ
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+def _task_upload_dir(task_id: UUID) -> Path:
+    """タスクのアップロードディレクトリ"""
+    return Path(settings.UPLOAD_DIR) / str(task_id)
 
 
 @router.post("/style-post", status_code=status.HTTP_202_ACCEPTED)
@@ -72,6 +62,9 @@ async def create_style_post_task(
     """
     スタイル投稿タスク作成・実行
 
+    アップロードファイルはチャンク単位で非同期に保存し、解析・DB操作・キューイングは
+    スレッドプールで実行する（大量の画像を受け付けても他のリクエストを止めない）
+
     Args:
         setting_id: 使用するSALON BOARD設定ID
         style_data_file: スタイル情報ファイル（CSV/Excel）
@@ -83,7 +76,7 @@ async def create_style_post_task(
         dict: タスクIDとメッセージ
     """
     # 設定存在確認
-    db_setting = crud_setting.get_setting_by_id(db, setting_id)
+    db_setting = await run_in_threadpool(crud_setting.get_setting_by_id, db, setting_id)
     if not db_setting or db_setting.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,8 +84,8 @@ async def create_style_post_task(
         )
 
     # ファイル形式確認
-    if not (style_data_file.filename.endswith('.csv') or
-            style_data_file.filename.endswith('.xlsx')):
+    style_data_type = style_data_kind(style_data_file.filename or "")
+    if style_data_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file format. Only CSV and Excel files are supported"
@@ -100,95 +93,66 @@ async def create_style_post_task(
 
     # タスクID生成
     task_uuid = uuid.uuid4()
-    task_dir = UPLOAD_DIR / str(task_uuid)
-    task_dir.mkdir(parents=True, exist_ok=True)
+    task_dir = _task_upload_dir(task_uuid)
+    image_dir = task_dir / "images"
+    await aiofiles.os.makedirs(image_dir, exist_ok=True)
 
     try:
+        budget = UploadBudget(settings.UPLOAD_MAX_TOTAL_BYTES)
+
         # スタイルデータファイル保存
-        style_data_path = task_dir / style_data_file.filename
-        with open(style_data_path, "wb") as f:
-            shutil.copyfileobj(style_data_file.file, f)
+        style_data_path = task_dir / safe_filename(style_data_file.filename)
+        await save_upload(
+            style_data_file,
+            style_data_path,
+            kind=style_data_type,
+            max_bytes=settings.UPLOAD_MAX_STYLE_DATA_BYTES,
+            chunk_bytes=settings.UPLOAD_CHUNK_BYTES,
+            budget=budget,
+        )
 
         # 画像ファイル保存
-        image_dir = task_dir / "images"
-        image_dir.mkdir(exist_ok=True)
-
         uploaded_image_names = []
         for image_file in image_files:
-            image_path = image_dir / image_file.filename
-            with open(image_path, "wb") as f:
-                shutil.copyfileobj(image_file.file, f)
-            uploaded_image_names.append(image_file.filename)
-
-        # ファイルバリデーション: スタイル情報ファイル内の画像名チェック
-        if style_data_path.suffix == ".csv":
-            df = pd.read_csv(style_data_path)
-        else:
-            df = pd.read_excel(style_data_path)
-
-        required_images = df["画像名"].tolist()
-        missing_images = [img for img in required_images if img not in uploaded_image_names]
-
-        if missing_images:
-            # クリーンアップ
-            shutil.rmtree(task_dir)
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=f"Missing image files: {', '.join(missing_images)}"
-            )
-
-        # current_tasksテーブルにレコード作成（UNIQUE制約でシングルタスク保証）
-        try:
-            db_task = crud_task.create_task(
-                db=db,
-                task_id=task_uuid,
-                user_id=current_user.id,
-                total_items=len(df)
-            )
-
-            crud_task.update_task_detail(
-                db=db,
-                task_id=db_task.id,
-                detail={
-                    "stage": "INITIALIZING",
-                    "stage_label": "タスクを準備しています",
-                    "message": "Playwrightの起動を準備中です",
-                    "status": "pending",
-                    "current_index": 0,
-                    "total": len(df),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
+            image_name = safe_filename(image_file.filename)
+            await save_upload(
+                image_file,
+                image_dir / image_name,
+                kind=UPLOAD_KIND_IMAGE,
+                max_bytes=settings.UPLOAD_MAX_IMAGE_BYTES,
+                chunk_bytes=settings.UPLOAD_CHUNK_BYTES,
+                budget=budget,
             )
-        except IntegrityError:
-            # UNIQUE制約違反 = 既にタスク実行中
-            shutil.rmtree(task_dir)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="You already have a task in progress"
-            )
-
-        # Celeryタスクをキューイング
-        process_style_post_task.apply_async(
-            kwargs={
-                "task_id": str(task_uuid),
-                "user_id": current_user.id,
-                "setting_id": setting_id,
-                "style_data_filepath": str(style_data_path),
-                "image_dir": str(image_dir)
-            },
-            task_id=str(task_uuid)
+            uploaded_image_names.append(image_name)
+
+        return await run_in_threadpool(
+            _register_style_post_task,
+            db,
+            current_user.id,
+            setting_id,
+            task_uuid,
+            task_dir,
+            style_data_path,
+            image_dir,
+            uploaded_image_names,
         )
 
-        return {
-            "task_id": str(task_uuid),
-            "message": "Task accepted and started"
-        }
-
+    except UploadTooLargeError as e:
+        await run_in_threadpool(shutil.rmtree, task_dir, True)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except UploadContentError as e:
+        await run_in_threadpool(shutil.rmtree, task_dir, True)
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except ProgrammingError as e:
-        if task_dir.exists():
-            shutil.rmtree(task_dir)
+        await run_in_threadpool(shutil.rmtree, task_dir, True)
 
         message = str(e)
         if hasattr(e, "orig"):
@@ -205,17 +169,89 @@ async def create_style_post_task(
         ) from e
     except Exception as e:
         # エラー時のクリーンアップ
-        if task_dir.exists():
-            shutil.rmtree(task_dir)
+        await run_in_threadpool(shutil.rmtree, task_dir, True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create task: {str(e)}"
         )
 
 
+def _register_style_post_task(
+    db: Session,
+    user_id: int,
+    setting_id: int,
+    task_uuid: uuid.UUID,
+    task_dir: Path,
+    style_data_path: Path,
+    image_dir: Path,
+    uploaded_image_names: List[str],
+) -> Dict[str, str]:
+    """
+    保存済みファイルを検証してタスクを登録・キューイングする（スレッドプールで実行）
+
+    Returns:
+        dict: タスクIDとメッセージ
+    """
+    # スタイル情報ファイルを1回だけ解析し、ワーカー用に正規化して保存（元ファイルは不要になる）
+    try:
+        style_rows = load_style_rows(style_data_path)
+    except StyleDataError as e:
+        shutil.rmtree(task_dir)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    style_records_file = write_style_records(style_rows, style_records_path(style_data_path))
+    style_data_path.unlink()
+
+    # ファイルバリデーション: スタイル情報ファイル内の画像名チェック
+    required_images = [row.get("画像名", "") for row in style_rows]
+    missing_images = [img for img in required_images if img not in uploaded_image_names]
+
+    if missing_images:
+        # クリーンアップ
+        shutil.rmtree(task_dir)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Missing image files: {', '.join(missing_images)}"
+        )
+
+    # 実行中のタスクがなければ開始し、あれば順番待ちにする
+    # （Celeryにはワーカー側の実装を読み込まないようタスク名で送信する）
+    try:
+        return task_queue.submit_task(
+            db,
+            task_id=task_uuid,
+            user_id=user_id,
+            task_name=PROCESS_STYLE_POST_TASK,
+            task_kwargs={
+                "task_id": str(task_uuid),
+                "user_id": user_id,
+                "setting_id": setting_id,
+                "style_data_filepath": str(style_records_file),
+                "image_dir": str(image_dir)
+            },
+            total_items=len(style_rows),
+            message="Playwrightの起動を準備中です"
+        )
+    except task_queue.TaskQueueFullError as e:
+        shutil.rmtree(task_dir)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except task_queue.TaskStartError as e:
+        # 開始できなかったタスクは失敗として記録済みのため、アップロードファイルだけを削除する
+        shutil.rmtree(task_dir, ignore_errors=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
 @router.post("/style-delete", status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("6/hour")
-async def create_style_delete_task(
+def create_style_delete_task(
     request: Request,
     setting_id: int = Form(...),
     range_start: int = Form(...),
@@ -265,35 +301,12 @@ async def create_style_delete_task(
     total_items = len(target_numbers)
 
     try:
-        try:
-            db_task = crud_task.create_task(
-                db=db,
-                task_id=task_uuid,
-                user_id=current_user.id,
-                total_items=total_items,
-            )
-
-            crud_task.update_task_detail(
-                db=db,
-                task_id=db_task.id,
-                detail={
-                    "stage": "INITIALIZING",
-                    "stage_label": "タスクを準備しています",
-                    "message": f"削除対象: {total_items}件、範囲 {range_start}〜{range_end}",
-                    "status": "pending",
-                    "current_index": 0,
-                    "total": total_items,
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                },
-            )
-        except IntegrityError:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="You already have a task in progress",
-            )
-
-        delete_styles_task.apply_async(
-            kwargs={
+        return task_queue.submit_task(
+            db,
+            task_id=task_uuid,
+            user_id=current_user.id,
+            task_name=DELETE_STYLES_TASK,
+            task_kwargs={
                 "task_id": str(task_uuid),
                 "user_id": current_user.id,
                 "setting_id": setting_id,
@@ -301,13 +314,19 @@ async def create_style_delete_task(
                 "range_end": range_end,
                 "exclude_numbers": list(exclude_set),
             },
-            task_id=str(task_uuid),
+            total_items=total_items,
+            message=f"削除対象: {total_items}件、範囲 {range_start}〜{range_end}",
+        )
+    except task_queue.TaskQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    except task_queue.TaskStartError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
         )
-
-        return {
-            "task_id": str(task_uuid),
-            "message": "Task accepted and started",
-        }
     except HTTPException:
         raise
     except Exception as e:
@@ -320,62 +339,130 @@ async def create_style_delete_task(
 
 @router.get("/status", response_model=TaskStatus)
 async def get_task_status(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """タスク進捗状況取得"""
-    db_task = crud_task.get_task_by_user_id(db, current_user.id)
+    db_task = await crud_task.get_task_by_user_id_async(db, current_user.id)
     if not db_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active task found"
         )
 
-    progress = (db_task.completed_items / db_task.total_items * 100) if db_task.total_items > 0 else 0
-    error_entries_raw: List[Dict[str, Any]] = []
-    if db_task.error_info_json:
-        try:
-            decoded = json.loads(db_task.error_info_json)
-            if isinstance(decoded, list):
-                error_entries_raw = decoded
-        except json.JSONDecodeError:
-            error_entries_raw = []
-
-    manual_entries = [
-        entry for entry in error_entries_raw
-        if entry.get("error_category") == "IMAGE_UPLOAD_ABORTED"
-    ]
-    error_entries = [
-        entry for entry in error_entries_raw
-        if entry.get("error_category") != "IMAGE_UPLOAD_ABORTED"
-    ]
-
-    has_errors = len(error_entries) > 0
-    error_count = len(error_entries)
-    manual_upload_count = len(manual_entries)
-    detail = None
-    if db_task.progress_detail_json:
+    return await task_stream.build_task_status_async(db, db_task)
+
+
+def _format_sse(data: str) -> str:
+    """Server-Sent Events形式のメッセージに整形"""
+    return f"data: {data}\n\n"
+
+
+async def _task_status_events(request: Request, pubsub, snapshot: str, snapshot_status: str):
+    """
+    初回スナップショットを送信後、Redis Pub/Subで受信したステータスを中継する
+
+    終了状態（SUCCESS/FAILURE）を受信するか、クライアントが切断した時点で終了する
+    """
+    try:
+        yield _format_sse(snapshot)
+        if snapshot_status in task_stream.TERMINAL_STATUSES:
+            return
+
+        while not await request.is_disconnected():
+            try:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=settings.TASK_STREAM_KEEPALIVE_SEC
+                )
+            except RedisError:
+                # 切断時はクライアント側でポーリングにフォールバックする
+                break
+
+            if message is None:
+                # プロキシによるアイドル切断を防ぐ
+                yield ": keepalive\n\n"
+                continue
+
+            data = message["data"]
+            yield _format_sse(data)
+
+            try:
+                message_status = json.loads(data).get("status")
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if message_status in task_stream.TERMINAL_STATUSES:
+                break
+    finally:
         try:
-            detail = json.loads(db_task.progress_detail_json)
-        except json.JSONDecodeError:
-            detail = None
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+        except RedisError:
+            pass
+
 
+@router.post("/stream-token", response_model=StreamToken)
+async def issue_stream_token(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    タスク進捗ストリーム接続用の短命トークン発行
+
+    EventSourceはヘッダーを付与できずトークンをURLに載せるため、アクセストークンの代わりに
+    有効期限の短い /stream 専用のトークンを渡す（アクセスログ等に残っても他のAPIには使えない）
+    """
     return {
-        "task_id": db_task.id,
-        "status": db_task.status,
-        "total_items": db_task.total_items,
-        "completed_items": db_task.completed_items,
-        "progress": round(progress, 2),
-        "has_errors": has_errors,
-        "error_count": error_count,
-        "manual_upload_count": manual_upload_count,
-        "created_at": db_task.created_at,
-        "detail": detail
+        "token": create_stream_token(current_user.email),
+        "expires_in": settings.TASK_STREAM_TOKEN_EXPIRE_SEC
     }
 
 
+@router.get("/stream")
+async def stream_task_status(
+    request: Request,
+    token: str = Query(..., description="ストリームトークン（POST /stream-token で取得、EventSourceはヘッダーを付与できないため）"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    タスク進捗のプッシュ配信（Server-Sent Events）
+
+    Celeryワーカーが進捗を書き込むたびにRedis Pub/Sub経由で /tasks/status と同じ形式のJSONを送信する。
+    Redisに接続できない場合は503を返し、クライアントはポーリングにフォールバックする。
+    """
+    current_user = await get_user_from_stream_token_async(db, token)
+
+    # スナップショット取得前に購読を開始し、その間の更新を取りこぼさない
+    pubsub = get_async_redis().pubsub()
+    try:
+        await pubsub.subscribe(task_stream.task_channel(current_user.id))
+    except (RedisError, OSError):
+        await pubsub.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Task stream is unavailable"
+        )
+
+    db_task = await crud_task.get_task_by_user_id_async(db, current_user.id)
+    if not db_task:
+        await pubsub.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active task found"
+        )
+
+    snapshot = task_stream.serialize_task_status(await task_stream.build_task_status_async(db, db_task))
+    return StreamingResponse(
+        _task_status_events(request, pubsub, snapshot, db_task.status),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 @router.post("/cancel", status_code=status.HTTP_202_ACCEPTED)
-async def cancel_task(
+def cancel_task(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -393,6 +480,9 @@ async def cancel_task(
             detail="Task has already finished"
         )
 
+    # ワーカーは進捗コールバック・待機ループでこのフラグを確認する
+    cancellation.request_cancel(db_task.id)
+
     if db_task.status != "CANCELLING":
         crud_task.update_task_status(db, db_task.id, "CANCELLING")
         crud_task.update_task_detail(
@@ -427,18 +517,95 @@ async def cancel_task(
         }
     )
 
+    task_stream.publish_task_status(db, db_task.id)
+
+    # 強制終了したワーカーは後続タスクを開始しないため、ここで空いたスロットに順番待ちのタスクを開始する
+    task_queue.dispatch_queued_tasks(db)
+
     return {
         "message": "Task cancellation requested."
     }
 
 
+@router.get("/queue", response_model=TaskQueue)
+async def get_task_queue(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """順番待ちタスク一覧取得（実行順）"""
+    db_tasks = await crud_task.get_queued_tasks_async(db, current_user.id)
+    return {
+        "tasks": [task_queue.queued_task_summary(db_task) for db_task in db_tasks],
+        "max_size": settings.TASK_QUEUE_MAX_PER_USER
+    }
+
+
+@router.put("/queue/{task_id}", response_model=TaskQueue)
+def move_queued_task(
+    task_id: UUID,
+    move: TaskQueueMove,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """順番待ちタスクの実行順変更"""
+    db_tasks = crud_task.move_queued_task(db, current_user.id, task_id, move.position)
+    if db_tasks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Queued task not found"
+        )
+
+    return {
+        "tasks": [task_queue.queued_task_summary(db_task) for db_task in db_tasks],
+        "max_size": settings.TASK_QUEUE_MAX_PER_USER
+    }
+
+
+@router.delete("/queue/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_queued_task(
+    task_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """順番待ちタスクの取り消し（アップロード済みファイルも削除）"""
+    db_task = crud_task.remove_queued_task(db, current_user.id, task_id)
+    if db_task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Queued task not found"
+        )
+
+    shutil.rmtree(_task_upload_dir(task_id), ignore_errors=True)
+
+
+async def _get_report_task(db: AsyncSession, user_id: int, task_id: Optional[UUID]):
+    """レポート・削除の対象タスク（task_id 未指定の場合は実行中のタスク、なければ最新の完了タスク）"""
+    if task_id is None:
+        return await crud_task.get_task_by_user_id_async(db, user_id)
+    return await crud_task.get_user_task_async(db, user_id, task_id)
+
+
+@router.get("/history", response_model=TaskHistory)
+async def get_task_history(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """完了タスク一覧取得（新しい順、各タスクのレポートは task_id を指定して取得する）"""
+    db_tasks = await crud_task.get_finished_tasks_async(db, current_user.id)
+    return {
+        "tasks": [task_queue.finished_task_summary(db_task) for db_task in db_tasks],
+        "max_size": settings.TASK_HISTORY_MAX_PER_USER
+    }
+
+
 @router.get("/error-report", response_model=ErrorReport)
 async def get_error_report(
-    db: Session = Depends(get_db),
+    task_id: Optional[UUID] = Query(None, description="対象タスクID（未指定の場合は最新の完了タスク）"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """エラーレポート取得（成功スタイル情報を含む）"""
-    db_task = crud_task.get_task_by_user_id(db, current_user.id)
+    db_task = await _get_report_task(db, current_user.id, task_id)
     if not db_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -452,20 +619,12 @@ async def get_error_report(
         )
 
     # 成功スタイル情報の取得
-    raw_successes = []
-    if db_task.success_info_json:
-        try:
-            raw_successes = json.loads(db_task.success_info_json)
-        except json.JSONDecodeError:
-            raw_successes = []
+    raw_successes = await crud_task.get_task_events_async(db, db_task.id, [crud_task.EVENT_SUCCESS])
 
-    # エラー情報の取得
-    raw_errors = []
-    if db_task.error_info_json:
-        try:
-            raw_errors = json.loads(db_task.error_info_json)
-        except json.JSONDecodeError:
-            raw_errors = []
+    # エラー情報の取得（手動画像登録イベントを含む）
+    raw_errors = await crud_task.get_task_events_async(
+        db, db_task.id, [crud_task.EVENT_ERROR, crud_task.EVENT_MANUAL_UPLOAD]
+    )
 
     manual_uploads = []
     filtered_errors = []
@@ -488,7 +647,7 @@ async def get_error_report(
     for error in raw_errors:
         entry = dict(error)
         convert_screenshot_path(entry)
-        if entry.get("error_category") == "IMAGE_UPLOAD_ABORTED":
+        if entry.get("event_type") == crud_task.EVENT_MANUAL_UPLOAD:
             manual_uploads.append(entry)
         else:
             filtered_errors.append(entry)
@@ -504,13 +663,41 @@ async def get_error_report(
     }
 
 
+@router.get("/timing-report", response_model=TimingReport)
+async def get_timing_report(
+    include_styles: bool = Query(False, description="スタイル別の計測結果を含める"),
+    task_id: Optional[UUID] = Query(None, description="対象タスクID（未指定の場合は実行中のタスク、なければ最新の完了タスク）"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """スタイル別所要時間レポート取得（実行中のタスクは計測済みのスタイルまで）"""
+    db_task = await _get_report_task(db, current_user.id, task_id)
+    if not db_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No task found"
+        )
+
+    timings = await crud_task.get_task_events_async(db, db_task.id, [crud_task.EVENT_STYLE_TIMING])
+    for timing in timings:
+        timing.pop("event_type", None)
+
+    return {
+        "task_id": db_task.id,
+        "status": db_task.status,
+        **summarize_style_timings(timings),
+        "styles": timings if include_styles else None,
+    }
+
+
 @router.delete("/finished-task", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_finished_task(
-    db: Session = Depends(get_db),
+    task_id: Optional[UUID] = Query(None, description="対象タスクID（未指定の場合は最新の完了タスク）"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """完了タスク情報削除"""
-    db_task = crud_task.get_task_by_user_id(db, current_user.id)
+    db_task = await _get_report_task(db, current_user.id, task_id)
     if not db_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -523,4 +710,4 @@ async def delete_finished_task(
             detail="Cannot delete task that is still in progress"
         )
 
-    crud_task.delete_task(db, db_task.id)
+    await crud_task.delete_task_async(db, db_task.id)
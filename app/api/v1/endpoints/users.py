@@ -1,5 +1,6 @@
 """
 ユーザー管理エンドポイント（管理者専用）
+同期セッションとbcryptを使うため、各エンドポイントは def で定義しスレッドプールで実行する
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -19,7 +20,7 @@ def _normalize_email(email: str) -> str:
 
 
 @router.get("/", response_model=UserList)
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     role: Optional[str] = None,
@@ -33,7 +34,7 @@ async def get_users(
 
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
@@ -59,7 +60,7 @@ async def create_user(
 
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
@@ -75,7 +76,7 @@ async def get_user(
 
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -108,48 +109,22 @@ async def update_user(
             )
 
     # パスワード更新処理（指定された場合）
-    if user_update.password:
-        # パスワードをハッシュ化
-        hashed_password = get_password_hash(user_update.password)
-        # UserUpdateスキーマからpasswordを除外し、hashed_passwordに置き換え
-        update_data = user_update.model_dump(exclude_unset=True, exclude={'password'})
-        if normalized_email:
-            update_data["email"] = normalized_email
-
-        # ユーザー取得
-        db_user = crud_user.get_user_by_id(db, user_id)
-        if not db_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+    hashed_password = get_password_hash(user_update.password) if user_update.password else None
+    if normalized_email:
+        # model_copyでemailだけ正規化値に差し替え
+        user_update = user_update.model_copy(update={"email": normalized_email})
 
-        # フィールド更新
-        for field, value in update_data.items():
-            setattr(db_user, field, value)
-
-        # ハッシュ化されたパスワードを設定
-        db_user.hashed_password = hashed_password
-
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    else:
-        # パスワード更新なしの通常更新
-        if normalized_email:
-            # model_copyでemailだけ正規化値に差し替え
-            user_update = user_update.model_copy(update={"email": normalized_email})
-        db_user = crud_user.update_user(db, user_id, user_update)
-        if not db_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        return db_user
+    db_user = crud_user.update_user(db, user_id, user_update, hashed_password=hashed_password)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return db_user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
@@ -0,0 +1,269 @@
+"""
+SALON BOARDアカウント単位のリース
+同じログインIDで並行してログインすると互いのセッションを無効にし、アクセス集中（ACCESS_CONGESTION）を
+招くため、タスクはRedis上のリースを取得してから処理を開始する。
+
+- リースはアカウントごとに1つ。保持中は LeaseKeeper がバックグラウンドで期限を延長する
+- 延長できずにリースを失った場合（失効・他タスクによる取得）は、タスクが次の行に進む前に中断する
+- 取得できないタスクはアカウントごとの待ち行列（ZSET、登録時刻順）に並び、先頭になった時点で取得する
+- 待機中のタスクは一定間隔で再試行し、そのたびに待機中であることを示すキーを延長する
+  （ワーカー停止等で再試行が来なくなったタスクは、キーの失効後に行列から取り除かれる）
+- Redisに接続できない場合は取得できたものとして扱う（タスクを止めない）
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class AccountLeaseLostError(Exception):
+    """保持していたアカウントのリースを失ったことを示す例外（同じアカウントの別タスクと並行しないよう中断する）"""
+    pass
+
+
+# 待機中を示すキーの保持期間（再試行間隔に対する倍率）
+WAITER_TTL_FACTOR = 4
+_WAITER_PREFIX = "sb_account_waiter:"
+
+# 待ち行列への登録・先頭の失効した待機タスクの除去・取得を1回の往復で行う
+# KEYS: リース, 待ち行列, 待機中キー
+# ARGV: タスクID, リース期限(ms), 現在時刻, 待機中キーの期限(秒), 待機中キーの接頭辞
+_ACQUIRE_SCRIPT = """
+local task_id = ARGV[1]
+redis.call('SET', KEYS[3], ARGV[3], 'NX')
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+local enqueued_at = redis.call('GET', KEYS[3])
+redis.call('ZADD', KEYS[2], 'NX', enqueued_at, task_id)
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+
+while true do
+  local head = redis.call('ZRANGE', KEYS[2], 0, 0)[1]
+  if (not head) or head == task_id or redis.call('EXISTS', ARGV[5] .. head) == 1 then
+    break
+  end
+  redis.call('ZREM', KEYS[2], head)
+end
+
+local holder = redis.call('GET', KEYS[1])
+local rank = redis.call('ZRANK', KEYS[2], task_id)
+if holder == task_id or ((not holder) and rank == 0) then
+  redis.call('SET', KEYS[1], task_id, 'PX', ARGV[2])
+  redis.call('ZREM', KEYS[2], task_id)
+  redis.call('DEL', KEYS[3])
+  return {1, 0, task_id, enqueued_at}
+end
+return {0, rank + 1, holder or '', enqueued_at}
+"""
+
+# 自分が保持しているリースのみ延長・解放する
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class LeaseAttempt:
+    """リース取得の結果"""
+
+    acquired: bool
+    position: int = 0                 # 待ち行列での順番（1始まり、取得できた場合は0）
+    holder: Optional[str] = None      # リースを保持しているタスクID
+    waited_sec: float = 0.0           # 最初に待ち行列へ並んでからの経過時間
+
+
+def account_key(sb_user_id: str) -> str:
+    """
+    SALON BOARDアカウントの識別子
+
+    複数店舗アカウントも同じログインIDのセッションを共有するため、店舗IDは含めない
+    """
+    return sb_user_id.strip().lower()
+
+
+def lease_key(account: str) -> str:
+    """アカウント単位のリースのキー"""
+    return f"sb_account_lease:{account}"
+
+
+def queue_key(account: str) -> str:
+    """アカウント単位の待ち行列のキー"""
+    return f"sb_account_queue:{account}"
+
+
+def waiter_key(task_id: str) -> str:
+    """待機中のタスクを示すキー（値は待ち行列へ並んだ時刻）"""
+    return f"{_WAITER_PREFIX}{task_id}"
+
+
+def try_acquire(account: str, task_id: str) -> LeaseAttempt:
+    """
+    リースの取得を試みる（取得できない場合は待ち行列に並ぶ）
+
+    Returns:
+        LeaseAttempt: 取得結果（Redisに接続できない場合は取得できたものとして扱う）
+    """
+    now = time.time()
+    try:
+        acquired, position, holder, enqueued_at = get_redis().eval(
+            _ACQUIRE_SCRIPT,
+            3,
+            lease_key(account),
+            queue_key(account),
+            waiter_key(task_id),
+            task_id,
+            settings.ACCOUNT_LEASE_TTL_SEC * 1000,
+            repr(now),
+            settings.ACCOUNT_LEASE_RETRY_SEC * WAITER_TTL_FACTOR,
+            _WAITER_PREFIX,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to acquire account lease: {e}")
+        return LeaseAttempt(acquired=True)
+
+    return LeaseAttempt(
+        acquired=bool(acquired),
+        position=int(position),
+        holder=holder or None,
+        waited_sec=max(0.0, now - float(enqueued_at)),
+    )
+
+
+def renew(account: str, task_id: str) -> Optional[bool]:
+    """
+    リースの期限を延長する
+
+    Returns:
+        Optional[bool]: 延長できた場合True、失効・他タスクに取得された場合False
+            （Redisに接続できない場合はNone。取得時と同様にタスクを止めない）
+    """
+    try:
+        return bool(get_redis().eval(
+            _RENEW_SCRIPT, 1, lease_key(account), task_id, settings.ACCOUNT_LEASE_TTL_SEC * 1000
+        ))
+    except Exception as e:
+        logger.warning(f"Failed to renew account lease: {e}")
+        return None
+
+
+def release(account: str, task_id: str) -> bool:
+    """
+    リースを解放する
+
+    Returns:
+        bool: 解放できた場合True
+    """
+    try:
+        return bool(get_redis().eval(_RELEASE_SCRIPT, 1, lease_key(account), task_id))
+    except Exception as e:
+        logger.warning(f"Failed to release account lease: {e}")
+        return False
+
+
+def leave_queue(account: str, task_id: str) -> bool:
+    """
+    待ち行列から外れる（待機中にキャンセルされた場合）
+
+    Returns:
+        bool: 処理できた場合True
+    """
+    try:
+        pipe = get_redis().pipeline()
+        pipe.zrem(queue_key(account), task_id)
+        pipe.delete(waiter_key(task_id))
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to leave account queue: {e}")
+        return False
+
+
+def waiting_task_ids(task_ids: Iterable[str]) -> Set[str]:
+    """
+    アカウントのリースを待っているタスクIDを返す（待機中はワーカーを占有しない）
+
+    Returns:
+        Set[str]: 待機中のタスクID（Redisに接続できない場合は空）
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return set()
+    try:
+        pipe = get_redis().pipeline()
+        for task_id in task_ids:
+            pipe.exists(waiter_key(task_id))
+        results = pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to read account waiters: {e}")
+        return set()
+    return {task_id for task_id, exists in zip(task_ids, results) if exists}
+
+
+class LeaseKeeper:
+    """
+    取得済みのリースを保持する（with ブロックの間、期限を定期的に延長し、終了時に解放する）
+
+    延長はワーカーの処理（同期のブラウザ操作）と並行して行うため、バックグラウンドスレッドで実行する。
+    リースを失った場合は延長を止めて lost を立て、タスクは進捗の確認時（ensure_held）に中断する
+    """
+
+    def __init__(self, account: str, task_id: str, interval_sec: Optional[float] = None):
+        self.account = account
+        self.task_id = task_id
+        self.interval_sec = interval_sec or max(1.0, settings.ACCOUNT_LEASE_TTL_SEC / 3)
+        self._stop = threading.Event()
+        self._lost = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def lost(self) -> bool:
+        """リースを失ったか"""
+        return self._lost.is_set()
+
+    def ensure_held(self) -> None:
+        """
+        リースを保持しているか確認する
+
+        Raises:
+            AccountLeaseLostError: リースを失った場合
+        """
+        if self._lost.is_set():
+            raise AccountLeaseLostError(
+                "SALON BOARDアカウントの実行権を失ったため処理を中断しました（同じアカウントの別タスクと重複しないため）"
+            )
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread = threading.Thread(target=self._renew_loop, name=f"account-lease-{self.task_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        release(self.account, self.task_id)
+
+    def _renew_loop(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            renewed = renew(self.account, self.task_id)
+            if renewed is None:
+                logger.warning("アカウントのリースを延長できませんでした: account=%s task=%s", self.account, self.task_id)
+            elif not renewed:
+                logger.error("アカウントのリースを失いました: account=%s task=%s", self.account, self.task_id)
+                self._lost.set()
+                return
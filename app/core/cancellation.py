@@ -0,0 +1,47 @@
+"""
+タスクキャンセルフラグ
+/tasks/cancel がRedisにフラグを立て、Celeryワーカーは進捗コールバックや待機ループから
+O(1) のGETで確認する（DBへの問い合わせを毎回行わない）
+"""
+import logging
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def cancel_key(task_id: UUID) -> str:
+    """タスク単位のキャンセルフラグのキー"""
+    return f"task_cancel:{task_id}"
+
+
+def request_cancel(task_id: UUID) -> bool:
+    """
+    キャンセルフラグを立てる
+
+    Returns:
+        bool: 設定できた場合True（Redisに接続できない場合はFalse、ワーカーはDB確認で検知する）
+    """
+    try:
+        get_redis().set(cancel_key(task_id), "1", ex=settings.TASK_CANCEL_FLAG_TTL_SEC)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to set cancel flag: {e}")
+        return False
+
+
+def is_cancel_requested(task_id: UUID) -> Optional[bool]:
+    """
+    キャンセルフラグを確認する
+
+    Returns:
+        Optional[bool]: フラグの有無（Redisに接続できない場合はNone）
+    """
+    try:
+        return bool(get_redis().exists(cancel_key(task_id)))
+    except Exception as e:
+        logger.warning(f"Failed to read cancel flag: {e}")
+        return None
@@ -6,6 +6,17 @@ from celery.schedules import crontab
 
 from app.core.config import settings
 
+# タスク名（APIは app.services.tasks を読み込まずタスク名で send_task する）
+PROCESS_STYLE_POST_TASK = "process_style_post"
+DELETE_STYLES_TASK = "delete_styles"
+CLEANUP_SCREENSHOTS_TASK = "cleanup_screenshots"
+REAP_STALE_TASKS_TASK = "reap_stale_tasks"
+
+# 長時間かかる投稿タスクと短時間で終わる削除タスクは別キューで処理する
+# （開始順序は app.core.task_scheduler が決め、送信時にもキューを指定する）
+STYLE_POST_QUEUE = "style_post"
+STYLE_DELETE_QUEUE = "style_delete"
+
 # Celeryアプリケーション初期化
 celery_app = Celery(
     "salon_board_poster",
@@ -26,6 +37,12 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,  # 一度に1タスクのみ取得
     worker_max_tasks_per_child=10,  # ワーカープロセス再起動（メモリリーク対策）
     worker_hijack_root_logger=False,  # 既存ロガー設定を維持
+    # acks_late のタスク（投稿）が実行中に別ワーカーへ再配信されないよう、未ACKの猶予をタイムアウトより長くする
+    broker_transport_options={"visibility_timeout": 3600 + 600},
+    task_routes={
+        PROCESS_STYLE_POST_TASK: {"queue": STYLE_POST_QUEUE},
+        DELETE_STYLES_TASK: {"queue": STYLE_DELETE_QUEUE},
+    },
 )
 
 # タスク自動検出
@@ -34,7 +51,12 @@ celery_app.autodiscover_tasks(["app.services"])
 # 定期実行タスクのスケジュール
 celery_app.conf.beat_schedule = {
     "cleanup-screenshots-daily": {
-        "task": "cleanup_screenshots",
+        "task": CLEANUP_SCREENSHOTS_TASK,
         "schedule": crontab(hour=3, minute=30),
-    }
+    },
+    # ワーカーごと停止したタスクのスロットを空け、順番待ちのタスクを開始する
+    "reap-stale-tasks": {
+        "task": REAP_STALE_TASKS_TASK,
+        "schedule": settings.TASK_REAPER_INTERVAL_SEC,
+    },
 }
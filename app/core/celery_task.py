@@ -2,12 +2,18 @@
 Celeryタスクの共通基底クラス定義
 """
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from uuid import UUID
 
-from celery import Task
+from celery import Task, states
 from app.db.session import SessionLocal
+from app.core import cancellation, task_heartbeat
+from app.core.config import settings
+from app.core.progress_writer import TaskProgressWriter
+from app.core.task_queue import dispatch_queued_tasks
+from app.core.task_stream import TaskStatusPublisher
 from app.crud import current_task as crud_task
 
 logger = logging.getLogger(__name__)
@@ -23,6 +29,12 @@ class MonitoredTask(Task):
     DBセッション管理とタスクモニタリング機能を提供する基底クラス
     """
     _db = None
+    _progress_writer: Optional[TaskProgressWriter] = None
+    _status_publisher: Optional[TaskStatusPublisher] = None
+    _cancel_db_checked_at: Optional[Tuple[UUID, float]] = None
+
+    # Redisに接続できない場合のDBステータス確認間隔（秒）
+    CANCEL_DB_FALLBACK_INTERVAL_SEC = 2.0
 
     @property
     def db(self):
@@ -31,12 +43,78 @@ class MonitoredTask(Task):
             self._db = SessionLocal()
         return self._db
 
-    def after_return(self, *args, **kwargs):
-        """タスク終了時のクリーンアップ"""
+    def __call__(self, *args, **kwargs):
+        """実行中はハートビートを延長する（ワーカーごと停止した場合は失効し、定期タスクが整理する）"""
+        task_id = kwargs.get("task_id")
+        if task_id is None:
+            return super().__call__(*args, **kwargs)
+        with task_heartbeat.HeartbeatKeeper(str(task_id)):
+            return super().__call__(*args, **kwargs)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        """タスク終了時のクリーンアップ（終了した場合は空いたスロットに順番待ちのタスクを開始する）"""
+        if self._progress_writer is not None:
+            try:
+                self._progress_writer.flush()
+            except Exception as e:
+                logger.warning(f"Failed to flush task progress: {e}")
+            self._progress_writer = None
+        self._status_publisher = None
+        self._cancel_db_checked_at = None
+        if status != states.RETRY and (kwargs or {}).get("user_id") is not None:
+            try:
+                dispatch_queued_tasks(self.db)
+            except Exception as e:
+                logger.warning(f"Failed to start next queued task: {e}")
         if self._db is not None:
             self._db.close()
             self._db = None
 
+    def progress_writer(self, task_uuid: UUID) -> TaskProgressWriter:
+        """
+        タスクの進捗ライターを取得（タスクIDが変わった場合は旧ライターをフラッシュして作り直す）
+        """
+        writer = self._progress_writer
+        if writer is not None and writer.task_id == task_uuid and writer.db is self.db:
+            return writer
+        if writer is not None:
+            self._flush_writer(writer)
+        publisher = TaskStatusPublisher(self.db, task_uuid)
+        writer = TaskProgressWriter(
+            self.db,
+            task_uuid,
+            flush_interval=settings.TASK_PROGRESS_FLUSH_INTERVAL_SEC,
+            max_pending_events=settings.TASK_PROGRESS_FLUSH_MAX_EVENTS,
+            on_flush=publisher.publish,
+        )
+        self._progress_writer = writer
+        self._status_publisher = publisher
+        return writer
+
+    def update_status(self, task_uuid: UUID, status: str) -> None:
+        """タスクのステータスを更新し、以降の進捗配信に反映する"""
+        crud_task.update_task_status(self.db, task_uuid, status)
+        self._set_published_status(task_uuid, status)
+
+    def _set_published_status(self, task_uuid: UUID, status: str) -> None:
+        publisher = self._status_publisher
+        if publisher is not None and publisher.task_id == task_uuid:
+            publisher.set_status(status)
+
+    def flush_progress(self, task_uuid: UUID) -> None:
+        """バッファ中の進捗を即時DBへ反映する（終了状態の更新前に呼ぶ）"""
+        self._flush_writer(self.progress_writer(task_uuid))
+
+    def _flush_writer(self, writer: TaskProgressWriter, force: bool = True) -> None:
+        try:
+            if force:
+                writer.flush()
+            else:
+                writer.maybe_flush()
+        except Exception as e:
+            # ログ記録のみ行い、タスク自体は止めない
+            logger.warning(f"Failed to flush task progress: {e}")
+
     @staticmethod
     def utc_now_iso() -> str:
         """現在時刻（UTC）のISO8601文字列を返す"""
@@ -57,10 +135,13 @@ class MonitoredTask(Task):
         # delete用
         style_number: Optional[int] = None,
         extra: Optional[Dict[str, Any]] = None,
-        total_items_override: Optional[int] = None
+        total_items_override: Optional[int] = None,
+        flush: bool = True
     ) -> None:
         """
         進捗詳細情報をDBに保存する共通メソッド
+
+        flush=False の場合は進捗ライターにバッファし、閾値到達時にまとめて書き込む
         """
         detail_payload: Dict[str, Any] = {
             "stage": stage,
@@ -88,11 +169,21 @@ class MonitoredTask(Task):
         if extra:
             detail_payload.update(extra)
 
-        try:
-            crud_task.update_task_detail(self.db, task_uuid, detail_payload)
-        except Exception as e:
-            # ログ記録のみ行い、タスク自体は止めない
-            logger.warning(f"Failed to record task detail: {e}")
+        writer = self.progress_writer(task_uuid)
+        writer.set_detail(detail_payload)
+        self._flush_writer(writer, force=flush)
+
+    def record_progress(self, task_uuid: UUID, completed_items: int, *, flush: bool = False) -> None:
+        """完了件数を記録する（既定ではバッファリング）"""
+        writer = self.progress_writer(task_uuid)
+        writer.set_completed(completed_items)
+        self._flush_writer(writer, force=flush)
+
+    def record_error(self, task_uuid: UUID, error_info: Dict[str, Any], *, flush: bool = False) -> None:
+        """エラー情報を記録する（既定ではバッファリング）"""
+        writer = self.progress_writer(task_uuid)
+        writer.add_error(error_info)
+        self._flush_writer(writer, force=flush)
 
     def record_success(
         self,
@@ -102,7 +193,9 @@ class MonitoredTask(Task):
         image_name: Optional[str] = None,
         stylist_name: Optional[str] = None,
         category: Optional[str] = None,
-        length: Optional[str] = None
+        length: Optional[str] = None,
+        *,
+        flush: bool = True
     ) -> None:
         """
         成功したスタイル情報をDBに保存する共通メソッド
@@ -115,6 +208,7 @@ class MonitoredTask(Task):
             stylist_name: スタイリスト名
             category: カテゴリ
             length: 長さ
+            flush: Falseの場合は進捗ライターにバッファする
         """
         success_payload: Dict[str, Any] = {
             "row_number": row_number,
@@ -130,34 +224,89 @@ class MonitoredTask(Task):
         if length is not None:
             success_payload["length"] = length
 
-        try:
-            crud_task.add_task_success(self.db, task_uuid, success_payload)
-        except Exception as e:
-            # ログ記録のみ行い、タスク自体は止めない
-            logger.warning(f"Failed to record task success: {e}")
+        writer = self.progress_writer(task_uuid)
+        writer.add_success(success_payload)
+        self._flush_writer(writer, force=flush)
+
+    def record_checkpoint(self, task_uuid: UUID, checkpoint_index: int) -> None:
+        """
+        分割実行する投稿タスクの処理済みの行数を記録する
+
+        バッファ中の成功・エラーイベントと同じCOMMITで即時に書き込む（再配信時はこの行から再開する）
+        """
+        writer = self.progress_writer(task_uuid)
+        writer.set_checkpoint(checkpoint_index)
+        self._flush_writer(writer)
+
+    def record_timing(self, task_uuid: UUID, timing: Dict[str, Any], *, flush: bool = False) -> None:
+        """スタイル1件分のステージ別所要時間を記録する（既定ではバッファリング）"""
+        writer = self.progress_writer(task_uuid)
+        writer.add_event(crud_task.EVENT_STYLE_TIMING, timing)
+        self._flush_writer(writer, force=flush)
+
+    def is_cancel_requested(self, task_uuid: UUID) -> bool:
+        """
+        キャンセル要求の有無を返す（待機ループからの呼び出し用）
+
+        RedisのキャンセルフラグをO(1)で確認し、DBのステータス確認は一定間隔に抑える
+        """
+        cancelled, _ = self._check_cancel_request(task_uuid)
+        return cancelled
+
+    def _check_cancel_request(self, task_uuid: UUID) -> Tuple[bool, Any]:
+        """
+        キャンセル要求を確認する
+
+        Returns:
+            Tuple[bool, Any]: (キャンセル要求の有無, DBを確認した場合はタスクレコード・それ以外はNone)
+        """
+        flag = cancellation.is_cancel_requested(task_uuid)
+        if flag:
+            self._set_published_status(task_uuid, "CANCELLING")
+            return True, None
+
+        # フラグ未設定でもDBのステータスを定期的に確認する（Redis障害時は短い間隔で確認）
+        interval = (
+            settings.TASK_CANCEL_DB_CHECK_INTERVAL_SEC
+            if flag is not None
+            else self.CANCEL_DB_FALLBACK_INTERVAL_SEC
+        )
+        now = time.monotonic()
+        last_check = self._cancel_db_checked_at
+        if last_check is not None and last_check[0] == task_uuid and now - last_check[1] < interval:
+            return False, None
+
+        self._cancel_db_checked_at = (task_uuid, now)
+        task_record = crud_task.get_task_by_id(self.db, task_uuid)
+        if task_record is not None:
+            self._set_published_status(task_uuid, task_record.status)
+        # キャンセル要求中(CANCELLING)または既に失敗(FAILURE)の場合
+        cancelled = bool(task_record and task_record.status in {"CANCELLING", "FAILURE"})
+        return cancelled, task_record
 
     def ensure_not_cancelled(self, task_uuid: UUID) -> Any:
         """
         ユーザーからのキャンセル要求をチェックする
         
         Returns:
-            task_record: 最新のタスクレコード
+            task_record: DBを確認した場合は最新のタスクレコード（Redisのフラグのみで判定した場合はNone）
         
         Raises:
             TaskCancelledError: キャンセル要求があった場合
         """
-        task_record = crud_task.get_task_by_id(self.db, task_uuid)
-        
-        # キャンセル要求中(CANCELLING)または既に失敗(FAILURE)の場合
-        if task_record and task_record.status in {"CANCELLING", "FAILURE"}:
+        cancelled, task_record = self._check_cancel_request(task_uuid)
+
+        if cancelled:
+            if task_record is None:
+                task_record = crud_task.get_task_by_id(self.db, task_uuid)
             self.record_detail(
                 task_uuid=task_uuid,
                 stage="CANCELLING",
                 stage_label="キャンセル要求中",
                 message="キャンセル要求を検出したため処理を停止します",
                 status_text="cancelling",
-                current_index=task_record.completed_items,
-                total=task_record.total_items,
+                current_index=task_record.completed_items if task_record else None,
+                total=task_record.total_items if task_record else None,
             )
             # 既にキャンセル済み例外を投げる
             raise TaskCancelledError("Task was cancelled by user")
@@ -168,13 +317,14 @@ class MonitoredTask(Task):
         self, 
         task_uuid: UUID, 
         task_id: str, 
-        cancel_error: TaskCancelledError,
+        cancel_error: Exception,
         completed_items: int = 0,
         total_items: int = 0
     ):
         """キャンセル発生時の共通処理"""
         logger.info("=== タスクキャンセル: %s - %s ===", task_id, cancel_error)
-        crud_task.update_task_status(self.db, task_uuid, "FAILURE") # UI上の扱いはFAILUREまたはCANCELLED
+        self.flush_progress(task_uuid)
+        self.update_status(task_uuid, "FAILURE") # UI上の扱いはFAILUREまたはCANCELLED
         
         # 直前の状態を取得して記録
         snapshot = crud_task.get_task_by_id(self.db, task_uuid)
@@ -210,14 +360,15 @@ class MonitoredTask(Task):
             return
 
         # 通常エラー
-        crud_task.update_task_status(self.db, task_uuid, "FAILURE")
+        self.flush_progress(task_uuid)
+        self.update_status(task_uuid, "FAILURE")
         
         # エラー詳細の記録（呼び出し元でscreenshot_pathなどを指定してcrud_task.add_task_errorしてる前提だが、
         # ここで最小限の記録をするか、呼び出し元に任せるか。
         # 今回は add_task_error は呼び出し元で行う設計（コンテキスト依存が強いため））
         
         if error_context:
-            crud_task.add_task_error(self.db, task_uuid, error_context)
+            self.record_error(task_uuid, error_context, flush=True)
 
         snapshot = crud_task.get_task_by_id(self.db, task_uuid)
         current = snapshot.completed_items if snapshot else completed_items
@@ -27,11 +27,26 @@ class Settings(BaseSettings):
         """データベース接続URL"""
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """データベース接続URL（FastAPIのリクエスト処理用、asyncpg）"""
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     # Redis設定
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
 
+    @property
+    def REDIS_URL(self) -> str:
+        """Redis接続URL（進捗配信などアプリケーション用途）"""
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
+    @property
+    def RATE_LIMIT_STORAGE_URL(self) -> str:
+        """レート制限カウンターの保存先 URL（Webプロセス・レプリカ間で共有）"""
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     @property
     def CELERY_BROKER_URL(self) -> str:
         """Celeryブローカー URL"""
@@ -46,6 +61,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    AUTH_USER_CACHE_TTL_SEC: int = 30  # 認証済みユーザーのRedisキャッシュ保持期間（0で無効）
 
     # 暗号化設定
     ENCRYPTION_KEY: str
@@ -64,6 +80,52 @@ class Settings(BaseSettings):
     SCREENSHOT_RETENTION_DAYS: int = 30
     SCREENSHOT_DIR_MAX_BYTES: int = 524_288_000
 
+    # タスク進捗書き込みのバッファリング
+    TASK_PROGRESS_FLUSH_INTERVAL_SEC: float = 2.0  # 前回書き込みからこの秒数経過でフラッシュ
+    TASK_PROGRESS_FLUSH_MAX_EVENTS: int = 20  # 未書き込みイベントがこの件数に達したらフラッシュ
+
+    # タスク進捗ストリーミング（SSE）
+    TASK_STREAM_KEEPALIVE_SEC: float = 15.0  # 更新がない間にkeepaliveコメントを送る間隔
+    TASK_STREAM_TOKEN_EXPIRE_SEC: int = 60  # ストリーム接続用トークンの有効期限（接続開始時のみ検証）
+
+    # ユーザー単位のタスク待ち行列（実行中のタスクがある間に登録されたタスクを順に実行する）
+    TASK_QUEUE_MAX_PER_USER: int = 10  # 順番待ちにできるタスク数の上限
+    TASK_HISTORY_MAX_PER_USER: int = 10  # 残す完了タスク数の上限（タスク登録時に古いものから削除）
+
+    # テナント間で公平なタスクの開始順序（投稿・削除のレーンごとに同時実行数を制限し、空きを重み付きラウンドロビンで割り当てる）
+    TASK_SCHEDULER_TENANT: str = "user"  # 公平性の単位（"user" または SALON BOARDアカウント単位の "salon"）
+    TASK_SCHEDULER_POST_SLOTS: int = 2  # 投稿タスクの同時実行数（style_post キューを処理するワーカーの並列数に合わせる）
+    TASK_SCHEDULER_DELETE_SLOTS: int = 1  # 削除タスクの同時実行数（style_delete キューを処理するワーカーの並列数に合わせる）
+    TASK_SCHEDULER_WEIGHTS: str = ""  # テナントの重み（例: "user:1=2,salon:abc=0.5"、未指定は1）
+    TASK_HEARTBEAT_TTL_SEC: int = 300  # 実行中タスクの生存確認の期限（失効したタスクは失敗として記録）
+    TASK_REAPER_INTERVAL_SEC: float = 60.0  # 失効したタスクの整理と順番待ちの開始を行う間隔
+
+    # ブラウザプール（Celeryワーカープロセス内で起動済みブラウザを再利用）
+    BROWSER_POOL_ENABLED: bool = True
+    BROWSER_POOL_MAX_CONTEXTS: int = 30  # この数のコンテキストを作成したらブラウザを再起動
+    BROWSER_POOL_MAX_RSS_MB: int = 1500  # ワーカー＋ブラウザのRSS合計がこれを超えたら再起動（0で無効）
+
+    # タスクキャンセル
+    TASK_CANCEL_FLAG_TTL_SEC: int = 86400  # Redisのキャンセルフラグ保持期間
+    TASK_CANCEL_DB_CHECK_INTERVAL_SEC: float = 30.0  # フラグ未設定時にDBのステータスも確認する間隔
+
+    # ペース配分（SALON BOARDアカウントごとの待機時間の倍率。伸縮ルールは app/services/salonboard/constants.py）
+    PACING_STATE_TTL_SEC: int = 604800  # Redisの状態保持期間（7日）
+
+    # SALON BOARDアカウント単位のリース（同じアカウントのタスクを順番に実行する）
+    ACCOUNT_LEASE_TTL_SEC: int = 120  # リースの期限（実行中は1/3ごとに延長）
+    ACCOUNT_LEASE_RETRY_SEC: int = 15  # 順番待ちのタスクを再実行する間隔
+
+    # スタイル投稿のアップロード受付
+    UPLOAD_DIR: str = "uploads"  # アップロードファイルの保存先（タスクIDごとのディレクトリを作る）
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # ディスクへ書き込む単位
+    UPLOAD_MAX_IMAGE_BYTES: int = 10 * 1024 * 1024  # 画像1ファイルの上限
+    UPLOAD_MAX_STYLE_DATA_BYTES: int = 5 * 1024 * 1024  # スタイル情報ファイルの上限
+    UPLOAD_MAX_TOTAL_BYTES: int = 1024 * 1024 * 1024  # 1リクエストの合計上限
+
+    # スタイル投稿の分割実行（task_soft_time_limit 内に収まる件数ごとに区切り、続きを再投入する）
+    STYLE_POST_CHUNK_SIZE: int = 25  # 1回の実行で投稿する件数（0で分割しない）
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,48 @@
+"""
+アカウント別ペース配分の保存
+SALON BOARDアカウント（ログインID）ごとの待機時間の倍率（PacingEngine.to_state()）をRedisに保持し、
+次回のタスクで前回の状態から再開する（同じアカウントを登録した複数の設定・ユーザーで共有する）
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def pacing_key(account: str) -> str:
+    """SALON BOARDアカウント単位のペース配分状態のキー（account は app.core.account_lease.account_key の値）"""
+    return f"sb_pacing:{account}"
+
+
+def load_pacing_state(account: str) -> Optional[Dict[str, Any]]:
+    """
+    ペース配分の状態を取得する
+
+    Returns:
+        Optional[Dict[str, Any]]: 保存済みの状態（未保存・Redisに接続できない場合はNone）
+    """
+    try:
+        raw = get_redis().get(pacing_key(account))
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"Failed to read pacing state: {e}")
+        return None
+
+
+def save_pacing_state(account: str, state: Dict[str, Any]) -> bool:
+    """
+    ペース配分の状態を保存する
+
+    Returns:
+        bool: 保存できた場合True
+    """
+    try:
+        get_redis().set(pacing_key(account), json.dumps(state), ex=settings.PACING_STATE_TTL_SEC)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to save pacing state: {e}")
+        return False
@@ -0,0 +1,142 @@
+"""
+タスク進捗のバッファリング書き込み
+進捗詳細・完了件数・イベント・再開位置をメモリ上でまとめ、一定間隔または件数でDBへ一括書き込みする
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.crud import current_task as crud_task
+
+logger = logging.getLogger(__name__)
+
+
+class TaskProgressWriter:
+    """
+    1タスク分の進捗書き込みを集約するライター
+
+    - 進捗詳細と完了件数は最新値のみ保持（途中の値は書き込まない）
+    - 成功・エラーイベントは発生順に保持し、フラッシュ時にまとめてINSERTする
+    - 再開位置（処理済みの行数）はイベントと同じCOMMITで書き込む
+    - flush() は UPDATE 1回 + INSERT 1回 + COMMIT 1回で完了する
+    - on_flush はフラッシュ成功後に、書き込んだ値（detail / completed_items / events）を
+      キーワード引数として呼ばれる（進捗のプッシュ配信に利用）
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        task_id: UUID,
+        *,
+        flush_interval: float,
+        max_pending_events: int,
+        clock: Callable[[], float] = time.monotonic,
+        on_flush: Optional[Callable[..., Any]] = None
+    ):
+        self.db = db
+        self.task_id = task_id
+        self.flush_interval = flush_interval
+        self.max_pending_events = max_pending_events
+        self._clock = clock
+        self._on_flush = on_flush
+        self._detail: Optional[Dict[str, Any]] = None
+        self._completed_items: Optional[int] = None
+        self._checkpoint_index: Optional[int] = None
+        self._events: List[Tuple[str, Dict[str, Any]]] = []
+        # 初回の書き込みは即時に反映させる
+        self._last_flush: Optional[float] = None
+
+    @property
+    def has_pending(self) -> bool:
+        """未書き込みの更新があるか"""
+        return (
+            self._detail is not None
+            or self._completed_items is not None
+            or self._checkpoint_index is not None
+            or bool(self._events)
+        )
+
+    def set_detail(self, detail: Dict[str, Any]) -> None:
+        """進捗詳細を更新（直前の未書き込み値は破棄）"""
+        self._detail = detail
+
+    def set_completed(self, completed_items: int) -> None:
+        """完了件数を更新（直前の未書き込み値は破棄）"""
+        self._completed_items = completed_items
+
+    def set_checkpoint(self, checkpoint_index: int) -> None:
+        """再開位置（処理済みの行数）を更新（直前の未書き込み値は破棄）"""
+        self._checkpoint_index = checkpoint_index
+
+    def add_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """イベントを追加"""
+        self._events.append((event_type, payload))
+
+    def add_error(self, error_info: Dict[str, Any]) -> None:
+        """エラーイベントを追加（手動画像登録の判定を含む）"""
+        self.add_event(crud_task.classify_error_event(error_info), error_info)
+
+    def add_success(self, success_info: Dict[str, Any]) -> None:
+        """成功イベントを追加"""
+        self.add_event(crud_task.EVENT_SUCCESS, success_info)
+
+    def should_flush(self) -> bool:
+        """時間・件数の閾値に達しているか"""
+        if not self.has_pending:
+            return False
+        if len(self._events) >= self.max_pending_events:
+            return True
+        if self._last_flush is None:
+            return True
+        return self._clock() - self._last_flush >= self.flush_interval
+
+    def maybe_flush(self) -> bool:
+        """
+        閾値に達していればフラッシュする
+
+        Returns:
+            bool: フラッシュを実行した場合True
+        """
+        if self.should_flush():
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """
+        未書き込みの更新をDBへ一括反映する
+
+        失敗した場合はロールバックしてバッファを保持し、次回のフラッシュで再試行する
+        """
+        if not self.has_pending:
+            return
+
+        try:
+            crud_task.apply_task_progress(
+                self.db,
+                self.task_id,
+                detail=self._detail,
+                completed_items=self._completed_items,
+                events=self._events,
+                checkpoint_index=self._checkpoint_index
+            )
+        except Exception:
+            self.db.rollback()
+            raise
+
+        flushed = {
+            "detail": self._detail,
+            "completed_items": self._completed_items,
+            "events": self._events,
+        }
+        self._detail = None
+        self._completed_items = None
+        self._checkpoint_index = None
+        self._events = []
+        self._last_flush = self._clock()
+
+        if self._on_flush is not None:
+            self._on_flush(**flushed)
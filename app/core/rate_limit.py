@@ -0,0 +1,34 @@
+"""
+レート制限
+全エンドポイントで共有する1つの Limiter を提供する。カウンターはRedisに保存し、
+uvicornワーカー・レプリカ間で同じ制限を適用する
+"""
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.core.config import settings
+from app.core.security import get_token_subject
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    レート制限のキー算出関数
+
+    有効なBearerトークンがあればそのsubject（ユーザー）単位、なければIPアドレス単位で制限する
+    （同じNAT配下のユーザー同士でカウンターを共有しない）
+    """
+    subject = get_token_subject(request)
+    if subject:
+        return f"user:{subject.strip().lower()}"
+    return f"ip:{get_remote_address(request)}"
+
+
+# Redisに接続できない間はプロセス内のカウンターで制限を続ける
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URL,
+    key_prefix="rate_limit",
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+)
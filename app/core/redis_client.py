@@ -0,0 +1,38 @@
+"""
+Redisクライアント
+Webプロセス・Celeryワーカーで共有するRedis接続を提供
+"""
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """同期Redisクライアントを取得（プロセス内で使い回す）"""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    return _sync_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """非同期Redisクライアントを取得（FastAPIのイベントループ上で使用）"""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=2,
+        )
+    return _async_client
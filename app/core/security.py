@@ -10,13 +10,15 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from cryptography.fernet import Fernet
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
+from app.core import user_cache
 from app.crud import user as crud_user
+from app.schemas.user import User as UserSchema
 
 
 # パスワードハッシュ化コンテキスト（bcrypt）
@@ -28,6 +30,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 # Fernet暗号化インスタンス
 fernet = Fernet(settings.ENCRYPTION_KEY.encode())
 
+# タスク進捗ストリーム（SSE）専用トークンの用途（scopeクレーム）
+STREAM_TOKEN_SCOPE = "task_stream"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -107,56 +112,136 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[str]:
+def create_stream_token(email: str) -> str:
+    """
+    タスク進捗ストリーム（SSE）専用の短命トークン生成
+
+    EventSourceはヘッダーを付与できずURLに載せるため、アクセストークンの代わりに使う
+    （scopeが異なるため、APIの認証には使えない）
+
+    Args:
+        email: ユーザーのメールアドレス
+
+    Returns:
+        str: JWTトークン
+    """
+    return create_access_token(
+        data={"sub": email, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=settings.TASK_STREAM_TOKEN_EXPIRE_SEC)
+    )
+
+
+def decode_access_token(token: str, scope: Optional[str] = None) -> Optional[str]:
     """
     JWTトークンのデコードと検証
 
     Args:
         token: JWTトークン
+        scope: 期待する用途（Noneの場合は通常のアクセストークン）
 
     Returns:
-        Optional[str]: ユーザーのメールアドレス（トークンが無効な場合はNone）
+        Optional[str]: ユーザーのメールアドレス（トークンが無効・用途が異なる場合はNone）
     """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("scope") != scope:
             return None
         return email
     except JWTError:
         return None
 
 
+def get_token_subject(request: Request) -> Optional[str]:
+    """
+    AuthorizationヘッダーのBearerトークンからsubject（メールアドレス）を取得する
+    デコード結果は request.state に保持し、get_current_user とレート制限のキー算出で共有する
+
+    Args:
+        request: リクエスト
+
+    Returns:
+        Optional[str]: メールアドレス（トークンがない・無効な場合はNone）
+    """
+    if hasattr(request.state, "token_subject"):
+        return request.state.token_subject
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    subject = decode_access_token(token) if scheme.lower() == "bearer" and token else None
+    request.state.token_subject = subject
+    return subject
+
+
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     現在ログイン中のユーザーを取得（依存関数）
 
     Args:
-        token: JWTトークン
-        db: データベースセッション
+        request: リクエスト
+        token: JWTトークン（Authorizationヘッダーの必須チェックに使用）
+        db: 非同期データベースセッション
 
     Returns:
-        User: ユーザーモデル
+        UserSchema: ユーザー
 
     Raises:
         HTTPException: 認証失敗時
     """
-    credentials_exception = HTTPException(
+    email = get_token_subject(request)
+    if email is None:
+        raise _credentials_exception()
+    return await _get_user_by_subject(db, email)
+
+
+async def get_user_from_stream_token_async(db: AsyncSession, token: str) -> UserSchema:
+    """
+    ストリームトークン（create_stream_token）からユーザーを取得（app.core.user_cache のキャッシュを使用）
+    Authorizationヘッダーを付与できないEventSource（SSE）向けのクエリパラメータ認証で使用する
+
+    Args:
+        db: 非同期データベースセッション
+        token: ストリームトークン
+
+    Returns:
+        UserSchema: ユーザー
+
+    Raises:
+        HTTPException: 認証失敗時
+    """
+    email = decode_access_token(token, scope=STREAM_TOKEN_SCOPE)
+    if email is None:
+        raise _credentials_exception()
+    return await _get_user_by_subject(db, email)
+
+
+async def _get_user_by_subject(db: AsyncSession, email: str) -> UserSchema:
+    # ポーリングのたびにusersテーブルへ問い合わせないよう、短時間キャッシュする
+    user = await user_cache.get_cached_user(email)
+    if user is None:
+        db_user = await crud_user.get_user_by_email_async(db, email=email)
+        if db_user is None:
+            raise _credentials_exception()
+        user = UserSchema.model_validate(db_user)
+        await user_cache.cache_user(user)
+
+    return _ensure_active_user(user)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    email = decode_access_token(token)
-    if email is None:
-        raise credentials_exception
 
-    user = crud_user.get_user_by_email(db, email=email)
+def _ensure_active_user(user):
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(
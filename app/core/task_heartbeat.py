@@ -0,0 +1,82 @@
+"""
+実行中タスクの生存確認（ハートビート）
+実行中（PROCESSING・CANCELLING）のタスクがワーカー上で生きていることをRedisのキーで示す。
+
+- 送信時（app.core.task_queue）に記録し、ワーカーでの実行中は HeartbeatKeeper が定期的に延長する
+- 再実行（アカウントの順番待ち・分割実行の続き）の間も、キーの期限内に次の実行が始まれば延長される
+- OOM・task_time_limit でワーカープロセスが強制終了された場合は延長されずに失効し、
+  定期タスク（reap_stale_tasks）がタスクを失敗として記録してレーンのスロットを空ける
+- Redisに接続できない場合は生存を判定できないものとして扱う（タスクを失敗にしない）
+"""
+import logging
+import threading
+from typing import Iterable, Optional, Set
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def heartbeat_key(task_id: str) -> str:
+    """タスク単位のハートビートのキー"""
+    return f"task_heartbeat:{task_id}"
+
+
+def beat(task_id: str) -> None:
+    """ハートビートを記録する（失敗してもログ記録のみ）"""
+    try:
+        get_redis().set(heartbeat_key(task_id), "1", ex=settings.TASK_HEARTBEAT_TTL_SEC)
+    except Exception as e:
+        logger.warning(f"Failed to record task heartbeat: {e}")
+
+
+def alive_task_ids(task_ids: Iterable[str]) -> Optional[Set[str]]:
+    """
+    ハートビートが有効なタスクIDを返す
+
+    Returns:
+        Optional[Set[str]]: 生きているタスクID（Redisに接続できない場合はNone）
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return set()
+    try:
+        pipe = get_redis().pipeline()
+        for task_id in task_ids:
+            pipe.exists(heartbeat_key(task_id))
+        results = pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to read task heartbeats: {e}")
+        return None
+    return {task_id for task_id, exists in zip(task_ids, results) if exists}
+
+
+class HeartbeatKeeper:
+    """
+    with ブロックの間、ハートビートを定期的に延長する
+
+    終了時はキーを削除せずに延長して抜ける（再実行までの間も生存扱いにする）
+    """
+
+    def __init__(self, task_id: str, interval_sec: Optional[float] = None):
+        self.task_id = task_id
+        self.interval_sec = interval_sec or max(1.0, settings.TASK_HEARTBEAT_TTL_SEC / 3)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "HeartbeatKeeper":
+        beat(self.task_id)
+        self._thread = threading.Thread(target=self._beat_loop, name=f"task-heartbeat-{self.task_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        beat(self.task_id)
+
+    def _beat_loop(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            beat(self.task_id)
@@ -0,0 +1,282 @@
+"""
+ユーザー単位のタスク待ち行列
+登録されたタスクは current_tasks に順番待ち（QUEUED）として保存し、レーン（投稿・削除）の
+空きスロットにテナント間で公平に選んだタスクから開始する（選び方は app.core.task_scheduler）。
+開始の判定はタスクの登録時・ワーカーのタスク終了時・ユーザーによる中止時と、定期タスクで行う。
+定期タスクはハートビート（app.core.task_heartbeat）の失効した実行中タスクを失敗として記録し、
+ワーカーごと停止したタスクがスロットを占有し続けないようにする。
+
+- ユーザーごとに実行中のタスクは1つで、ユーザーの待ち行列の順に開始する
+  （部分UNIQUEインデックスで保証し、同時に開始しようとした側は何もしない）
+- 開始時に送信するCeleryタスク名と引数は登録時に保存する（Web側はタスク名で send_task する）
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core import account_lease, task_heartbeat, task_scheduler
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.task_stream import publish_task_status
+from app.crud import current_task as crud_task, salon_board_setting as crud_setting
+from app.models.current_task import CurrentTask
+
+logger = logging.getLogger(__name__)
+
+class TaskQueueFullError(Exception):
+    """順番待ちのタスク数が上限に達していることを示す例外"""
+    pass
+
+
+class TaskStartError(Exception):
+    """登録したタスクをキューへ送信できず、開始できなかったことを示す例外"""
+    pass
+
+
+def _detail(stage: str, stage_label: str, message: str, status_text: str, total: int) -> Dict[str, Any]:
+    return {
+        "stage": stage,
+        "stage_label": stage_label,
+        "message": message,
+        "status": status_text,
+        "current_index": 0,
+        "total": total,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def _initializing_detail(message: str, total: int) -> Dict[str, Any]:
+    return _detail("INITIALIZING", "タスクを準備しています", message, "pending", total)
+
+
+def submit_task(
+    db: Session,
+    *,
+    task_id: UUID,
+    user_id: int,
+    task_name: str,
+    task_kwargs: Dict[str, Any],
+    total_items: int,
+    message: str
+) -> Dict[str, Any]:
+    """
+    タスクを登録する（待ち行列の末尾に追加し、空きスロットがあればすぐに開始する）
+
+    Args:
+        db: データベースセッション
+        task_id: タスクID（CeleryタスクIDと同じ）
+        user_id: ユーザーID
+        task_name: Celeryタスク名
+        task_kwargs: Celeryタスクの引数
+        total_items: 処理対象の総件数
+        message: 開始前に表示する進捗メッセージ
+
+    Returns:
+        dict: タスクID・メッセージ・待ち行列での順番（開始した場合は0）
+
+    Raises:
+        TaskQueueFullError: 順番待ちのタスク数が上限に達している場合
+        TaskStartError: タスクをキューへ送信できなかった場合（タスクは失敗として記録済み）
+    """
+    if len(crud_task.get_queued_tasks(db, user_id)) >= settings.TASK_QUEUE_MAX_PER_USER:
+        raise TaskQueueFullError(
+            f"Task queue is full (up to {settings.TASK_QUEUE_MAX_PER_USER} queued tasks)"
+        )
+
+    crud_task.prune_finished_tasks(db, user_id, settings.TASK_HISTORY_MAX_PER_USER)
+    db_task = crud_task.enqueue_task(
+        db=db,
+        task_id=task_id,
+        user_id=user_id,
+        total_items=total_items,
+        task_name=task_name,
+        task_kwargs=task_kwargs
+    )
+    crud_task.update_task_detail(
+        db, db_task.id, _detail("QUEUED", "順番待ち", message, "queued", total_items)
+    )
+
+    dispatch_queued_tasks(db)
+    db.refresh(db_task)
+    if db_task.status == "FAILURE":
+        raise TaskStartError(
+            crud_task.get_task_detail(db_task).get("message") or "Failed to start the task"
+        )
+    if db_task.status != crud_task.STATUS_QUEUED:
+        return {
+            "task_id": str(task_id),
+            "message": "Task accepted and started",
+            "queue_position": 0
+        }
+
+    return {
+        "task_id": str(task_id),
+        "message": "Task queued",
+        "queue_position": db_task.queue_position
+    }
+
+
+def tenant_of(db: Session, db_task: CurrentTask) -> str:
+    """
+    公平性を判定する単位（TASK_SCHEDULER_TENANT が "salon" の場合はSALON BOARDアカウント、それ以外はユーザー）
+    """
+    if settings.TASK_SCHEDULER_TENANT == "salon":
+        setting_id = crud_task.get_task_kwargs(db_task).get("setting_id")
+        setting = crud_setting.get_setting_by_id(db, setting_id) if setting_id else None
+        if setting is not None:
+            return f"salon:{account_lease.account_key(setting.sb_user_id)}"
+    return f"user:{db_task.user_id}"
+
+
+def dispatch_queued_tasks(db: Session) -> List[CurrentTask]:
+    """
+    レーンの空きスロットに、テナント間で公平に選んだ順番待ちタスクを開始する
+
+    タスクの登録時・ワーカーのタスク終了時・ユーザーによる中止時に呼び出す
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        List[CurrentTask]: 開始したタスク
+    """
+    started: List[CurrentTask] = []
+    with task_scheduler.scheduler_lock():
+        heads = crud_task.get_queue_heads(db)
+        if not heads:
+            return started
+
+        # アカウントのリースを待っているタスクはワーカーを占有しないため、スロットに数えない
+        active = crud_task.get_running_tasks(db)
+        waiting = account_lease.waiting_task_ids(str(db_task.id) for db_task in active)
+        running: Dict[str, int] = {}
+        for db_task in active:
+            if str(db_task.id) in waiting:
+                continue
+            lane = task_scheduler.task_lane(db_task.task_name)
+            running[lane] = running.get(lane, 0) + 1
+
+        candidates = [
+            task_scheduler.Candidate(
+                tenant=tenant_of(db, db_task),
+                lane=task_scheduler.task_lane(db_task.task_name),
+                waiting_since=db_task.created_at.timestamp() if db_task.created_at else 0.0,
+                item=db_task,
+            )
+            for db_task in heads
+        ]
+        schedulers = task_scheduler.load_schedulers()
+        plan = task_scheduler.plan_dispatch(candidates, running, task_scheduler.lane_slots(), schedulers)
+        for candidate in plan:
+            db_task = candidate.item
+            if crud_task.start_queued_task(db, db_task) and _send_task(db, db_task, candidate.lane):
+                logger.info(
+                    "順番待ちのタスクを開始しました: tenant=%s lane=%s task=%s",
+                    candidate.tenant, candidate.lane, db_task.id
+                )
+                started.append(db_task)
+        if plan:
+            task_scheduler.save_schedulers(schedulers)
+    return started
+
+
+def _send_task(db: Session, db_task: CurrentTask, lane: str) -> bool:
+    """実行中にしたタスクをレーンのキューへ送信する（失敗した場合はタスクを失敗として記録）"""
+    message = crud_task.get_task_detail(db_task).get("message") or "タスクを開始します"
+    crud_task.update_task_detail(db, db_task.id, _initializing_detail(message, db_task.total_items))
+    # ワーカーが受け取るまでの間も生存扱いにする
+    task_heartbeat.beat(str(db_task.id))
+
+    try:
+        celery_app.send_task(
+            db_task.task_name,
+            kwargs=crud_task.get_task_kwargs(db_task),
+            task_id=str(db_task.id),
+            queue=task_scheduler.LANE_QUEUES[lane]
+        )
+    except Exception as e:
+        logger.error("順番待ちのタスクを開始できませんでした: task=%s (%s)", db_task.id, e)
+        crud_task.update_task_status(db, db_task.id, "FAILURE")
+        crud_task.update_task_detail(
+            db,
+            db_task.id,
+            _detail("FAILED", "タスク失敗", f"タスクを開始できませんでした: {e}", "failure", db_task.total_items)
+        )
+        publish_task_status(db, db_task.id)
+        return False
+
+    publish_task_status(db, db_task.id)
+    return True
+
+
+def reap_stale_tasks(db: Session) -> List[CurrentTask]:
+    """
+    ハートビートが失効した実行中タスクを失敗として記録する
+
+    OOM・task_time_limit 等でワーカープロセスが強制終了されたタスクは after_return に到達せず、
+    実行中のままレーンのスロットを占有し続けるため、定期タスクから呼び出して整理する
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        List[CurrentTask]: 失敗として記録したタスク（Redisに接続できない場合は何もしない）
+    """
+    active = crud_task.get_running_tasks(db)
+    alive = task_heartbeat.alive_task_ids(str(db_task.id) for db_task in active)
+    if alive is None:
+        return []
+
+    reaped: List[CurrentTask] = []
+    for db_task in active:
+        if str(db_task.id) in alive:
+            continue
+        logger.warning("応答のないタスクを終了します: task=%s status=%s", db_task.id, db_task.status)
+        crud_task.update_task_status(db, db_task.id, "FAILURE")
+        crud_task.update_task_detail(
+            db,
+            db_task.id,
+            {
+                **_detail(
+                    "FAILED",
+                    "タスク失敗",
+                    "ワーカーが停止したためタスクを終了しました",
+                    "error",
+                    db_task.total_items
+                ),
+                "current_index": db_task.completed_items,
+            }
+        )
+        publish_task_status(db, db_task.id)
+        reaped.append(db_task)
+    return reaped
+
+
+def finished_task_summary(db_task: CurrentTask) -> Dict[str, Any]:
+    """完了タスクの表示用情報（FinishedTaskスキーマに対応する辞書）"""
+    detail = crud_task.get_task_detail(db_task)
+    return {
+        "task_id": db_task.id,
+        "task_type": task_scheduler.task_lane(db_task.task_name),
+        "status": db_task.status,
+        "total_items": db_task.total_items,
+        "completed_items": db_task.completed_items,
+        "message": detail.get("message", ""),
+        "created_at": db_task.created_at,
+    }
+
+
+def queued_task_summary(db_task: CurrentTask) -> Dict[str, Any]:
+    """順番待ちタスクの表示用情報（QueuedTaskスキーマに対応する辞書）"""
+    detail = crud_task.get_task_detail(db_task)
+    return {
+        "task_id": db_task.id,
+        "task_type": task_scheduler.task_lane(db_task.task_name),
+        "position": db_task.queue_position,
+        "total_items": db_task.total_items,
+        "message": detail.get("message", ""),
+        "created_at": db_task.created_at,
+    }
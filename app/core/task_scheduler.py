@@ -0,0 +1,231 @@
+"""
+テナント間で公平なタスクの開始順序
+順番待ちのタスク（current_tasks の QUEUED）をどの順でCeleryへ送るかを決める。
+
+- レーン: 短時間で終わる削除タスクと長時間かかる投稿タスクは別のCeleryキューに送り、
+  レーンごとの同時実行数（スロット）を超えて送信しない（ブローカーには空きスロット分だけが並ぶ）
+- テナント: ユーザー単位、または SALON BOARDアカウント単位（TASK_SCHEDULER_TENANT）
+- 空きスロットは重み付きラウンドロビン（ストライドスケジューリング）でテナントに割り当てる。
+  開始するたびにテナントの通過値を 1/重み 進め、通過値が最小のテナント（同値なら待ち時間が長い方）を選ぶ。
+  待ちのなかったテナントは現在の通過値から始まるため、休止中の分をまとめて優先されることはない
+- 通過値はレーンごとにRedisへ保存する。Redisに接続できない場合は待ち時間の長い順（FIFO）になる
+"""
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from app.core.celery_app import (
+    DELETE_STYLES_TASK,
+    PROCESS_STYLE_POST_TASK,
+    STYLE_DELETE_QUEUE,
+    STYLE_POST_QUEUE,
+)
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LANE_POST = "post"
+LANE_DELETE = "delete"
+
+# レーンごとのCeleryキュー
+LANE_QUEUES = {
+    LANE_POST: STYLE_POST_QUEUE,
+    LANE_DELETE: STYLE_DELETE_QUEUE,
+}
+
+TASK_LANES = {
+    PROCESS_STYLE_POST_TASK: LANE_POST,
+    DELETE_STYLES_TASK: LANE_DELETE,
+}
+
+# 通過値の保持期間（この間タスクを開始しなかったテナントの値は消える）
+PASS_TTL_SEC = 24 * 60 * 60
+_GLOBAL_PASS_FIELD = "__global__"
+
+
+def task_lane(task_name: Optional[str]) -> str:
+    """タスク名からレーンを判定（不明なタスクは長時間レーン扱い）"""
+    return TASK_LANES.get(task_name, LANE_POST)
+
+
+def lane_slots() -> Dict[str, int]:
+    """レーンごとの同時実行数"""
+    return {
+        LANE_POST: settings.TASK_SCHEDULER_POST_SLOTS,
+        LANE_DELETE: settings.TASK_SCHEDULER_DELETE_SLOTS,
+    }
+
+
+def parse_weights(raw: str) -> Dict[str, float]:
+    """
+    テナントの重み設定を解析する
+
+    Args:
+        raw: "user:1=2,salon:abc=0.5" 形式（未指定のテナントは1）
+
+    Returns:
+        Dict[str, float]: テナントをキーとした重み（不正な指定は無視）
+    """
+    weights: Dict[str, float] = {}
+    for entry in (raw or "").split(","):
+        tenant, _, value = entry.strip().rpartition("=")
+        if not tenant:
+            continue
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if weight > 0:
+            weights[tenant.strip()] = weight
+    return weights
+
+
+@dataclass
+class Candidate:
+    """開始を待っているタスク（ユーザーごとの待ち行列の先頭）"""
+
+    tenant: str
+    lane: str
+    waiting_since: float          # 待ち始めた時刻（同じ通過値の場合に先に待っていた方を選ぶ）
+    item: Any = None              # 呼び出し側のタスク（CurrentTask・シミュレーションのジョブ）
+
+
+class StrideScheduler:
+    """重み付きラウンドロビン（1レーン分）"""
+
+    def __init__(
+        self,
+        passes: Optional[Mapping[str, float]] = None,
+        weights: Optional[Mapping[str, float]] = None
+    ):
+        """
+        初期化
+
+        Args:
+            passes: 保存済みの通過値（テナントをキー、"__global__" は直近に選んだ通過値）
+            weights: テナントの重み（未指定は1）
+        """
+        self.passes: Dict[str, float] = {key: float(value) for key, value in (passes or {}).items()}
+        self.global_pass = self.passes.pop(_GLOBAL_PASS_FIELD, 0.0)
+        self.weights = dict(weights or {})
+
+    def weight(self, tenant: str) -> float:
+        return self.weights.get(tenant, 1.0)
+
+    def _effective_pass(self, tenant: str) -> float:
+        return max(self.passes.get(tenant, self.global_pass), self.global_pass)
+
+    def pick(self, candidates: Sequence[Candidate]) -> Optional[Candidate]:
+        """
+        次に開始するタスクを選び、そのテナントの通過値を進める
+
+        Returns:
+            Optional[Candidate]: 選んだタスク（候補がない場合はNone）
+        """
+        if not candidates:
+            return None
+        chosen = min(candidates, key=lambda candidate: (self._effective_pass(candidate.tenant), candidate.waiting_since))
+        start = self._effective_pass(chosen.tenant)
+        self.global_pass = start
+        self.passes[chosen.tenant] = start + 1.0 / self.weight(chosen.tenant)
+        return chosen
+
+    def state(self) -> Dict[str, float]:
+        """保存用の通過値"""
+        return {**self.passes, _GLOBAL_PASS_FIELD: self.global_pass}
+
+
+def plan_dispatch(
+    candidates: Sequence[Candidate],
+    running: Mapping[str, int],
+    slots: Mapping[str, int],
+    schedulers: Mapping[str, StrideScheduler]
+) -> List[Candidate]:
+    """
+    空きスロットに開始するタスクを選ぶ
+
+    Args:
+        candidates: 開始を待っているタスク
+        running: レーンごとの実行中タスク数
+        slots: レーンごとの同時実行数
+        schedulers: レーンごとのスケジューラー（通過値が更新される）
+
+    Returns:
+        List[Candidate]: 開始するタスク（選んだ順）
+    """
+    chosen: List[Candidate] = []
+    for lane, scheduler in schedulers.items():
+        waiting = [candidate for candidate in candidates if candidate.lane == lane]
+        free = slots.get(lane, 0) - running.get(lane, 0)
+        while free > 0 and waiting:
+            candidate = scheduler.pick(waiting)
+            waiting.remove(candidate)
+            chosen.append(candidate)
+            free -= 1
+    return chosen
+
+
+def pass_key(lane: str) -> str:
+    """レーン単位の通過値のキー"""
+    return f"task_scheduler_pass:{lane}"
+
+
+def load_schedulers() -> Dict[str, StrideScheduler]:
+    """
+    保存済みの通過値からレーンごとのスケジューラーを作る
+
+    Returns:
+        Dict[str, StrideScheduler]: レーンをキーとしたスケジューラー（Redisに接続できない場合は通過値なし）
+    """
+    weights = parse_weights(settings.TASK_SCHEDULER_WEIGHTS)
+    schedulers: Dict[str, StrideScheduler] = {}
+    for lane in LANE_QUEUES:
+        try:
+            passes = get_redis().hgetall(pass_key(lane))
+        except Exception as e:
+            logger.warning(f"Failed to load scheduler state: {e}")
+            passes = {}
+        schedulers[lane] = StrideScheduler(passes, weights)
+    return schedulers
+
+
+def save_schedulers(schedulers: Mapping[str, StrideScheduler]) -> None:
+    """通過値を保存する（失敗してもログ記録のみ）"""
+    try:
+        pipe = get_redis().pipeline()
+        for lane, scheduler in schedulers.items():
+            pipe.hset(pass_key(lane), mapping=scheduler.state())
+            pipe.expire(pass_key(lane), PASS_TTL_SEC)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to save scheduler state: {e}")
+
+
+@contextmanager
+def scheduler_lock() -> Iterator[None]:
+    """
+    スケジューラーの排他ロック（Web・ワーカーの複数プロセスから同時に空きスロットを埋めない）
+
+    Redisに接続できない・待ちきれない場合はロックなしで続行する（ユーザー単位の同時実行は
+    部分UNIQUEインデックスで防がれ、超過するのはレーンのスロット数のみ）
+    """
+    lock = None
+    try:
+        lock = get_redis().lock("task_scheduler_lock", timeout=30, blocking_timeout=5)
+        if not lock.acquire():
+            logger.warning("Scheduler lock timed out; dispatching without lock")
+            lock = None
+    except Exception as e:
+        logger.warning(f"Failed to acquire scheduler lock: {e}")
+        lock = None
+
+    try:
+        yield
+    finally:
+        if lock is not None:
+            try:
+                lock.release()
+            except Exception as e:
+                logger.warning(f"Failed to release scheduler lock: {e}")
@@ -0,0 +1,169 @@
+"""
+タスク進捗のプッシュ配信
+Celeryワーカーが進捗を書き込むたびにRedis Pub/Subへステータスを発行し、
+Web側のストリーミングエンドポイント（SSE）が購読してブラウザへ中継する
+"""
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.redis_client import get_redis
+from app.crud import current_task as crud_task
+from app.models.current_task import CurrentTask
+from app.schemas.task import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# 終了状態（ストリームを閉じる）
+TERMINAL_STATUSES = {"SUCCESS", "FAILURE"}
+
+
+def task_channel(user_id: int) -> str:
+    """ユーザー単位の進捗配信チャンネル名"""
+    return f"task_progress:{user_id}"
+
+
+def build_task_status(db: Session, db_task: CurrentTask) -> Dict[str, Any]:
+    """
+    /tasks/status と同じ形式のステータス情報を組み立てる
+
+    Args:
+        db: データベースセッション
+        db_task: タスク
+
+    Returns:
+        Dict[str, Any]: TaskStatusスキーマに対応する辞書
+    """
+    return _task_status(db_task, crud_task.count_task_events(db, db_task.id))
+
+
+async def build_task_status_async(db: AsyncSession, db_task: CurrentTask) -> Dict[str, Any]:
+    """build_task_status の非同期版（FastAPIのリクエスト処理用）"""
+    return _task_status(db_task, await crud_task.count_task_events_async(db, db_task.id))
+
+
+def _progress(completed_items: int, total_items: int) -> float:
+    progress = (completed_items / total_items * 100) if total_items > 0 else 0
+    return round(progress, 2)
+
+
+def _task_status(db_task: CurrentTask, event_counts: Dict[str, int]) -> Dict[str, Any]:
+    error_count = event_counts[crud_task.EVENT_ERROR]
+    manual_upload_count = event_counts[crud_task.EVENT_MANUAL_UPLOAD]
+    detail = None
+    if db_task.progress_detail_json:
+        try:
+            detail = json.loads(db_task.progress_detail_json)
+        except json.JSONDecodeError:
+            detail = None
+
+    return {
+        "task_id": db_task.id,
+        "status": db_task.status,
+        "total_items": db_task.total_items,
+        "completed_items": db_task.completed_items,
+        "progress": _progress(db_task.completed_items, db_task.total_items),
+        "has_errors": error_count > 0,
+        "error_count": error_count,
+        "manual_upload_count": manual_upload_count,
+        "created_at": db_task.created_at,
+        "detail": detail
+    }
+
+
+def serialize_task_status(status_data: Dict[str, Any]) -> str:
+    """ステータス情報を配信用JSON文字列に変換"""
+    return TaskStatus(**status_data).model_dump_json()
+
+
+def publish_task_status(db: Session, task_id: UUID) -> Optional[int]:
+    """
+    タスクの最新ステータスをRedisへ発行する
+
+    配信は補助的な機能のため、失敗してもログ記録のみでタスク処理は止めない
+
+    Returns:
+        Optional[int]: 受信した購読者数（発行できなかった場合はNone）
+    """
+    try:
+        db_task = crud_task.get_task_by_id(db, task_id)
+        if db_task is None:
+            return None
+        message = serialize_task_status(build_task_status(db, db_task))
+        return get_redis().publish(task_channel(db_task.user_id), message)
+    except Exception as e:
+        logger.warning(f"Failed to publish task status: {e}")
+        return None
+
+
+class TaskStatusPublisher:
+    """
+    1タスク分（ワーカーの1回の実行）の進捗配信
+
+    初回の発行時のみDBからステータスを組み立て、以降は進捗ライターがフラッシュした値
+    （進捗詳細・完了件数・イベント）を手元のステータスに反映して発行する。
+    フラッシュのたびにタスクの取得とイベント件数の集計を行わない。
+    """
+
+    def __init__(self, db: Session, task_id: UUID):
+        self.db = db
+        self.task_id = task_id
+        self._status: Optional[Dict[str, Any]] = None
+        self._user_id: Optional[int] = None
+
+    def set_status(self, status: str) -> None:
+        """ワーカーが更新したタスクのステータスを反映する（次回の発行から使用）"""
+        if self._status is not None:
+            self._status["status"] = status
+
+    def publish(
+        self,
+        *,
+        detail: Optional[Dict[str, Any]] = None,
+        completed_items: Optional[int] = None,
+        events: Iterable[Tuple[str, Dict[str, Any]]] = ()
+    ) -> Optional[int]:
+        """
+        フラッシュした値を反映してRedisへ発行する（失敗してもログ記録のみ）
+
+        Returns:
+            Optional[int]: 受信した購読者数（発行できなかった場合はNone）
+        """
+        try:
+            if self._status is None:
+                # 書き込み済みの値を含めてDBから組み立てる
+                db_task = crud_task.get_task_by_id(self.db, self.task_id)
+                if db_task is None:
+                    return None
+                self._status = build_task_status(self.db, db_task)
+                self._user_id = db_task.user_id
+            else:
+                self._apply(detail, completed_items, events)
+            message = serialize_task_status(self._status)
+            return get_redis().publish(task_channel(self._user_id), message)
+        except Exception as e:
+            logger.warning(f"Failed to publish task status: {e}")
+            return None
+
+    def _apply(
+        self,
+        detail: Optional[Dict[str, Any]],
+        completed_items: Optional[int],
+        events: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        status_data = self._status
+        if detail is not None:
+            status_data["detail"] = detail
+        if completed_items is not None:
+            status_data["completed_items"] = completed_items
+            status_data["progress"] = _progress(completed_items, status_data["total_items"])
+        for event_type, _ in events:
+            if event_type == crud_task.EVENT_ERROR:
+                status_data["error_count"] += 1
+            elif event_type == crud_task.EVENT_MANUAL_UPLOAD:
+                status_data["manual_upload_count"] += 1
+        status_data["has_errors"] = status_data["error_count"] > 0
@@ -0,0 +1,94 @@
+"""
+スタイル別所要時間の集計
+Celeryワーカーが記録した STYLE_TIMING イベント（SalonBoard の StyleTimer の計測結果）を
+ステージ別の p50/p95 と、意図的な待機・サーバー応答待ちの内訳に集計する
+"""
+import math
+from typing import Any, Dict, Iterable, List
+
+# 意図的な待機（人間らしさのための待機・制限解除待ち）
+INTENTIONAL_WAITS = ("human_pause", "cooldown")
+WAIT_LOADER_OVERLAY = "loader_overlay"
+
+
+def percentile(values: List[int], ratio: float) -> int:
+    """最近傍順位法によるパーセンタイル"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(ratio * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _share(part: int, total: int) -> float:
+    return round(part / total, 4) if total > 0 else 0.0
+
+
+def summarize_style_timings(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    スタイル別の計測結果を集計する
+
+    Args:
+        records: StyleTimer.finish_style() の戻り値のリスト
+
+    Returns:
+        Dict[str, Any]: スタイル全体・ステージ別の p50/p95 と、待機時間の内訳
+    """
+    records = list(records)
+    totals = [int(record.get("total_ms", 0)) for record in records]
+    total_ms = sum(totals)
+
+    stage_values: Dict[str, List[int]] = {}
+    stage_pauses: Dict[str, int] = {}
+    wait_totals: Dict[str, int] = {}
+    wait_counts: Dict[str, int] = {}
+    browser_calls: Dict[str, int] = {}
+    pacing_scales: List[float] = []
+    for record in records:
+        for stage, values in (record.get("stages") or {}).items():
+            stage_values.setdefault(stage, []).append(int(values.get("ms", 0)))
+            stage_pauses[stage] = stage_pauses.get(stage, 0) + int(values.get("pause_ms", 0))
+        for kind, elapsed_ms in (record.get("waits") or {}).items():
+            wait_totals[kind] = wait_totals.get(kind, 0) + int(elapsed_ms)
+        if record.get("pacing_scale") is not None:
+            pacing_scales.append(float(record["pacing_scale"]))
+        for kind, count in (record.get("wait_counts") or {}).items():
+            wait_counts[kind] = wait_counts.get(kind, 0) + int(count)
+        for kind, calls in (record.get("browser_calls") or {}).items():
+            browser_calls[kind] = browser_calls.get(kind, 0) + int(calls)
+
+    pause_ms = sum(wait_totals.get(kind, 0) for kind in INTENTIONAL_WAITS)
+    overlay_ms = wait_totals.get(WAIT_LOADER_OVERLAY, 0)
+    # 意図的な待機以外はブラウザ操作とSALON BOARDの応答待ち
+    other_ms = max(0, total_ms - pause_ms)
+
+    stages = []
+    for stage, values in sorted(stage_values.items(), key=lambda item: -sum(item[1])):
+        stage_total = sum(values)
+        stages.append({
+            "stage": stage,
+            "count": len(values),
+            "total_ms": stage_total,
+            "p50_ms": percentile(values, 0.5),
+            "p95_ms": percentile(values, 0.95),
+            "pause_share": _share(stage_pauses.get(stage, 0), stage_total),
+        })
+
+    return {
+        "style_count": len(records),
+        "total_ms": total_ms,
+        "style_p50_ms": percentile(totals, 0.5),
+        "style_p95_ms": percentile(totals, 0.95),
+        "intentional_pause_ms": pause_ms,
+        "loader_overlay_ms": overlay_ms,
+        "server_and_browser_ms": other_ms,
+        "intentional_pause_share": _share(pause_ms, total_ms),
+        "server_and_browser_share": _share(other_ms, total_ms),
+        # ペース配分の倍率（スタイル完了時点の平均・最終値）
+        "pacing_scale_mean": round(sum(pacing_scales) / len(pacing_scales), 4) if pacing_scales else None,
+        "pacing_scale_last": pacing_scales[-1] if pacing_scales else None,
+        "waits": wait_totals,
+        "wait_counts": wait_counts,
+        "browser_calls": browser_calls,
+        "stages": stages,
+    }
@@ -0,0 +1,78 @@
+"""
+認証済みユーザーのキャッシュ
+get_current_user はリクエストごとにトークンのsubject（メールアドレス）でユーザーを取得するため、
+Redisに短時間キャッシュして、ポーリング中のタブごとに発生する users テーブルへの問い合わせを減らす。
+ユーザーの更新・削除時は app.crud.user から invalidate_users() で破棄する
+"""
+import logging
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis, get_redis
+from app.schemas.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def user_cache_key(email: str) -> str:
+    """トークンのsubject（メールアドレス）単位のキャッシュキー"""
+    return f"auth_user:{email.strip().lower()}"
+
+
+async def get_cached_user(email: str) -> Optional[User]:
+    """
+    キャッシュからユーザーを取得する
+
+    Returns:
+        Optional[User]: ユーザー（未キャッシュ・無効・Redisに接続できない場合はNone）
+    """
+    if settings.AUTH_USER_CACHE_TTL_SEC <= 0:
+        return None
+    try:
+        raw = await get_async_redis().get(user_cache_key(email))
+    except Exception as e:
+        logger.warning(f"Failed to read user cache: {e}")
+        return None
+    if raw is None:
+        return None
+    try:
+        return User.model_validate_json(raw)
+    except ValueError:
+        return None
+
+
+async def cache_user(user: User) -> bool:
+    """
+    ユーザーをキャッシュする
+
+    Returns:
+        bool: 保存できた場合True
+    """
+    if settings.AUTH_USER_CACHE_TTL_SEC <= 0:
+        return False
+    try:
+        await get_async_redis().set(
+            user_cache_key(user.email), user.model_dump_json(), ex=settings.AUTH_USER_CACHE_TTL_SEC
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to write user cache: {e}")
+        return False
+
+
+def invalidate_users(emails: Iterable[str]) -> bool:
+    """
+    ユーザーのキャッシュを破棄する（ユーザーの更新・削除時）
+
+    Returns:
+        bool: 破棄できた場合True（Redisに接続できない場合はFalse、TTL経過で失効する）
+    """
+    keys = {user_cache_key(email) for email in emails if email}
+    if not keys:
+        return True
+    try:
+        get_redis().delete(*keys)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to invalidate user cache: {e}")
+        return False
@@ -1,12 +1,36 @@
 """
 CurrentTask CRUD操作
 """
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import json
 from uuid import UUID
 
 from app.models.current_task import CurrentTask
+from app.models.task_event import TaskEvent
+
+# タスクイベント種別
+EVENT_SUCCESS = "SUCCESS"
+EVENT_ERROR = "ERROR"
+EVENT_MANUAL_UPLOAD = "MANUAL_UPLOAD"
+EVENT_STYLE_TIMING = "STYLE_TIMING"
+
+# 手動画像登録扱いとするエラー種別
+MANUAL_UPLOAD_ERROR_CATEGORY = "IMAGE_UPLOAD_ABORTED"
+
+# タスクステータス
+STATUS_QUEUED = "QUEUED"
+ACTIVE_STATUSES = ("PROCESSING", "CANCELLING")
+FINISHED_STATUSES = ("SUCCESS", "FAILURE")
+
+# ユーザー単位で表示するタスクの優先順（実行中 → 最新の完了タスク）
+_DISPLAY_ORDER = (
+    case((CurrentTask.status.in_(ACTIVE_STATUSES), 0), else_=1),
+    CurrentTask.created_at.desc(),
+)
 
 
 def get_task_by_id(db: Session, task_id: UUID) -> Optional[CurrentTask]:
@@ -25,7 +49,7 @@ def get_task_by_id(db: Session, task_id: UUID) -> Optional[CurrentTask]:
 
 def get_task_by_user_id(db: Session, user_id: int) -> Optional[CurrentTask]:
     """
-    ユーザーIDでタスク取得
+    ユーザーIDでタスク取得（順番待ちを除き、実行中のタスク、なければ最新の完了タスク）
 
     Args:
         db: データベースセッション
@@ -34,42 +58,295 @@ def get_task_by_user_id(db: Session, user_id: int) -> Optional[CurrentTask]:
     Returns:
         Optional[CurrentTask]: タスク（存在しない場合はNone）
     """
-    return db.query(CurrentTask).filter(CurrentTask.user_id == user_id).first()
+    return (
+        db.query(CurrentTask)
+        .filter(CurrentTask.user_id == user_id, CurrentTask.status != STATUS_QUEUED)
+        .order_by(*_DISPLAY_ORDER)
+        .first()
+    )
+
+
+def get_active_task(db: Session, user_id: int) -> Optional[CurrentTask]:
+    """
+    ユーザーの実行中タスク取得
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        Optional[CurrentTask]: 実行中（PROCESSING/CANCELLING）のタスク（存在しない場合はNone）
+    """
+    return (
+        db.query(CurrentTask)
+        .filter(CurrentTask.user_id == user_id, CurrentTask.status.in_(ACTIVE_STATUSES))
+        .first()
+    )
 
 
 def create_task(
     db: Session,
     task_id: UUID,
     user_id: int,
-    total_items: int
+    total_items: int,
+    task_name: Optional[str] = None,
+    task_kwargs: Optional[Dict[str, Any]] = None
 ) -> CurrentTask:
     """
-    タスク作成
+    タスク作成（実行中として登録）
 
     Args:
         db: データベースセッション
         task_id: タスクID（CeleryタスクIDと同じ）
         user_id: ユーザーID
         total_items: 処理対象の総スタイル数
+        task_name: Celeryタスク名
+        task_kwargs: Celeryタスクの引数
 
     Returns:
         CurrentTask: 作成されたタスク
+
+    Raises:
+        IntegrityError: ユーザーの実行中タスクが既に存在する場合
     """
-    db_task = CurrentTask(
+    return _add_task(db, CurrentTask(
         id=task_id,
         user_id=user_id,
         status="PROCESSING",
         total_items=total_items,
         completed_items=0,
         progress_detail_json=None,
-        error_info_json=None
+        task_name=task_name,
+        task_kwargs_json=_encode_kwargs(task_kwargs)
+    ))
+
+
+def enqueue_task(
+    db: Session,
+    task_id: UUID,
+    user_id: int,
+    total_items: int,
+    task_name: str,
+    task_kwargs: Dict[str, Any]
+) -> CurrentTask:
+    """
+    タスクを順番待ちとして登録（ユーザーの待ち行列の末尾に追加）
+
+    Args:
+        db: データベースセッション
+        task_id: タスクID（開始時のCeleryタスクIDと同じ）
+        user_id: ユーザーID
+        total_items: 処理対象の総スタイル数
+        task_name: 開始時に送信するCeleryタスク名
+        task_kwargs: 開始時に送信するCeleryタスクの引数
+
+    Returns:
+        CurrentTask: 作成されたタスク
+    """
+    last_position = (
+        db.query(func.max(CurrentTask.queue_position))
+        .filter(CurrentTask.user_id == user_id, CurrentTask.status == STATUS_QUEUED)
+        .scalar()
     )
+    return _add_task(db, CurrentTask(
+        id=task_id,
+        user_id=user_id,
+        status=STATUS_QUEUED,
+        total_items=total_items,
+        completed_items=0,
+        progress_detail_json=None,
+        queue_position=(last_position or 0) + 1,
+        task_name=task_name,
+        task_kwargs_json=_encode_kwargs(task_kwargs)
+    ))
+
+
+def _add_task(db: Session, db_task: CurrentTask) -> CurrentTask:
     db.add(db_task)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
     db.refresh(db_task)
     return db_task
 
 
+def _encode_kwargs(task_kwargs: Optional[Dict[str, Any]]) -> Optional[str]:
+    if task_kwargs is None:
+        return None
+    return json.dumps(task_kwargs, ensure_ascii=False)
+
+
+def get_task_kwargs(db_task: CurrentTask) -> Dict[str, Any]:
+    """
+    登録時に保存したCeleryタスクの引数を取得
+
+    Args:
+        db_task: タスク
+
+    Returns:
+        Dict[str, Any]: Celeryタスクの引数（未保存の場合は空の辞書）
+    """
+    if not db_task.task_kwargs_json:
+        return {}
+    return json.loads(db_task.task_kwargs_json)
+
+
+def get_task_detail(db_task: CurrentTask) -> Dict[str, Any]:
+    """
+    タスク進捗の詳細情報を取得
+
+    Args:
+        db_task: タスク
+
+    Returns:
+        Dict[str, Any]: 詳細情報（未設定・壊れている場合は空の辞書）
+    """
+    if not db_task.progress_detail_json:
+        return {}
+    try:
+        detail = json.loads(db_task.progress_detail_json)
+    except json.JSONDecodeError:
+        return {}
+    return detail if isinstance(detail, dict) else {}
+
+
+def get_queued_tasks(db: Session, user_id: int) -> List[CurrentTask]:
+    """
+    ユーザーの順番待ちタスクを実行順に取得
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        List[CurrentTask]: 順番待ちのタスク
+    """
+    return (
+        db.query(CurrentTask)
+        .filter(CurrentTask.user_id == user_id, CurrentTask.status == STATUS_QUEUED)
+        .order_by(CurrentTask.queue_position, CurrentTask.created_at)
+        .all()
+    )
+
+
+def _renumber_queue(db_tasks: List[CurrentTask]) -> None:
+    for position, db_task in enumerate(db_tasks, start=1):
+        db_task.queue_position = position
+
+
+def move_queued_task(db: Session, user_id: int, task_id: UUID, position: int) -> Optional[List[CurrentTask]]:
+    """
+    順番待ちタスクの実行順を変更
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        task_id: 移動するタスクID
+        position: 移動先の順番（1始まり、範囲外の場合は先頭または末尾）
+
+    Returns:
+        Optional[List[CurrentTask]]: 変更後の順番待ちタスク（対象が順番待ちにない場合はNone）
+    """
+    db_tasks = get_queued_tasks(db, user_id)
+    target = next((db_task for db_task in db_tasks if db_task.id == task_id), None)
+    if target is None:
+        return None
+
+    db_tasks.remove(target)
+    index = min(max(position, 1), len(db_tasks) + 1) - 1
+    db_tasks.insert(index, target)
+    _renumber_queue(db_tasks)
+    db.commit()
+    return db_tasks
+
+
+def remove_queued_task(db: Session, user_id: int, task_id: UUID) -> Optional[CurrentTask]:
+    """
+    順番待ちタスクを取り消す（後続の順番を詰める）
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        task_id: 取り消すタスクID
+
+    Returns:
+        Optional[CurrentTask]: 削除したタスク（対象が順番待ちにない場合はNone）
+    """
+    db_tasks = get_queued_tasks(db, user_id)
+    target = next((db_task for db_task in db_tasks if db_task.id == task_id), None)
+    if target is None:
+        return None
+
+    db_tasks.remove(target)
+    db.delete(target)
+    _renumber_queue(db_tasks)
+    db.commit()
+    return target
+
+
+def get_queue_heads(db: Session) -> List[CurrentTask]:
+    """
+    開始できる順番待ちタスク（実行中のタスクがないユーザーの待ち行列の先頭）を取得
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        List[CurrentTask]: ユーザーごとの先頭のタスク
+    """
+    active_users = select(CurrentTask.user_id).where(CurrentTask.status.in_(ACTIVE_STATUSES))
+    db_tasks = (
+        db.query(CurrentTask)
+        .filter(CurrentTask.status == STATUS_QUEUED, CurrentTask.user_id.not_in(active_users))
+        .order_by(CurrentTask.user_id, CurrentTask.queue_position, CurrentTask.created_at)
+        .all()
+    )
+    heads: Dict[int, CurrentTask] = {}
+    for db_task in db_tasks:
+        heads.setdefault(db_task.user_id, db_task)
+    return list(heads.values())
+
+
+def get_running_tasks(db: Session) -> List[CurrentTask]:
+    """
+    全ユーザーの実行中（PROCESSING・CANCELLING）のタスクを取得
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        List[CurrentTask]: 実行中のタスク
+    """
+    return db.query(CurrentTask).filter(CurrentTask.status.in_(ACTIVE_STATUSES)).all()
+
+
+def start_queued_task(db: Session, db_task: CurrentTask) -> bool:
+    """
+    順番待ちタスクを実行中にする（同じユーザーの後続の順番を詰める）
+
+    Args:
+        db: データベースセッション
+        db_task: 開始するタスク
+
+    Returns:
+        bool: 実行中にできた場合True（他のプロセスが先にユーザーのタスクを開始した場合はFalse）
+    """
+    followers = [other for other in get_queued_tasks(db, db_task.user_id) if other.id != db_task.id]
+    db_task.status = "PROCESSING"
+    db_task.queue_position = None
+    _renumber_queue(followers)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 部分UNIQUEインデックス違反 = 他のプロセスが同時に開始した
+        db.rollback()
+        return False
+    db.refresh(db_task)
+    return True
+
+
 def update_task_progress(db: Session, task_id: UUID, completed_items: int) -> Optional[CurrentTask]:
     """
     タスク進捗更新
@@ -110,6 +387,47 @@ def update_task_detail(db: Session, task_id: UUID, detail: Dict[str, Any]) -> Op
     return db_task
 
 
+def apply_task_progress(
+    db: Session,
+    task_id: UUID,
+    *,
+    detail: Optional[Dict[str, Any]] = None,
+    completed_items: Optional[int] = None,
+    events: Optional[Iterable[Tuple[str, Dict[str, Any]]]] = None,
+    checkpoint_index: Optional[int] = None
+) -> None:
+    """
+    進捗詳細・完了件数・イベント・再開位置をまとめて書き込む（UPDATE 1回 + INSERT 1回 + COMMIT 1回）
+
+    Args:
+        db: データベースセッション
+        task_id: タスクID
+        detail: フロントエンド表示用の詳細情報（Noneの場合は更新しない）
+        completed_items: 完了件数（Noneの場合は更新しない）
+        events: (イベント種別, payload) のリスト
+        checkpoint_index: 分割実行する投稿タスクの処理済みの行数（Noneの場合は更新しない。
+            同じCOMMITで書き込むため、処理済みの行の成功・エラーイベントより先に進まない）
+    """
+    values: Dict[str, Any] = {}
+    if detail is not None:
+        values["progress_detail_json"] = json.dumps(detail, ensure_ascii=False)
+    if completed_items is not None:
+        values["completed_items"] = completed_items
+    if checkpoint_index is not None:
+        values["checkpoint_index"] = checkpoint_index
+    if values:
+        db.query(CurrentTask).filter(CurrentTask.id == task_id).update(
+            values, synchronize_session=False
+        )
+
+    db_events = [build_task_event(task_id, event_type, payload) for event_type, payload in (events or [])]
+    if db_events:
+        db.add_all(db_events)
+
+    if values or db_events:
+        db.commit()
+
+
 def update_task_status(db: Session, task_id: UUID, status: str) -> Optional[CurrentTask]:
     """
     タスクステータス更新
@@ -117,7 +435,7 @@ def update_task_status(db: Session, task_id: UUID, status: str) -> Optional[Curr
     Args:
         db: データベースセッション
         task_id: タスクID
-        status: 新しいステータス（"PROCESSING", "CANCELLING", "SUCCESS", "FAILURE"）
+        status: 新しいステータス（"QUEUED", "PROCESSING", "CANCELLING", "SUCCESS", "FAILURE"）
 
     Returns:
         Optional[CurrentTask]: 更新されたタスク（存在しない場合はNone）
@@ -130,9 +448,49 @@ def update_task_status(db: Session, task_id: UUID, status: str) -> Optional[Curr
     return db_task
 
 
-def add_task_error(db: Session, task_id: UUID, error_info: dict) -> Optional[CurrentTask]:
+def classify_error_event(error_info: Dict[str, Any]) -> str:
     """
-    タスクエラー情報追加
+    エラー情報からイベント種別を判定
+
+    Args:
+        error_info: エラー情報の辞書
+
+    Returns:
+        str: "MANUAL_UPLOAD"（手動画像登録が必要）または "ERROR"
+    """
+    if error_info.get("error_category") == MANUAL_UPLOAD_ERROR_CATEGORY:
+        return EVENT_MANUAL_UPLOAD
+    return EVENT_ERROR
+
+
+def build_task_event(task_id: UUID, event_type: str, payload: Dict[str, Any]) -> TaskEvent:
+    """
+    タスクイベントのモデルインスタンスを生成（未コミット）
+
+    Args:
+        task_id: タスクID
+        event_type: イベント種別（"SUCCESS", "ERROR", "MANUAL_UPLOAD", "STYLE_TIMING"）
+        payload: イベント内容の辞書
+
+    Returns:
+        TaskEvent: 生成されたイベント
+    """
+    row_number = payload.get("row_number") or 0
+    try:
+        row_number = int(row_number)
+    except (TypeError, ValueError):
+        row_number = 0
+    return TaskEvent(
+        task_id=task_id,
+        event_type=event_type,
+        row_number=row_number,
+        payload_json=json.dumps(payload, ensure_ascii=False, default=str)
+    )
+
+
+def add_task_error(db: Session, task_id: UUID, error_info: dict) -> TaskEvent:
+    """
+    タスクエラー情報追加（task_eventsへの1行INSERTのみ）
 
     Args:
         db: データベースセッション
@@ -140,27 +498,77 @@ def add_task_error(db: Session, task_id: UUID, error_info: dict) -> Optional[Cur
         error_info: エラー情報の辞書
 
     Returns:
-        Optional[CurrentTask]: 更新されたタスク（存在しない場合はNone）
+        TaskEvent: 追加されたイベント
     """
-    db_task = get_task_by_id(db, task_id)
-    if db_task:
-        # 既存のエラー情報を取得
-        if db_task.error_info_json:
-            try:
-                errors = json.loads(db_task.error_info_json)
-            except json.JSONDecodeError:
-                errors = []
-        else:
-            errors = []
-
-        # 新しいエラーを追加
-        errors.append(error_info)
-
-        # JSON文字列として保存
-        db_task.error_info_json = json.dumps(errors, ensure_ascii=False)
-        db.commit()
-        db.refresh(db_task)
-    return db_task
+    db_event = build_task_event(task_id, classify_error_event(error_info), error_info)
+    db.add(db_event)
+    db.commit()
+    return db_event
+
+
+def count_task_events(db: Session, task_id: UUID) -> Dict[str, int]:
+    """
+    イベント種別ごとの件数を取得（インデックスを使ったGROUP BY集計）
+
+    Args:
+        db: データベースセッション
+        task_id: タスクID
+
+    Returns:
+        Dict[str, int]: イベント種別をキーとした件数（該当なしの種別は0）
+    """
+    rows = (
+        db.query(TaskEvent.event_type, func.count(TaskEvent.id))
+        .filter(TaskEvent.task_id == task_id)
+        .group_by(TaskEvent.event_type)
+        .all()
+    )
+    return _event_counts(rows)
+
+
+def _event_counts(rows: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    counts = {EVENT_SUCCESS: 0, EVENT_ERROR: 0, EVENT_MANUAL_UPLOAD: 0}
+    for event_type, count in rows:
+        counts[event_type] = count
+    return counts
+
+
+def get_task_events(
+    db: Session,
+    task_id: UUID,
+    event_types: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    タスクイベントを発生順に取得
+
+    Args:
+        db: データベースセッション
+        task_id: タスクID
+        event_types: 取得するイベント種別（未指定の場合は全種別）
+
+    Returns:
+        List[Dict[str, Any]]: 各イベントのpayload（"event_type"キーを付与）
+    """
+    query = db.query(TaskEvent).filter(TaskEvent.task_id == task_id)
+    if event_types is not None:
+        query = query.filter(TaskEvent.event_type.in_(list(event_types)))
+
+    return _decode_events(query.order_by(TaskEvent.id).all())
+
+
+def _decode_events(db_events: Iterable[TaskEvent]) -> List[Dict[str, Any]]:
+    """イベントのpayloadを復元（"event_type"キーを付与、壊れたpayloadは読み飛ばす）"""
+    events: List[Dict[str, Any]] = []
+    for db_event in db_events:
+        try:
+            payload = json.loads(db_event.payload_json)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        payload["event_type"] = db_event.event_type
+        events.append(payload)
+    return events
 
 
 def delete_task(db: Session, task_id: UUID) -> bool:
@@ -182,9 +590,41 @@ def delete_task(db: Session, task_id: UUID) -> bool:
     return False
 
 
-def add_task_success(db: Session, task_id: UUID, success_info: dict) -> Optional[CurrentTask]:
+def prune_finished_tasks(db: Session, user_id: int, keep: int) -> int:
     """
-    タスク成功スタイル情報追加
+    ユーザーの完了タスクのうち、新しいものから keep 件を残して古いものを削除
+
+    確認（DELETE /finished-task）されずに残った完了タスクとイベントが溜まり続けないようにする
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        keep: 残す完了タスク数
+
+    Returns:
+        int: 削除したタスク数
+    """
+    stale_ids = [
+        task_id for (task_id,) in (
+            db.query(CurrentTask.id)
+            .filter(CurrentTask.user_id == user_id, CurrentTask.status.in_(FINISHED_STATUSES))
+            .order_by(CurrentTask.created_at.desc())
+            .offset(max(keep, 0))
+            .all()
+        )
+    ]
+    if not stale_ids:
+        return 0
+
+    db.execute(delete(TaskEvent).where(TaskEvent.task_id.in_(stale_ids)))
+    db.execute(delete(CurrentTask).where(CurrentTask.id.in_(stale_ids)))
+    db.commit()
+    return len(stale_ids)
+
+
+def add_task_success(db: Session, task_id: UUID, success_info: dict) -> TaskEvent:
+    """
+    タスク成功スタイル情報追加（task_eventsへの1行INSERTのみ）
 
     Args:
         db: データベースセッション
@@ -192,24 +632,147 @@ def add_task_success(db: Session, task_id: UUID, success_info: dict) -> Optional
         success_info: 成功スタイル情報の辞書
 
     Returns:
-        Optional[CurrentTask]: 更新されたタスク（存在しない場合はNone）
+        TaskEvent: 追加されたイベント
     """
-    db_task = get_task_by_id(db, task_id)
-    if db_task:
-        # 既存の成功情報を取得
-        if db_task.success_info_json:
-            try:
-                successes = json.loads(db_task.success_info_json)
-            except json.JSONDecodeError:
-                successes = []
-        else:
-            successes = []
-
-        # 新しい成功情報を追加
-        successes.append(success_info)
-
-        # JSON文字列として保存
-        db_task.success_info_json = json.dumps(successes, ensure_ascii=False)
-        db.commit()
-        db.refresh(db_task)
-    return db_task
+    db_event = build_task_event(task_id, EVENT_SUCCESS, success_info)
+    db.add(db_event)
+    db.commit()
+    return db_event
+
+
+async def get_task_by_user_id_async(db: AsyncSession, user_id: int) -> Optional[CurrentTask]:
+    """
+    ユーザーIDでタスク取得（非同期、順番待ちを除き、実行中のタスク、なければ最新の完了タスク）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        Optional[CurrentTask]: タスク（存在しない場合はNone）
+    """
+    result = await db.execute(
+        select(CurrentTask)
+        .where(CurrentTask.user_id == user_id, CurrentTask.status != STATUS_QUEUED)
+        .order_by(*_DISPLAY_ORDER)
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_user_task_async(db: AsyncSession, user_id: int, task_id: UUID) -> Optional[CurrentTask]:
+    """
+    ユーザーのタスクをタスクIDで取得（非同期、順番待ちを除く）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+        task_id: タスクID
+
+    Returns:
+        Optional[CurrentTask]: タスク（存在しない・他ユーザーのタスクの場合はNone）
+    """
+    result = await db.execute(
+        select(CurrentTask).where(
+            CurrentTask.id == task_id,
+            CurrentTask.user_id == user_id,
+            CurrentTask.status != STATUS_QUEUED,
+        )
+    )
+    return result.scalars().first()
+
+
+async def get_finished_tasks_async(db: AsyncSession, user_id: int) -> List[CurrentTask]:
+    """
+    ユーザーの完了タスクを新しい順に取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        List[CurrentTask]: 完了（SUCCESS/FAILURE）したタスク
+    """
+    result = await db.execute(
+        select(CurrentTask)
+        .where(CurrentTask.user_id == user_id, CurrentTask.status.in_(FINISHED_STATUSES))
+        .order_by(CurrentTask.created_at.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def get_queued_tasks_async(db: AsyncSession, user_id: int) -> List[CurrentTask]:
+    """
+    ユーザーの順番待ちタスクを実行順に取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        List[CurrentTask]: 順番待ちのタスク
+    """
+    result = await db.execute(
+        select(CurrentTask)
+        .where(CurrentTask.user_id == user_id, CurrentTask.status == STATUS_QUEUED)
+        .order_by(CurrentTask.queue_position, CurrentTask.created_at)
+    )
+    return list(result.scalars().all())
+
+
+async def count_task_events_async(db: AsyncSession, task_id: UUID) -> Dict[str, int]:
+    """
+    イベント種別ごとの件数を取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        task_id: タスクID
+
+    Returns:
+        Dict[str, int]: イベント種別をキーとした件数（該当なしの種別は0）
+    """
+    result = await db.execute(
+        select(TaskEvent.event_type, func.count(TaskEvent.id))
+        .where(TaskEvent.task_id == task_id)
+        .group_by(TaskEvent.event_type)
+    )
+    return _event_counts(result.all())
+
+
+async def get_task_events_async(
+    db: AsyncSession,
+    task_id: UUID,
+    event_types: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    タスクイベントを発生順に取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        task_id: タスクID
+        event_types: 取得するイベント種別（未指定の場合は全種別）
+
+    Returns:
+        List[Dict[str, Any]]: 各イベントのpayload（"event_type"キーを付与）
+    """
+    statement = select(TaskEvent).where(TaskEvent.task_id == task_id)
+    if event_types is not None:
+        statement = statement.where(TaskEvent.event_type.in_(list(event_types)))
+    result = await db.execute(statement.order_by(TaskEvent.id))
+    return _decode_events(result.scalars().all())
+
+
+async def delete_task_async(db: AsyncSession, task_id: UUID) -> None:
+    """
+    タスク削除（非同期）
+
+    非同期セッションではイベントの遅延ロードによるカスケード削除ができないため、
+    イベントを先に一括削除する
+
+    Args:
+        db: 非同期データベースセッション
+        task_id: タスクID
+    """
+    await db.execute(delete(TaskEvent).where(TaskEvent.task_id == task_id))
+    await db.execute(delete(CurrentTask).where(CurrentTask.id == task_id))
+    await db.commit()
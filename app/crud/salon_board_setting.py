@@ -1,12 +1,24 @@
 """
 SALON BOARD設定 CRUD操作
 """
+import json
+import logging
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.sql import func
+from typing import Any, Dict, List, Optional
 
 from app.models.salon_board_setting import SalonBoardSetting
 from app.schemas.salon_board_setting import SalonBoardSettingCreate, SalonBoardSettingUpdate
-from app.core.security import encrypt_password
+from app.core.security import decrypt_password, encrypt_password
+
+logger = logging.getLogger(__name__)
+
+# 変更時に保存済みログインセッションを破棄するフィールド
+SESSION_BOUND_FIELDS = ("sb_user_id", "encrypted_sb_password", "salon_id", "salon_name")
 
 
 def get_setting_by_id(db: Session, setting_id: int) -> Optional[SalonBoardSetting]:
@@ -49,21 +61,23 @@ def create_setting(db: Session, setting: SalonBoardSettingCreate, user_id: int)
     Returns:
         SalonBoardSetting: 作成された設定
     """
-    # パスワード暗号化
-    encrypted_password = encrypt_password(setting.sb_password)
+    db_setting = _build_setting(setting, user_id)
+    db.add(db_setting)
+    db.commit()
+    db.refresh(db_setting)
+    return db_setting
 
-    db_setting = SalonBoardSetting(
+
+def _build_setting(setting: SalonBoardSettingCreate, user_id: int) -> SalonBoardSetting:
+    """作成スキーマから設定モデルを組み立てる（パスワードは暗号化）"""
+    return SalonBoardSetting(
         user_id=user_id,
         setting_name=setting.setting_name,
         sb_user_id=setting.sb_user_id,
-        encrypted_sb_password=encrypted_password,
+        encrypted_sb_password=encrypt_password(setting.sb_password),
         salon_id=setting.salon_id,
         salon_name=setting.salon_name
     )
-    db.add(db_setting)
-    db.commit()
-    db.refresh(db_setting)
-    return db_setting
 
 
 def update_setting(
@@ -86,6 +100,15 @@ def update_setting(
     if not db_setting:
         return None
 
+    _apply_setting_update(db_setting, setting_update)
+
+    db.commit()
+    db.refresh(db_setting)
+    return db_setting
+
+
+def _apply_setting_update(db_setting: SalonBoardSetting, setting_update: SalonBoardSettingUpdate) -> None:
+    """更新スキーマの内容を設定に反映（同期・非同期の更新処理で共通）"""
     # 指定されたフィールドのみ更新
     update_data = setting_update.model_dump(exclude_unset=True)
 
@@ -93,13 +116,17 @@ def update_setting(
     if "sb_password" in update_data and update_data["sb_password"]:
         update_data["encrypted_sb_password"] = encrypt_password(update_data.pop("sb_password"))
 
+    # ログイン情報・サロンが変わった場合、保存済みセッションは使えないため破棄
+    if any(
+        field in update_data and update_data[field] != getattr(db_setting, field)
+        for field in SESSION_BOUND_FIELDS
+    ):
+        db_setting.encrypted_storage_state = None
+        db_setting.storage_state_updated_at = None
+
     for field, value in update_data.items():
         setattr(db_setting, field, value)
 
-    db.commit()
-    db.refresh(db_setting)
-    return db_setting
-
 
 def delete_setting(db: Session, setting_id: int) -> bool:
     """
@@ -118,3 +145,154 @@ def delete_setting(db: Session, setting_id: int) -> bool:
         db.commit()
         return True
     return False
+
+
+async def get_setting_by_id_async(db: AsyncSession, setting_id: int) -> Optional[SalonBoardSetting]:
+    """
+    IDで設定取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        setting_id: 設定ID
+
+    Returns:
+        Optional[SalonBoardSetting]: 設定（存在しない場合はNone）
+    """
+    return await db.get(SalonBoardSetting, setting_id)
+
+
+async def get_settings_by_user_id_async(db: AsyncSession, user_id: int) -> List[SalonBoardSetting]:
+    """
+    ユーザーIDで設定一覧取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        List[SalonBoardSetting]: 設定リスト
+    """
+    result = await db.execute(select(SalonBoardSetting).where(SalonBoardSetting.user_id == user_id))
+    return list(result.scalars().all())
+
+
+async def create_setting_async(
+    db: AsyncSession,
+    setting: SalonBoardSettingCreate,
+    user_id: int
+) -> SalonBoardSetting:
+    """
+    SALON BOARD設定作成（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        setting: 設定作成スキーマ
+        user_id: ユーザーID
+
+    Returns:
+        SalonBoardSetting: 作成された設定
+    """
+    db_setting = _build_setting(setting, user_id)
+    db.add(db_setting)
+    await db.commit()
+    await db.refresh(db_setting)
+    return db_setting
+
+
+async def update_setting_async(
+    db: AsyncSession,
+    db_setting: SalonBoardSetting,
+    setting_update: SalonBoardSettingUpdate
+) -> SalonBoardSetting:
+    """
+    SALON BOARD設定更新（非同期、取得済みの設定を更新する）
+
+    Args:
+        db: 非同期データベースセッション
+        db_setting: 更新対象の設定
+        setting_update: 設定更新スキーマ
+
+    Returns:
+        SalonBoardSetting: 更新された設定
+    """
+    _apply_setting_update(db_setting, setting_update)
+    await db.commit()
+    await db.refresh(db_setting)
+    return db_setting
+
+
+async def delete_setting_async(db: AsyncSession, db_setting: SalonBoardSetting) -> None:
+    """
+    SALON BOARD設定削除（非同期、取得済みの設定を削除する）
+
+    Args:
+        db: 非同期データベースセッション
+        db_setting: 削除対象の設定
+    """
+    await db.delete(db_setting)
+    await db.commit()
+
+
+def get_storage_state(db_setting: SalonBoardSetting) -> Optional[Dict[str, Any]]:
+    """
+    保存済みログインセッション（Playwright storage_state）を復号して取得
+
+    Args:
+        db_setting: 設定
+
+    Returns:
+        Optional[Dict[str, Any]]: storage_state（未保存・復号できない場合はNone）
+    """
+    if not db_setting.encrypted_storage_state:
+        return None
+    try:
+        return json.loads(decrypt_password(db_setting.encrypted_storage_state))
+    except (InvalidToken, ValueError) as e:
+        # 暗号鍵の変更などで復号できない場合はフルログインさせる
+        logger.warning(f"Failed to decrypt storage state for setting {db_setting.id}: {e}")
+        return None
+
+
+def save_storage_state(db: Session, setting_id: int, storage_state: Dict[str, Any]) -> bool:
+    """
+    ログインセッション（Playwright storage_state）を暗号化して保存
+
+    パスワードと同じFernet鍵で暗号化する
+
+    Args:
+        db: データベースセッション
+        setting_id: 設定ID
+        storage_state: BrowserContext.storage_state() の戻り値
+
+    Returns:
+        bool: 保存成功（True）/ 設定が存在しない（False）
+    """
+    db_setting = get_setting_by_id(db, setting_id)
+    if not db_setting:
+        return False
+
+    db_setting.encrypted_storage_state = encrypt_password(json.dumps(storage_state))
+    db_setting.storage_state_updated_at = func.current_timestamp()
+    db.commit()
+    return True
+
+
+def clear_storage_state(db: Session, setting_id: int) -> bool:
+    """
+    保存済みログインセッションを破棄
+
+    Args:
+        db: データベースセッション
+        setting_id: 設定ID
+
+    Returns:
+        bool: 破棄成功（True）/ 設定が存在しない（False）
+    """
+    db_setting = get_setting_by_id(db, setting_id)
+    if not db_setting:
+        return False
+
+    db_setting.encrypted_storage_state = None
+    db_setting.storage_state_updated_at = None
+    db.commit()
+    return True
@@ -3,9 +3,11 @@ User CRUD操作
 """
 from typing import List, Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -44,6 +46,24 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     )
 
 
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    メールアドレスでユーザー取得（非同期）
+
+    Args:
+        db: 非同期データベースセッション
+        email: メールアドレス
+
+    Returns:
+        Optional[User]: ユーザー（存在しない場合はNone）
+    """
+    normalized_email = email.strip().lower()
+    result = await db.execute(
+        select(User).where(func.lower(User.email) == normalized_email).limit(1)
+    )
+    return result.scalars().first()
+
+
 def get_users(db: Session, skip: int = 0, limit: int = 100, role: Optional[str] = None) -> List[User]:
     """
     ユーザー一覧取得
@@ -104,34 +124,46 @@ def create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
     return db_user
 
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
+def update_user(
+    db: Session,
+    user_id: int,
+    user_update: UserUpdate,
+    hashed_password: Optional[str] = None
+) -> Optional[User]:
     """
-    ユーザー情報更新（パスワードを除く）
+    ユーザー情報更新
+
+    認証済みユーザーのキャッシュ（変更前・変更後のメールアドレス）を破棄する
 
     Args:
         db: データベースセッション
         user_id: ユーザーID
-        user_update: ユーザー更新スキーマ
+        user_update: ユーザー更新スキーマ（passwordは無視する）
+        hashed_password: ハッシュ化済みの新しいパスワード（変更しない場合はNone）
 
     Returns:
         Optional[User]: 更新されたユーザー（存在しない場合はNone）
     """
     db_user = get_user_by_id(db, user_id)
     if db_user:
-        update_data = user_update.model_dump(exclude_unset=True)
-        
+        previous_email = db_user.email
+        update_data = user_update.model_dump(exclude_unset=True, exclude={"password"})
+
         # フィールドを更新
         for field, value in update_data.items():
             setattr(db_user, field, value)
+        if hashed_password:
+            db_user.hashed_password = hashed_password
 
         db.commit()
         db.refresh(db_user)
+        user_cache.invalidate_users([previous_email, db_user.email])
     return db_user
 
 
 def delete_user(db: Session, user_id: int) -> bool:
     """
-    ユーザー削除
+    ユーザー削除（認証済みユーザーのキャッシュも破棄する）
 
     Args:
         db: データベースセッション
@@ -142,7 +174,9 @@ def delete_user(db: Session, user_id: int) -> bool:
     """
     db_user = get_user_by_id(db, user_id)
     if db_user:
+        email = db_user.email
         db.delete(db_user)
         db.commit()
+        user_cache.invalidate_users([email])
         return True
     return False
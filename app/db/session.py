@@ -1,8 +1,12 @@
 """
 データベースセッション管理
 SQLAlchemy Engineとセッションの作成
+
+- FastAPIのリクエスト処理は非同期エンジン（asyncpg）の AsyncSession を使う（get_async_db）
+- Celeryワーカー・スクリプト・スレッドプールで実行する処理は同期エンジンの Session を使う（get_db / SessionLocal）
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -20,6 +24,23 @@ engine = create_engine(
 # セッションローカルの作成
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期Engineの作成（接続は最初のクエリ実行時に確立される）
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+    echo=settings.DEBUG
+)
+
+# コミット後も属性を参照できるよう expire_on_commit=False（遅延ロードは非同期では使えないため）
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # ベースクラス
 Base = declarative_base()
 
@@ -37,3 +58,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    非同期データベースセッション取得（依存関数）
+    async def のエンドポイントでイベントループをブロックせずにクエリを実行する
+
+    Yields:
+        AsyncSession: 非同期データベースセッション
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -9,12 +9,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import FileResponse
 from sqlalchemy import text
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.rate_limit import limiter
 from app.db.session import engine
 from app.api.v1.api import api_router
 from app.core.security import get_current_user
@@ -24,9 +24,6 @@ from app.schemas.user import User
 setup_logging("web")
 logger = logging.getLogger(__name__)
 
-# レート制限初期化
-limiter = Limiter(key_func=get_remote_address)
-
 # FastAPIアプリケーション初期化
 app = FastAPI(
     title=settings.APP_NAME,
@@ -1,3 +1,4 @@
 from .user import User
 from .salon_board_setting import SalonBoardSetting
 from .current_task import CurrentTask
+from .task_event import TaskEvent
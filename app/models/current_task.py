@@ -1,8 +1,8 @@
 """
 CurrentTaskモデル
-現在実行中のタスク情報
+実行中・順番待ち・完了後未確認のタスク情報
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Text, CheckConstraint
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Text, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -21,26 +21,44 @@ class CurrentTask(Base):
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        unique=True,  # ユーザー単位のシングルタスク保証
         index=True
     )
     status = Column(String(50), nullable=False, index=True)
     total_items = Column(Integer, nullable=False)
     completed_items = Column(Integer, nullable=False, default=0)
     progress_detail_json = Column(Text, nullable=True)
-    error_info_json = Column(Text, nullable=True)
-    success_info_json = Column(Text, nullable=True)
+    # 順番待ち（QUEUED）のタスクのみ使用: ユーザー内の実行順（1始まり）と開始時に送信するCeleryタスク
+    queue_position = Column(Integer, nullable=True)
+    task_name = Column(String(100), nullable=True)
+    task_kwargs_json = Column(Text, nullable=True)
+    # 分割実行する投稿タスクの処理済みの行数（続きはこの行から再開する）
+    checkpoint_index = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
 
     # CHECK制約
     __table_args__ = (
         CheckConstraint(
-            "status IN ('PROCESSING', 'CANCELLING', 'SUCCESS', 'FAILURE')",
+            "status IN ('QUEUED', 'PROCESSING', 'CANCELLING', 'SUCCESS', 'FAILURE')",
             name="current_tasks_status_check"
         ),
         CheckConstraint("total_items >= 0", name="current_tasks_total_items_check"),
         CheckConstraint("completed_items >= 0", name="current_tasks_completed_items_check"),
+        CheckConstraint("checkpoint_index >= 0", name="current_tasks_checkpoint_index_check"),
+        # ユーザー単位で実行中のタスクは1つ（部分UNIQUEインデックスでシングルタスク保証）
+        Index(
+            "uq_current_tasks_active_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('PROCESSING', 'CANCELLING')"),
+            sqlite_where=text("status IN ('PROCESSING', 'CANCELLING')"),
+        ),
     )
 
     # リレーション
-    user = relationship("User", back_populates="current_task")
+    user = relationship("User", back_populates="current_tasks")
+    events = relationship(
+        "TaskEvent",
+        back_populates="task",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
@@ -2,7 +2,7 @@
 SalonBoardSettingモデル
 SALON BOARD接続設定
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -21,6 +21,9 @@ class SalonBoardSetting(Base):
     encrypted_sb_password = Column(String(512), nullable=False)
     salon_id = Column(String(100), nullable=True)
     salon_name = Column(String(255), nullable=True)
+    # ログイン済みセッション（Playwright storage_state をFernetで暗号化したJSON）
+    encrypted_storage_state = Column(Text, nullable=True)
+    storage_state_updated_at = Column(TIMESTAMP, nullable=True)
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
     updated_at = Column(
         TIMESTAMP,
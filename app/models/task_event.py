@@ -0,0 +1,39 @@
+"""
+TaskEventモデル
+タスク実行中に発生した成功・エラー・手動対応・所要時間イベント（追記専用）
+"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Text, CheckConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+from app.db.types import Guid
+
+
+class TaskEvent(Base):
+    """タスクイベントモデル（1イベント1行の追記専用テーブル）"""
+
+    __tablename__ = "task_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(
+        Guid,
+        ForeignKey("current_tasks.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    event_type = Column(String(20), nullable=False)
+    row_number = Column(Integer, nullable=False, default=0)
+    payload_json = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        CheckConstraint(
+            "event_type IN ('SUCCESS', 'ERROR', 'MANUAL_UPLOAD', 'STYLE_TIMING')",
+            name="task_events_event_type_check"
+        ),
+        # 件数集計（task_id + event_type）と時系列取得の両方に使う複合インデックス
+        Index("ix_task_events_task_id_event_type", "task_id", "event_type"),
+    )
+
+    # リレーション
+    task = relationship("CurrentTask", back_populates="events")
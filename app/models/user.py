@@ -2,7 +2,7 @@
 Userモデル
 システム利用者のアカウント情報
 """
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -26,8 +26,10 @@ class User(Base):
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
 
     # CHECK制約: roleは'admin'または'user'のみ
+    # ユーザー取得は小文字化したメールアドレスで比較するため、lower(email) の式インデックスを持つ
     __table_args__ = (
         CheckConstraint("role IN ('admin', 'user')", name="users_role_check"),
+        Index("ix_users_lower_email", func.lower(email)),
     )
 
     # リレーション
@@ -36,9 +38,8 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan"
     )
-    current_task = relationship(
+    current_tasks = relationship(
         "CurrentTask",
         back_populates="user",
-        uselist=False,
         cascade="all, delete-orphan"
     )
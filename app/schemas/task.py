@@ -69,3 +69,73 @@ class ErrorReport(BaseModel):
     manual_upload_count: int = Field(default=0, description="手動登録が必要な画像件数")
     successes: List[SuccessDetail] = Field(default_factory=list, description="成功したスタイル一覧")
     success_count: int = Field(default=0, description="成功したスタイル件数")
+
+
+class StageTimingSummary(BaseModel):
+    """ステージ別所要時間の集計"""
+    stage: str
+    count: int
+    total_ms: int
+    p50_ms: int
+    p95_ms: int
+    pause_share: float = Field(..., description="ステージ内で意図的な待機が占める割合")
+
+
+class TimingReport(BaseModel):
+    """スタイル別所要時間レポートスキーマ"""
+    task_id: UUID
+    status: str
+    style_count: int
+    total_ms: int
+    style_p50_ms: int
+    style_p95_ms: int
+    intentional_pause_ms: int = Field(..., description="人間らしさの待機・制限解除待ちの合計")
+    loader_overlay_ms: int = Field(..., description="ローディングオーバーレイの消失待ちの合計")
+    server_and_browser_ms: int = Field(..., description="意図的な待機以外（ブラウザ操作・SALON BOARDの応答待ち）の合計")
+    intentional_pause_share: float
+    server_and_browser_share: float
+    pacing_scale_mean: Optional[float] = Field(default=None, description="待機時間の倍率の平均（スタイル完了時点）")
+    pacing_scale_last: Optional[float] = Field(default=None, description="最後に完了したスタイルの待機時間の倍率")
+    waits: Dict[str, int] = Field(default_factory=dict, description="待機種別ごとの合計（click_and_waitは内部の待機を含む）")
+    wait_counts: Dict[str, int] = Field(default_factory=dict, description="待機種別ごとの実行回数")
+    browser_calls: Dict[str, int] = Field(default_factory=dict, description="待機処理内で発行したPlaywright呼び出しの回数")
+    stages: List[StageTimingSummary] = Field(default_factory=list)
+    styles: Optional[List[Dict[str, Any]]] = Field(default=None, description="スタイル別の計測結果（include_styles=true の場合のみ）")
+
+
+class QueuedTask(BaseModel):
+    """順番待ちタスクスキーマ"""
+    task_id: UUID
+    task_type: str = Field(..., description="タスク種別（post: スタイル投稿、delete: スタイル削除）")
+    position: int = Field(..., ge=1, description="実行順（1始まり）")
+    total_items: int
+    message: str = Field(default="", description="登録時の概要")
+    created_at: datetime
+
+
+class TaskQueue(BaseModel):
+    """ユーザーのタスク待ち行列スキーマ"""
+    tasks: List[QueuedTask] = Field(default_factory=list)
+    max_size: int = Field(..., description="順番待ちにできるタスク数の上限")
+
+
+class TaskQueueMove(BaseModel):
+    """順番待ちタスクの並べ替えスキーマ"""
+    position: int = Field(..., ge=1, description="移動先の実行順（1始まり、末尾を超える場合は末尾）")
+
+
+class FinishedTask(BaseModel):
+    """完了タスクスキーマ"""
+    task_id: UUID
+    task_type: str = Field(..., description="タスク種別（post: スタイル投稿、delete: スタイル削除）")
+    status: Literal["SUCCESS", "FAILURE"]
+    total_items: int
+    completed_items: int
+    message: str = Field(default="", description="最後の進捗メッセージ")
+    created_at: datetime
+
+
+class TaskHistory(BaseModel):
+    """ユーザーの完了タスク一覧スキーマ"""
+    tasks: List[FinishedTask] = Field(default_factory=list, description="完了タスク（新しい順）")
+    max_size: int = Field(..., description="残す完了タスク数の上限（超えた分はタスク登録時に古いものから削除）")
@@ -11,6 +11,12 @@ class Token(BaseModel):
     token_type: str
 
 
+class StreamToken(BaseModel):
+    """タスク進捗ストリーム接続用トークンレスポンス"""
+    token: str
+    expires_in: int
+
+
 class TokenData(BaseModel):
     """トークンペイロードデータ"""
     email: Optional[str] = None
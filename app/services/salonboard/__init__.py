@@ -4,15 +4,23 @@ SALON BOARD 自動化サービスパッケージ
 このパッケージはSALON BOARDへのスタイル投稿・削除処理を提供します。
 """
 
-from .exceptions import StylePostError, StyleDeleteError, RobotDetectionError
+from .exceptions import StylePostError, StyleDeleteError, RobotDetectionError, AutomationCancelledError
 from .style_poster import SalonBoardStylePoster, load_selectors
 from .style_deleter import SalonBoardStyleDeleter
+from .browser_pool import BrowserPool, get_browser_pool, shutdown_browser_pool
+from .pacing import PacingEngine, PacingProfile
 
 __all__ = [
     "StylePostError",
     "StyleDeleteError",
     "RobotDetectionError",
+    "AutomationCancelledError",
     "SalonBoardStylePoster",
     "SalonBoardStyleDeleter",
     "load_selectors",
+    "BrowserPool",
+    "get_browser_pool",
+    "shutdown_browser_pool",
+    "PacingEngine",
+    "PacingProfile",
 ]
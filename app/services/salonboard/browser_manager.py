@@ -5,13 +5,17 @@ Camoufoxを使用したブラウザ自動化の基盤
 import logging
 import random
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from camoufox.sync_api import Camoufox
 
 if TYPE_CHECKING:
     from playwright.sync_api import Browser, BrowserContext, Page, Request
 
+from .browser_pool import BrowserPool, launch_camoufox
+from .pacing import PacingEngine
+from .timing import StyleTimer
+
 from .constants import (
     TIMEOUT_CLICK,
     TIMEOUT_LOAD,
@@ -59,7 +63,8 @@ class SalonBoardBrowserManager:
         selectors: Dict,
         screenshot_dir: str,
         headless: bool = True,
-        slow_mo: int = 100
+        slow_mo: int = 100,
+        browser_pool: Optional[BrowserPool] = None
     ):
         """
         初期化
@@ -69,12 +74,14 @@ class SalonBoardBrowserManager:
             screenshot_dir: エラー時のスクリーンショット保存先ディレクトリ
             headless: ヘッドレスモードで実行するか
             slow_mo: 操作間の遅延時間（ミリ秒）
+            browser_pool: 起動済みブラウザを共有するプール（Noneの場合はインスタンスごとに起動・終了）
         """
         self.selectors = selectors
         self.screenshot_dir = Path(screenshot_dir)
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         self.headless = headless
         self.slow_mo = slow_mo
+        self.browser_pool = browser_pool
 
         self._random = random.Random()
         self._camoufox: Optional[Camoufox] = None
@@ -82,7 +89,16 @@ class SalonBoardBrowserManager:
         self.context: Optional["BrowserContext"] = None
         self.page: Optional["Page"] = None
         self.progress_callback: Optional[Callable] = None
-        self._last_failed_upload_reason: Optional[str] = None
+        # キャンセル要求の有無を返すコールバック（待機ループ内で確認する）
+        self.cancel_checker: Optional[Callable[[], bool]] = None
+        # 保存済みログインセッション（最初のコンテキストに復元する）と、新規ログイン時の保存先
+        self.storage_state: Optional[Dict[str, Any]] = None
+        self.storage_state_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        # スタイル1件ごとのステージ別所要時間（完了ごとに timing_callback へ渡す）
+        self.stage_timer = StyleTimer()
+        self.timing_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        # 待機時間の倍率（アカウントごとの状態を run() で受け取る）
+        self.pacing = PacingEngine()
         self.expected_total: int = 0
 
     def _create_page(self) -> "Page":
@@ -122,28 +138,65 @@ class SalonBoardBrowserManager:
             return
         url = request.url
         if "/CNB/imgreg/imgUpload/" in url:
-            message = f"{url} -> {failure_text}"
-            self._last_failed_upload_reason = message
-            logger.warning("リクエスト失敗検出: %s", message)
+            logger.warning("リクエスト失敗検出: %s -> %s", url, failure_text)
+
+    def _context_options(self) -> Dict[str, Any]:
+        """最初のコンテキスト作成時のオプション（保存済みセッションがあれば復元する）"""
+        if self.storage_state:
+            return {"storage_state": self.storage_state}
+        return {}
+
+    def _export_storage_state(self) -> None:
+        """現在のログインセッションを storage_state_callback へ渡す（失敗しても処理は継続）"""
+        if self.storage_state_callback is None or not self.context:
+            return
+        try:
+            self.storage_state_callback(self.context.storage_state())
+        except Exception as e:
+            logger.warning("ログインセッションの保存に失敗しました: %s", e)
 
     def _start_browser(self):
         """ブラウザ起動（Camoufox版）"""
-        self._camoufox = Camoufox(
-            headless=self.headless,
-            slow_mo=self.slow_mo,
-            os="windows",
-            locale="ja-JP",
-            humanize=True,
-            block_webrtc=True,
-        )
-
-        # start() メソッドが内部的に __enter__() を呼び出す
-        self.browser = self._camoufox.start()
-        self.context = self.browser.new_context()
+        if self.browser_pool is not None:
+            # 起動済みブラウザから独立したコンテキストを払い出してもらう
+            self.context = self.browser_pool.acquire_context(
+                headless=self.headless,
+                slow_mo=self.slow_mo,
+                **self._context_options()
+            )
+            self.browser = self.context.browser
+            self.page = self._create_page()
+            logger.info("ブラウザコンテキスト取得完了（Camoufox, プール）")
+            return
+
+        self._camoufox, self.browser = launch_camoufox(self.headless, self.slow_mo)
+        self.context = self.browser.new_context(**self._context_options())
         self.page = self._create_page()
 
         logger.info("ブラウザ起動完了（Camoufox）")
 
+    def _new_context(self) -> "BrowserContext":
+        """新規ブラウザコンテキストを作成（プール利用時はプールから取得、保存済みセッションは復元しない）"""
+        if self.browser_pool is not None:
+            context = self.browser_pool.acquire_context(headless=self.headless, slow_mo=self.slow_mo)
+            self.browser = context.browser
+            return context
+        return self.browser.new_context()
+
+    def _release_context(self) -> None:
+        """現在のブラウザコンテキストを閉じる（プール利用時はプールへ返却）"""
+        if not self.context:
+            return
+        try:
+            if self.browser_pool is not None:
+                self.browser_pool.release_context(self.context)
+            else:
+                self.context.close()
+        except Exception as e:
+            logger.warning("コンテキストクローズ時に警告: %s", e)
+        finally:
+            self.context = None
+
     def _reset_browser_context(self) -> "Page":
         """
         ブラウザコンテキストをリセットして新規ページを返す
@@ -165,16 +218,10 @@ class SalonBoardBrowserManager:
                 self.page = None
 
         # 既存のコンテキストをクローズ
-        if self.context:
-            try:
-                self.context.close()
-            except Exception as e:
-                logger.warning("コンテキストクローズ時に警告: %s", e)
-            finally:
-                self.context = None
+        self._release_context()
 
         # 新規コンテキスト作成
-        self.context = self.browser.new_context()
+        self.context = self._new_context()
         logger.info("新規ブラウザコンテキストを作成しました")
 
         # 新規ページ作成
@@ -184,7 +231,7 @@ class SalonBoardBrowserManager:
         return self.page
 
     def _close_browser(self):
-        """ブラウザ終了（Camoufox版）"""
+        """ブラウザ終了（Camoufox版、プール利用時はコンテキストのみ返却）"""
         if self.page:
             try:
                 self.page.close()
@@ -193,13 +240,13 @@ class SalonBoardBrowserManager:
             finally:
                 self.page = None
 
-        if self.context:
-            try:
-                self.context.close()
-            except Exception as e:
-                logger.warning("ブラウザコンテキスト終了時に警告: %s", e)
-            finally:
-                self.context = None
+        self._release_context()
+
+        if self.browser_pool is not None:
+            # ブラウザ本体はプールが保持し、次のタスクで再利用する
+            self.browser = None
+            logger.info("ブラウザコンテキストをプールへ返却しました")
+            return
 
         if self._camoufox:
             try:
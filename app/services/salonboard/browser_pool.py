@@ -0,0 +1,280 @@
+"""
+Camoufoxブラウザプール
+Celeryワーカープロセス内で起動済みのブラウザを使い回し、タスクごとに独立したコンテキストを払い出す
+"""
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Set, Tuple
+
+from camoufox.sync_api import Camoufox
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# 起動オプション（headless, slow_mo）
+LaunchKey = Tuple[bool, int]
+
+
+def launch_camoufox(headless: bool, slow_mo: int) -> Tuple[Camoufox, "Browser"]:
+    """
+    Camoufoxブラウザを起動する
+
+    Args:
+        headless: ヘッドレスモードで実行するか
+        slow_mo: 操作間の遅延時間（ミリ秒）
+
+    Returns:
+        Tuple[Camoufox, Browser]: 終了処理用のCamoufoxインスタンスと起動済みブラウザ
+    """
+    camoufox = Camoufox(
+        headless=headless,
+        slow_mo=slow_mo,
+        os="windows",
+        locale="ja-JP",
+        humanize=True,
+        block_webrtc=True,
+    )
+    # start() メソッドが内部的に __enter__() を呼び出す
+    browser = camoufox.start()
+    return camoufox, browser
+
+
+def read_process_tree_rss_mb(root_pid: Optional[int] = None) -> Optional[float]:
+    """
+    指定プロセスと全子孫プロセスの合計RSS（MB）を返す
+
+    Firefoxのコンテンツプロセスはワーカーの子孫として起動するため、ツリー全体で集計する。
+    /proc が利用できない環境ではNoneを返す。
+    """
+    proc_root = Path("/proc")
+    if not proc_root.is_dir():
+        return None
+
+    root_pid = root_pid or os.getpid()
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    children: dict = {}
+    rss_bytes: dict = {}
+
+    for entry in proc_root.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            statm = (entry / "statm").read_text()
+        except OSError:
+            continue
+        # comm にスペースや括弧が含まれる場合があるため、最後の ")" 以降を解析する
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            ppid = int(fields[1])
+            resident_pages = int(statm.split()[1])
+        except (IndexError, ValueError):
+            continue
+        pid = int(entry.name)
+        children.setdefault(ppid, []).append(pid)
+        rss_bytes[pid] = resident_pages * page_size
+
+    if root_pid not in rss_bytes:
+        return None
+
+    total = 0
+    stack = [root_pid]
+    seen: Set[int] = set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += rss_bytes.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / (1024 * 1024)
+
+
+class BrowserPool:
+    """
+    ワーカープロセス単位のブラウザプール
+
+    - ブラウザはタスク間で起動したまま保持し、タスクには新規コンテキスト（Cookie等は独立）を払い出す
+    - 払い出し時にヘルスチェックを行い、切断済みのブラウザは再起動する
+    - コンテキスト作成数またはプロセスツリーのRSSが上限に達した場合、
+      使用中のコンテキストがなくなった時点でブラウザを再起動する（フィンガープリントもここで更新される）
+    """
+
+    def __init__(
+        self,
+        *,
+        max_contexts: int = 30,
+        max_rss_mb: int = 0,
+        launcher: Callable[[bool, int], Tuple[Any, "Browser"]] = launch_camoufox,
+        rss_reader: Callable[[], Optional[float]] = read_process_tree_rss_mb
+    ):
+        """
+        初期化
+
+        Args:
+            max_contexts: 1つのブラウザで作成するコンテキスト数の上限（0以下で無制限）
+            max_rss_mb: プロセスツリーのRSS上限（MB、0以下で無制限）
+            launcher: ブラウザ起動関数
+            rss_reader: RSS取得関数
+        """
+        self.max_contexts = max_contexts
+        self.max_rss_mb = max_rss_mb
+        self._launcher = launcher
+        self._rss_reader = rss_reader
+        self._camoufox: Any = None
+        self._browser: Optional["Browser"] = None
+        self._launch_key: Optional[LaunchKey] = None
+        self._owner_pid: Optional[int] = None
+        self._contexts_created = 0
+        self._active: Set["BrowserContext"] = set()
+        self.launch_count = 0
+
+    @property
+    def active_contexts(self) -> int:
+        """払い出し中のコンテキスト数"""
+        return len(self._active)
+
+    def acquire_context(self, *, headless: bool, slow_mo: int, **context_options) -> "BrowserContext":
+        """
+        新規ブラウザコンテキストを払い出す
+
+        Args:
+            headless: ヘッドレスモードで実行するか
+            slow_mo: 操作間の遅延時間（ミリ秒）
+            context_options: browser.new_context() に渡すオプション
+
+        Returns:
+            BrowserContext: 新規コンテキスト（使用後は release_context() で返却する）
+        """
+        if self._owner_pid is not None and self._owner_pid != os.getpid():
+            # fork元のブラウザはこのプロセスからは操作できないため参照だけ破棄する
+            logger.info("fork後のプロセスのためブラウザプールを初期化します")
+            self._forget_browser()
+
+        key: LaunchKey = (headless, slow_mo)
+        if self._browser is not None:
+            reason = self._recycle_reason(key)
+            if reason:
+                logger.info("ブラウザを再起動します: %s", reason)
+                self._close_browser()
+
+        if self._browser is None:
+            self._launch(key)
+
+        try:
+            context = self._browser.new_context(**context_options)
+        except Exception as e:
+            # 新規コンテキストを作れないブラウザは使用中のものも含めて作り直す
+            logger.warning("コンテキスト作成に失敗したためブラウザを再起動します: %s", e)
+            self._close_browser()
+            self._launch(key)
+            context = self._browser.new_context(**context_options)
+
+        self._contexts_created += 1
+        self._active.add(context)
+        return context
+
+    def release_context(self, context: Optional["BrowserContext"]) -> None:
+        """コンテキストを閉じてプールに返却する（ブラウザは起動したまま保持）"""
+        if context is None:
+            return
+        self._active.discard(context)
+        try:
+            context.close()
+        except Exception as e:
+            logger.warning("コンテキストクローズ時に警告: %s", e)
+
+    def shutdown(self) -> None:
+        """ブラウザを終了する（ワーカープロセス終了時に呼ぶ）"""
+        if self._browser is None:
+            return
+        if self._owner_pid != os.getpid():
+            self._forget_browser()
+            return
+        self._close_browser()
+
+    def _is_healthy(self) -> bool:
+        try:
+            return bool(self._browser is not None and self._browser.is_connected())
+        except Exception:
+            return False
+
+    def _recycle_reason(self, key: LaunchKey) -> Optional[str]:
+        """ブラウザを再起動すべき理由（不要な場合はNone）"""
+        if not self._is_healthy():
+            return "ブラウザとの接続が切れています"
+        if self._active:
+            # 使用中のコンテキストがある間は再起動しない
+            return None
+        if key != self._launch_key:
+            return "起動オプションが変更されました"
+        if self.max_contexts > 0 and self._contexts_created >= self.max_contexts:
+            return f"コンテキスト作成数が上限に達しました ({self._contexts_created}/{self.max_contexts})"
+        if self.max_rss_mb > 0:
+            rss_mb = self._rss_reader()
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                return f"メモリ使用量が上限を超えました ({rss_mb:.0f}MB > {self.max_rss_mb}MB)"
+        return None
+
+    def _launch(self, key: LaunchKey) -> None:
+        headless, slow_mo = key
+        self._camoufox, self._browser = self._launcher(headless, slow_mo)
+        self._launch_key = key
+        self._owner_pid = os.getpid()
+        self._contexts_created = 0
+        self.launch_count += 1
+        logger.info("ブラウザ起動完了（Camoufox, プール）")
+
+    def _close_browser(self) -> None:
+        for context in list(self._active):
+            try:
+                context.close()
+            except Exception:
+                pass
+        camoufox = self._camoufox
+        self._forget_browser()
+        if camoufox is not None:
+            try:
+                camoufox.__exit__(None, None, None)
+            except Exception as e:
+                logger.warning("ブラウザ終了時に警告: %s", e)
+        logger.info("ブラウザ終了（Camoufox, プール）")
+
+    def _forget_browser(self) -> None:
+        self._camoufox = None
+        self._browser = None
+        self._launch_key = None
+        self._owner_pid = None
+        self._contexts_created = 0
+        self._active = set()
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool(*, max_contexts: int, max_rss_mb: int) -> BrowserPool:
+    """
+    プロセス内で共有するブラウザプールを取得する
+
+    Args:
+        max_contexts: 1つのブラウザで作成するコンテキスト数の上限
+        max_rss_mb: プロセスツリーのRSS上限（MB）
+    """
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool(max_contexts=max_contexts, max_rss_mb=max_rss_mb)
+    else:
+        _pool.max_contexts = max_contexts
+        _pool.max_rss_mb = max_rss_mb
+    return _pool
+
+
+def shutdown_browser_pool() -> None:
+    """共有ブラウザプールを終了する"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
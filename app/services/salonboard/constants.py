@@ -20,3 +20,12 @@ WAIT_MIN_DEFAULT = 50
 HUMAN_BASE_WAIT_MS = 700  # 人間らしい基本待機（ミリ秒）
 HUMAN_JITTER_MS = 350  # 人間らしい待機のばらつき（ミリ秒）
 HUMAN_MIN_WAIT_MS = 250  # 最小待機時間（ミリ秒）
+
+# ペース配分（_human_pause の待機時間の倍率）
+PACING_MIN_SCALE = 0.5  # 縮小の下限
+PACING_MAX_SCALE = 3.0  # 延長の上限
+PACING_CONGESTION_FACTOR = 1.5  # アクセス集中（302）時の倍率
+PACING_ABORTED_FACTOR = 1.25  # リクエスト中断時の倍率
+PACING_CLEAN_STREAK = 5  # 縮小に必要な正常アップロードの連続件数
+PACING_RELAX_FACTOR = 0.9  # 縮小時の倍率
+PACING_FLOOR_MS = 150  # 縮小しても下回らない最小待機（ミリ秒）
@@ -19,6 +19,13 @@ class StyleDeleteError(Exception):
         self.screenshot_path = screenshot_path
 
 
+class AutomationCancelledError(Exception):
+    """キャンセル要求により自動化処理を中断したことを示す例外"""
+
+    def __init__(self, message: str = "Task was cancelled by user"):
+        super().__init__(message)
+
+
 class RobotDetectionError(StylePostError):
     """ロボット認証検出エラー"""
 
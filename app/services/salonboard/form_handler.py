@@ -3,16 +3,16 @@ SALON BOARD フォーム入力Mixin
 スタイルフォームの各種入力処理を提供
 """
 import logging
-import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 if TYPE_CHECKING:
-    from playwright.sync_api import Response
+    from playwright.sync_api import Request, Response
 
-from .exceptions import StylePostError
+from .exceptions import StylePostError, AutomationCancelledError
+from .timing import WAIT_UPLOAD_RESPONSE, timed
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +30,14 @@ class StyleFormHandlerMixin:
     TIMEOUT_PAGE_TRANSITION: int
     IMAGE_PROCESSING_WAIT: int
     WAIT_MEDIUM_BASE: int
-    _last_failed_upload_reason: Optional[str]
     _human_pause: object
     _take_screenshot: object
     _click_and_wait: object
     _wait_for_upload_completion: object
     _emit_progress: object
+    _raise_if_cancelled: object
+    _cancellable_wait: object
+    pacing: object
     step_navigate_to_style_list_page: object
 
     # アクセス集中エラーのリトライ設定
@@ -208,6 +210,133 @@ class StyleFormHandlerMixin:
                 self._take_screenshot(f"error-{self._sanitize_filename(field_name)}")
             )
 
+    # 画像アップロード結果の分類
+    UPLOAD_OUTCOME_SUCCESS = "success"
+    UPLOAD_OUTCOME_CONGESTION = "congestion"      # 302/3xx（アクセス集中）
+    UPLOAD_OUTCOME_HTTP_ERROR = "http_error"      # 4xx/5xx
+    UPLOAD_OUTCOME_ABORTED = "aborted"            # NS_BINDING_ABORTED 等のブラウザ側中断
+    UPLOAD_OUTCOME_FAILED = "failed"              # 応答なし・その他のリクエスト失敗
+
+    # doUpload の応答（またはリクエスト失敗）を待つ上限
+    TIMEOUT_UPLOAD_RESPONSE = 40000
+
+    @staticmethod
+    def _is_upload_request(request: "Request") -> bool:
+        """画像アップロード（doUpload）のPOSTリクエストか"""
+        return "/CNB/imgreg/imgUpload/doUpload" in request.url and request.method.upper() == "POST"
+
+    def _is_upload_response(self, response: "Response") -> bool:
+        return self._is_upload_request(response.request)
+
+    def _submit_image_upload(self, submit_button) -> Tuple[Optional["Response"], Optional[str]]:
+        """
+        送信ボタンをクリックし、doUpload の応答またはリクエスト失敗のいずれか早い方を待つ
+
+        Returns:
+            Tuple[Optional[Response], Optional[str]]: (応答, 失敗理由) のどちらか一方
+        """
+        # 待機の合間に届いた応答・失敗も取りこぼさないよう、クリック前からリスナーで受け取る
+        outcome: Dict[str, object] = {}
+
+        def on_response(response: "Response") -> None:
+            if self._is_upload_response(response):
+                outcome.setdefault("response", response)
+
+        def on_request_failed(request: "Request") -> None:
+            if self._is_upload_request(request):
+                outcome.setdefault("failure", request.failure or "imgUpload/doUpload のリクエストが失敗しました")
+
+        self.page.on("response", on_response)
+        self.page.on("requestfailed", on_request_failed)
+        try:
+            try:
+                with self.page.expect_request(self._is_upload_request, timeout=self.TIMEOUT_UPLOAD_RESPONSE):
+                    try:
+                        submit_button.scroll_into_view_if_needed(timeout=2000)
+                    except Exception:
+                        pass
+                    try:
+                        submit_button.click(timeout=self.TIMEOUT_CLICK)
+                    except Exception:
+                        try:
+                            submit_button.hover(timeout=2000)
+                        except Exception:
+                            pass
+                        self._human_pause(base_ms=500, jitter_ms=200, minimum_ms=250)
+                        submit_button.click(timeout=self.TIMEOUT_CLICK, force=True)
+            except PlaywrightTimeoutError:
+                return None, "imgUpload/doUpload のリクエストが送信されませんでした"
+
+            return self._wait_for_upload_outcome(outcome)
+        finally:
+            self.page.remove_listener("response", on_response)
+            self.page.remove_listener("requestfailed", on_request_failed)
+
+    @timed(WAIT_UPLOAD_RESPONSE)
+    def _wait_for_upload_outcome(self, outcome: Dict[str, object]) -> Tuple[Optional["Response"], Optional[str]]:
+        """
+        doUpload の応答・リクエスト失敗・キャンセル要求のいずれかまで1回の待機で待つ（最大 TIMEOUT_UPLOAD_RESPONSE ミリ秒）
+
+        応答イベントの述語で doUpload の応答を受け取り、リスナーが記録したリクエスト失敗とキャンセル要求を確認する
+        """
+        def settled(response: "Response") -> bool:
+            if self._is_upload_response(response):
+                outcome.setdefault("response", response)
+            if "response" in outcome or "failure" in outcome:
+                return True
+            try:
+                self._raise_if_cancelled()
+            except AutomationCancelledError as e:
+                # 述語の例外はPlaywrightのエラーに変換されるため、記録して待機を終える
+                outcome["cancelled"] = e
+                return True
+            return False
+
+        if "response" not in outcome and "failure" not in outcome:
+            self._raise_if_cancelled()
+            try:
+                self.page.wait_for_event("response", predicate=settled, timeout=self.TIMEOUT_UPLOAD_RESPONSE)
+            except PlaywrightTimeoutError:
+                if "failure" not in outcome:
+                    logger.warning("画像アップロードの応答待ちがタイムアウトしました（%sms）", self.TIMEOUT_UPLOAD_RESPONSE)
+                    return None, "imgUpload/doUpload のレスポンスを取得できませんでした（タイムアウト）"
+
+        if "cancelled" in outcome:
+            raise outcome["cancelled"]
+        response = outcome.get("response")
+        if response is not None:
+            logger.info("画像アップロードレスポンス取得: status=%s, url=%s", response.status, response.url)
+            return response, None
+        failure = str(outcome["failure"])
+        logger.warning("リクエスト失敗を検出: %s", failure)
+        return None, failure
+
+    def _classify_upload_outcome(self, response: Optional["Response"], failure_reason: Optional[str]) -> str:
+        """doUpload の応答・失敗理由を UPLOAD_OUTCOME_* に分類"""
+        if response is None:
+            if failure_reason and "ABORTED" in failure_reason.upper():
+                return self.UPLOAD_OUTCOME_ABORTED
+            return self.UPLOAD_OUTCOME_FAILED
+        if response.status in (301, 302, 303):
+            return self.UPLOAD_OUTCOME_CONGESTION
+        if response.status >= 400:
+            return self.UPLOAD_OUTCOME_HTTP_ERROR
+        return self.UPLOAD_OUTCOME_SUCCESS
+
+    def _close_image_modal(self, form_config: Dict) -> None:
+        """画像アップロードモーダルを閉じる（閉じない場合はキャンセル操作を試みる）"""
+        self._wait_for_modal_overlay_hidden(form_config)
+        try:
+            self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
+        except Exception:
+            try:
+                cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
+                if cancel_button.count() > 0:
+                    cancel_button.first.click(timeout=3000)
+                    self._human_pause(base_ms=500, jitter_ms=200)
+            except Exception:
+                pass
+
     def _upload_image(
         self,
         image_path: str,
@@ -231,8 +360,6 @@ class StyleFormHandlerMixin:
                     minimum_ms=2000
                 )
 
-            self._last_failed_upload_reason = None
-
             try:
                 logger.info("アップロードエリアをクリック中...")
                 self.page.locator(form_config["image"]["upload_area"]).click(timeout=self.TIMEOUT_CLICK)
@@ -271,92 +398,19 @@ class StyleFormHandlerMixin:
                     pass
                 self._human_pause(base_ms=650, jitter_ms=220, minimum_ms=350)
 
-                # ネイティブクリック（hover/scrollを伴う）で送信
+                # ネイティブクリック（hover/scrollを伴う）で送信し、応答またはリクエスト失敗の早い方を待つ
                 logger.info("送信ボタンクリック中（ネイティブクリック）...")
-                upload_predicate = lambda response: (
-                    "/CNB/imgreg/imgUpload/doUpload" in response.url
-                    and response.request.method.upper() == "POST"
-                )
-
-                upload_response: Optional["Response"] = None
-                manual_upload_required = False
-                manual_upload_reason = ""
-
-                # 送信ボタンクリック前に失敗理由をリセット
-                self._last_failed_upload_reason = None
-
-                # レスポンスキャプチャ用
-                captured_response = None
-
-                def on_response(response):
-                    nonlocal captured_response
-                    if upload_predicate(response):
-                        captured_response = response
-
-                # 一時的にレスポンスリスナーを追加
-                self.page.on("response", on_response)
+                upload_response, failure_reason = self._submit_image_upload(submit_button)
+                outcome = self._classify_upload_outcome(upload_response, failure_reason)
 
-                try:
-                    try:
-                        submit_button.scroll_into_view_if_needed(timeout=2000)
-                    except Exception:
-                        pass
-                    try:
-                        submit_button.click(timeout=self.TIMEOUT_CLICK)
-                    except Exception:
-                        try:
-                            submit_button.hover(timeout=2000)
-                        except Exception:
-                            pass
-                        self._human_pause(base_ms=500, jitter_ms=200, minimum_ms=250)
-                        submit_button.click(timeout=self.TIMEOUT_CLICK, force=True)
-
-                    # クリック後にリクエスト失敗をポーリングでチェック（最大10秒）
-                    poll_deadline = time.monotonic() + 10.0
-                    poll_interval_ms = 200  # 200msごとにチェック
-
-                    while time.monotonic() < poll_deadline:
-                        if self._last_failed_upload_reason:
-                            # リクエスト失敗を検出 - 直ちに次の処理へ
-                            logger.warning("リクエスト失敗を検出: %s", self._last_failed_upload_reason)
-                            manual_upload_reason = self._last_failed_upload_reason
-                            if "ABORTED" in manual_upload_reason.upper():
-                                manual_upload_required = True
-                            break
-                        if captured_response:
-                            # レスポンス受信
-                            upload_response = captured_response
-                            logger.info("画像アップロードレスポンス取得: status=%s, url=%s", upload_response.status, upload_response.url)
-                            break
-                        self.page.wait_for_timeout(poll_interval_ms)
-                    else:
-                        # タイムアウト - ポーリング期間中に失敗もレスポンスもなかった場合
-                        if captured_response:
-                            upload_response = captured_response
-                            logger.info("画像アップロードレスポンス取得（遅延）: status=%s, url=%s", upload_response.status, upload_response.url)
-                        elif self._last_failed_upload_reason:
-                            logger.warning("リクエスト失敗を検出（遅延）: %s", self._last_failed_upload_reason)
-                            manual_upload_reason = self._last_failed_upload_reason
-                            if "ABORTED" in manual_upload_reason.upper():
-                                manual_upload_required = True
-                        else:
-                            # レスポンスも失敗検出もない - タイムアウト
-                            reason = "imgUpload/doUpload のレスポンス待機がタイムアウトしました"
-                            manual_upload_reason = reason
-                finally:
-                    # レスポンスリスナー削除は、追加待機ループ後のレスポンス handling 全体が完了してから行う
-                    # ここでは削除せず、後続の処理で適切なタイミングで削除する
-                    pass
-
-                # ポーリング期間終了後、再度リクエスト失敗をチェック
-                if not manual_upload_required and self._last_failed_upload_reason:
-                    logger.warning("リクエスト失敗を検出（ポーリング期間終了後）: %s", self._last_failed_upload_reason)
-                    manual_upload_reason = self._last_failed_upload_reason
-                    if "ABORTED" in manual_upload_reason.upper():
-                        manual_upload_required = True
+                if outcome == self.UPLOAD_OUTCOME_SUCCESS:
+                    logger.info("画像アップロードが成功しました")
+                    self.pacing.record_clean_upload()
+                    break
 
-                # NS_BINDING_ABORTED 等のリクエスト失敗の場合
-                if manual_upload_required:
+                if outcome == self.UPLOAD_OUTCOME_ABORTED:
+                    # NS_BINDING_ABORTED 等のリクエスト失敗 - 手動アップロードを促す
+                    self.pacing.record_upload_aborted()
                     warning_message = (
                         f"画像アップロードリクエストがブラウザ側で中断されました (image={image_filename})。"
                         "SALON BOARDで手動アップロードを実施してください。"
@@ -369,257 +423,75 @@ class StyleFormHandlerMixin:
                         "reason": warning_message,
                         "image_name": image_filename,
                         "error_category": "IMAGE_UPLOAD_ABORTED",
-                        "raw_error": manual_upload_reason,
+                        "raw_error": failure_reason,
                         "screenshot_path": ""
                     })
-                    # モーダルを閉じて返す
-                    self._wait_for_modal_overlay_hidden(form_config)
-                    try:
-                        self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
-                    except Exception:
-                        try:
-                            cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
-                            if cancel_button.count() > 0:
-                                cancel_button.first.click(timeout=3000)
-                                self._human_pause(base_ms=500, jitter_ms=200)
-                        except Exception:
-                            pass
-                    # リスナーを削除してから早期リターン
-                    self.page.remove_listener("response", on_response)
+                    self._close_image_modal(form_config)
                     return manual_upload_events
 
-                # 302/3xxステータスの場合、アクセス集中エラーとして処理
-                if upload_response and upload_response.status in (301, 302, 303):
+                if outcome == self.UPLOAD_OUTCOME_CONGESTION:
+                    # 302/3xxステータスの場合、アクセス集中エラーとして処理
                     logger.warning("302レスポンスを検出、アクセス集中エラーとして処理します: status=%s", upload_response.status)
+                    self.pacing.record_congestion()
 
                     # エラーダイアログが表示されていれば閉じる
                     self._human_pause(base_ms=500, jitter_ms=200, minimum_ms=300)
                     has_error, error_message = self._check_and_handle_access_congestion_dialog(wait_for_appearance=True)
-
                     if not has_error:
                         error_message = "302レスポンス（アクセス集中）"
 
                     # モーダルを閉じて次のリトライへ
-                    self._wait_for_modal_overlay_hidden(form_config)
-                    try:
-                        self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
-                    except Exception:
-                        # モーダルが閉じない場合はキャンセル操作を試みる
-                        try:
-                            cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
-                            if cancel_button.count() > 0:
-                                cancel_button.first.click(timeout=3000)
-                                self._human_pause(base_ms=500, jitter_ms=200)
-                        except Exception:
-                            pass
+                    self._close_image_modal(form_config)
 
-                    # リトライ可能な場合は次のループへ
                     if attempt < self.ACCESS_CONGESTION_MAX_RETRIES:
                         logger.warning("アクセス集中エラーのためリトライします...")
-                        # 数秒待機してからリトライ
                         wait_seconds = 3
                         logger.info("サーバー側の負荷軽減のため待機します（%s秒）...", wait_seconds)
-                        time.sleep(wait_seconds)
+                        self._cancellable_wait(wait_seconds * 1000)
                         continue
-                    else:
-                        # リトライ回数超過 - 手動アップロードを促す
-                        logger.warning("リトライ回数の上限に達しました")
-                        warning_message = (
-                            f"画像アップロード機能が混雑しています (image={image_filename})。"
-                            "SALON BOARDで手動アップロードを実施してください。"
-                        )
-                        logger.warning("%s", warning_message)
-                        manual_upload_events.append({
-                            "row_number": row_number,
-                            "style_name": style_name,
-                            "field": "画像アップロード",
-                            "reason": warning_message,
-                            "image_name": image_filename,
-                            "error_category": "ACCESS_CONGESTION",
-                            "raw_error": error_message,
-                            "screenshot_path": ""
-                        })
-                        # リスナーを削除してから早期リターン
-                        self.page.remove_listener("response", on_response)
-                        return manual_upload_events
-
-                elif upload_response and upload_response.status >= 400:
-                    # 4xx/5xxエラー - リトライ不可
-                    # リスナーを削除してから例外
-                    self.page.remove_listener("response", on_response)
+
+                    # リトライ回数超過 - 手動アップロードを促す
+                    logger.warning("リトライ回数の上限に達しました")
+                    warning_message = (
+                        f"画像アップロード機能が混雑しています (image={image_filename})。"
+                        "SALON BOARDで手動アップロードを実施してください。"
+                    )
+                    logger.warning("%s", warning_message)
+                    manual_upload_events.append({
+                        "row_number": row_number,
+                        "style_name": style_name,
+                        "field": "画像アップロード",
+                        "reason": warning_message,
+                        "image_name": image_filename,
+                        "error_category": "ACCESS_CONGESTION",
+                        "raw_error": error_message,
+                        "screenshot_path": ""
+                    })
+                    return manual_upload_events
+
+                if outcome == self.UPLOAD_OUTCOME_HTTP_ERROR:
+                    # 4xx/5xxエラー
                     body_preview = ""
                     try:
                         body_preview = upload_response.text()[:200]
                     except Exception:
                         pass
-                    extra = ""
-                    if self._last_failed_upload_reason:
-                        extra = f", request_failure={self._last_failed_upload_reason}"
                     raise Exception(
-                        f"画像アップロードAPIが失敗しました (status={upload_response.status}, preview={body_preview}{extra})"
+                        f"画像アップロードAPIが失敗しました (status={upload_response.status}, preview={body_preview})"
                     )
 
-                # 成功の場合 - ループを抜ける
-                if upload_response and upload_response.status < 400:
-                    logger.info("画像アップロードが成功しました")
-                    break
-
-                # upload_response がない場合は追加で待機
-                if not upload_response:
-                    logger.warning("アップロードレスポンスが取得できませんでした、追加で待機します...")
-                    # 追加で30秒待機してレスポンスが取得できるか確認
-                    additional_deadline = time.monotonic() + 30.0
-                    additional_poll_interval_ms = 500
-
-                    while time.monotonic() < additional_deadline:
-                        if self._last_failed_upload_reason:
-                            # リクエスト失敗を検出
-                            logger.warning("リクエスト失敗を検出（追加待機中）: %s", self._last_failed_upload_reason)
-                            manual_upload_reason = self._last_failed_upload_reason
-                            if "ABORTED" in manual_upload_reason.upper():
-                                manual_upload_required = True
-                            break
-                        if captured_response:
-                            # レスポンス受信
-                            upload_response = captured_response
-                            logger.info("画像アップロードレスポンス取得（追加待機）: status=%s, url=%s", upload_response.status, upload_response.url)
-                            break
-                        self.page.wait_for_timeout(additional_poll_interval_ms)
-
-                    # 追加待機後にレスポンスが取得できた場合はステータスコードを検証
-                    if upload_response:
-                        # 302/3xxステータスの場合、アクセス集中エラーとして処理
-                        if upload_response.status in (301, 302, 303):
-                            logger.warning("302レスポンスを検出（追加待機後）、アクセス集中エラーとして処理します: status=%s", upload_response.status)
-
-                            # エラーダイアログが表示されていれば閉じる
-                            self._human_pause(base_ms=500, jitter_ms=200, minimum_ms=300)
-                            has_error, error_message = self._check_and_handle_access_congestion_dialog(wait_for_appearance=True)
-
-                            if not has_error:
-                                error_message = "302レスポンス（アクセス集中）"
-
-                            # モーダルを閉じて次のリトライへ
-                            self._wait_for_modal_overlay_hidden(form_config)
-                            try:
-                                self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
-                            except Exception:
-                                try:
-                                    cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
-                                    if cancel_button.count() > 0:
-                                        cancel_button.first.click(timeout=3000)
-                                        self._human_pause(base_ms=500, jitter_ms=200)
-                                except Exception:
-                                    pass
-
-                            # リトライ可能な場合は次のループへ
-                            if attempt < self.ACCESS_CONGESTION_MAX_RETRIES:
-                                logger.warning("アクセス集中エラーのためリトライします...")
-                                wait_seconds = 3
-                                logger.info("サーバー側の負荷軽減のため待機します（%s秒）...", wait_seconds)
-                                time.sleep(wait_seconds)
-                                continue
-                            else:
-                                # リトライ回数超過 - 手動アップロードを促す
-                                logger.warning("リトライ回数の上限に達しました")
-                                warning_message = (
-                                    f"画像アップロード機能が混雑しています (image={image_filename})。"
-                                    "SALON BOARDで手動アップロードを実施してください。"
-                                )
-                                logger.warning("%s", warning_message)
-                                manual_upload_events.append({
-                                    "row_number": row_number,
-                                    "style_name": style_name,
-                                    "field": "画像アップロード",
-                                    "reason": warning_message,
-                                    "image_name": image_filename,
-                                    "error_category": "ACCESS_CONGESTION",
-                                    "raw_error": error_message,
-                                    "screenshot_path": ""
-                                })
-                                return manual_upload_events
-
-                        # 4xx/5xxエラー - リトライ不可
-                        if upload_response.status >= 400:
-                            # リスナーを削除してから例外
-                            self.page.remove_listener("response", on_response)
-                            body_preview = ""
-                            try:
-                                body_preview = upload_response.text()[:200]
-                            except Exception:
-                                pass
-                            extra = ""
-                            if self._last_failed_upload_reason:
-                                extra = f", request_failure={self._last_failed_upload_reason}"
-                            raise Exception(
-                                f"画像アップロードAPIが失敗しました (status={upload_response.status}, preview={body_preview}{extra})"
-                            )
-
-                        # 成功の場合 - ループを抜ける
-                        if upload_response.status < 400:
-                            logger.info("画像アップロードが成功しました（追加待機後）")
-                            break
-
-                    # NS_BINDING_ABORTED 等のリクエスト失敗の場合（追加待機後）
-                    if manual_upload_required:
-                        warning_message = (
-                            f"画像アップロードリクエストがブラウザ側で中断されました (image={image_filename})。"
-                            "SALON BOARDで手動アップロードを実施してください。"
-                        )
-                        logger.warning("%s", warning_message)
-                        manual_upload_events.append({
-                            "row_number": row_number,
-                            "style_name": style_name,
-                            "field": "画像アップロード",
-                            "reason": warning_message,
-                            "image_name": image_filename,
-                            "error_category": "IMAGE_UPLOAD_ABORTED",
-                            "raw_error": manual_upload_reason,
-                            "screenshot_path": ""
-                        })
-                        # モーダルを閉じて返す
-                        self._wait_for_modal_overlay_hidden(form_config)
-                        try:
-                            self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
-                        except Exception:
-                            try:
-                                cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
-                                if cancel_button.count() > 0:
-                                    cancel_button.first.click(timeout=3000)
-                                    self._human_pause(base_ms=500, jitter_ms=200)
-                            except Exception:
-                                pass
-                    # リスナーを削除してから早期リターン
-                    self.page.remove_listener("response", on_response)
-                    return manual_upload_events
-
-                    # 追加待機後もレスポンスがない場合は例外を送出してリトライ
-                    if not upload_response and not manual_upload_required:
-                        error_msg = "アップロードレスポンスの取得がタイムアウトしました（総計40秒）"
-                        logger.warning("%s", error_msg)
-                        # すべてのレスポンス handling 完了後にリスナーを削除
-                        self.page.remove_listener("response", on_response)
-                        raise Exception(error_msg)
-
-                # すべてのレスポンス handling 完了後にリスナーを削除
-                self.page.remove_listener("response", on_response)
+                # 応答なし（タイムアウト）またはその他のリクエスト失敗
+                raise Exception(f"画像アップロードの応答を取得できませんでした: {failure_reason}")
 
+            except AutomationCancelledError:
+                # キャンセル要求はリトライせずに即座に中断する
+                raise
             except Exception as e:
                 # ループ内での例外 - リトライ可能な場合は次のループへ
                 if attempt < self.ACCESS_CONGESTION_MAX_RETRIES:
                     logger.warning("アップロード処理でエラーが発生しました、リトライします: %s", e)
                     # オーバーレイが解除されるのを待ってから、モーダルを閉じて次のリトライへ
-                    self._wait_for_modal_overlay_hidden(form_config)
-                    try:
-                        self.page.wait_for_selector(form_config["image"]["modal_container"], state="hidden", timeout=3000)
-                    except Exception:
-                        try:
-                            cancel_button = self.page.locator(f"{form_config['image']['modal_container']} .dispose, {form_config['image']['modal_container']} .close")
-                            if cancel_button.count() > 0:
-                                cancel_button.first.click(timeout=3000)
-                                self._human_pause(base_ms=500, jitter_ms=200)
-                        except Exception:
-                            pass
+                    self._close_image_modal(form_config)
                     continue
                 else:
                     # リトライ回数超過 - 例外を再送出
@@ -1006,9 +878,6 @@ class StyleFormHandlerMixin:
         """
         1件のスタイル処理（リファクタリング版）
         """
-        # 前のスタイル処理での失敗理由をリセット（次のスタイルに影響しないように）
-        self._last_failed_upload_reason = None
-
         row_number = style_data.get("_row_number", 0)
         form_config = self.selectors["style_form"]
         style_name = style_data.get("スタイル名", "不明")
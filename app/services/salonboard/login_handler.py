@@ -16,13 +16,16 @@ class LoginHandlerMixin:
 
     # 以下はSalonBoardBrowserManagerまたは他のMixinで定義される属性・メソッド
     page: object
+    context: object
     selectors: Dict
+    storage_state: Optional[Dict]
     TIMEOUT_LOAD: int
     _human_pause: object
     _check_robot_detection: object
     _click_and_wait: object
     _wait_for_dashboard_ready: object
     _take_screenshot: object
+    _export_storage_state: object
 
     def _select_salon_if_needed(self, salon_info: Optional[Dict]) -> None:
         """
@@ -132,6 +135,75 @@ class LoginHandlerMixin:
             # 二次確認はベストエフォート（ここではエラーにしない）
             logger.warning("ログイン後のダッシュボードナビ二次確認をスキップ（非致命）")
 
+    def _is_session_alive(self) -> bool:
+        """
+        現在のコンテキストがログイン済みかを確認する
+
+        ログイン必須ページへ直接遷移し、ログイン画面へ戻されずにナビゲーションが
+        表示されればログイン済みと判定する
+
+        Returns:
+            bool: ログイン済みの場合 True
+        """
+        login_config = self.selectors["login"]
+        probe_url = login_config.get("session_probe_url", "https://salonboard.com/CNB/draft/styleList/")
+
+        logger.debug("セッション確認ページへ遷移: %s", probe_url)
+        try:
+            self.page.goto(probe_url, timeout=self.TIMEOUT_LOAD)
+            self.page.wait_for_load_state("domcontentloaded", timeout=self.TIMEOUT_LOAD)
+        except PlaywrightTimeoutError:
+            logger.info("セッション確認ページの読込みがタイムアウトしました")
+            return False
+        # ロボット認証チェック（検出時は例外がスローされる）
+        self._check_robot_detection()
+
+        if "/login" in self.page.url:
+            logger.info("ログイン画面へリダイレクトされました: url=%s", self.page.url)
+            return False
+        try:
+            if self.page.locator(login_config["login_form"]).count() > 0:
+                logger.info("ログインフォームが表示されています")
+                return False
+        except Exception:
+            pass
+
+        return self._wait_for_dashboard_ready(
+            timeout_ms=5000,
+            header_selector="#headerNavigationBar",
+            dashboard_selector=login_config["dashboard_global_navi"],
+        )
+
+    def step_login_or_resume(self, user_id: str, password: str, salon_info: Optional[Dict] = None) -> bool:
+        """
+        保存済みセッションでの再開を試み、無効な場合のみログイン処理を行う
+
+        セッションの有効性はログイン必須ページへの遷移1回で確認する。
+        フルログインした場合は新しいセッションを書き出す（_export_storage_state）。
+
+        Args:
+            user_id: SALON BOARDログインID
+            password: SALON BOARDパスワード
+            salon_info: サロン情報（複数店舗アカウント用）{"id": "...", "name": "..."}
+
+        Returns:
+            bool: 保存済みセッションで再開できた場合 True
+        """
+        if self.storage_state:
+            if self._is_session_alive():
+                logger.info("保存済みセッションでログイン状態を再開しました")
+                return True
+            logger.info("保存済みセッションが無効のため、ログインし直します")
+            # 失効したCookieが残るとログイン画面の挙動が変わるため破棄してからログインする
+            try:
+                self.context.clear_cookies()
+            except Exception as e:
+                logger.warning("Cookie破棄時に警告: %s", e)
+
+        self.step_login(user_id, password, salon_info)
+        self._export_storage_state()
+        return False
+
     def step_navigate_to_style_list_page(self, use_direct_url: bool = False):
         """
         スタイル一覧ページへ移動
@@ -0,0 +1,117 @@
+"""
+SALON BOARD 自動化処理のペース配分
+_human_pause の待機時間を、SALON BOARD側の反応（アクセス集中・リクエスト中断・ロボット認証・
+正常なアップロードの連続）に応じて伸縮させる。状態はSALON BOARDアカウント（ログインID）ごとに保持する。
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .constants import (
+    PACING_ABORTED_FACTOR,
+    PACING_CLEAN_STREAK,
+    PACING_CONGESTION_FACTOR,
+    PACING_FLOOR_MS,
+    PACING_MAX_SCALE,
+    PACING_MIN_SCALE,
+    PACING_RELAX_FACTOR,
+)
+
+logger = logging.getLogger(__name__)
+
+# ペース配分に影響するシグナル
+SIGNAL_CLEAN_UPLOAD = "clean_upload"
+SIGNAL_CONGESTION = "congestion"
+SIGNAL_UPLOAD_ABORTED = "upload_aborted"
+SIGNAL_ROBOT_DETECTION = "robot_detection"
+
+
+@dataclass(frozen=True)
+class PacingProfile:
+    """待機時間の伸縮ルール"""
+
+    min_scale: float = PACING_MIN_SCALE            # 縮小の下限（安全側の限界）
+    max_scale: float = PACING_MAX_SCALE            # 延長の上限
+    congestion_factor: float = PACING_CONGESTION_FACTOR  # アクセス集中（302）時の倍率
+    aborted_factor: float = PACING_ABORTED_FACTOR  # NS_BINDING_ABORTED 等の中断時の倍率
+    clean_streak: int = PACING_CLEAN_STREAK        # この件数だけ正常なアップロードが続いたら縮小
+    relax_factor: float = PACING_RELAX_FACTOR      # 縮小時の倍率
+    floor_ms: int = PACING_FLOOR_MS                # 縮小しても下回らない最小待機（ミリ秒）
+
+
+class PacingEngine:
+    """
+    待機時間の倍率（scale）を管理する
+
+    - 異常のシグナルで倍率を引き上げ、正常なアップロードが clean_streak 件続くと引き下げる
+    - ロボット認証を検出した場合は上限まで引き上げる
+    - 倍率は常に [min_scale, max_scale] に収める
+    """
+
+    def __init__(self, profile: Optional[PacingProfile] = None, scale: float = 1.0, clean_streak: int = 0):
+        self.profile = profile or PacingProfile()
+        self.scale = self._clamp(scale)
+        self.clean_streak = max(0, clean_streak)
+        self.signals: Dict[str, int] = {}
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]], profile: Optional[PacingProfile] = None) -> "PacingEngine":
+        """to_state() で保存した状態から復元（不正な値は既定値に戻す）"""
+        state = state or {}
+        try:
+            scale = float(state.get("scale", 1.0))
+            clean_streak = int(state.get("clean_streak", 0))
+        except (TypeError, ValueError):
+            scale, clean_streak = 1.0, 0
+        return cls(profile=profile, scale=scale, clean_streak=clean_streak)
+
+    def to_state(self) -> Dict[str, Any]:
+        """アカウントごとに保存する状態"""
+        return {"scale": round(self.scale, 4), "clean_streak": self.clean_streak}
+
+    def scaled(self, base_ms: int, jitter_ms: int, minimum_ms: int) -> Tuple[int, int, int]:
+        """_human_pause の引数に倍率を適用する"""
+        floor_ms = min(minimum_ms, self.profile.floor_ms)
+        return (
+            int(base_ms * self.scale),
+            int(jitter_ms * self.scale),
+            max(floor_ms, int(minimum_ms * self.scale)),
+        )
+
+    def record_clean_upload(self) -> None:
+        """画像アップロードが正常に完了した"""
+        self._count(SIGNAL_CLEAN_UPLOAD)
+        self.clean_streak += 1
+        if self.clean_streak >= self.profile.clean_streak:
+            self.clean_streak = 0
+            self._set_scale(self.scale * self.profile.relax_factor, SIGNAL_CLEAN_UPLOAD)
+
+    def record_congestion(self) -> None:
+        """アクセス集中（302）を検出した"""
+        self._count(SIGNAL_CONGESTION)
+        self.clean_streak = 0
+        self._set_scale(self.scale * self.profile.congestion_factor, SIGNAL_CONGESTION)
+
+    def record_upload_aborted(self) -> None:
+        """画像アップロードリクエストがブラウザ側で中断された"""
+        self._count(SIGNAL_UPLOAD_ABORTED)
+        self.clean_streak = 0
+        self._set_scale(self.scale * self.profile.aborted_factor, SIGNAL_UPLOAD_ABORTED)
+
+    def record_robot_detection(self) -> None:
+        """ロボット認証を検出した"""
+        self._count(SIGNAL_ROBOT_DETECTION)
+        self.clean_streak = 0
+        self._set_scale(self.profile.max_scale, SIGNAL_ROBOT_DETECTION)
+
+    def _count(self, signal: str) -> None:
+        self.signals[signal] = self.signals.get(signal, 0) + 1
+
+    def _set_scale(self, scale: float, signal: str) -> None:
+        new_scale = self._clamp(scale)
+        if new_scale != self.scale:
+            logger.info("待機時間の倍率を変更: %.2f -> %.2f (%s)", self.scale, new_scale, signal)
+        self.scale = new_scale
+
+    def _clamp(self, scale: float) -> float:
+        return min(self.profile.max_scale, max(self.profile.min_scale, scale))
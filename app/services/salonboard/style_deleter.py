@@ -3,10 +3,12 @@ SALON BOARDスタイル削除処理
 """
 from __future__ import annotations
 
+import bisect
 import math
 from collections import deque
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
 
 import logging
 
@@ -15,11 +17,128 @@ from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 if TYPE_CHECKING:
     from playwright.sync_api import Locator
 
+from .pacing import PacingEngine
 from .style_poster import SalonBoardStylePoster
-from .exceptions import StylePostError, StyleDeleteError
+from .exceptions import StylePostError, StyleDeleteError, AutomationCancelledError
 
 logger = logging.getLogger(__name__)
 
+# 一覧の各行から（行番号, スタイル番号文字列）を取得するスクリプト
+# 番号入力・削除ボタンのどちらかがない行は除外する（セレクタはCSSであること）
+_SCRAPE_STYLE_ROWS_SCRIPT = """
+(rows, [numberSelector, deleteSelector]) => rows.flatMap((row, index) => {
+    const input = row.querySelector(numberSelector);
+    if (!input || !row.querySelector(deleteSelector)) {
+        return [];
+    }
+    return [[index, (input.value || input.getAttribute("value") || "").trim()]];
+})
+"""
+
+
+# スタイル一覧1ページあたりの表示件数
+STYLE_LIST_PAGE_SIZE = 150
+
+
+class StylePageIndex:
+    """
+    スタイル番号 → 一覧ページ番号の索引
+
+    走査済みページの番号一覧を保持し、未走査の番号は最寄りの走査済みページから
+    ページ位置を外挿する。削除後は後続の番号が繰り上がるため remove() で追従する。
+    """
+
+    def __init__(self, page_size: int = STYLE_LIST_PAGE_SIZE):
+        self.page_size = page_size
+        self._pages: Dict[int, List[int]] = {}
+        # このページ以降にスタイルがないことが分かっている最小ページ
+        self._end_page: Optional[int] = None
+
+    def record_page(self, page: int, numbers: Iterable[int]) -> None:
+        """走査したページの番号一覧を記録"""
+        numbers = sorted(numbers)
+        if numbers:
+            self._pages[page] = numbers
+            if self._end_page is not None and self._end_page <= page:
+                self._end_page = None
+        else:
+            self._pages.pop(page, None)
+            self._end_page = page if self._end_page is None else min(self._end_page, page)
+
+    def locate(self, number: int) -> Optional[int]:
+        """
+        番号が表示されているページを返す
+
+        Returns:
+            Optional[int]: ページ番号（一覧に存在しないことが確定した場合は None）
+        """
+        below = 0  # number より小さい番号だけを含む走査済みページの最大値
+        above = self._end_page  # number より大きい番号だけを含む（または空の）ページの最小値
+        for page, numbers in self._pages.items():
+            if numbers[0] <= number <= numbers[-1]:
+                return page if self._contains(numbers, number) else None
+            if numbers[-1] < number:
+                below = max(below, page)
+            elif above is None or page < above:
+                above = page
+
+        # 隣接する走査済みページの間、または先頭ページより前の番号は存在しない
+        lower_bound = below + 1
+        upper_bound = above - 1 if above is not None else None
+        if upper_bound is not None and lower_bound > upper_bound:
+            return None
+
+        estimate = math.ceil((number - self._offset(number)) / self.page_size)
+        estimate = max(estimate, lower_bound)
+        if upper_bound is not None:
+            estimate = min(estimate, upper_bound)
+        return estimate
+
+    def plan(self, numbers: Iterable[int]) -> Dict[int, int]:
+        """番号群のページ別件数（処理前の見積もり）"""
+        pages: Dict[int, int] = {}
+        for number in numbers:
+            page = self.locate(number)
+            if page is not None:
+                pages[page] = pages.get(page, 0) + 1
+        return pages
+
+    def remove(self, number: int) -> None:
+        """
+        削除した番号を索引から除き、後続の番号を繰り上げる
+
+        削除ページより後ろのページは行が1件ずつ前のページへずれるため破棄する
+        （次ページが走査済みなら、その先頭行を削除ページの末尾へ繰り入れる）
+        """
+        page = self.locate(number)
+        if page is None:
+            return
+        numbers = self._pages.get(page)
+        next_numbers = self._pages.get(page + 1)
+        for stale_page in [p for p in self._pages if p > page]:
+            del self._pages[stale_page]
+        self._end_page = None
+        if numbers:
+            shifted = [n - 1 if n > number else n for n in numbers if n != number]
+            if next_numbers and len(numbers) == self.page_size:
+                shifted.append(next_numbers[0] - 1)
+            if shifted:
+                self._pages[page] = shifted
+            else:
+                del self._pages[page]
+
+    def _offset(self, number: int) -> int:
+        """最寄りの走査済みページから、番号と表示位置のずれを求める"""
+        if not self._pages:
+            return 0
+        page = min(self._pages, key=lambda p: abs(self._pages[p][0] - number))
+        return self._pages[page][0] - ((page - 1) * self.page_size + 1)
+
+    @staticmethod
+    def _contains(numbers: List[int], number: int) -> bool:
+        index = bisect.bisect_left(numbers, number)
+        return index < len(numbers) and numbers[index] == number
+
 
 @dataclass
 class DeleteCandidate:
@@ -37,6 +156,9 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
     スタイル一覧から指定範囲のスタイルを順次「削除」する。
     """
 
+    # 1つのスタイル番号を探すために一覧ページを移動する回数の上限（超えたら見つからないものとする）
+    MAX_LIST_NAVIGATIONS_PER_TARGET = 3
+
     def run_delete(
         self,
         user_id: str,
@@ -46,11 +168,20 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
         exclude_numbers: Set[int],
         salon_info: Optional[Dict] = None,
         progress_callback: Optional[Callable[[int, int, Dict, Optional[Dict]], None]] = None,
+        cancel_checker: Optional[Callable[[], bool]] = None,
+        storage_state: Optional[Dict] = None,
+        storage_state_callback: Optional[Callable[[Dict], None]] = None,
+        pacing: Optional[PacingEngine] = None,
     ) -> None:
         """
         削除処理のメインフロー
         """
         self.progress_callback = progress_callback
+        self.cancel_checker = cancel_checker
+        self.storage_state = storage_state
+        self.storage_state_callback = storage_state_callback
+        if pacing is not None:
+            self.pacing = pacing
         target_numbers = [n for n in range(range_start, range_end + 1) if n not in exclude_numbers]
         total_targets = len(target_numbers)
         success_count = 0
@@ -118,7 +249,7 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                 },
             )
 
-            self.step_login(user_id, password, salon_info=salon_info)
+            self.step_login_or_resume(user_id, password, salon_info=salon_info)
             emit_progress(
                 0,
                 {
@@ -132,9 +263,12 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
             )
 
             self.step_navigate_to_style_list_page()
-            start_page = max(1, math.ceil(range_end / 150))
-            self._go_to_style_list_page(start_page)
-            current_page = start_page
+            current_page = self._displayed_list_page()
+            page_index = StylePageIndex()
+            page_loads = 0
+            # 探している番号と、その番号のために移動した回数
+            navigating_for: Optional[int] = None
+            navigations = 0
 
             # 処理対象番号を降順ソート済みの deque として管理（番号ずれ対策、パフォーマンス改善）
             remaining_targets = deque(
@@ -144,11 +278,27 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                 )
             )
 
+            logger.info("[DELETE] plan pages=%s", dict(sorted(page_index.plan(remaining_targets).items())))
+
             while remaining_targets:
                 # 処理対象の最大番号を指定して候補を探す
                 target_number = remaining_targets[0]
 
+                if target_number != navigating_for:
+                    navigating_for = target_number
+                    navigations = 0
+
+                # 索引から対象ページを求めて直接遷移する（表示中のページなら再読込しない）
+                target_page = page_index.locate(target_number)
+                if target_page is not None and target_page != current_page:
+                    self._go_to_style_list_page(target_page)
+                    # 範囲外のページ番号は別のページに置き換えられることがあるため、実際に表示されたページで記録する
+                    current_page = self._displayed_list_page()
+                    page_loads += 1
+                    navigations += 1
+
                 candidates = self._collect_candidates()
+                page_index.record_page(current_page, [c.style_number for c in candidates])
                 logger.info(
                     "[DELETE] page=%s candidates=%s target_number=%s remaining=%s",
                     current_page,
@@ -184,6 +334,7 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                         # 成功時のみカウントアップ
                         success_count += 1
                         remaining_targets.popleft()  # 処理済みを削除
+                        page_index.remove(target_number)
 
                         logger.info(
                             "[DELETE] success style_number=%s success=%s/%s total=%s remaining=%s",
@@ -206,8 +357,11 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                             },
                         )
                         # 成功時は次の反復へ（_delete_single_row内で既に一覧に戻っている）
+                        current_page = self._displayed_list_page()
                         continue
 
+                    except AutomationCancelledError:
+                        raise
                     except Exception as exc:
                         error_count += 1
                         screenshot_path = ""
@@ -246,45 +400,52 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                         )
                         # エラーがあったスタイルはスキップして次へ
                         remaining_targets.popleft()
-                        # _delete_single_row の finally で既に一覧に戻っている
+                        # _delete_single_row 内で既に一覧に戻っている
+                        current_page = self._displayed_list_page()
+
+                elif (
+                    navigations < self.MAX_LIST_NAVIGATIONS_PER_TARGET
+                    and page_index.locate(target_number) is not None
+                ):
+                    # 走査結果から別のページにあると推定された場合は、そのページへ移動して再度探す
+                    logger.info(
+                        "[DELETE] target_number=%s not on page=%s, moving to page=%s",
+                        target_number,
+                        current_page,
+                        page_index.locate(target_number),
+                    )
+                    continue
 
                 else:
-                    # target_number が見つからない場合
+                    # 一覧に存在しないことが確定した場合、または移動回数の上限に達した場合 → エラー
                     logger.warning(
-                        "[DELETE] target_number=%s not found on current page (page=%s)",
+                        "[DELETE] target_number=%s not found on style list (page=%s, navigations=%s)",
                         target_number,
                         current_page,
+                        navigations,
+                    )
+                    emit_progress(
+                        success_count,
+                        {
+                            "stage": "DELETE_NOT_FOUND",
+                            "stage_label": "未処理のスタイルがあります",
+                            "message": f"スタイル番号 {target_number} を一覧から見つけられませんでした",
+                            "status": "warning",
+                            "current_index": success_count,
+                            "total": total_targets,
+                            "style_number": target_number,
+                        },
+                        error={
+                            "row_number": 0,
+                            "style_name": f"番号 {target_number}",
+                            "field": "削除",
+                            "reason": "スタイル一覧に対象番号が見つかりませんでした",
+                            "screenshot_path": self._take_screenshot("delete-not-found"),
+                        },
+                    )
+                    raise StyleDeleteError(
+                        f"スタイル番号 {target_number} が一覧で見つかりませんでした"
                     )
-
-                    # 前のページを試す
-                    if current_page > 1:
-                        current_page -= 1
-                        self._go_to_style_list_page(current_page)
-                        continue
-                    else:
-                        # 最初のページまで探しても見つからない → エラー
-                        emit_progress(
-                            success_count,
-                            {
-                                "stage": "DELETE_NOT_FOUND",
-                                "stage_label": "未処理のスタイルがあります",
-                                "message": f"スタイル番号 {target_number} を一覧から見つけられませんでした",
-                                "status": "warning",
-                                "current_index": success_count,
-                                "total": total_targets,
-                                "style_number": target_number,
-                            },
-                            error={
-                                "row_number": 0,
-                                "style_name": f"番号 {target_number}",
-                                "field": "削除",
-                                "reason": "スタイル一覧に対象番号が見つかりませんでした",
-                                "screenshot_path": self._take_screenshot("delete-not-found"),
-                            },
-                        )
-                        raise StyleDeleteError(
-                            f"スタイル番号 {target_number} が一覧で見つかりませんでした"
-                        )
 
             # 最終サマリー：成功件数とエラー件数を明確に表示
             summary_message = (
@@ -306,10 +467,11 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                 },
             )
             logger.info(
-                "[DELETE] summary: success=%s error=%s total=%s",
+                "[DELETE] summary: success=%s error=%s total=%s page_loads=%s",
                 success_count,
                 error_count,
                 total_targets,
+                page_loads,
             )
         finally:
             self._close_browser()
@@ -329,37 +491,40 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
         self.page.goto(target_url, timeout=self.TIMEOUT_LOAD)
         self.page.wait_for_load_state("domcontentloaded", timeout=self.TIMEOUT_LOAD)
 
+    def _displayed_list_page(self) -> int:
+        """表示中のスタイル一覧のページ番号（URLの pn パラメータ、なければ1）"""
+        try:
+            return max(1, int(parse_qs(urlparse(self.page.url).query).get("pn", ["1"])[0]))
+        except (TypeError, ValueError):
+            return 1
+
     def _collect_candidates(self) -> List[DeleteCandidate]:
-        """一覧テーブルから番号と削除ボタンのペアを取得"""
+        """
+        一覧テーブルから番号と削除ボタンのペアを取得
+
+        行ごとの count()/input_value() 呼び出しを避けるため、evaluate_all の1往復で
+        全行の（行番号, スタイル番号）を取得する。削除ボタンは Locator のまま保持し、
+        クリック時に解決する。
+        """
         selectors = self.selectors["style_list"]
         rows = self.page.locator(selectors["rows"])
-        row_count = rows.count()
+        scraped = rows.evaluate_all(
+            _SCRAPE_STYLE_ROWS_SCRIPT,
+            [selectors["style_number_input"], selectors["delete_button"]],
+        )
         candidates: List[DeleteCandidate] = []
 
-        for idx in range(row_count):
-            row = rows.nth(idx)
-            number_inputs = row.locator(selectors["style_number_input"])
-            if number_inputs.count() == 0:
-                continue
-            style_number_raw = ""
-            try:
-                style_number_raw = number_inputs.first.input_value().strip()
-            except Exception:
-                try:
-                    attr_value = number_inputs.first.get_attribute("value") or ""
-                    style_number_raw = attr_value.strip()
-                except Exception:
-                    continue
+        for row_index, style_number_raw in scraped:
             try:
                 style_number = int(style_number_raw)
-            except ValueError:
-                continue
-
-            delete_buttons = row.locator(selectors["delete_button"])
-            if delete_buttons.count() == 0:
+            except (TypeError, ValueError):
                 continue
-
-            candidates.append(DeleteCandidate(style_number=style_number, click_target=delete_buttons.first))
+            candidates.append(
+                DeleteCandidate(
+                    style_number=style_number,
+                    click_target=rows.nth(row_index).locator(selectors["delete_button"]).first,
+                )
+            )
 
         return candidates
 
@@ -424,6 +589,8 @@ class SalonBoardStyleDeleter(SalonBoardStylePoster):
                 if navigated_back:
                     return
 
+            except AutomationCancelledError:
+                raise
             except Exception as exc:
                 last_error = exc
                 logger.warning(
@@ -3,17 +3,19 @@ SALON BOARD スタイル自動投稿サービス
 Playwrightを使用したブラウザ自動化
 """
 import logging
+from itertools import islice
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
-import pandas as pd
 import yaml
 
 from .browser_manager import SalonBoardBrowserManager
 from .utils import BrowserUtilsMixin
 from .login_handler import LoginHandlerMixin
 from .form_handler import StyleFormHandlerMixin
-from .exceptions import StylePostError
+from .exceptions import StylePostError, AutomationCancelledError
+from .pacing import PacingEngine
+from .style_records import count_style_records, iter_style_records
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +36,38 @@ class SalonBoardStylePoster(
         image_dir: str,
         salon_info: Optional[Dict] = None,
         progress_callback: Optional[Callable] = None,
-        total_items: Optional[int] = None
-    ):
+        total_items: Optional[int] = None,
+        cancel_checker: Optional[Callable[[], bool]] = None,
+        storage_state: Optional[Dict] = None,
+        storage_state_callback: Optional[Callable[[Dict], None]] = None,
+        timing_callback: Optional[Callable[[Dict], None]] = None,
+        pacing: Optional[PacingEngine] = None,
+        start_index: int = 0,
+        max_items: Optional[int] = None,
+        checkpoint_callback: Optional[Callable[[int], None]] = None
+    ) -> int:
         """
         メイン実行ロジック
 
         Args:
             user_id: SALON BOARDログインID
             password: SALON BOARDパスワード
-            data_filepath: スタイル情報ファイルパス（CSV/Excel）
+            data_filepath: スタイル情報ファイルパス（受付時に正規化したJSON Lines、旧形式のCSV/Excelも可）
             image_dir: 画像ディレクトリパス
             salon_info: サロン情報（複数店舗用）
             progress_callback: 進捗コールバック関数
             total_items: 期待される処理件数（事前計算済みの総件数）
+            cancel_checker: キャンセル要求の有無を返す関数（待機ループ内で確認）
+            storage_state: 保存済みログインセッション（有効ならログイン処理を省略）
+            storage_state_callback: 新規ログイン後のセッションを受け取る関数（次回タスクでの再利用用）
+            timing_callback: スタイル1件ごとのステージ別所要時間を受け取る関数
+            pacing: アカウントごとの待機時間の倍率（省略時は既定の倍率から開始）
+            start_index: 処理を始める行（0始まり、分割実行の続きでは処理済みの行数）
+            max_items: 今回処理する件数の上限（省略時は最後まで処理）
+            checkpoint_callback: 1件処理するごとに処理済みの行数を受け取る関数
+
+        Returns:
+            int: 処理済みの行数（総件数未満の場合は続きが残っている）
         """
         # credentials を保持（セッションリセット用）
         self._user_id = user_id
@@ -54,68 +75,69 @@ class SalonBoardStylePoster(
         self._salon_info = salon_info
 
         self.progress_callback = progress_callback
+        self.cancel_checker = cancel_checker
+        self.storage_state = storage_state
+        self.storage_state_callback = storage_state_callback
+        self.timing_callback = timing_callback
+        if pacing is not None:
+            self.pacing = pacing
         self.expected_total = total_items or 0
 
         try:
             # ブラウザ起動
             self._emit_progress(
-                0,
+                start_index,
                 {
                     "stage": "BROWSER_STARTING",
                     "stage_label": "ブラウザ起動準備",
                     "message": "Playwrightを起動しています",
                     "status": "info",
-                    "current_index": 0,
+                    "current_index": start_index,
                     "total": self.expected_total
                 }
             )
             self._start_browser()
             self._emit_progress(
-                0,
+                start_index,
                 {
                     "stage": "BROWSER_READY",
                     "stage_label": "ブラウザ起動完了",
                     "message": "Playwrightの起動が完了しました",
                     "status": "info",
-                    "current_index": 0,
+                    "current_index": start_index,
                     "total": self.expected_total
                 }
             )
 
-            # ログイン
-            self.step_login(user_id, password, salon_info)
+            # ログイン（保存済みセッションが有効な場合は省略）
+            self.step_login_or_resume(user_id, password, salon_info)
             self._emit_progress(
-                0,
+                start_index,
                 {
                     "stage": "LOGIN_COMPLETED",
                     "stage_label": "ログイン完了",
                     "message": "SALON BOARDへのログインが完了しました",
                     "status": "info",
-                    "current_index": 0,
+                    "current_index": start_index,
                     "total": self.expected_total
                 }
             )
 
-            # データ読み込み
+            # データ読み込み（受付時に正規化されたレコードを1件ずつ読み込む）
             logger.info("データファイル読み込み: %s", data_filepath)
-            if data_filepath.endswith(".csv"):
-                df = pd.read_csv(data_filepath)
-            elif data_filepath.endswith(".xlsx"):
-                df = pd.read_excel(data_filepath)
-            else:
-                raise Exception("サポートされていないファイル形式です")
-
-            logger.info("%s件のスタイルデータを読み込みました", len(df))
-            logger.debug("データカラム: %s", list(df.columns))
-            self.expected_total = len(df)
+            self.expected_total = count_style_records(data_filepath)
+            logger.info("%s件のスタイルデータを読み込みました", self.expected_total)
+            data_message = f"{self.expected_total}件のスタイルデータを読み込みました"
+            if start_index > 0:
+                data_message += f"（{start_index + 1}件目から再開します）"
             self._emit_progress(
-                0,
+                start_index,
                 {
                     "stage": "DATA_READY",
                     "stage_label": "データ読み込み完了",
-                    "message": f"{self.expected_total}件のスタイルデータを読み込みました",
+                    "message": data_message,
                     "status": "info",
-                    "current_index": 0,
+                    "current_index": start_index,
                     "total": self.expected_total
                 }
             )
@@ -123,21 +145,26 @@ class SalonBoardStylePoster(
             # スタイル一覧ページへ移動
             self.step_navigate_to_style_list_page()
             self._emit_progress(
-                0,
+                start_index,
                 {
                     "stage": "NAVIGATED",
                     "stage_label": "投稿準備完了",
                     "message": "スタイル一覧ページを開きました",
                     "status": "info",
-                    "current_index": 0,
+                    "current_index": start_index,
                     "total": self.expected_total
                 }
             )
 
-            # スタイルごとにループ処理
+            # スタイルごとにループ処理（分割実行では start_index から max_items 件）
             image_dir_path = Path(image_dir)
-            for index, row in df.iterrows():
+            stop_index = start_index + max_items if max_items else None
+            processed = start_index
+            records = islice(enumerate(iter_style_records(data_filepath)), start_index, stop_index)
+            for index, row in records:
                 style_name = row.get("スタイル名", "不明")
+                self.stage_timer.start_style(index + 2, style_name)
+                style_status = "error"
                 self._emit_progress(
                     index,
                     {
@@ -152,7 +179,7 @@ class SalonBoardStylePoster(
                 )
 
                 try:
-                    logger.info("--- スタイル %s/%s 処理中 ---", index + 1, len(df))
+                    logger.info("--- スタイル %s/%s 処理中 ---", index + 1, self.expected_total)
 
                     # 画像パス生成
                     image_filename = row["画像名"]
@@ -162,8 +189,8 @@ class SalonBoardStylePoster(
                         raise Exception(f"画像ファイルが見つかりません: {image_filename}")
                     logger.debug("画像ファイル確認: %s (exists=%s, size=%s bytes)", image_path, image_path.exists(), image_path.stat().st_size if image_path.exists() else "n/a")
 
-                    style_dict = row.to_dict()
-                    style_dict["_row_number"] = index + 2  # CSVヘッダー分を考慮
+                    style_dict = dict(row)
+                    style_dict.setdefault("_row_number", index + 2)  # CSVヘッダー分を考慮
 
                     # スタイル処理
                     manual_events = self.step_process_single_style(style_dict, str(image_path), index)
@@ -182,6 +209,8 @@ class SalonBoardStylePoster(
                             logger.error("セッションリセットに失敗しました: %s", reset_error)
                             # リセット失敗しても処理を継続（次のスタイルで同じ問題が発生する可能性あり）
 
+                    style_status = "warning" if manual_events else "completed"
+
                     # manual_eventsにエラーが含まれる場合のみ成功時の進捗更新を行う
                     if not manual_events:
                         self._emit_progress(
@@ -247,6 +276,8 @@ class SalonBoardStylePoster(
                                 error=event
                             )
 
+                except AutomationCancelledError:
+                    raise
                 except Exception as e:
                     logger.error("エラー発生: %s", e)
 
@@ -282,6 +313,33 @@ class SalonBoardStylePoster(
                         },
                         error=error_payload
                     )
+                finally:
+                    timing = self.stage_timer.finish_style(style_status)
+                    if timing is not None:
+                        timing["pacing_scale"] = round(self.pacing.scale, 4)
+                    self._emit_timing(timing)
+
+                # エラーを記録した行も処理済みとする（中止の場合はここに来ない）
+                processed = index + 1
+                if checkpoint_callback:
+                    checkpoint_callback(processed)
+
+            if processed < self.expected_total:
+                # 続きは別の実行で再開する（最新のログインセッションを引き継ぐ）
+                logger.info("分割実行: %s/%s件まで処理しました", processed, self.expected_total)
+                self._export_storage_state()
+                self._emit_progress(
+                    processed,
+                    {
+                        "stage": "CHUNK_COMPLETED",
+                        "stage_label": "分割実行",
+                        "message": f"{processed}/{self.expected_total}件目まで処理しました。続きを順番に再開します",
+                        "status": "info",
+                        "current_index": processed,
+                        "total": self.expected_total
+                    }
+                )
+                return processed
 
             logger.info("全スタイルの処理が完了しました")
             self._emit_progress(
@@ -295,6 +353,7 @@ class SalonBoardStylePoster(
                     "total": self.expected_total
                 }
             )
+            return self.expected_total
 
         except Exception as e:
             logger.exception("致命的エラー: %s", e)
@@ -354,17 +413,17 @@ class SalonBoardStylePoster(
                 }
             )
 
-            # 再ログイン
+            # 再ログイン（新しいセッションを次回タスク用に保存し直す）
             self.step_login(user_id, password, salon_info)
+            self._export_storage_state()
 
             # スタイル一覧へ移動
             self.step_navigate_to_style_list_page()
 
             # 待機（サーバー側の制限解除を待つ）
-            import time
             wait_seconds = 5
             logger.info("サーバー側の制限解除を待機します（%s秒）...", wait_seconds)
-            time.sleep(wait_seconds)
+            self._cancellable_wait(wait_seconds * 1000)
 
             logger.info("セッションリセットと再ログインが完了しました")
 
@@ -379,6 +438,8 @@ class SalonBoardStylePoster(
                 }
             )
 
+        except AutomationCancelledError:
+            raise
         except Exception as e:
             logger.error("セッションリセットに失敗しました: %s", e)
             raise StylePostError(
@@ -0,0 +1,52 @@
+"""
+スタイル情報レコードの読み込み
+APIが投稿受付時に正規化して保存したJSON Lines（1行1スタイル）を逐次読み込む。
+旧形式（CSV/Excel）のファイルが渡された場合はpandasで読み込んで同じ形に変換する。
+"""
+import json
+from typing import Any, Dict, Iterator, List
+
+# JSON Lines形式のスタイル情報ファイルの拡張子（app.services.style_data と対応）
+STYLE_RECORDS_SUFFIX = ".jsonl"
+
+
+def iter_style_records(data_filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    スタイル情報を1件ずつ返す
+
+    各レコードはカラム名をキーとする文字列の辞書で、"_row_number"（ヘッダーを含む行番号）を持つ
+    """
+    if data_filepath.endswith(STYLE_RECORDS_SUFFIX):
+        with open(data_filepath, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    yield from _read_legacy_rows(data_filepath)
+
+
+def count_style_records(data_filepath: str) -> int:
+    """スタイル情報の件数（JSON Linesは行数を数えるだけで、レコードは解析しない）"""
+    if data_filepath.endswith(STYLE_RECORDS_SUFFIX):
+        with open(data_filepath, encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+    return len(_read_legacy_rows(data_filepath))
+
+
+def _read_legacy_rows(data_filepath: str) -> List[Dict[str, Any]]:
+    """CSV/Excelを読み込む（受付時に正規化されていないファイル用）"""
+    import pandas as pd
+
+    if data_filepath.endswith(".csv"):
+        df = pd.read_csv(data_filepath)
+    elif data_filepath.endswith(".xlsx"):
+        df = pd.read_excel(data_filepath)
+    else:
+        raise Exception("サポートされていないファイル形式です")
+
+    rows = []
+    for index, row in enumerate(df.to_dict(orient="records")):
+        record = {key: value for key, value in row.items() if not pd.isna(value)}
+        record["_row_number"] = index + 2
+        rows.append(record)
+    return rows
@@ -0,0 +1,145 @@
+"""
+SALON BOARD 自動化処理の所要時間計測
+スタイル1件ごとにステージ別の所要時間と、待機処理（意図的な待機・サーバー応答待ち）の内訳を記録する
+"""
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# 計測対象の待機種別
+WAIT_HUMAN_PAUSE = "human_pause"          # 人間らしさのための待機（_human_pause）
+WAIT_COOLDOWN = "cooldown"                # 制限解除待ちなどの固定待機（_cancellable_wait）
+WAIT_LOADER_OVERLAY = "loader_overlay"    # ローディングオーバーレイの消失待ち
+WAIT_CLICK_AND_WAIT = "click_and_wait"    # クリック＋遷移待ち（内部の待機を含む）
+WAIT_UPLOAD_RESPONSE = "upload_response"  # 画像アップロード（doUpload）の応答待ち
+
+# 意図的な待機（こちらのペース配分による時間、app.core.timing_report の集計と対応）
+INTENTIONAL_WAITS = (WAIT_HUMAN_PAUSE, WAIT_COOLDOWN)
+
+
+def _ms(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
+
+class StyleTimer:
+    """
+    スタイル1件分の所要時間を集計するタイマー
+
+    - start_style() から finish_style() までを1件とし、その間の mark_stage() でステージを区切る
+    - measure() は待機種別ごとの合計時間・回数と、意図的な待機のステージ別内訳を記録する
+    - count_calls() は待機処理内で発行したPlaywright呼び出しの回数を記録する
+    - スタイル処理外（ログイン等）の計測は記録しない
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._record: Optional[Dict[str, Any]] = None
+        self._style_started = 0.0
+        self._stage: Optional[str] = None
+        self._stage_started = 0.0
+        self._depth: Dict[str, int] = {}
+
+    @property
+    def active(self) -> bool:
+        """スタイル処理中か"""
+        return self._record is not None
+
+    def start_style(self, row_number: int, style_name: str) -> None:
+        """スタイル1件の計測を開始"""
+        now = self._clock()
+        self._record = {
+            "row_number": row_number,
+            "style_name": style_name,
+            "total_ms": 0,
+            "stages": {},
+            "waits": {},
+            "wait_counts": {},
+            "browser_calls": {},
+        }
+        self._style_started = now
+        self._stage = None
+        self._stage_started = now
+
+    def mark_stage(self, stage: str) -> None:
+        """現在のステージを終了し、次のステージの計測を開始"""
+        if self._record is None:
+            return
+        now = self._clock()
+        self._close_stage(now)
+        self._stage = stage
+        self._stage_started = now
+
+    @contextmanager
+    def measure(self, kind: str) -> Iterator[None]:
+        """待機処理の所要時間を計測（同じ種別の入れ子は外側のみ計上）"""
+        if self._record is None or self._depth.get(kind):
+            yield
+            return
+        self._depth[kind] = 1
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._depth[kind] = 0
+            if self._record is not None:
+                elapsed_ms = _ms(self._clock() - started)
+                waits = self._record["waits"]
+                waits[kind] = waits.get(kind, 0) + elapsed_ms
+                wait_counts = self._record["wait_counts"]
+                wait_counts[kind] = wait_counts.get(kind, 0) + 1
+                if kind in INTENTIONAL_WAITS and self._stage is not None:
+                    stage = self._record["stages"].setdefault(self._stage, {"ms": 0, "pause_ms": 0})
+                    stage["pause_ms"] += elapsed_ms
+
+    def count_calls(self, kind: str, calls: int = 1) -> None:
+        """待機処理内で発行したPlaywright呼び出しの回数を加算"""
+        if self._record is None:
+            return
+        browser_calls = self._record["browser_calls"]
+        browser_calls[kind] = browser_calls.get(kind, 0) + calls
+
+    def finish_style(self, status: str) -> Optional[Dict[str, Any]]:
+        """
+        スタイル1件の計測を終了
+
+        Args:
+            status: 処理結果（"completed", "warning", "error"）
+
+        Returns:
+            Optional[Dict[str, Any]]: 計測結果（計測中でない場合はNone）
+        """
+        if self._record is None:
+            return None
+        now = self._clock()
+        self._close_stage(now)
+        record = self._record
+        record["status"] = status
+        record["total_ms"] = _ms(now - self._style_started)
+        self._record = None
+        self._stage = None
+        return record
+
+    def _close_stage(self, now: float) -> None:
+        if self._stage is None:
+            return
+        stage = self._record["stages"].setdefault(self._stage, {"ms": 0, "pause_ms": 0})
+        stage["ms"] += _ms(now - self._stage_started)
+
+
+def timed(kind: str):
+    """
+    BrowserUtilsMixin 等のメソッドを stage_timer で計測するデコレータ
+
+    stage_timer 属性を持たないインスタンスではそのまま実行する
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            timer: Optional[StyleTimer] = getattr(self, "stage_timer", None)
+            if timer is None:
+                return func(self, *args, **kwargs)
+            with timer.measure(kind):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,15 +5,58 @@ SALON BOARD ユーティリティMixin
 import logging
 import time
 from datetime import datetime
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-from .exceptions import StylePostError, RobotDetectionError
+from .exceptions import StylePostError, RobotDetectionError, AutomationCancelledError
+from .pacing import PacingEngine
+from .timing import (
+    StyleTimer,
+    WAIT_CLICK_AND_WAIT,
+    WAIT_COOLDOWN,
+    WAIT_HUMAN_PAUSE,
+    WAIT_LOADER_OVERLAY,
+    timed,
+)
 
 logger = logging.getLogger(__name__)
 
+# ロボット認証の一括確認スクリプト（表示中の要素・テキストに一致したものを返す）
+# セレクタは各セレクタの最初の要素、テキストは描画中のテキスト（innerText）を対象とする
+# CSSとして解釈できないセレクタ（Playwright独自構文）は unsupported として返す
+_ROBOT_DETECTION_PROBE_SCRIPT = """
+({selectors, texts}) => {
+    const isVisible = (element) => {
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== "hidden";
+    };
+    const matches = [];
+    const unsupported = [];
+    for (const selector of selectors) {
+        let element = null;
+        try {
+            element = document.querySelector(selector);
+        } catch (e) {
+            unsupported.push(selector);
+            continue;
+        }
+        if (element && isVisible(element)) {
+            matches.push(`セレクタ: ${selector}`);
+        }
+    }
+    const normalize = (value) => value.replace(/\\s+/g, " ").toLowerCase();
+    const bodyText = document.body ? normalize(document.body.innerText || "") : "";
+    for (const text of texts) {
+        if (bodyText.includes(normalize(text))) {
+            matches.push(`テキスト: ${text}`);
+        }
+    }
+    return {matches, unsupported};
+}
+"""
+
 
 class BrowserUtilsMixin:
     """ブラウザ操作ユーティリティMixin"""
@@ -24,8 +67,15 @@ class BrowserUtilsMixin:
     screenshot_dir: object
     _random: object
     progress_callback: Optional[Callable]
+    cancel_checker: Optional[Callable[[], bool]]
+    timing_callback: Optional[Callable[[Dict], None]]
+    stage_timer: StyleTimer
+    pacing: PacingEngine
     expected_total: int
 
+    # loader_overlay の非表示待機を区切る間隔（キャンセル確認の間隔）
+    LOADER_OVERLAY_WAIT_CHUNK_MS = 2000
+
     def _take_screenshot(self, prefix: str = "error") -> str:
         """
         スクリーンショット撮影
@@ -46,17 +96,18 @@ class BrowserUtilsMixin:
             return str(filepath)
         return ""
 
+    @timed(WAIT_HUMAN_PAUSE)
     def _human_pause(
         self,
         base_ms: int = 500,
         jitter_ms: int = 100,
         minimum_ms: int = 50
     ) -> None:
-        """待機処理（ページが閉じている場合は time.sleep を使用）"""
+        """待機処理（倍率は pacing で調整、ページが閉じている場合は time.sleep を使用）"""
         if not self.page:
             return
 
-        # 単純な待機のみ行う
+        base_ms, jitter_ms, minimum_ms = self.pacing.scaled(base_ms, jitter_ms, minimum_ms)
         sleep_ms = max(minimum_ms, base_ms + self._random.randint(-jitter_ms, jitter_ms))
         try:
             self.page.wait_for_timeout(sleep_ms)
@@ -65,45 +116,77 @@ class BrowserUtilsMixin:
             logger.debug("page.wait_for_timeout に失敗したため time.sleep を使用します")
             time.sleep(sleep_ms / 1000.0)
 
+    def _raise_if_cancelled(self) -> None:
+        """
+        キャンセル要求があれば処理を中断する（待機ループから呼び出す）
+
+        Raises:
+            AutomationCancelledError: キャンセル要求があった場合
+        """
+        if self.cancel_checker is not None and self.cancel_checker():
+            logger.info("キャンセル要求を検出したため処理を中断します")
+            raise AutomationCancelledError()
+
+    @timed(WAIT_COOLDOWN)
+    def _cancellable_wait(self, wait_ms: int, chunk_ms: int = 500) -> None:
+        """キャンセル要求を確認しながら待機する（長めの固定待機用）"""
+        deadline = time.monotonic() + (wait_ms / 1000.0)
+        while True:
+            self._raise_if_cancelled()
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                return
+            step_ms = min(chunk_ms, remaining_ms)
+            try:
+                self.page.wait_for_timeout(step_ms)
+            except (PlaywrightError, AttributeError):
+                time.sleep(step_ms / 1000.0)
+
     def _check_robot_detection(self) -> None:
         """
         ロボット認証検出
 
+        設定されたセレクタとテキストを page.evaluate の1往復でまとめて確認する。
+        評価に失敗した場合（遷移中でコンテキストが破棄された等）は要素ごとの確認にフォールバックする。
+
         Raises:
             RobotDetectionError: ロボット認証が検出された場合
         """
         robot_config = self.selectors.get("robot_detection", {})
+        selectors = list(robot_config.get("selectors", []))
+        texts = list(robot_config.get("texts", []))
+        if not selectors and not texts:
+            return
 
-        # セレクタチェック（visible状態のものだけ）
-        for selector in robot_config.get("selectors", []):
-            # 要素が存在し、かつ表示されている場合のみ検出
-            locator = self.page.locator(selector)
-            if locator.count() > 0:
-                # 最初の要素が実際に表示されているかチェック
-                try:
-                    if locator.first.is_visible(timeout=1000):
-                        logger.warning("ロボット認証検出（セレクタ: %s）", selector)
-                        screenshot_path = self._take_screenshot("robot-detection")
-                        raise RobotDetectionError(screenshot_path=screenshot_path)
-                except RobotDetectionError:
-                    raise
-                except Exception:
-                    # タイムアウトや要素が見つからない場合は無視
-                    pass
-
-        # テキストチェック（visible状態のものだけ）
-        for text in robot_config.get("texts", []):
-            locator = self.page.locator(f"text={text}")
-            if locator.count() > 0:
-                try:
-                    if locator.first.is_visible(timeout=1000):
-                        logger.warning("ロボット認証検出（テキスト: %s）", text)
-                        screenshot_path = self._take_screenshot("robot-detection")
-                        raise RobotDetectionError(screenshot_path=screenshot_path)
-                except RobotDetectionError:
-                    raise
-                except Exception:
-                    pass
+        try:
+            probe = self.page.evaluate(_ROBOT_DETECTION_PROBE_SCRIPT, {"selectors": selectors, "texts": texts})
+            matches = probe["matches"]
+            if probe["unsupported"]:
+                matches += self._probe_robot_detection_per_locator(probe["unsupported"], [])
+        except PlaywrightError as e:
+            logger.debug("ロボット認証の一括確認に失敗したため個別に確認します: %s", e)
+            matches = self._probe_robot_detection_per_locator(selectors, texts)
+
+        if matches:
+            logger.warning("ロボット認証検出（%s）", ", ".join(matches))
+            self.pacing.record_robot_detection()
+            screenshot_path = self._take_screenshot("robot-detection")
+            raise RobotDetectionError(screenshot_path=screenshot_path)
+
+    def _probe_robot_detection_per_locator(self, selectors: List[str], texts: List[str]) -> List[str]:
+        """ロボット認証の要素ごとの確認（visible状態のものだけ、一括確認のフォールバック）"""
+        targets = [(f"セレクタ: {selector}", selector) for selector in selectors]
+        targets += [(f"テキスト: {text}", f"text={text}") for text in texts]
+        matches = []
+        for label, selector in targets:
+            try:
+                locator = self.page.locator(selector)
+                if locator.count() > 0 and locator.first.is_visible(timeout=1000):
+                    matches.append(label)
+            except Exception:
+                # タイムアウトや要素が見つからない場合は無視
+                pass
+        return matches
 
     def _emit_progress(
         self,
@@ -115,6 +198,10 @@ class BrowserUtilsMixin:
         total_override: Optional[int] = None
     ) -> None:
         """進捗コールバックを通じて詳細情報を通知"""
+        if detail is not None and detail.get("stage"):
+            # 通知されるステージの切り替わりを所要時間計測の区切りとする
+            self.stage_timer.mark_stage(str(detail["stage"]))
+
         if not self.progress_callback:
             return
 
@@ -144,6 +231,16 @@ class BrowserUtilsMixin:
                 success=success
             )
 
+    def _emit_timing(self, record: Optional[Dict]) -> None:
+        """スタイル1件分の所要時間を timing_callback へ渡す（失敗しても処理は継続）"""
+        if record is None or self.timing_callback is None:
+            return
+        try:
+            self.timing_callback(record)
+        except Exception as e:
+            logger.warning("所要時間の記録に失敗しました: %s", e)
+
+    @timed(WAIT_CLICK_AND_WAIT)
     def _click_and_wait(
         self,
         selector: str,
@@ -184,6 +281,8 @@ class BrowserUtilsMixin:
                 self._human_pause()
                 self.page.locator(selector).first.click(timeout=click_timeout)
                 break  # クリック成功
+            except AutomationCancelledError:
+                raise
             except Exception as click_error:
                 if click_attempt < max_click_attempts - 1:
                     logger.warning("クリック %s 回目で失敗、リトライします: %s", click_attempt + 1, click_error)
@@ -230,6 +329,7 @@ class BrowserUtilsMixin:
         check_interval_ms = 1000
 
         while time.monotonic() < deadline:
+            self._raise_if_cancelled()
             try:
                 if self.page.locator(header_selector).first.is_visible(timeout=2000):
                     logger.info("ヘッダー検出: %s", header_selector)
@@ -282,6 +382,7 @@ class BrowserUtilsMixin:
         last_log = 0.0
 
         while time.monotonic() < deadline:
+            self._raise_if_cancelled()
             modal_visible = False
             try:
                 modal = self.page.locator(modal_selector)
@@ -343,6 +444,7 @@ class BrowserUtilsMixin:
 
         raise Exception(f"画像アップロード完了を確認できませんでした (timeout={timeout_ms}ms)")
 
+    @timed(WAIT_LOADER_OVERLAY)
     def _wait_for_loader_overlay_disappeared(self, timeout_ms: int = 30000) -> bool:
         """
         loader_overlay が非表示になるまで待機
@@ -366,35 +468,32 @@ class BrowserUtilsMixin:
             logger.debug("loader_overlay セレクタが設定されていません")
             return True
 
+        # ブラウザ側で非表示になるまで待つ（非表示・DOMにない場合は即座に返る）。
+        # キャンセル要求を確認できるよう、待機は LOADER_OVERLAY_WAIT_CHUNK_MS ごとに区切る
         deadline = time.monotonic() + (timeout_ms / 1000.0)
-        poll_ms = 200
-        last_log = 0.0
-
-        while time.monotonic() < deadline:
-            overlay_visible = False
-            try:
-                overlay = self.page.locator(loader_overlay_selector)
-                if overlay.count() > 0:
-                    if overlay.first.is_visible(timeout=200):
-                        overlay_visible = True
-            except PlaywrightError:
-                pass
-
-            if not overlay_visible:
-                logger.debug("loader_overlay が非表示になりました")
-                return True
-
-            now = time.monotonic()
-            if now - last_log > 2.0:
-                logger.info("loader_overlay がまだ表示されています... 待機中")
-                last_log = now
-
-            try:
-                self.page.wait_for_timeout(poll_ms)
-            except PlaywrightError:
-                # ページが閉じている等の場合は time.sleep で代替
-                time.sleep(poll_ms / 1000.0)
-                return False  # ページが閉じたので待機終了
+        calls = 0
+        try:
+            while True:
+                self._raise_if_cancelled()
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    break
+                calls += 1
+                try:
+                    self.page.wait_for_selector(
+                        loader_overlay_selector,
+                        state="hidden",
+                        timeout=min(self.LOADER_OVERLAY_WAIT_CHUNK_MS, remaining_ms),
+                    )
+                    logger.debug("loader_overlay が非表示になりました")
+                    return True
+                except PlaywrightTimeoutError:
+                    logger.info("loader_overlay がまだ表示されています... 待機中")
+                except PlaywrightError:
+                    # ページが閉じている等の場合は待機終了
+                    return False
+        finally:
+            self.stage_timer.count_calls(WAIT_LOADER_OVERLAY, calls)
 
         # タイムアウト
         logger.warning("loader_overlay の非表示待機がタイムアウトしました (timeout=%sms)", timeout_ms)
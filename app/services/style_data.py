@@ -0,0 +1,122 @@
+"""
+スタイル情報ファイルの受付処理
+アップロードされたCSV/Excelを投稿受付時に1回だけ解析・検証し、Celeryワーカーが逐次読み込める
+JSON Lines（1行1スタイル）に正規化して保存する
+
+Webプロセスの起動を軽く保つため pandas は使わず、CSVは標準ライブラリ、Excelは openpyxl の
+読み取り専用モードで1行ずつ読み込む
+"""
+import csv
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# 正規化済みスタイル情報ファイルの拡張子（app.services.salonboard.style_records と対応）
+STYLE_RECORDS_SUFFIX = ".jsonl"
+
+# 受付時に存在を確認するカラム
+REQUIRED_COLUMNS = ("画像名",)
+
+
+class StyleDataError(ValueError):
+    """スタイル情報ファイルの内容が不正な場合の例外"""
+
+
+def _normalize_value(value: Any) -> Optional[str]:
+    """セルの値を文字列に揃える（整数値のfloatは小数点を付けない、空欄はNone）"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return text or None
+
+
+def _iter_csv_rows(data_path: Path) -> Iterator[Sequence[Any]]:
+    """CSVを1行ずつ読み込む（Excelで保存したBOM付きUTF-8にも対応）"""
+    with open(data_path, newline="", encoding="utf-8-sig") as f:
+        try:
+            yield from csv.reader(f)
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise StyleDataError(f"Could not read CSV file (UTF-8 is required): {e}") from e
+
+
+def _iter_xlsx_rows(data_path: Path) -> Iterator[Sequence[Any]]:
+    """Excelの先頭シートを読み取り専用モードで1行ずつ読み込む"""
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(data_path, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        raise StyleDataError(f"Could not read Excel file: {e}") from e
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_table_rows(data_path: Path) -> Iterator[Sequence[Any]]:
+    if data_path.suffix == ".csv":
+        return _iter_csv_rows(data_path)
+    return _iter_xlsx_rows(data_path)
+
+
+def iter_style_rows(data_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    CSV/Excelを1行ずつ解析し、正規化したスタイル情報を返す
+
+    - 空欄のセルはキーごと省略する（ワーカー側では未指定として扱われる）
+    - すべて空欄の行は読み飛ばす
+    - 値はすべて文字列にそろえ、"_row_number"（ヘッダーを含む行番号）を付与する
+
+    Raises:
+        StyleDataError: ファイルが読み込めない・空である、または必須カラムがない場合
+    """
+    rows = _iter_table_rows(data_path)
+    header = next(rows, None)
+    if header is None:
+        raise StyleDataError("Style data file is empty")
+    columns = [_normalize_value(name) for name in header]
+
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing_columns:
+        raise StyleDataError(f"Missing required columns: {', '.join(missing_columns)}")
+
+    index = 0
+    for row in rows:
+        record: Dict[str, Any] = {}
+        for column, value in zip(columns, row):
+            normalized = _normalize_value(value)
+            if column is not None and normalized is not None:
+                record[column] = normalized
+        if not record:
+            continue
+        record["_row_number"] = index + 2  # ヘッダー行を考慮
+        index += 1
+        yield record
+
+
+def load_style_rows(data_path: Path) -> List[Dict[str, Any]]:
+    """
+    CSV/Excelを解析して正規化したスタイル情報のリストを返す
+
+    Raises:
+        StyleDataError: ファイルが読み込めない・空である、または必須カラムがない場合
+    """
+    return list(iter_style_rows(data_path))
+
+
+def write_style_records(rows: Iterable[Dict[str, Any]], records_path: Path) -> Path:
+    """正規化済みスタイル情報をJSON Linesで保存する"""
+    with open(records_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write("\n")
+    return records_path
+
+
+def style_records_path(data_path: Path) -> Path:
+    """アップロードされたファイルに対応する正規化済みファイルのパス"""
+    return data_path.with_suffix(STYLE_RECORDS_SUFFIX)
@@ -5,16 +5,27 @@ Celeryタスク定義
 import logging
 import os
 import shutil
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
 from uuid import UUID
 
 from celery import Task
-
-from app.core.celery_app import celery_app
+from celery.exceptions import Retry
+from celery.signals import worker_process_shutdown
+
+from app.core.celery_app import (
+    CLEANUP_SCREENSHOTS_TASK,
+    REAP_STALE_TASKS_TASK,
+    DELETE_STYLES_TASK,
+    PROCESS_STYLE_POST_TASK,
+    celery_app,
+)
+from app.core import account_lease, task_queue
 from app.core.config import settings
 from app.core.celery_task import MonitoredTask, TaskCancelledError
+from app.core.pacing_store import load_pacing_state, save_pacing_state
 from app.crud import current_task as crud_task, salon_board_setting as crud_setting
 from app.core.security import decrypt_password
 from app.services.salonboard import (
@@ -23,6 +34,11 @@ from app.services.salonboard import (
     StylePostError,
     StyleDeleteError,
     RobotDetectionError,
+    AutomationCancelledError,
+    BrowserPool,
+    PacingEngine,
+    get_browser_pool,
+    shutdown_browser_pool,
     load_selectors,
 )
 
@@ -30,29 +46,176 @@ logger = logging.getLogger(__name__)
 SCREENSHOT_DIR = Path(settings.SCREENSHOT_DIR)
 
 
-@celery_app.task(bind=True, base=MonitoredTask, name="process_style_post")
+def get_task_browser_pool() -> Optional[BrowserPool]:
+    """ワーカープロセスで共有するブラウザプールを取得（無効化されている場合はNone）"""
+    if not settings.BROWSER_POOL_ENABLED:
+        return None
+    return get_browser_pool(
+        max_contexts=settings.BROWSER_POOL_MAX_CONTEXTS,
+        max_rss_mb=settings.BROWSER_POOL_MAX_RSS_MB,
+    )
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_browser_pool(**kwargs) -> None:
+    """ワーカープロセス終了時にプール中のブラウザを終了する"""
+    shutdown_browser_pool()
+
+
+def make_storage_state_saver(db, setting_id: int) -> Callable[[Dict[str, Any]], None]:
+    """ログイン後のセッションを設定へ暗号化保存するコールバックを生成"""
+    def save(storage_state: Dict[str, Any]) -> None:
+        try:
+            crud_setting.save_storage_state(db, setting_id, storage_state)
+        except Exception:
+            db.rollback()
+            raise
+        logger.info("ログインセッションを保存しました: setting_id=%s", setting_id)
+    return save
+
+
+@contextmanager
+def account_pacing(account: str) -> Iterator[PacingEngine]:
+    """
+    SALON BOARDアカウントごとのペース配分を前回の状態から再開し、終了時（失敗時も）に保存する
+
+    同じログインIDを登録した別の設定・ユーザーのタスクとも、SALON BOARD側の反応を共有する
+    """
+    pacing = PacingEngine.from_state(load_pacing_state(account))
+    logger.info("待機時間の倍率: account=%s scale=%.2f", account, pacing.scale)
+    try:
+        yield pacing
+    finally:
+        save_pacing_state(account, pacing.to_state())
+        logger.info(
+            "待機時間の倍率を保存しました: account=%s scale=%.2f signals=%s",
+            account,
+            pacing.scale,
+            pacing.signals,
+        )
+
+
+def cleanup_uploads(style_data_filepath: str, image_dir: str) -> None:
+    """タスク終了時にアップロードファイルを削除する"""
+    try:
+        if os.path.exists(style_data_filepath):
+            os.remove(style_data_filepath)
+            logger.info("スタイルデータファイル削除: %s", style_data_filepath)
+
+        if os.path.exists(image_dir):
+            shutil.rmtree(image_dir)
+            logger.info("画像ディレクトリ削除: %s", image_dir)
+    except Exception as cleanup_error:
+        logger.warning("クリーンアップエラー: %s", cleanup_error)
+
+
+def wait_for_account_turn(task: MonitoredTask, task_uuid: UUID, account: str, total_items: int) -> None:
+    """
+    SALON BOARDアカウントのリースを取得する
+
+    同じアカウントの別タスクが実行中の場合は待ち行列に並び、順番待ちの状況を進捗詳細に記録して
+    一定時間後に再実行する（待機中もワーカーを占有しない）
+
+    Raises:
+        Retry: 順番待ちで再実行する場合
+        TaskCancelledError: 待機中にキャンセルされた場合
+    """
+    task_id = str(task_uuid)
+    try:
+        task.ensure_not_cancelled(task_uuid)
+    except TaskCancelledError:
+        account_lease.leave_queue(account, task_id)
+        raise
+
+    attempt = account_lease.try_acquire(account, task_id)
+    wait_detail = {
+        "queue_position": attempt.position,
+        "account_wait_sec": round(attempt.waited_sec, 1),
+    }
+    if attempt.acquired:
+        if attempt.waited_sec >= 1:
+            logger.info("アカウントの順番が来ました: account=%s waited=%.1fs", account, attempt.waited_sec)
+            task.record_detail(
+                task_uuid=task_uuid,
+                stage="ACCOUNT_ACQUIRED",
+                stage_label="順番待ち完了",
+                message=f"順番が来たため処理を開始します（待機 {int(attempt.waited_sec)}秒）",
+                status_text="info",
+                total=total_items,
+                extra=wait_detail,
+            )
+        return
+
+    logger.info(
+        "同じアカウントのタスクが実行中のため待機します: account=%s position=%s holder=%s",
+        account,
+        attempt.position,
+        attempt.holder,
+    )
+    task.record_detail(
+        task_uuid=task_uuid,
+        stage="ACCOUNT_WAITING",
+        stage_label="順番待ち",
+        message=(
+            "同じSALON BOARDアカウントの別タスクが実行中のため待機しています"
+            f"（{attempt.position}番目、待機 {int(attempt.waited_sec)}秒）"
+        ),
+        status_text="waiting",
+        total=total_items,
+        extra=wait_detail,
+    )
+    raise task.retry(countdown=settings.ACCOUNT_LEASE_RETRY_SEC, max_retries=None)
+
+
+@celery_app.task(
+    bind=True,
+    base=MonitoredTask,
+    name=PROCESS_STYLE_POST_TASK,
+    # ワーカーが停止（OOM等）した場合はメッセージを再配信し、処理済みの行から再開する
+    acks_late=True,
+    reject_on_worker_lost=True
+)
 def process_style_post_task(
     self,
     task_id: str,
     user_id: int,
     setting_id: int,
     style_data_filepath: str,
-    image_dir: str
+    image_dir: str,
+    start_index: int = 0
 ):
     """
     スタイル投稿処理タスク
+
+    STYLE_POST_CHUNK_SIZE 件ごとに区切って実行し、続きが残っている場合は処理済みの行から
+    再開するタスクとして再投入する（1回の実行を task_soft_time_limit 内に収める）。
+    処理済みの行数は1件ごとに current_tasks.checkpoint_index へ（その行の成功・エラーイベントと
+    同じCOMMITで）記録し、ワーカー停止で同じ実行が再配信された場合も処理済みの行は投稿しない。
+
+    Args:
+        start_index: 処理を始める行（分割実行の続きで指定）
     """
     task_uuid = UUID(task_id)
     db = self.db
     # 初期値
     total_items = 0
+    # 保持中のアカウントのリース（失った場合は進捗の確認時に中断する）
+    lease: Optional[account_lease.LeaseKeeper] = None
+    # 順番待ちで再実行する場合はアップロードファイルを残す
+    requeued = False
+
+    # 終了済みのタスクが再配信された場合は何もしない
+    db_task_snapshot = crud_task.get_task_by_id(db, task_uuid)
+    if db_task_snapshot is None or db_task_snapshot.status in crud_task.FINISHED_STATUSES:
+        logger.warning("終了済みのタスクのため処理しません: %s", task_id)
+        return
 
     try:
         logger.info("=== タスク開始: %s ===", task_id)
-        
+
         # 初期状態の確保 (total_itemsなど)
-        db_task_snapshot = crud_task.get_task_by_id(db, task_uuid)
-        total_items = db_task_snapshot.total_items if db_task_snapshot else 0
+        total_items = db_task_snapshot.total_items
+        resume_index = max(start_index, db_task_snapshot.checkpoint_index)
 
         # SALON BOARD設定取得
         setting = crud_setting.get_setting_by_id(db, setting_id)
@@ -82,7 +245,8 @@ def process_style_post_task(
             selectors=selectors,
             screenshot_dir=screenshot_dir,
             headless=not settings.USE_HEADFUL_MODE,
-            slow_mo=100
+            slow_mo=100,
+            browser_pool=get_task_browser_pool()
         )
 
         # 進捗コールバック関数
@@ -98,6 +262,8 @@ def process_style_post_task(
             nonlocal total_items
 
             self.ensure_not_cancelled(task_uuid)
+            if lease is not None:
+                lease.ensure_held()
 
             if total and total > total_items:
                 total_items = total
@@ -125,12 +291,14 @@ def process_style_post_task(
                     current_index=current_idx,
                     total=total_val,
                     style_name=style_name,
-                    extra=detail # 残りのデータ
+                    extra=detail, # 残りのデータ
+                    flush=False
                 )
 
-            crud_task.update_task_progress(db, task_uuid, completed)
+            # 進捗・イベントは進捗ライターに集約し、閾値到達時にまとめて書き込む
+            self.record_progress(task_uuid, completed)
             if error:
-                crud_task.add_task_error(db, task_uuid, error)
+                self.record_error(task_uuid, error)
             if success:
                 self.record_success(
                     task_uuid=task_uuid,
@@ -139,22 +307,52 @@ def process_style_post_task(
                     image_name=success.get("image_name"),
                     stylist_name=success.get("stylist_name"),
                     category=success.get("category"),
-                    length=success.get("length")
+                    length=success.get("length"),
+                    flush=False
                 )
 
-        # Poster実行
-        poster.run(
-            user_id=setting.sb_user_id,
-            password=sb_password,
-            data_filepath=style_data_filepath,
-            image_dir=image_dir,
-            salon_info=salon_info,
-            progress_callback=progress_callback,
-            total_items=total_items
-        )
-
-        # 完了処理
-        crud_task.update_task_status(db, task_uuid, "SUCCESS")
+        # Poster実行（同じSALON BOARDアカウントのタスクとは順番に実行する）
+        account = account_lease.account_key(setting.sb_user_id)
+        wait_for_account_turn(self, task_uuid, account, total_items)
+        with account_lease.LeaseKeeper(account, task_id) as lease, account_pacing(account) as pacing:
+            processed = poster.run(
+                user_id=setting.sb_user_id,
+                password=sb_password,
+                data_filepath=style_data_filepath,
+                image_dir=image_dir,
+                salon_info=salon_info,
+                progress_callback=progress_callback,
+                total_items=total_items,
+                cancel_checker=lambda: self.is_cancel_requested(task_uuid),
+                storage_state=crud_setting.get_storage_state(setting),
+                storage_state_callback=make_storage_state_saver(db, setting_id),
+                timing_callback=lambda timing: self.record_timing(task_uuid, timing),
+                pacing=pacing,
+                start_index=resume_index,
+                max_items=settings.STYLE_POST_CHUNK_SIZE or None,
+                checkpoint_callback=lambda index: self.record_checkpoint(task_uuid, index)
+            )
+
+        if processed < poster.expected_total:
+            # 分割実行: リースを解放してから続きを再投入する（空いたワーカーが保存済みセッションで再開する）
+            self.flush_progress(task_uuid)
+            logger.info("=== 分割実行の続きを再投入: %s (%s/%s) ===", task_id, processed, poster.expected_total)
+            raise self.retry(
+                kwargs={
+                    "task_id": task_id,
+                    "user_id": user_id,
+                    "setting_id": setting_id,
+                    "style_data_filepath": style_data_filepath,
+                    "image_dir": image_dir,
+                    "start_index": processed,
+                },
+                countdown=0,
+                max_retries=None
+            )
+
+        # 完了処理（バッファ中の進捗を反映してからステータス更新）
+        self.flush_progress(task_uuid)
+        self.update_status(task_uuid, "SUCCESS")
         
         # 最終状態取得
         final_snapshot = crud_task.get_task_by_id(db, task_uuid)
@@ -172,7 +370,11 @@ def process_style_post_task(
         )
         logger.info("=== タスク完了: %s ===", task_id)
 
-    except TaskCancelledError as cancel_error:
+    except Retry:
+        requeued = True
+        raise
+
+    except (TaskCancelledError, AutomationCancelledError) as cancel_error:
         self.handle_cancel(task_uuid, task_id, cancel_error, completed_items=0, total_items=total_items)
         raise
 
@@ -189,6 +391,15 @@ def process_style_post_task(
                 "error_category": "ROBOT_DETECTION",
                 "screenshot_path": e.screenshot_path
             }
+        elif isinstance(e, account_lease.AccountLeaseLostError):
+            error_context = {
+                "row_number": 0,
+                "style_name": "システムエラー",
+                "field": "タスク全体",
+                "reason": str(e),
+                "error_category": "ACCOUNT_LEASE_LOST",
+                "screenshot_path": ""
+            }
         elif isinstance(e, StylePostError):
             logger.warning("スクリーンショット: %s", e.screenshot_path)
             error_context = {
@@ -220,20 +431,12 @@ def process_style_post_task(
         raise
 
     finally:
-        # アップロードファイルのクリーンアップ
-        try:
-            if os.path.exists(style_data_filepath):
-                os.remove(style_data_filepath)
-                logger.info("スタイルデータファイル削除: %s", style_data_filepath)
-
-            if os.path.exists(image_dir):
-                shutil.rmtree(image_dir)
-                logger.info("画像ディレクトリ削除: %s", image_dir)
-        except Exception as cleanup_error:
-            logger.warning("クリーンアップエラー: %s", cleanup_error)
+        # アップロードファイルのクリーンアップ（順番待ち・分割実行の続きで再実行する場合は残す）
+        if not requeued:
+            cleanup_uploads(style_data_filepath, image_dir)
 
 
-@celery_app.task(bind=True, base=MonitoredTask, name="delete_styles")
+@celery_app.task(bind=True, base=MonitoredTask, name=DELETE_STYLES_TASK)
 def delete_styles_task(
     self,
     task_id: str,
@@ -251,6 +454,7 @@ def delete_styles_task(
 
     # 初期値
     total_items = 0
+    lease: Optional[account_lease.LeaseKeeper] = None
     exclude_set: Set[int] = {int(n) for n in exclude_numbers}
 
     try:
@@ -275,6 +479,7 @@ def delete_styles_task(
             screenshot_dir=screenshot_dir,
             headless=not settings.USE_HEADFUL_MODE,
             slow_mo=100,
+            browser_pool=get_task_browser_pool(),
         )
 
         def progress_callback(
@@ -286,6 +491,8 @@ def delete_styles_task(
         ) -> None:
             nonlocal total_items
             self.ensure_not_cancelled(task_uuid)
+            if lease is not None:
+                lease.ensure_held()
 
             if total and total > total_items:
                 total_items = total
@@ -310,12 +517,14 @@ def delete_styles_task(
                     current_index=current_idx,
                     total=total_val,
                     style_number=style_num,
-                    extra=detail
+                    extra=detail,
+                    flush=False
                 )
 
-            crud_task.update_task_progress(db, task_uuid, completed)
+            # 進捗・イベントは進捗ライターに集約し、閾値到達時にまとめて書き込む
+            self.record_progress(task_uuid, completed)
             if error:
-                crud_task.add_task_error(db, task_uuid, error)
+                self.record_error(task_uuid, error)
 
         salon_info = None
         if setting.salon_id or setting.salon_name:
@@ -324,18 +533,26 @@ def delete_styles_task(
                 "name": setting.salon_name,
             }
 
-        deleter.run_delete(
-            user_id=setting.sb_user_id,
-            password=sb_password,
-            range_start=range_start,
-            range_end=range_end,
-            exclude_numbers=exclude_set,
-            salon_info=salon_info,
-            progress_callback=progress_callback,
-        )
-
-        # 完了処理
-        crud_task.update_task_status(db, task_uuid, "SUCCESS")
+        account = account_lease.account_key(setting.sb_user_id)
+        wait_for_account_turn(self, task_uuid, account, total_items)
+        with account_lease.LeaseKeeper(account, task_id) as lease, account_pacing(account) as pacing:
+            deleter.run_delete(
+                user_id=setting.sb_user_id,
+                password=sb_password,
+                range_start=range_start,
+                range_end=range_end,
+                exclude_numbers=exclude_set,
+                salon_info=salon_info,
+                progress_callback=progress_callback,
+                cancel_checker=lambda: self.is_cancel_requested(task_uuid),
+                storage_state=crud_setting.get_storage_state(setting),
+                storage_state_callback=make_storage_state_saver(db, setting_id),
+                pacing=pacing,
+            )
+
+        # 完了処理（バッファ中の進捗を反映してからステータス更新）
+        self.flush_progress(task_uuid)
+        self.update_status(task_uuid, "SUCCESS")
 
         final_snapshot = crud_task.get_task_by_id(db, task_uuid)
         final_completed = final_snapshot.completed_items if final_snapshot else total_items
@@ -352,7 +569,10 @@ def delete_styles_task(
         )
         logger.info("=== 削除タスク完了: %s ===", task_id)
 
-    except TaskCancelledError as cancel_error:
+    except Retry:
+        raise
+
+    except (TaskCancelledError, AutomationCancelledError) as cancel_error:
         self.handle_cancel(task_uuid, task_id, cancel_error, completed_items=0, total_items=total_items)
         raise
 
@@ -374,7 +594,9 @@ def delete_styles_task(
         }
 
         # 汎用例外の場合でscreenshot_pathが無い場合の情報補完
-        if not isinstance(e, (StylePostError, StyleDeleteError)):
+        if isinstance(e, account_lease.AccountLeaseLostError):
+            error_context["error_category"] = "ACCOUNT_LEASE_LOST"
+        elif not isinstance(e, (StylePostError, StyleDeleteError)):
              error_context["reason"] = f"予期せぬエラー: {str(e)}"
 
         self.handle_failure(
@@ -486,7 +708,7 @@ def cleanup_screenshots(
     return metrics
 
 
-@celery_app.task(name="cleanup_screenshots")
+@celery_app.task(name=CLEANUP_SCREENSHOTS_TASK)
 def cleanup_screenshots_task() -> Dict[str, int]:
     """
     スクリーンショットの定期クリーンアップタスク
@@ -504,3 +726,15 @@ def cleanup_screenshots_task() -> Dict[str, int]:
         result["remaining_bytes"],
     )
     return result
+
+
+@celery_app.task(bind=True, base=MonitoredTask, name=REAP_STALE_TASKS_TASK)
+def reap_stale_tasks_task(self) -> Dict[str, int]:
+    """
+    応答のない実行中タスクの整理と順番待ちタスクの開始を行う定期タスク
+    """
+    reaped = task_queue.reap_stale_tasks(self.db)
+    started = task_queue.dispatch_queued_tasks(self.db)
+    if reaped or started:
+        logger.info("タスクの整理: reaped=%s started=%s", len(reaped), len(started))
+    return {"reaped": len(reaped), "started": len(started)}
@@ -0,0 +1,139 @@
+"""
+アップロードファイルの受付処理
+UploadFile をチャンク単位で非同期にディスクへ書き込み、書き込みながらサイズ上限と
+ファイル先頭のマジックバイトを検証する（イベントループをブロックしない）
+"""
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+# ファイル種別
+UPLOAD_KIND_IMAGE = "image"
+UPLOAD_KIND_CSV = "csv"
+UPLOAD_KIND_XLSX = "xlsx"
+
+# 受け付ける画像形式のマジックバイト（JPEG/PNG）
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",
+    b"\x89PNG\r\n\x1a\n",
+)
+# XLSXはZIPコンテナ
+XLSX_SIGNATURE = b"PK\x03\x04"
+
+
+class UploadRejectedError(ValueError):
+    """アップロードファイルを受け付けられない場合の例外"""
+
+
+class UploadTooLargeError(UploadRejectedError):
+    """ファイルサイズまたはリクエスト合計サイズが上限を超えた"""
+
+
+class UploadContentError(UploadRejectedError):
+    """ファイルの内容が宣言された形式と一致しない"""
+
+
+class UploadBudget:
+    """1リクエスト内の合計書き込みサイズを管理する"""
+
+    def __init__(self, max_total_bytes: int):
+        self.max_total_bytes = max_total_bytes
+        self.used_bytes = 0
+
+    def consume(self, size: int) -> None:
+        self.used_bytes += size
+        if self.used_bytes > self.max_total_bytes:
+            raise UploadTooLargeError(
+                f"Total upload size exceeds the limit ({self.max_total_bytes} bytes)"
+            )
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """クライアントが送ったファイル名からディレクトリ部分を取り除く"""
+    name = Path((filename or "").replace("\\", "/")).name
+    if name in ("", ".", ".."):
+        raise UploadContentError(f"Invalid file name: {filename!r}")
+    return name
+
+
+def style_data_kind(filename: str) -> Optional[str]:
+    """スタイル情報ファイルの種別（CSV/XLSX以外はNone）"""
+    if filename.endswith(".csv"):
+        return UPLOAD_KIND_CSV
+    if filename.endswith(".xlsx"):
+        return UPLOAD_KIND_XLSX
+    return None
+
+
+def check_signature(kind: str, head: bytes, filename: str) -> None:
+    """
+    ファイル先頭のバイト列が種別と一致するか確認する
+
+    Raises:
+        UploadContentError: 一致しない場合
+    """
+    if kind == UPLOAD_KIND_IMAGE:
+        valid = head.startswith(IMAGE_SIGNATURES)
+        expected = "JPEG or PNG image"
+    elif kind == UPLOAD_KIND_XLSX:
+        valid = head.startswith(XLSX_SIGNATURE)
+        expected = "Excel (.xlsx) file"
+    else:
+        # CSVにはマジックバイトがないため、バイナリ（NULを含む）でないことのみ確認
+        valid = b"\x00" not in head
+        expected = "text CSV file"
+    if not valid:
+        raise UploadContentError(f"{filename} is not a valid {expected}")
+
+
+async def save_upload(
+    upload: UploadFile,
+    dest: Path,
+    kind: str,
+    max_bytes: int,
+    chunk_bytes: int,
+    budget: Optional[UploadBudget] = None,
+) -> int:
+    """
+    アップロードファイルをチャンク単位で非同期に保存する
+
+    先頭チャンクでマジックバイトを確認し、書き込みながらサイズ上限を確認する。
+    検証に失敗した場合は書きかけのファイルを削除する。
+
+    Args:
+        upload: アップロードファイル
+        dest: 保存先パス
+        kind: ファイル種別（UPLOAD_KIND_*）
+        max_bytes: このファイルのサイズ上限
+        chunk_bytes: 1回に読み書きするサイズ
+        budget: リクエスト全体の合計サイズ管理
+
+    Returns:
+        int: 書き込んだバイト数
+
+    Raises:
+        UploadTooLargeError: サイズ上限を超えた場合
+        UploadContentError: 空ファイル、または内容が種別と一致しない場合
+    """
+    filename = dest.name
+    written = 0
+    try:
+        async with aiofiles.open(dest, "wb") as f:
+            while chunk := await upload.read(chunk_bytes):
+                if written == 0:
+                    check_signature(kind, chunk, filename)
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLargeError(f"{filename} exceeds the size limit ({max_bytes} bytes)")
+                if budget is not None:
+                    budget.consume(len(chunk))
+                await f.write(chunk)
+        if written == 0:
+            raise UploadContentError(f"{filename} is empty")
+    except UploadRejectedError:
+        await aiofiles.os.remove(dest)
+        raise
+    return written
@@ -86,3 +86,56 @@ export async function apiCallFormData(url, formData) {
 
     return response.json();
 }
+
+/**
+ * Opens a Server-Sent Events stream that pushes the current task status.
+ * Each message has the same shape as the /api/v1/tasks/status response.
+ * The stream URL carries a short-lived stream token from /api/v1/tasks/stream-token,
+ * not the access token, because EventSource cannot send an Authorization header.
+ * When streaming is unavailable (no EventSource support, Redis down, connection dropped),
+ * the stream is closed and onFallback is called once so the caller can switch to polling.
+ * @param {object} handlers
+ * @param {function(object): void} handlers.onStatus - Called with each status payload.
+ * @param {function(): void} handlers.onFallback - Called once when the stream cannot be used.
+ * @returns {{close: function(): void}} A handle to close the stream.
+ */
+export function openTaskStream({ onStatus, onFallback }) {
+    if (!getToken() || typeof window.EventSource === 'undefined') {
+        onFallback();
+        return { close() {} };
+    }
+
+    let source = null;
+    let closed = false;
+    const close = () => {
+        closed = true;
+        if (source) source.close();
+    };
+    const fallback = () => {
+        if (closed) return;
+        close();
+        onFallback();
+    };
+
+    apiCall('/api/v1/tasks/stream-token', { method: 'POST' })
+        .then(({ token }) => {
+            if (closed) return;
+            source = new EventSource(`/api/v1/tasks/stream?token=${encodeURIComponent(token)}`);
+
+            source.onmessage = (event) => {
+                let status;
+                try {
+                    status = JSON.parse(event.data);
+                } catch (error) {
+                    return;
+                }
+                onStatus(status);
+            };
+
+            // Do not let EventSource reconnect on its own (the stream token is short-lived); hand over to polling instead.
+            source.onerror = fallback;
+        })
+        .catch(fallback);
+
+    return { close };
+}
@@ -0,0 +1,109 @@
+/**
+ * Task Queue Module
+ * Shows the user's queued tasks (shared by the post and delete pages).
+ * Queued tasks start automatically, in order, when the running task finishes.
+ */
+import { apiCall } from './api.js';
+import { showAlert } from './ui.js';
+
+const taskTypeLabels = {
+    post: 'スタイル投稿',
+    delete: 'スタイル削除',
+};
+
+function createCell(text) {
+    const cell = document.createElement('td');
+    cell.textContent = text;
+    return cell;
+}
+
+function createActionButton(label, action, task, className) {
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.className = `btn ${className}`;
+    button.textContent = label;
+    button.dataset.action = action;
+    button.dataset.taskId = task.task_id;
+    button.dataset.position = task.position;
+    return button;
+}
+
+/**
+ * Fetches the queue and renders it; the section is hidden while the queue is empty.
+ */
+export async function refreshTaskQueue() {
+    const section = document.getElementById('task-queue-section');
+    const list = document.getElementById('task-queue-list');
+    if (!section || !list) return;
+
+    let queue;
+    try {
+        queue = await apiCall('/api/v1/tasks/queue');
+    } catch (error) {
+        console.error('Failed to load task queue:', error);
+        return;
+    }
+
+    list.innerHTML = '';
+    queue.tasks.forEach((task) => {
+        const row = document.createElement('tr');
+        row.appendChild(createCell(`${task.position}`));
+        row.appendChild(createCell(taskTypeLabels[task.task_type] || task.task_type));
+        row.appendChild(createCell(task.message || `${task.total_items}件`));
+
+        const actions = document.createElement('td');
+        const moveUp = createActionButton('上へ', 'move-up', task, 'btn-secondary');
+        moveUp.disabled = task.position <= 1;
+        actions.appendChild(moveUp);
+        actions.appendChild(createActionButton('取消', 'cancel', task, 'btn-danger'));
+        row.appendChild(actions);
+
+        list.appendChild(row);
+    });
+
+    const count = document.getElementById('task-queue-count');
+    if (count) count.textContent = `${queue.tasks.length}件`;
+    section.classList.toggle('hidden', queue.tasks.length === 0);
+}
+
+/**
+ * Wires the reorder / cancel buttons of the queue list.
+ */
+export function setupTaskQueue() {
+    const list = document.getElementById('task-queue-list');
+    if (!list) return;
+
+    list.addEventListener('click', async (event) => {
+        const button = event.target.closest('button[data-action]');
+        if (!button) return;
+
+        const url = `/api/v1/tasks/queue/${button.dataset.taskId}`;
+        try {
+            if (button.dataset.action === 'move-up') {
+                await apiCall(url, {
+                    method: 'PUT',
+                    body: JSON.stringify({ position: Number(button.dataset.position) - 1 }),
+                });
+            } else if (button.dataset.action === 'cancel') {
+                if (!confirm('この順番待ちのタスクを取り消しますか？')) return;
+                await apiCall(url, { method: 'DELETE' });
+                showAlert('順番待ちのタスクを取り消しました', 'info');
+            }
+        } catch (error) {
+            showAlert(error.message, 'danger');
+        }
+        await refreshTaskQueue();
+    });
+}
+
+/**
+ * Message shown after a submission (started now or added to the queue).
+ * @param {object} response - The response of the task creation endpoint.
+ * @param {string} startedMessage - Message used when the task started immediately.
+ */
+export function describeSubmission(response, startedMessage) {
+    if (response && response.queue_position > 0) {
+        return `順番待ちに追加しました（${response.queue_position}番目）`;
+    }
+    return startedMessage;
+}
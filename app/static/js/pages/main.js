@@ -1,10 +1,12 @@
 /**
  * Main Page Logic
  */
-import { apiCall, apiCallFormData } from '../modules/api.js';
+import { apiCall, apiCallFormData, openTaskStream } from '../modules/api.js';
 import { showAlert, showLoading, hideLoading, openScreenshotModal } from '../modules/ui.js';
+import { describeSubmission, refreshTaskQueue, setupTaskQueue } from '../modules/taskQueue.js';
 
 let pollingInterval = null;
+let taskStream = null;
 let lastErrorCount = 0;
 let notificationPermission = 'default';
 
@@ -60,6 +62,12 @@ async function init() {
             newTaskBtn.addEventListener('click', handleNewTask);
         }
 
+        const queueTaskBtn = document.getElementById('queue-task-btn');
+        if (queueTaskBtn) {
+            queueTaskBtn.addEventListener('click', showQueueForm);
+        }
+        setupTaskQueue();
+
         // Template Example Toggle - if specific button exists
         // (Note: in index.html, onclick="toggleTemplateExample" might be used. We need to attach listener instead if possible, or expose global)
         // For module compatibility, it's better to attach listeners if element IDs are known.
@@ -101,6 +109,7 @@ function deriveStatusLabel(status) {
     if (status.status === 'PROCESSING') {
         if (detailStatus === 'error') return 'エラーを処理中...';
         if (detailStatus === 'working') return '処理中...';
+        if (detailStatus === 'waiting') return '順番待ち...';
         if (detailStatus === 'info') return '準備中...';
         return '処理中...';
     }
@@ -173,13 +182,22 @@ async function checkTaskStatus() {
 
         if (status.status === 'PROCESSING' || status.status === 'CANCELLING') {
             showProgressSection(status);
-            startPolling();
+            startStatusUpdates();
         } else if (status.status === 'SUCCESS' || status.status === 'FAILURE') {
             await showResultSection(status);
         }
     } catch (error) {
         showFormSection();
     }
+    await refreshTaskQueue();
+}
+
+function showQueueForm() {
+    const formSec = document.getElementById('task-form-section');
+    if (formSec) {
+        formSec.classList.remove('hidden');
+        formSec.scrollIntoView({ behavior: 'smooth' });
+    }
 }
 
 function showFormSection() {
@@ -313,46 +331,76 @@ function updateProgress(status) {
     }
 }
 
+/**
+ * Applies a task status received from the stream or from polling.
+ * @param {object} status - Same shape as the /api/v1/tasks/status response.
+ */
+async function handleStatusUpdate(status) {
+    if (status.status === 'PROCESSING' || status.status === 'CANCELLING') {
+        updateProgress(status);
+    } else {
+        stopStatusUpdates();
+        lastErrorCount = 0;
+
+        if (status.status === 'SUCCESS') {
+            sendNotification(
+                'タスク完了',
+                status.has_errors
+                    ? `タスクが完了しました（エラー: ${status.error_count}件）`
+                    : 'タスクが完了しました',
+                { tag: 'task-complete' }
+            );
+        } else {
+            const isCancelled = status.detail?.status === 'cancelled';
+            sendNotification(
+                isCancelled ? 'タスク中止' : 'タスク失敗',
+                isCancelled ? 'タスクをキャンセルしました' : 'タスクがエラーにより中断されました',
+                { tag: isCancelled ? 'task-cancelled' : 'task-failed' }
+            );
+        }
+
+        await showResultSection(status);
+        // 順番待ちの先頭が開始されるため、一覧を更新する
+        await refreshTaskQueue();
+    }
+}
+
+/**
+ * Subscribes to pushed task status; falls back to polling when streaming is unavailable.
+ */
+function startStatusUpdates() {
+    if (taskStream || pollingInterval) return;
+
+    taskStream = openTaskStream({
+        onStatus: (status) => {
+            handleStatusUpdate(status).catch((error) => console.error('Status update error:', error));
+        },
+        onFallback: () => {
+            taskStream = null;
+            startPolling();
+        },
+    });
+}
+
 function startPolling() {
     if (pollingInterval) return;
 
     pollingInterval = setInterval(async () => {
         try {
             const status = await apiCall('/api/v1/tasks/status');
-
-            if (status.status === 'PROCESSING' || status.status === 'CANCELLING') {
-                updateProgress(status);
-            } else {
-                stopPolling();
-                lastErrorCount = 0;
-
-                if (status.status === 'SUCCESS') {
-                    sendNotification(
-                        'タスク完了',
-                        status.has_errors
-                            ? `タスクが完了しました（エラー: ${status.error_count}件）`
-                            : 'タスクが完了しました',
-                        { tag: 'task-complete' }
-                    );
-                } else {
-                    const isCancelled = status.detail?.status === 'cancelled';
-                    sendNotification(
-                        isCancelled ? 'タスク中止' : 'タスク失敗',
-                        isCancelled ? 'タスクをキャンセルしました' : 'タスクがエラーにより中断されました',
-                        { tag: isCancelled ? 'task-cancelled' : 'task-failed' }
-                    );
-                }
-
-                await showResultSection(status);
-            }
+            await handleStatusUpdate(status);
         } catch (error) {
             console.error('Polling error:', error);
-            stopPolling();
+            stopStatusUpdates();
         }
     }, 2000);
 }
 
-function stopPolling() {
+function stopStatusUpdates() {
+    if (taskStream) {
+        taskStream.close();
+        taskStream = null;
+    }
     if (pollingInterval) {
         clearInterval(pollingInterval);
         pollingInterval = null;
@@ -534,10 +582,10 @@ async function handleTaskSubmit(e) {
     showLoading();
 
     try {
-        await apiCallFormData('/api/v1/tasks/style-post', formData);
+        const response = await apiCallFormData('/api/v1/tasks/style-post', formData);
 
         hideLoading();
-        showAlert('タスクを開始しました', 'success');
+        showAlert(describeSubmission(response, 'タスクを開始しました'), 'success');
 
         await checkTaskStatus();
     } catch (error) {
@@ -572,7 +620,8 @@ async function handleCancelTask(event) {
 async function handleNewTask() {
     try {
         await apiCall('/api/v1/tasks/finished-task', { method: 'DELETE' });
-        showFormSection();
+        // 順番待ちから開始されたタスクがあれば進捗を表示する
+        await checkTaskStatus();
         const form = document.getElementById('task-form');
         if (form) form.reset();
 
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+APIの同時リクエスト負荷テスト
+
+/api/v1/tasks/status と /api/v1/sb-settings/ に一定数の同時接続でリクエストを送り続け、
+エンドポイント別のスループット（req/s）とレイテンシ（p50/p95/p99）を計測する。
+
+- --base-url: 起動済みのサーバーを計測する（--email / --password のユーザーでログイン）
+- --local: SQLiteの一時DBでアプリを uvicorn（1ワーカー）としてバックグラウンド起動して計測する。
+  --db-latency-ms で1クエリごとの待ち時間を加え、DBサーバーとの往復を再現する
+  （待ち時間はクエリを実行するスレッドで発生するため、同期セッションではイベントループが止まる）
+
+変更前後の比較は、それぞれの構成で --json に保存し --compare で差分を表示する。
+
+使用方法:
+    python scripts/benchmark_api_load.py --local --db-latency-ms 5 --concurrency 50 --duration 10 --json after.json
+    python scripts/benchmark_api_load.py --base-url http://localhost:8000 --email admin@example.com --password ****
+    python scripts/benchmark_api_load.py --compare before.json after.json
+
+前提:
+    .env 等で Settings の必須環境変数が設定されていること（--local でもアプリの読み込みに必要）
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+ENDPOINTS = ("/api/v1/tasks/status", "/api/v1/sb-settings/")
+
+LOCAL_EMAIL = "loadtest@example.com"
+LOCAL_PASSWORD = "loadtest-password"
+
+
+class LocalApiServer:
+    """SQLiteの一時DBでアプリをバックグラウンドスレッドで起動する（get_db / get_async_db を差し替え）"""
+
+    def __init__(self, db_latency_ms: float = 0.0, port: int = 0):
+        self.db_latency_ms = db_latency_ms
+        self.port = port or _free_port()
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "LocalApiServer":
+        import uvicorn
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.orm import sessionmaker
+
+        from app.main import app
+        from app.db import session as db_session
+
+        db_path = Path(tempfile.mkdtemp()) / "loadtest.db"
+        sync_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+        event.listen(sync_engine, "connect", self._on_sync_connect)
+        db_session.Base.metadata.create_all(bind=sync_engine)
+        SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+        self._seed(SyncSession)
+
+        def override_get_db():
+            db = SyncSession()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[db_session.get_db] = override_get_db
+
+        # 非同期セッションがある構成のみ差し替える（変更前の構成でも同じスクリプトで計測できるように）
+        get_async_db = getattr(db_session, "get_async_db", None)
+        if get_async_db is not None:
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+            event.listen(async_engine.sync_engine, "connect", self._on_async_connect)
+            AsyncSessionLocal = async_sessionmaker(
+                bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+
+            async def override_get_async_db():
+                async with AsyncSessionLocal() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_db] = override_get_async_db
+
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("APIサーバーの起動がタイムアウトしました")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+    def _sleep_per_statement(self, _statement: str) -> None:
+        time.sleep(self.db_latency_ms / 1000)
+
+    def _on_sync_connect(self, dbapi_connection, _record) -> None:
+        if self.db_latency_ms:
+            dbapi_connection.set_trace_callback(self._sleep_per_statement)
+
+    def _on_async_connect(self, dbapi_connection, _record) -> None:
+        # aiosqlite の接続スレッド上でクエリごとに待機させる
+        if self.db_latency_ms:
+            dbapi_connection.await_(dbapi_connection._connection.set_trace_callback(self._sleep_per_statement))
+
+    def _seed(self, SyncSession) -> None:
+        """ログインユーザー・SALON BOARD設定・実行中タスクを作成"""
+        from app.core.security import get_password_hash
+        from app.crud import current_task as crud_task
+        from app.crud.salon_board_setting import create_setting
+        from app.crud.user import create_user
+        from app.schemas.salon_board_setting import SalonBoardSettingCreate
+        from app.schemas.user import UserCreate
+
+        db = SyncSession()
+        try:
+            user = create_user(
+                db,
+                UserCreate(email=LOCAL_EMAIL, password=LOCAL_PASSWORD, role="user", is_active=True),
+                get_password_hash(LOCAL_PASSWORD),
+            )
+            for index in range(3):
+                create_setting(
+                    db,
+                    SalonBoardSettingCreate(
+                        setting_name=f"店舗{index + 1}", sb_user_id=f"sb{index}", sb_password="password"
+                    ),
+                    user.id,
+                )
+            task_id = uuid.uuid4()
+            crud_task.create_task(db, task_id, user_id=user.id, total_items=20)
+            for row_number in range(2, 12):
+                crud_task.add_task_success(db, task_id, {"row_number": row_number, "style_name": f"s{row_number}"})
+        finally:
+            db.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_load(base_url: str, token: str, endpoint: str, concurrency: int, duration: float) -> Dict:
+    """1エンドポイントに concurrency 本の接続で duration 秒間リクエストを送り続ける"""
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(endpoint)
+                    key = str(response.status_code)
+                except httpx.HTTPError as e:
+                    key = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                status_counts[key] = status_counts.get(key, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(endpoint, latencies, status_counts, elapsed, concurrency)
+
+
+def _percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(endpoint: str, latencies: List[float], status_counts: Dict[str, int], elapsed: float, concurrency: int) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "elapsed_sec": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 1) if ordered else 0.0,
+        "status_counts": status_counts,
+    }
+
+
+def print_results(results: List[Dict]) -> None:
+    print(f"{'endpoint':<24} {'req':>7} {'req/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8}  status")
+    for result in results:
+        statuses = ", ".join(f"{key}:{count}" for key, count in sorted(result["status_counts"].items()))
+        print(
+            f"{result['endpoint']:<24} {result['requests']:>7} {result['rps']:>8.1f} "
+            f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}  {statuses}"
+        )
+
+
+def print_comparison(before_path: str, after_path: str) -> None:
+    with open(before_path, encoding="utf-8") as f:
+        before = {result["endpoint"]: result for result in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = {result["endpoint"]: result for result in json.load(f)["results"]}
+
+    print(f"{'endpoint':<24} {'req/s before':>13} {'after':>8} {'ratio':>7} {'p95 before':>11} {'after':>8}")
+    for endpoint, after_result in after.items():
+        before_result = before.get(endpoint)
+        if before_result is None:
+            continue
+        ratio = after_result["rps"] / before_result["rps"] if before_result["rps"] else 0.0
+        print(
+            f"{endpoint:<24} {before_result['rps']:>13.1f} {after_result['rps']:>8.1f} {ratio:>6.2f}x "
+            f"{before_result['p95_ms']:>11.1f} {after_result['p95_ms']:>8.1f}"
+        )
+
+
+async def run_all(base_url: str, email: str, password: str, concurrency: int, duration: float) -> List[Dict]:
+    # httpx のリクエストログは計測中に大量に出力されるため抑制（アプリのログ設定より後に行う）
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        token = await login(client, email, password)
+    results = []
+    for endpoint in ENDPOINTS:
+        results.append(await run_load(base_url, token, endpoint, concurrency, duration))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="APIの同時リクエスト負荷テスト")
+    parser.add_argument("--base-url", type=str, default=None, help="計測する起動済みサーバーのURL")
+    parser.add_argument("--email", type=str, default=None, help="ログインに使うユーザーのメールアドレス")
+    parser.add_argument("--password", type=str, default=None, help="ログインに使うユーザーのパスワード")
+    parser.add_argument("--local", action="store_true", help="SQLiteの一時DBでアプリを起動して計測する")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="--local で1クエリごとに加える待ち時間")
+    parser.add_argument("--concurrency", type=int, default=50, help="同時接続数")
+    parser.add_argument("--duration", type=float, default=10.0, help="エンドポイントごとの計測秒数")
+    parser.add_argument("--label", type=str, default="", help="結果に付けるラベル（before/after 等）")
+    parser.add_argument("--json", type=str, default=None, help="結果をJSONで保存するパス")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="保存済みの結果2つを比較する")
+    args = parser.parse_args()
+
+    if args.compare:
+        print_comparison(*args.compare)
+        return
+
+    if args.local:
+        with LocalApiServer(db_latency_ms=args.db_latency_ms) as server:
+            results = asyncio.run(
+                run_all(server.base_url, LOCAL_EMAIL, LOCAL_PASSWORD, args.concurrency, args.duration)
+            )
+    elif args.base_url and args.email and args.password:
+        results = asyncio.run(run_all(args.base_url, args.email, args.password, args.concurrency, args.duration))
+    else:
+        parser.error("--local または --base-url/--email/--password を指定してください")
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "label": args.label,
+                    "concurrency": args.concurrency,
+                    "duration_sec": args.duration,
+                    "db_latency_ms": args.db_latency_ms if args.local else None,
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
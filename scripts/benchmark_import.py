@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Webプロセスの読み込み時間・メモリのベンチマーク
+
+新しいPythonプロセスで app.main を読み込み、読み込み時間・最大RSS・読み込まれたモジュール数と
+ワーカー専用の重い依存（pandas・Camoufox・Playwright）の有無を計測する。
+比較用に、以前の構成（エンドポイントが pandas と app.services.tasks を直接読み込んでいた状態）を
+再現した読み込みも同じ方法で計測する。
+
+使用方法:
+    python scripts/benchmark_import.py
+    python scripts/benchmark_import.py --repeat 10 --importtime 15
+    python scripts/benchmark_import.py --json result.json
+
+前提:
+    .env 等で Settings の必須環境変数が設定されていること
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+# ワーカー専用の重い依存
+HEAVY_MODULES = ("pandas", "camoufox", "playwright", "app.services.tasks")
+
+# 計測対象（ラベル, 読み込むモジュール）
+SCENARIOS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("before", ("app.main", "pandas", "app.services.tasks")),
+    ("after", ("app.main",)),
+]
+
+_PROBE_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "import_ms": elapsed_ms,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def run_probe(modules: Tuple[str, ...]) -> Dict:
+    """新しいプロセスでモジュールを読み込み、計測結果を返す"""
+    script = _PROBE_SCRIPT.format(modules=modules, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=project_root, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def top_importtime(modules: Tuple[str, ...], limit: int) -> List[Tuple[int, str]]:
+    """-X importtime の累積時間（マイクロ秒）上位を返す"""
+    script = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        # 入れ子（インデント付き）の読み込みは親の累積時間に含まれるため対象外
+        if not name.startswith(" "):
+            entries.append((int(cumulative), name))
+    entries.sort(reverse=True)
+    return entries[:limit]
+
+
+def summarize(label: str, samples: List[Dict]) -> Dict:
+    import_ms = [sample["import_ms"] for sample in samples]
+    rss_kb = [sample["max_rss_kb"] for sample in samples]
+    return {
+        "label": label,
+        "runs": len(samples),
+        "import_ms_median": round(statistics.median(import_ms), 1),
+        "import_ms_min": round(min(import_ms), 1),
+        "max_rss_mb_median": round(statistics.median(rss_kb) / 1024, 1),
+        "modules": samples[-1]["modules"],
+        "heavy_modules": samples[-1]["heavy"],
+    }
+
+
+def print_summary(results: List[Dict]) -> None:
+    print(f"{'scenario':<8} {'import(ms) med':>15} {'min':>8} {'RSS(MB)':>9} {'modules':>8}  heavy")
+    for result in results:
+        print(
+            f"{result['label']:<8} {result['import_ms_median']:>15.1f} {result['import_ms_min']:>8.1f} "
+            f"{result['max_rss_mb_median']:>9.1f} {result['modules']:>8}  {', '.join(result['heavy_modules']) or '-'}"
+        )
+    if len(results) == 2:
+        before, after = results
+        saved_ms = before["import_ms_median"] - after["import_ms_median"]
+        saved_mb = before["max_rss_mb_median"] - after["max_rss_mb_median"]
+        print(f"\n差分: 読み込み {saved_ms:.1f}ms 短縮 / RSS {saved_mb:.1f}MB 削減")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Webプロセスの読み込み時間・メモリのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=5, help="シナリオごとの計測回数")
+    parser.add_argument("--importtime", type=int, default=0, help="-X importtime の累積上位を表示する件数")
+    parser.add_argument("--json", type=str, default=None, help="結果をJSONで保存するパス")
+    args = parser.parse_args()
+
+    results = []
+    for label, modules in SCENARIOS:
+        # 初回はバイトコード生成を含むため捨てる
+        run_probe(modules)
+        samples = [run_probe(modules) for _ in range(args.repeat)]
+        results.append(summarize(label, samples))
+        if args.importtime:
+            results[-1]["importtime_top"] = [
+                {"module": name, "cumulative_us": cumulative}
+                for cumulative, name in top_importtime(modules, args.importtime)
+            ]
+
+    print_summary(results)
+    for result in results:
+        for entry in result.get("importtime_top", []):
+            print(f"  [{result['label']}] {entry['cumulative_us'] / 1000:>8.1f}ms  {entry['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
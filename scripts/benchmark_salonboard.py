@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+SALON BOARD 自動化ベンチマーク
+
+擬似サーバー（scripts/fake_salonboard.py）を起動し、実際の SalonBoardStylePoster /
+SalonBoardStyleDeleter を実ブラウザで動かして、スループット（スタイル/分）と
+ステージ別の所要時間を計測する。
+
+使用方法:
+    python scripts/benchmark_salonboard.py --styles 10 --latency-ms 150 --congestion-rate 0.1
+    python scripts/benchmark_salonboard.py --styles 30 --mode both --json result.json
+    python scripts/benchmark_salonboard.py --mode scrape --repeat 20
+
+前提:
+    Camoufoxのブラウザが取得済みであること（python -m camoufox fetch）
+"""
+
+import argparse
+import copy
+import csv
+import json
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import uvicorn
+
+from app.core.timing_report import summarize_style_timings
+from app.services.salonboard import SalonBoardStyleDeleter, SalonBoardStylePoster, load_selectors
+from scripts.fake_salonboard import STYLE_LIST_PAGE_SIZE, FakeSalonBoardConfig, create_fake_salonboard_app
+
+REAL_BASE_URL = "https://salonboard.com"
+
+
+@dataclass
+class StageStats:
+    """ステージ別の集計"""
+
+    count: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_sec += elapsed
+        self.max_sec = max(self.max_sec, elapsed)
+
+
+@dataclass
+class StageRecorder:
+    """
+    進捗コールバックからステージ別の所要時間を集計する
+
+    あるステージの所要時間は、そのステージの通知から次の通知までの経過時間とする
+    """
+
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    errors: List[Dict] = field(default_factory=list)
+    successes: int = 0
+    _current: Optional[str] = None
+    _started_at: float = 0.0
+
+    def __call__(self, completed, total, detail=None, error=None, success=None):
+        now = time.perf_counter()
+        if detail and detail.get("stage"):
+            self._close(now)
+            self._current = detail["stage"]
+            self._started_at = now
+        if error:
+            self.errors.append(error)
+        if success:
+            self.successes += 1
+
+    def finish(self) -> None:
+        self._close(time.perf_counter())
+        self._current = None
+
+    def _close(self, now: float) -> None:
+        if self._current is not None:
+            self.stages.setdefault(self._current, StageStats()).add(now - self._started_at)
+
+
+class FakeServer:
+    """擬似サーバーをバックグラウンドスレッドで起動する"""
+
+    def __init__(self, config: FakeSalonBoardConfig, port: int = 0):
+        self.app = create_fake_salonboard_app(config)
+        self.port = port or _free_port()
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        state = self.app.state.fake
+        return {**state.stats, "styles": len(state.styles)}
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("擬似サーバーの起動がタイムアウトしました")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_selectors(base_url: str) -> Dict:
+    """selectors.yaml の本番URLを擬似サーバーのURLへ置き換える"""
+    selectors = copy.deepcopy(load_selectors(str(project_root / "app" / "selectors.yaml")))
+    login_config = selectors["login"]
+    for key in ("url", "session_probe_url"):
+        if key in login_config:
+            login_config[key] = login_config[key].replace(REAL_BASE_URL, base_url)
+    return selectors
+
+
+def write_style_data(work_dir: Path, count: int, config: FakeSalonBoardConfig) -> Path:
+    """ベンチマーク用のスタイルCSVと画像を作成する"""
+    sample_image = project_root / "sample" / "style1.jpg"
+    image_dir = work_dir / "images"
+    image_dir.mkdir(parents=True, exist_ok=True)
+
+    data_path = work_dir / "styles.csv"
+    columns = ["スタイリスト名", "クーポン名", "コメント", "スタイル名", "カテゴリ", "長さ", "メニュー内容", "ハッシュタグ", "画像名"]
+    with data_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for index in range(count):
+            image_name = f"bench{index + 1:04d}.jpg"
+            shutil.copyfile(sample_image, image_dir / image_name)
+            mens = index % 2 == 1
+            writer.writerow({
+                "スタイリスト名": config.stylists[index % len(config.stylists)],
+                "クーポン名": config.coupons[index % len(config.coupons)],
+                "コメント": f"ベンチマーク用コメント{index + 1}",
+                "スタイル名": f"ベンチマークスタイル{index + 1}",
+                "カテゴリ": "メンズ" if mens else "レディース",
+                "長さ": "ショート" if mens else "ミディアム",
+                "メニュー内容": "カット",
+                "ハッシュタグ": "ベンチ,テスト",
+                "画像名": image_name,
+            })
+    return data_path
+
+
+def summarize(label: str, items: int, elapsed: float, recorder: StageRecorder) -> Dict:
+    """計測結果を集計する"""
+    return {
+        "mode": label,
+        "items": items,
+        "elapsed_sec": round(elapsed, 2),
+        "items_per_minute": round(items / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "successes": recorder.successes,
+        "errors": len(recorder.errors),
+        "stages": {
+            stage: {
+                "count": stats.count,
+                "total_sec": round(stats.total_sec, 2),
+                "mean_sec": round(stats.total_sec / stats.count, 2),
+                "max_sec": round(stats.max_sec, 2),
+            }
+            for stage, stats in sorted(recorder.stages.items(), key=lambda item: -item[1].total_sec)
+        },
+    }
+
+
+def print_summary(result: Dict) -> None:
+    print(f"\n=== {result['mode']} ===")
+    print(f"件数: {result['items']}  所要時間: {result['elapsed_sec']}秒  "
+          f"スループット: {result['items_per_minute']}件/分  エラー: {result['errors']}")
+    print(f"{'ステージ':<28}{'回数':>6}{'合計(秒)':>12}{'平均(秒)':>12}{'最大(秒)':>12}")
+    for stage, stats in result["stages"].items():
+        print(f"{stage:<28}{stats['count']:>6}{stats['total_sec']:>12}{stats['mean_sec']:>12}{stats['max_sec']:>12}")
+    style_timing = result.get("style_timing")
+    if style_timing and style_timing["style_count"]:
+        print(f"スタイル1件: p50={style_timing['style_p50_ms']}ms p95={style_timing['style_p95_ms']}ms  "
+              f"意図的な待機 {style_timing['intentional_pause_share']:.0%} / "
+              f"ブラウザ操作・応答待ち {style_timing['server_and_browser_share']:.0%}")
+        print(f"loader_overlay待機: {style_timing['loader_overlay_ms']}ms "
+              f"（{style_timing['wait_counts'].get('loader_overlay', 0)}回, "
+              f"Playwright呼び出し {style_timing['browser_calls'].get('loader_overlay', 0)}回）")
+        if style_timing.get("pacing_scale_last") is not None:
+            print(f"待機時間の倍率: 平均 {style_timing['pacing_scale_mean']}  最終 {style_timing['pacing_scale_last']}")
+
+
+def salon_info_for(config: FakeSalonBoardConfig) -> Optional[Dict]:
+    """複数店舗アカウントの場合は先頭の店舗を選択させる"""
+    if len(config.salons) > 1:
+        salon_id, salon_name = config.salons[0]
+        return {"id": salon_id, "name": salon_name}
+    return None
+
+
+def run_post(server: FakeServer, config: FakeSalonBoardConfig, args, work_dir: Path) -> Dict:
+    data_path = write_style_data(work_dir, args.styles, config)
+    recorder = StageRecorder()
+    style_timings: List[Dict] = []
+    poster = SalonBoardStylePoster(
+        selectors=build_selectors(server.base_url),
+        screenshot_dir=str(work_dir / "screenshots"),
+        headless=args.headless,
+        slow_mo=args.slow_mo,
+    )
+    started = time.perf_counter()
+    poster.run(
+        user_id=config.sb_user_id,
+        password=config.sb_password,
+        data_filepath=str(data_path),
+        image_dir=str(work_dir / "images"),
+        salon_info=salon_info_for(config),
+        progress_callback=recorder,
+        total_items=args.styles,
+        timing_callback=style_timings.append,
+    )
+    elapsed = time.perf_counter() - started
+    recorder.finish()
+    result = summarize("post", args.styles, elapsed, recorder)
+    # スタイル処理内の待機内訳（意図的な待機 vs 応答待ち）
+    result["style_timing"] = summarize_style_timings(style_timings)
+    return result
+
+
+def run_delete(server: FakeServer, config: FakeSalonBoardConfig, args, work_dir: Path) -> Dict:
+    count = min(args.styles, len(server.app.state.fake.styles))
+    recorder = StageRecorder()
+    deleter = SalonBoardStyleDeleter(
+        selectors=build_selectors(server.base_url),
+        screenshot_dir=str(work_dir / "screenshots"),
+        headless=args.headless,
+        slow_mo=args.slow_mo,
+    )
+    started = time.perf_counter()
+    deleter.run_delete(
+        user_id=config.sb_user_id,
+        password=config.sb_password,
+        range_start=1,
+        range_end=count,
+        exclude_numbers=set(),
+        salon_info=salon_info_for(config),
+        progress_callback=recorder,
+    )
+    elapsed = time.perf_counter() - started
+    recorder.finish()
+    return summarize("delete", count, elapsed, recorder)
+
+
+def collect_candidates_per_row(deleter: SalonBoardStyleDeleter) -> List:
+    """比較用: 行ごとに count()/input_value() を呼ぶ従来の一覧走査"""
+    selectors = deleter.selectors["style_list"]
+    rows = deleter.page.locator(selectors["rows"])
+    candidates = []
+    for idx in range(rows.count()):
+        row = rows.nth(idx)
+        number_inputs = row.locator(selectors["style_number_input"])
+        if number_inputs.count() == 0:
+            continue
+        try:
+            style_number = int(number_inputs.first.input_value().strip())
+        except ValueError:
+            continue
+        delete_buttons = row.locator(selectors["delete_button"])
+        if delete_buttons.count() == 0:
+            continue
+        candidates.append((style_number, delete_buttons.first))
+    return candidates
+
+
+def run_scrape(server: FakeServer, config: FakeSalonBoardConfig, args, work_dir: Path) -> Dict:
+    """スタイル一覧1ページ分の候補取得を、行ごとの走査と evaluate_all で比較する"""
+    deleter = SalonBoardStyleDeleter(
+        selectors=build_selectors(server.base_url),
+        screenshot_dir=str(work_dir / "screenshots"),
+        headless=args.headless,
+        slow_mo=args.slow_mo,
+    )
+    timings: Dict[str, List[float]] = {"per_row": [], "evaluate_all": []}
+    try:
+        deleter._start_browser()
+        deleter.step_login_or_resume(config.sb_user_id, config.sb_password, salon_info=salon_info_for(config))
+        deleter._go_to_style_list_page(1)
+        rows = len(deleter._collect_candidates())
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            collect_candidates_per_row(deleter)
+            timings["per_row"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            deleter._collect_candidates()
+            timings["evaluate_all"].append(time.perf_counter() - started)
+    finally:
+        deleter._close_browser()
+
+    mean_ms = {name: round(sum(values) / len(values) * 1000, 1) for name, values in timings.items()}
+    return {
+        "mode": "scrape",
+        "rows": rows,
+        "repeat": args.repeat,
+        "per_row_ms": mean_ms["per_row"],
+        "evaluate_all_ms": mean_ms["evaluate_all"],
+        "speedup": round(mean_ms["per_row"] / mean_ms["evaluate_all"], 1) if mean_ms["evaluate_all"] else 0.0,
+    }
+
+
+def print_scrape_summary(result: Dict) -> None:
+    print(f"\n=== {result['mode']} ===")
+    print(f"行数: {result['rows']}  試行: {result['repeat']}回")
+    print(f"行ごとの走査: {result['per_row_ms']}ms  evaluate_all: {result['evaluate_all_ms']}ms  "
+          f"（{result['speedup']}倍）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SALON BOARD 自動化ベンチマーク（擬似サーバー使用）")
+    parser.add_argument("--styles", type=int, default=5, help="投稿・削除するスタイル件数")
+    parser.add_argument("--mode", choices=["post", "delete", "both", "scrape"], default="post")
+    parser.add_argument("--latency-ms", type=int, default=0, help="擬似サーバーの応答遅延（ミリ秒）")
+    parser.add_argument("--congestion-rate", type=float, default=0.0, help="画像アップロードを302で拒否する確率")
+    parser.add_argument("--salons", type=int, default=1, help="擬似アカウントの店舗数（2以上で店舗選択画面を経由）")
+    parser.add_argument("--headed", dest="headless", action="store_false", help="ブラウザを表示して実行")
+    parser.add_argument("--slow-mo", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=10, help="scrapeモードの計測回数")
+    parser.add_argument("--json", dest="json_path", default=None, help="結果をJSONで保存するパス")
+    args = parser.parse_args()
+
+    config = FakeSalonBoardConfig(
+        latency_ms=args.latency_ms,
+        congestion_rate=args.congestion_rate,
+        salons=[(f"H{index:09d}", f"擬似サロン{index}") for index in range(1, args.salons + 1)],
+        # 削除のみの計測では事前に一覧を埋めておく（scrapeは一覧1ページ分）
+        initial_styles={"delete": args.styles, "scrape": STYLE_LIST_PAGE_SIZE}.get(args.mode, 0),
+        seed=args.seed,
+    )
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="sb-bench-") as tmp, FakeServer(config, args.port) as server:
+        work_dir = Path(tmp)
+        if args.mode in ("post", "both"):
+            results.append(run_post(server, config, args, work_dir))
+        if args.mode in ("delete", "both"):
+            results.append(run_delete(server, config, args, work_dir))
+        if args.mode == "scrape":
+            results.append(run_scrape(server, config, args, work_dir))
+        server_stats = server.stats
+
+    for result in results:
+        if result["mode"] == "scrape":
+            print_scrape_summary(result)
+        else:
+            print_summary(result)
+    print(f"\n擬似サーバー統計: {server_stats}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "server": server_stats, "args": vars(args)}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+タスクの開始順序（スケジューラー）のシミュレーションによるベンチマーク
+
+投稿・削除タスクが混在する負荷を離散イベントで再現し、登録から開始までの待ち時間を比較する。
+
+- fifo: 以前の構成。ユーザーごとに順番待ちの先頭をCeleryの共有キューへ送り、
+        ワーカーの全スロット（投稿+削除）で送信順に実行する
+- fair: app.core.task_scheduler の構成。投稿・削除を別レーンに分け、レーンの空きスロットを
+        テナント（SALON BOARDアカウント）間の重み付きラウンドロビンで割り当てる
+
+負荷: 複数のスタッフ（ユーザー）が同じアカウントでまとめて投稿する大口テナントと、
+      投稿・削除をときどき登録する小口テナント
+
+使用方法:
+    python scripts/benchmark_scheduler.py
+    python scripts/benchmark_scheduler.py --runs 20 --heavy-users 4 --heavy-batch 5
+    python scripts/benchmark_scheduler.py --json result.json
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.task_scheduler import (  # noqa: E402
+    LANE_DELETE,
+    LANE_POST,
+    Candidate,
+    StrideScheduler,
+    plan_dispatch,
+)
+
+POLICIES = ("fifo", "fair")
+
+
+@dataclass
+class Job:
+    """シミュレーション上のタスク"""
+
+    id: int
+    tenant: str
+    user: str
+    lane: str
+    kind: str           # 集計区分（heavy-post / light-post / light-delete）
+    submit: float       # 登録時刻（秒）
+    duration: float     # 実行時間（秒）
+    start: Optional[float] = None
+
+
+def post_duration(rng: random.Random) -> float:
+    """投稿タスクの実行時間（5〜20件 × 1件50〜90秒）"""
+    return sum(rng.uniform(50, 90) for _ in range(rng.randint(5, 20)))
+
+
+def delete_duration(rng: random.Random) -> float:
+    """削除タスクの実行時間（ログイン30秒 + 1〜10件 × 1件8〜15秒）"""
+    return 30 + sum(rng.uniform(8, 15) for _ in range(rng.randint(1, 10)))
+
+
+def generate_workload(args, seed: int) -> List[Job]:
+    """大口テナントのまとめ投稿と、小口テナントのポアソン到着の投稿・削除を作る"""
+    rng = random.Random(seed)
+    horizon = args.hours * 3600
+    jobs: List[Job] = []
+
+    def add(tenant: str, user: str, lane: str, kind: str, submit: float):
+        duration = post_duration(rng) if lane == LANE_POST else delete_duration(rng)
+        jobs.append(Job(len(jobs), tenant, user, lane, kind, submit, duration))
+
+    for user_index in range(args.heavy_users):
+        for burst_at in (0.0, horizon / 2):
+            for _ in range(args.heavy_batch):
+                add("salon:heavy", f"heavy-{user_index}", LANE_POST, "heavy-post", burst_at + rng.uniform(0, 60))
+
+    for tenant_index in range(args.light_tenants):
+        tenant = f"salon:light-{tenant_index}"
+        for lane, kind, interval in (
+            (LANE_POST, "light-post", args.light_post_interval_min * 60),
+            (LANE_DELETE, "light-delete", args.light_delete_interval_min * 60),
+        ):
+            at = rng.expovariate(1 / interval)
+            while at < horizon:
+                add(tenant, tenant, lane, kind, at)
+                at += rng.expovariate(1 / interval)
+
+    jobs.sort(key=lambda job: job.submit)
+    return jobs
+
+
+class Simulation:
+    """ユーザーごとの順番待ちと、方式ごとの開始判定を再現する"""
+
+    def __init__(self, policy: str, jobs: List[Job], post_slots: int, delete_slots: int):
+        self.policy = policy
+        self.jobs = jobs
+        self.slots = {LANE_POST: post_slots, LANE_DELETE: delete_slots}
+        self.now = 0.0
+        self.events: List = []
+        self.user_queues: Dict[str, Deque[Job]] = {}
+        self.user_active: Dict[str, bool] = {}
+        self.running: Dict[str, int] = {LANE_POST: 0, LANE_DELETE: 0}
+        self.broker: Deque[Job] = deque()      # fifo: Celeryの共有キュー
+        self.schedulers = {LANE_POST: StrideScheduler(), LANE_DELETE: StrideScheduler()}
+
+    def run(self) -> List[Job]:
+        for job in self.jobs:
+            heapq.heappush(self.events, (job.submit, 1, job.id, "submit", job))
+        while self.events:
+            self.now, _, _, kind, job = heapq.heappop(self.events)
+            if kind == "submit":
+                self._submit(job)
+            else:
+                self._finish(job)
+        return self.jobs
+
+    def _start(self, job: Job):
+        job.start = self.now
+        self.running[job.lane] += 1
+        # 同時刻では終了を登録より先に処理する
+        heapq.heappush(self.events, (self.now + job.duration, 0, job.id, "finish", job))
+
+    def _submit(self, job: Job):
+        self.user_queues.setdefault(job.user, deque()).append(job)
+        if self.policy == "fifo":
+            self._send_user_head(job.user)
+            self._start_from_broker()
+        else:
+            self._dispatch()
+
+    def _finish(self, job: Job):
+        self.running[job.lane] -= 1
+        self.user_active[job.user] = False
+        if self.policy == "fifo":
+            self._send_user_head(job.user)
+            self._start_from_broker()
+        else:
+            self._dispatch()
+
+    # fifo: ユーザーの先頭を共有キューへ送り、全スロットで送信順に実行する
+    def _send_user_head(self, user: str):
+        queue = self.user_queues.get(user)
+        if queue and not self.user_active.get(user):
+            self.user_active[user] = True
+            self.broker.append(queue.popleft())
+
+    def _start_from_broker(self):
+        total_slots = sum(self.slots.values())
+        while self.broker and sum(self.running.values()) < total_slots:
+            self._start(self.broker.popleft())
+
+    # fair: レーンの空きスロットにテナント間で公平に選ぶ（app.core.task_queue.dispatch_queued_tasks と同じ手順）
+    def _dispatch(self):
+        candidates = [
+            Candidate(queue[0].tenant, queue[0].lane, queue[0].submit, queue[0])
+            for user, queue in self.user_queues.items()
+            if queue and not self.user_active.get(user)
+        ]
+        for candidate in plan_dispatch(candidates, self.running, self.slots, self.schedulers):
+            job = candidate.item
+            self.user_queues[job.user].popleft()
+            self.user_active[job.user] = True
+            self._start(job)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近傍順位法によるパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(waits: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """区分ごとの待ち時間（分）の統計"""
+    summary = {}
+    for kind in sorted(waits):
+        values = [wait / 60 for wait in waits[kind]]
+        summary[kind] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values) if values else 0.0,
+        }
+    return summary
+
+
+def print_summary(results: Dict[str, Dict[str, Dict[str, float]]]):
+    print(f"\n{'方式':<6} {'区分':<14} {'件数':>6} {'p50(分)':>9} {'p95(分)':>9} {'p99(分)':>9} {'最大(分)':>9}")
+    print("-" * 68)
+    for policy, summary in results.items():
+        for kind, stats in summary.items():
+            print(
+                f"{policy:<6} {kind:<14} {stats['count']:>6} {stats['p50']:>9.1f} "
+                f"{stats['p95']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>9.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="タスクの開始順序のシミュレーション")
+    parser.add_argument("--hours", type=float, default=8, help="シミュレーションする時間")
+    parser.add_argument("--heavy-users", type=int, default=4, help="大口テナントのユーザー数")
+    parser.add_argument("--heavy-batch", type=int, default=5, help="大口テナントの1ユーザーがまとめて登録する投稿数（開始時と中間の2回）")
+    parser.add_argument("--light-tenants", type=int, default=10, help="小口テナント数")
+    parser.add_argument("--light-post-interval-min", type=float, default=240, help="小口テナントの投稿の平均間隔（分）")
+    parser.add_argument("--light-delete-interval-min", type=float, default=60, help="小口テナントの削除の平均間隔（分）")
+    parser.add_argument("--post-slots", type=int, default=2, help="投稿レーンの同時実行数")
+    parser.add_argument("--delete-slots", type=int, default=1, help="削除レーンの同時実行数（fifoでは合計を共有）")
+    parser.add_argument("--runs", type=int, default=20, help="シード値を変えて繰り返す回数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="結果をJSONで保存するパス")
+    args = parser.parse_args()
+
+    results = {}
+    for policy in POLICIES:
+        waits: Dict[str, List[float]] = {}
+        for run in range(args.runs):
+            jobs = generate_workload(args, args.seed + run)
+            for job in Simulation(policy, jobs, args.post_slots, args.delete_slots).run():
+                waits.setdefault(job.kind, []).append(job.start - job.submit)
+        results[policy] = summarize(waits)
+
+    print_summary(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "args": vars(args)}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
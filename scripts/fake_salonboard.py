@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+SALON BOARD 擬似サーバー（オフライン検証・ベンチマーク用）
+
+app/selectors.yaml のセレクタに一致するHTMLを返し、投稿・削除処理を実ブラウザで
+最後まで実行できるようにする。応答遅延とアクセス集中（302）の注入に対応。
+
+使用方法:
+    python scripts/fake_salonboard.py --port 8765 --latency-ms 150 --congestion-rate 0.1
+
+    ログインID/パスワード: fake-user / fake-pass（--sb-user-id / --sb-password で変更可）
+"""
+
+import argparse
+import asyncio
+import html
+import random
+import secrets
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+
+# セッションCookie名
+SESSION_COOKIE = "SB_FAKE_SESSION"
+# スタイル一覧の1ページあたりの件数（SalonBoardStyleDeleter の前提に合わせる）
+STYLE_LIST_PAGE_SIZE = 150
+
+DEFAULT_STYLISTS = ["幸脇 一雅", "阪井 拓実", "山田 花子"]
+DEFAULT_COUPONS = [
+    "【人気No.1☆リピート率90％超え】Cut+ケア+魔法のバブル付【高崎】¥7700⇒",
+    "【メンズ支持率No.1】ツイスパ＋カット＋魔法のバブル￥17600⇒15400",
+    "カット",
+]
+LADIES_LENGTHS = ["ベリーショート", "ショート", "ミディアム", "セミロング", "ロング", "ヘアセット", "ミセス"]
+MENS_LENGTHS = ["ベリーショート", "ショート", "ミディアム", "ロング"]
+MENU_CONTENTS = [("01", "カット"), ("02", "カラー"), ("03", "パーマ"), ("04", "ストレート"), ("05", "トリートメント")]
+
+
+@dataclass
+class FakeSalonBoardConfig:
+    """擬似サーバーの設定"""
+
+    sb_user_id: str = "fake-user"
+    sb_password: str = "fake-pass"
+    # 複数店舗アカウントを再現する場合は (サロンID, サロン名) を2件以上指定する
+    salons: List[Tuple[str, str]] = field(default_factory=list)
+    stylists: List[str] = field(default_factory=lambda: list(DEFAULT_STYLISTS))
+    coupons: List[str] = field(default_factory=lambda: list(DEFAULT_COUPONS))
+    # 全リクエストに加える応答遅延（ミリ秒）
+    latency_ms: int = 0
+    # 画像アップロード（doUpload）を302で拒否する確率（0.0〜1.0）
+    congestion_rate: float = 0.0
+    # クーポンモーダル表示前に loader_overlay を表示する時間（ミリ秒）
+    loader_overlay_ms: int = 300
+    # 起動時に登録済みとするスタイル件数
+    initial_styles: int = 0
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeStyle:
+    """登録済みスタイル"""
+
+    style_id: int
+    name: str
+    stylist: str = ""
+    image_url: str = ""
+    hashtags: List[str] = field(default_factory=list)
+
+
+class FakeSalonBoardState:
+    """擬似サーバーの状態（スタイル一覧・セッション・統計）"""
+
+    def __init__(self, config: FakeSalonBoardConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.sessions: Dict[str, Optional[str]] = {}
+        self.styles: List[FakeStyle] = []
+        self._next_style_id = 1
+        self._next_image_id = 1
+        self.stats: Dict[str, int] = {
+            "logins": 0,
+            "uploads": 0,
+            "uploads_congested": 0,
+            "styles_registered": 0,
+            "styles_deleted": 0,
+        }
+        for index in range(config.initial_styles):
+            self.add_style(name=f"既存スタイル{index + 1}")
+
+    def add_style(self, **kwargs) -> FakeStyle:
+        style = FakeStyle(style_id=self._next_style_id, **kwargs)
+        self._next_style_id += 1
+        # 新規登録は一覧の先頭（掲載番号1）に追加され、既存の番号は1つずつずれる
+        self.styles.insert(0, style)
+        return style
+
+    def delete_style(self, style_id: int) -> bool:
+        for index, style in enumerate(self.styles):
+            if style.style_id == style_id:
+                del self.styles[index]
+                return True
+        return False
+
+    def next_image_url(self) -> str:
+        url = f"/IMGDBHD/fake/{self._next_image_id:06d}.jpg"
+        self._next_image_id += 1
+        return url
+
+
+def _page(title: str, body: str, *, chrome: bool = True) -> HTMLResponse:
+    """共通レイアウト（ログイン後の画面はヘッダーとグローバルナビを含む）"""
+    header = ""
+    if chrome:
+        header = (
+            '<div id="headerNavigationBar">SALON BOARD（擬似）</div>'
+            '<div id="globalNavi"><ul class="common-CLPcommon__globalNavi">'
+            '<li><a href="/KLP/top/">トップ</a></li>'
+            '<li><a href="/CNB/top/">掲載管理</a></li>'
+            "</ul></div>"
+        )
+    return HTMLResponse(
+        "<!DOCTYPE html><html lang=\"ja\"><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title></head><body>{header}{body}</body></html>"
+    )
+
+
+def _complete_page(message: str) -> HTMLResponse:
+    return _page(
+        "完了",
+        f"<p class=\"complete\">{html.escape(message)}</p>"
+        "<input type=\"button\" value=\"スタイル掲載情報一覧画面へ\" "
+        "onclick=\"location.href='/CNB/draft/styleList/'\">",
+    )
+
+
+LOGIN_BODY = """
+<form id="idPasswordInputForm" method="post" action="/login/">
+  <input type="text" name="userId">
+  <input type="password" id="jsiPwInput" name="password">
+  <a class="common-CNCcommon__primaryBtn loginBtnSize" href="javascript:void(0)"
+     onclick="document.getElementById('idPasswordInputForm').submit()">ログイン</a>
+</form>
+"""
+
+STYLE_EDIT_SCRIPT = """
+<script>
+(function () {
+  var $ = function (s) { return document.querySelector(s); };
+  var form = $('#styleEditForm');
+  var overlay = $('.imageUploaderOverlay');
+  var modal = $('.imageUploaderModalContainer');
+  var submit = $('.imageUploaderModalSubmitButton');
+  var fileInput = $('#formFile');
+  var preview = $('#FRONT_IMG_ID_IMG');
+  var dialog = $('div.modpopup01');
+  var loader = $('div.loader_overlay');
+
+  function closeModal() { modal.style.display = 'none'; overlay.style.display = 'none'; }
+
+  preview.addEventListener('click', function () {
+    fileInput.value = '';
+    submit.classList.remove('isActive');
+    overlay.style.display = 'block';
+    modal.style.display = 'block';
+  });
+  modal.querySelector('.close').addEventListener('click', closeModal);
+  fileInput.addEventListener('change', function () {
+    if (fileInput.files.length) { submit.classList.add('isActive'); }
+  });
+  submit.addEventListener('click', function () {
+    if (!submit.classList.contains('isActive')) { return; }
+    var data = new FormData();
+    data.append('formFile', fileInput.files[0]);
+    fetch('/CNB/imgreg/imgUpload/doUpload', { method: 'POST', body: data, credentials: 'same-origin' })
+      .then(function (res) {
+        if (res.redirected) {
+          closeModal();
+          dialog.style.display = 'block';
+          return null;
+        }
+        return res.json();
+      })
+      .then(function (json) {
+        if (!json) { return; }
+        preview.src = json.url;
+        preview.className = 'imgnewphoto';
+        $('#frontImgUrl').value = json.url;
+        closeModal();
+      });
+  });
+  dialog.querySelector('a.accept').addEventListener('click', function () { dialog.style.display = 'none'; });
+
+  var couponModal = $('.couponContents');
+  var settingBtn = couponModal.querySelector('.jsc_SB_modal_setting_btn');
+  $('a.jsc_SB_modal_single_coupon').addEventListener('click', function () {
+    loader.style.display = 'block';
+    setTimeout(function () { loader.style.display = 'none'; couponModal.style.display = 'block'; }, LOADER_MS);
+  });
+  couponModal.querySelectorAll('input[name=coupon]').forEach(function (radio) {
+    radio.addEventListener('change', function () { settingBtn.classList.remove('is_disable'); });
+  });
+  settingBtn.addEventListener('click', function () {
+    if (settingBtn.classList.contains('is_disable')) { return; }
+    var checked = couponModal.querySelector('input[name=coupon]:checked');
+    $('#couponName').value = checked ? checked.value : '';
+    couponModal.style.display = 'none';
+  });
+
+  var tagInput = $('#hashTagTxt');
+  var tagButton = $('button.jsc_style_edit-editCommon__tag--addBtn');
+  tagInput.addEventListener('input', function () {
+    tagButton.classList.toggle('common-CNBcommon__secondaryBtn--disabled', !tagInput.value.trim());
+  });
+  tagButton.addEventListener('click', function () {
+    if (tagButton.classList.contains('common-CNBcommon__secondaryBtn--disabled')) { return; }
+    var hidden = document.createElement('input');
+    hidden.type = 'hidden';
+    hidden.name = 'hashtags';
+    hidden.value = tagInput.value.trim();
+    form.appendChild(hidden);
+    tagInput.value = '';
+    tagButton.classList.add('common-CNBcommon__secondaryBtn--disabled');
+  });
+
+  $('img[alt="登録"]').addEventListener('click', function () { form.submit(); });
+})();
+</script>
+"""
+
+
+def _options(values: List[str]) -> str:
+    return "".join(
+        f'<option value="{html.escape(value)}">{html.escape(value)}</option>' for value in values
+    )
+
+
+def _style_edit_body(config: FakeSalonBoardConfig) -> str:
+    coupons = "".join(
+        f'<label><input type="radio" name="coupon" value="{html.escape(name)}">{html.escape(name)}</label>'
+        for name in config.coupons
+    )
+    menus = "".join(
+        f'<label><input type="checkbox" name="frmStyleEditStyleDto.menuContentsCdList" value="{code}">{label}</label>'
+        for code, label in MENU_CONTENTS
+    )
+    return f"""
+<div class="loader_overlay" style="display:none;position:fixed;inset:0;background:rgba(0,0,0,.2)"></div>
+<form id="styleEditForm" method="post" action="/CNB/draft/styleEdit/">
+  <img id="FRONT_IMG_ID_IMG" class="imgnewnophoto" src="/CNB/img/styleimageupload.png" alt="画像" width="120" height="160">
+  <input type="hidden" id="frontImgUrl" name="front_img_url">
+  <select id="stylistCheckCd" name="stylist"><option value="">選択してください</option>{_options(config.stylists)}</select>
+  <textarea id="stylistCommentTxt" name="comment"></textarea>
+  <input type="text" id="styleNameTxt" name="style_name">
+  <input type="radio" id="styleCategoryCd01" name="category" value="01">レディース
+  <input type="radio" id="styleCategoryCd02" name="category" value="02">メンズ
+  <select id="ladiesHairLengthCd" name="ladies_length">{_options(LADIES_LENGTHS)}</select>
+  <select id="mensHairLengthCd" name="mens_length">{_options(MENS_LENGTHS)}</select>
+  {menus}
+  <textarea id="menuDetailTxt" name="menu_detail"></textarea>
+  <a class="jsc_SB_modal_single_coupon" href="javascript:void(0)">クーポンを選択</a>
+  <input type="hidden" id="couponName" name="coupon_name">
+  <input type="text" id="hashTagTxt">
+  <button type="button" class="jsc_style_edit-editCommon__tag--addBtn common-CNBcommon__secondaryBtn--disabled">追加</button>
+  <img alt="登録" src="/CNB/img/register.png" width="80" height="30">
+</form>
+<div class="couponContents jsc_SB_modal_target" style="display:none">
+  {coupons}
+  <a class="jsc_SB_modal_setting_btn is_disable" href="javascript:void(0)">設定する</a>
+</div>
+<div class="imageUploaderOverlay jscImageUploaderOverlay" style="display:none"></div>
+<div class="imageUploaderModalContainer" style="display:none">
+  <input type="file" id="formFile" name="formFile">
+  <input type="button" class="imageUploaderModalSubmitButton" value="登録する">
+  <a class="close" href="javascript:void(0)">閉じる</a>
+</div>
+<div class="modpopup01 sch w400 cf dialog" style="display:none">
+  <p class="message">アクセスが集中しています。しばらくしてから再度お試しください。</p>
+  <a class="accept" href="javascript:void(0)">OK</a>
+</div>
+{STYLE_EDIT_SCRIPT.replace("LOADER_MS", str(config.loader_overlay_ms))}
+"""
+
+
+def _style_list_body(state: FakeSalonBoardState, page_number: int) -> str:
+    start = (page_number - 1) * STYLE_LIST_PAGE_SIZE
+    page_styles = state.styles[start:start + STYLE_LIST_PAGE_SIZE]
+    rows = ["<tr><th>掲載順</th><th>スタイル名</th><th>操作</th></tr>"]
+    for offset, style in enumerate(page_styles):
+        sort_no = start + offset + 1
+        rows.append(
+            "<tr>"
+            f'<td><input type="text" name="frmStyleList.styleList[{offset}].sortNo" value="{sort_no}"></td>'
+            f"<td>{html.escape(style.name)}</td>"
+            f'<td><a href="/CNB/draft/styleDelete/?id={style.style_id}" '
+            "onclick=\"return confirm('削除してもよろしいですか？')\">"
+            '<img alt="削除する" src="/CNB/img/delete.png" width="60" height="20"></a></td>'
+            "</tr>"
+        )
+    paging = '<div id="pagingControl">'
+    if page_number > 1:
+        paging += f'<a class="pgPrev" href="/CNB/draft/styleList/?pn={page_number - 1}">前へ</a>'
+    if start + STYLE_LIST_PAGE_SIZE < len(state.styles):
+        paging += f'<a class="pgNext" href="/CNB/draft/styleList/?pn={page_number + 1}">次へ</a>'
+    paging += "</div>"
+    return (
+        '<a href="/CNB/draft/styleEdit/"><img alt="スタイル新規追加" src="/CNB/img/new.png" width="100" height="30"></a>'
+        f'<form id="sortStyleForm"><table><tbody>{"".join(rows)}</tbody></table></form>{paging}'
+    )
+
+
+def create_fake_salonboard_app(config: Optional[FakeSalonBoardConfig] = None) -> FastAPI:
+    """
+    擬似SALON BOARDアプリケーションを生成
+
+    Args:
+        config: 擬似サーバーの設定（省略時はデフォルト）
+
+    Returns:
+        FastAPI: アプリケーション（状態は app.state.fake に保持）
+    """
+    config = config or FakeSalonBoardConfig()
+    state = FakeSalonBoardState(config)
+    app = FastAPI(title="Fake SALON BOARD", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def inject_latency(request: Request, call_next):
+        if config.latency_ms > 0 and not request.url.path.startswith("/__fake__"):
+            await asyncio.sleep(config.latency_ms / 1000.0)
+        return await call_next(request)
+
+    def _session(request: Request) -> Optional[str]:
+        token = request.cookies.get(SESSION_COOKIE)
+        return token if token in state.sessions else None
+
+    def _login_redirect() -> RedirectResponse:
+        return RedirectResponse("/login/", status_code=302)
+
+    @app.get("/login/")
+    async def login_page():
+        return _page("ログイン", LOGIN_BODY, chrome=False)
+
+    @app.post("/login/")
+    async def login(userId: str = Form(""), password: str = Form("")):
+        if userId != config.sb_user_id or password != config.sb_password:
+            return _page("ログイン", '<p class="error">IDまたはパスワードが違います</p>' + LOGIN_BODY, chrome=False)
+        token = secrets.token_hex(16)
+        state.sessions[token] = None
+        state.stats["logins"] += 1
+        target = "/CNC/storeSelect/" if len(config.salons) > 1 else "/KLP/top/"
+        response = RedirectResponse(target, status_code=302)
+        response.set_cookie(SESSION_COOKIE, token, httponly=True)
+        return response
+
+    @app.get("/CNC/storeSelect/")
+    async def store_select(request: Request):
+        if not _session(request):
+            return _login_redirect()
+        rows = "".join(
+            "<tr>"
+            f'<td class="mod_center">{html.escape(salon_id)}</td>'
+            f'<td class="storeName"><a href="/CNC/storeSelect/doSelect?id={html.escape(salon_id)}">{html.escape(name)}</a></td>'
+            "</tr>"
+            for salon_id, name in config.salons
+        )
+        return _page("店舗選択", f'<table id="biyouStoreInfoArea"><tbody>{rows}</tbody></table>', chrome=False)
+
+    @app.get("/CNC/storeSelect/doSelect")
+    async def store_do_select(request: Request, id: str):
+        token = _session(request)
+        if not token:
+            return _login_redirect()
+        state.sessions[token] = id
+        return RedirectResponse("/KLP/top/", status_code=302)
+
+    @app.get("/KLP/top/")
+    async def top(request: Request):
+        if not _session(request):
+            return _login_redirect()
+        return _page("トップ", "<p>ダッシュボード</p>")
+
+    @app.get("/CNB/top/")
+    async def keisai_top(request: Request):
+        if not _session(request):
+            return _login_redirect()
+        return _page("掲載管理", '<a class="moveBtn" href="/CNB/draft/styleList/">スタイル</a>')
+
+    @app.get("/CNB/draft/styleList/")
+    async def style_list(request: Request, pn: int = 1):
+        if not _session(request):
+            return _login_redirect()
+        return _page("スタイル一覧", _style_list_body(state, max(1, pn)))
+
+    @app.get("/CNB/draft/styleEdit/")
+    async def style_edit_page(request: Request):
+        if not _session(request):
+            return _login_redirect()
+        return _page("スタイル編集", _style_edit_body(config))
+
+    @app.post("/CNB/draft/styleEdit/")
+    async def style_edit_submit(request: Request):
+        if not _session(request):
+            return _login_redirect()
+        form = await request.form()
+        state.add_style(
+            name=str(form.get("style_name") or ""),
+            stylist=str(form.get("stylist") or ""),
+            image_url=str(form.get("front_img_url") or ""),
+            hashtags=[str(tag) for tag in form.getlist("hashtags")],
+        )
+        state.stats["styles_registered"] += 1
+        return _complete_page("登録が完了しました。")
+
+    @app.get("/CNB/draft/styleDelete/")
+    async def style_delete(request: Request, id: int):
+        if not _session(request):
+            return _login_redirect()
+        if state.delete_style(id):
+            state.stats["styles_deleted"] += 1
+        return _complete_page("登録が完了しました。")
+
+    @app.post("/CNB/imgreg/imgUpload/doUpload")
+    async def do_upload(request: Request, formFile: UploadFile = File(...)):
+        if not _session(request):
+            return _login_redirect()
+        await formFile.read()
+        state.stats["uploads"] += 1
+        if config.congestion_rate > 0 and state.random.random() < config.congestion_rate:
+            state.stats["uploads_congested"] += 1
+            return RedirectResponse("/CNB/imgreg/imgUpload/congestion", status_code=302)
+        return JSONResponse({"url": state.next_image_url()})
+
+    @app.get("/CNB/imgreg/imgUpload/congestion")
+    async def upload_congestion():
+        return HTMLResponse("<p>アクセスが集中しています</p>")
+
+    @app.get("/CNB/img/{name}")
+    @app.get("/IMGDBHD/fake/{name}")
+    async def placeholder_image(name: str):
+        # 表示用のダミー画像（1x1 GIF）
+        return Response(
+            b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+            b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;",
+            media_type="image/gif",
+        )
+
+    @app.get("/__fake__/stats")
+    async def fake_stats():
+        return {**state.stats, "styles": len(state.styles)}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SALON BOARD 擬似サーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="全リクエストに加える応答遅延（ミリ秒）")
+    parser.add_argument("--congestion-rate", type=float, default=0.0, help="画像アップロードを302で拒否する確率")
+    parser.add_argument("--initial-styles", type=int, default=0, help="起動時に登録済みとするスタイル件数")
+    parser.add_argument("--sb-user-id", default="fake-user")
+    parser.add_argument("--sb-password", default="fake-pass")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeSalonBoardConfig(
+        sb_user_id=args.sb_user_id,
+        sb_password=args.sb_password,
+        latency_ms=args.latency_ms,
+        congestion_rate=args.congestion_rate,
+        initial_styles=args.initial_styles,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_salonboard_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -114,3 +114,33 @@ def test_cannot_access_other_user_settings(client: TestClient, db_session: Sessi
     # DELETE
     delete_res = client.delete(f"/api/v1/sb-settings/{other_setting_id}", headers=normal_user_auth_headers)
     assert delete_res.status_code == 403
+
+def test_storage_state_cleared_when_credentials_change(client: TestClient, db_session: Session, normal_user_auth_headers: dict):
+    """ログイン情報変更時に保存済みセッションが破棄されることのテスト"""
+    from app.crud import salon_board_setting as crud_setting
+
+    setting_data = {"setting_name": "Session", "sb_user_id": "user@session", "sb_password": "pass"}
+    create_response = client.post("/api/v1/sb-settings", headers=normal_user_auth_headers, json=setting_data)
+    setting_id = create_response.json()["id"]
+
+    storage_state = {"cookies": [{"name": "SESSION", "value": "abc"}], "origins": []}
+    assert crud_setting.save_storage_state(db_session, setting_id, storage_state)
+    db_setting = crud_setting.get_setting_by_id(db_session, setting_id)
+    # 平文では保存されず、復号すると元に戻る
+    assert "abc" not in db_setting.encrypted_storage_state
+    assert crud_setting.get_storage_state(db_setting) == storage_state
+    assert "encrypted_storage_state" not in client.get(
+        "/api/v1/sb-settings", headers=normal_user_auth_headers
+    ).json()["settings"][0]
+
+    # 設定名のみの変更ではセッションを保持
+    client.put(f"/api/v1/sb-settings/{setting_id}", headers=normal_user_auth_headers, json={"setting_name": "Renamed"})
+    db_session.expire_all()
+    assert crud_setting.get_storage_state(crud_setting.get_setting_by_id(db_session, setting_id)) == storage_state
+
+    # ログインIDの変更でセッションを破棄
+    client.put(f"/api/v1/sb-settings/{setting_id}", headers=normal_user_auth_headers, json={"sb_user_id": "other@session"})
+    db_session.expire_all()
+    db_setting = crud_setting.get_setting_by_id(db_session, setting_id)
+    assert db_setting.encrypted_storage_state is None
+    assert crud_setting.get_storage_state(db_setting) is None
@@ -1,3 +1,7 @@
+import json
+import subprocess
+import sys
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -10,8 +14,12 @@ from app.crud.salon_board_setting import create_setting
 from app.crud import current_task as crud_task
 from app.schemas.user import UserCreate
 from app.schemas.salon_board_setting import SalonBoardSettingCreate
+from app.core.config import settings
 from app.core.security import get_password_hash
 
+# JPEGのマジックバイトで始まるダミー画像
+FAKE_JPEG = b"\xff\xd8\xff\xe0" + b"fake image data"
+
 # --- フィクスチャ ---
 
 @pytest.fixture(scope="function")
@@ -36,7 +44,7 @@ def user_with_setting(client: TestClient, db_session: Session):
 
 # --- テストケース ---
 
-@patch("app.api.v1.endpoints.tasks.process_style_post_task.apply_async")
+@patch("app.api.v1.endpoints.tasks.celery_app.send_task")
 def test_create_task_success(mock_celery_task, client: TestClient, user_with_setting: dict, tmp_path: Path):
     """正常なタスク作成のテスト"""
     style_data = {"画像名": ["image1.jpg"], "スタイリスト名": ["Test Stylist"], "クーポン名": ["Test Coupon"], "コメント":["c"], "スタイル名":["s"], "カテゴリ":["レディース"], "長さ":["ロング"], "メニュー内容":["m"], "ハッシュタグ":["h"]}
@@ -44,7 +52,7 @@ def test_create_task_success(mock_celery_task, client: TestClient, user_with_set
     csv_path = tmp_path / "styles.csv"
     df.to_csv(csv_path, index=False)
     image1_path = tmp_path / "image1.jpg"
-    image1_path.write_text("fake image data")
+    image1_path.write_bytes(FAKE_JPEG)
 
     with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
         files = {
@@ -57,36 +65,103 @@ def test_create_task_success(mock_celery_task, client: TestClient, user_with_set
     assert response.status_code == 202
     assert "task_id" in response.json()
     mock_celery_task.assert_called_once()
+    # Web側はワーカーの実装を読み込まず、タスク名で送信する
+    assert mock_celery_task.call_args.args == ("process_style_post",)
+    assert mock_celery_task.call_args.kwargs["task_id"] == response.json()["task_id"]
+
+    # ワーカーには受付時に正規化したJSON Linesが渡され、元のCSVは残らない
+    records_path = Path(mock_celery_task.call_args.kwargs["kwargs"]["style_data_filepath"])
+    assert records_path.suffix == ".jsonl"
+    assert not (records_path.parent / "styles.csv").exists()
+    records = [json.loads(line) for line in records_path.read_text(encoding="utf-8").splitlines()]
+    assert records == [{
+        "画像名": "image1.jpg", "スタイリスト名": "Test Stylist", "クーポン名": "Test Coupon", "コメント": "c",
+        "スタイル名": "s", "カテゴリ": "レディース", "長さ": "ロング", "メニュー内容": "m", "ハッシュタグ": "h",
+        "_row_number": 2,
+    }]
 
-def test_create_task_already_running(client: TestClient, user_with_setting: dict, tmp_path: Path):
-    """タスク実行中に再度タスクを作成しようとすると409エラーになるテスト"""
+def test_create_task_already_running_is_queued(client: TestClient, user_with_setting: dict, tmp_path: Path):
+    """タスク実行中に再度タスクを作成すると順番待ちになり、Celeryには送信されないテスト"""
     style_data = {"画像名": ["image1.jpg"], "スタイリスト名": ["Test Stylist"], "クーポン名": ["Test Coupon"], "コメント":["c"], "スタイル名":["s"], "カテゴリ":["レディース"], "長さ":["ロング"], "メニュー内容":["m"], "ハッシュタグ":["h"]}
     df = pd.DataFrame(style_data)
     csv_path = tmp_path / "styles.csv"
     df.to_csv(csv_path, index=False)
     image1_path = tmp_path / "image1.jpg"
-    image1_path.write_text("fake image data")
+    image1_path.write_bytes(FAKE_JPEG)
 
-    with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
-        files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
-        data = {"setting_id": user_with_setting["setting_id"]}
-        with patch("app.api.v1.endpoints.tasks.process_style_post_task.apply_async") as mock_celery_task:
+    data = {"setting_id": user_with_setting["setting_id"]}
+    with patch("app.api.v1.endpoints.tasks.celery_app.send_task") as mock_celery_task:
+        with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
+            files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
             response1 = client.post("/api/v1/tasks/style-post", files=files, data=data, headers=user_with_setting["headers"])
-            assert response1.status_code == 202
+        assert response1.status_code == 202
+        assert response1.json()["queue_position"] == 0
 
-    with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
-        files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
-        response2 = client.post("/api/v1/tasks/style-post", files=files, data=data, headers=user_with_setting["headers"])
-    
-    assert response2.status_code == 409
-    assert response2.json()["detail"] == "You already have a task in progress"
+        with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
+            files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
+            response2 = client.post("/api/v1/tasks/style-post", files=files, data=data, headers=user_with_setting["headers"])
+
+    assert response2.status_code == 202
+    assert response2.json()["message"] == "Task queued"
+    assert response2.json()["queue_position"] == 1
+    mock_celery_task.assert_called_once()
+
+    # ステータスは実行中のタスク、順番待ちは一覧で確認する
+    status_res = client.get("/api/v1/tasks/status", headers=user_with_setting["headers"])
+    assert status_res.json()["task_id"] == response1.json()["task_id"]
+    queue = client.get("/api/v1/tasks/queue", headers=user_with_setting["headers"]).json()
+    assert [task["task_id"] for task in queue["tasks"]] == [response2.json()["task_id"]]
+    assert queue["tasks"][0]["task_type"] == "post"
+    assert queue["max_size"] == settings.TASK_QUEUE_MAX_PER_USER
+
+    # 順番待ちの取り消しでアップロード済みファイルも削除される
+    queued_dir = Path(settings.UPLOAD_DIR) / response2.json()["task_id"]
+    assert queued_dir.exists()
+    cancel_res = client.delete(f"/api/v1/tasks/queue/{response2.json()['task_id']}", headers=user_with_setting["headers"])
+    assert cancel_res.status_code == 204
+    assert not queued_dir.exists()
+
+
+def test_queue_reorder_cancel_and_limit(client: TestClient, user_with_setting: dict, db_session: Session, monkeypatch):
+    """順番待ちの並べ替え・取り消しと、上限を超えた登録の拒否"""
+    import uuid
+
+    user_id = user_with_setting["user_id"]
+    headers = user_with_setting["headers"]
+    crud_task.create_task(db_session, uuid.uuid4(), user_id=user_id, total_items=1)
+    queued_ids = [uuid.uuid4() for _ in range(3)]
+    for task_id in queued_ids:
+        crud_task.enqueue_task(db_session, task_id, user_id, 1, "delete_styles", {"task_id": str(task_id)})
+
+    move_res = client.put(f"/api/v1/tasks/queue/{queued_ids[2]}", json={"position": 1}, headers=headers)
+    assert move_res.status_code == 200
+    assert [task["task_id"] for task in move_res.json()["tasks"]] == [str(queued_ids[i]) for i in (2, 0, 1)]
+    assert [task["position"] for task in move_res.json()["tasks"]] == [1, 2, 3]
+
+    assert client.delete(f"/api/v1/tasks/queue/{queued_ids[0]}", headers=headers).status_code == 204
+    queue = client.get("/api/v1/tasks/queue", headers=headers).json()["tasks"]
+    assert [(task["task_id"], task["position"]) for task in queue] == [(str(queued_ids[2]), 1), (str(queued_ids[1]), 2)]
+
+    assert client.delete(f"/api/v1/tasks/queue/{uuid.uuid4()}", headers=headers).status_code == 404
+    assert client.put(f"/api/v1/tasks/queue/{uuid.uuid4()}", json={"position": 1}, headers=headers).status_code == 404
+
+    monkeypatch.setattr(settings, "TASK_QUEUE_MAX_PER_USER", 2)
+    with patch("app.api.v1.endpoints.tasks.celery_app.send_task") as mock_celery_task:
+        full_res = client.post(
+            "/api/v1/tasks/style-delete",
+            data={"setting_id": user_with_setting["setting_id"], "range_start": 1, "range_end": 3},
+            headers=headers,
+        )
+    assert full_res.status_code == 409
+    assert full_res.json()["detail"].startswith("Task queue is full")
+    mock_celery_task.assert_not_called()
 
 def test_create_task_invalid_file_format(client: TestClient, user_with_setting: dict, tmp_path: Path):
     """不正なファイル形式でのタスク作成失敗をテスト"""
     invalid_file = tmp_path / "style.txt"
     invalid_file.write_text("invalid content")
     image1_path = tmp_path / "image1.jpg"
-    image1_path.write_text("fake image data")
+    image1_path.write_bytes(FAKE_JPEG)
 
     with open(invalid_file, "rb") as txt_file, open(image1_path, "rb") as img_file:
         files = [("style_data_file", ("style.txt", txt_file, "text/plain")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
@@ -103,7 +178,7 @@ def test_create_task_missing_image(client: TestClient, user_with_setting: dict,
     csv_path = tmp_path / "styles.csv"
     df.to_csv(csv_path, index=False)
     image1_path = tmp_path / "image1.jpg"
-    image1_path.write_text("fake image data")
+    image1_path.write_bytes(FAKE_JPEG)
 
     with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
         files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
@@ -113,7 +188,72 @@ def test_create_task_missing_image(client: TestClient, user_with_setting: dict,
     assert response.status_code == 422
     assert "Missing image files: image2.jpg" in response.json()["detail"]
 
-@patch("app.api.v1.endpoints.tasks.process_style_post_task.delay")
+def test_create_task_missing_image_column(client: TestClient, user_with_setting: dict, tmp_path: Path):
+    """画像名カラムがないスタイル情報ファイルは受付時に422になるテスト"""
+    csv_path = tmp_path / "styles.csv"
+    pd.DataFrame({"スタイル名": ["s"]}).to_csv(csv_path, index=False)
+    image1_path = tmp_path / "image1.jpg"
+    image1_path.write_bytes(FAKE_JPEG)
+
+    with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
+        files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
+        data = {"setting_id": user_with_setting["setting_id"]}
+        response = client.post("/api/v1/tasks/style-post", files=files, data=data, headers=user_with_setting["headers"])
+
+    assert response.status_code == 422
+    assert "Missing required columns: 画像名" in response.json()["detail"]
+
+def _post_single_style(client: TestClient, user_with_setting: dict, tmp_path: Path, image_bytes: bytes):
+    csv_path = tmp_path / "styles.csv"
+    csv_path.write_text("画像名\nimage1.jpg\n", encoding="utf-8")
+    image1_path = tmp_path / "image1.jpg"
+    image1_path.write_bytes(image_bytes)
+    with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
+        files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
+        data = {"setting_id": user_with_setting["setting_id"]}
+        return client.post("/api/v1/tasks/style-post", files=files, data=data, headers=user_with_setting["headers"])
+
+def test_create_task_rejects_non_image_content(client: TestClient, user_with_setting: dict, db_session: Session, tmp_path: Path):
+    """拡張子が画像でも中身がJPEG/PNGでなければ415になり、タスクは作成されない"""
+    with patch("app.api.v1.endpoints.tasks.celery_app.send_task") as mock_send_task:
+        response = _post_single_style(client, user_with_setting, tmp_path, b"<html>not an image</html>")
+
+    assert response.status_code == 415
+    assert "image1.jpg is not a valid JPEG or PNG image" in response.json()["detail"]
+    mock_send_task.assert_not_called()
+    assert crud_task.get_task_by_user_id(db_session, user_with_setting["user_id"]) is None
+
+def test_create_task_rejects_oversized_image(client: TestClient, user_with_setting: dict, tmp_path: Path, monkeypatch):
+    """画像が上限サイズを超えると413になる"""
+    monkeypatch.setattr(settings, "UPLOAD_MAX_IMAGE_BYTES", len(FAKE_JPEG) - 1)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 4)
+
+    with patch("app.api.v1.endpoints.tasks.celery_app.send_task") as mock_send_task:
+        response = _post_single_style(client, user_with_setting, tmp_path, FAKE_JPEG)
+
+    assert response.status_code == 413
+    assert "image1.jpg exceeds the size limit" in response.json()["detail"]
+    mock_send_task.assert_not_called()
+
+def test_create_task_returns_503_when_dispatch_fails(client: TestClient, user_with_setting: dict, db_session: Session, tmp_path: Path):
+    """キューへ送信できない場合は503になり、タスクは失敗として記録され、アップロードファイルは残らない"""
+    with patch("app.api.v1.endpoints.tasks.celery_app.send_task", side_effect=ConnectionError("broker down")):
+        response = _post_single_style(client, user_with_setting, tmp_path, FAKE_JPEG)
+        delete_response = client.post(
+            "/api/v1/tasks/style-delete",
+            data={"setting_id": user_with_setting["setting_id"], "range_start": 1, "range_end": 3},
+            headers=user_with_setting["headers"],
+        )
+
+    assert response.status_code == 503
+    assert "broker down" in response.json()["detail"]
+    assert delete_response.status_code == 503
+
+    db_task = crud_task.get_task_by_user_id(db_session, user_with_setting["user_id"])
+    assert db_task.status == "FAILURE"
+    assert not any(Path(settings.UPLOAD_DIR).glob("*/*"))
+
+@patch("app.api.v1.endpoints.tasks.celery_app.send_task")
 def test_task_lifecycle(mock_celery_task, client: TestClient, user_with_setting: dict, db_session: Session, tmp_path: Path):
     """タスクのライフサイクル（ステータス確認、キャンセル、削除）をテスト"""
     # 1. タスク作成
@@ -122,7 +262,7 @@ def test_task_lifecycle(mock_celery_task, client: TestClient, user_with_setting:
     csv_path = tmp_path / "styles.csv"
     df.to_csv(csv_path, index=False)
     image1_path = tmp_path / "image1.jpg"
-    image1_path.write_text("fake image data")
+    image1_path.write_bytes(FAKE_JPEG)
     with open(csv_path, "rb") as csv_file, open(image1_path, "rb") as img_file:
         files = [("style_data_file", ("styles.csv", csv_file, "text/csv")), ("image_files", ("image1.jpg", img_file, "image/jpeg"))]
         data = {"setting_id": user_with_setting["setting_id"]}
@@ -158,3 +298,219 @@ def test_task_lifecycle(mock_celery_task, client: TestClient, user_with_setting:
     assert status_res_after_delete.status_code == 404
 
 
+def test_status_and_error_report_read_task_events(client: TestClient, user_with_setting: dict, db_session: Session):
+    """ステータスとエラーレポートがtask_eventsから件数・一覧を返すテスト"""
+    import uuid
+
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user_with_setting["user_id"], total_items=3)
+    crud_task.add_task_success(db_session, task_id, {"row_number": 2, "style_name": "s1"})
+    crud_task.add_task_error(db_session, task_id, {
+        "row_number": 3, "style_name": "s2", "field": "スタイリスト選択", "reason": "失敗",
+        "screenshot_path": "app/static/screenshots/error.png"
+    })
+    crud_task.add_task_error(db_session, task_id, {
+        "row_number": 4, "style_name": "s3", "image_name": "s3.jpg", "reason": "中断",
+        "error_category": "IMAGE_UPLOAD_ABORTED"
+    })
+
+    status_res = client.get("/api/v1/tasks/status", headers=user_with_setting["headers"])
+    assert status_res.status_code == 200
+    assert status_res.json()["error_count"] == 1
+    assert status_res.json()["manual_upload_count"] == 1
+
+    crud_task.update_task_status(db_session, task_id, "SUCCESS")
+    report_res = client.get("/api/v1/tasks/error-report", headers=user_with_setting["headers"])
+    assert report_res.status_code == 200
+    report = report_res.json()
+    assert report["total_errors"] == 1
+    assert report["errors"][0]["screenshot_url"] == "/static/screenshots/error.png"
+    assert report["manual_upload_count"] == 1
+    assert report["manual_uploads"][0]["image_name"] == "s3.jpg"
+    assert report["success_count"] == 1
+
+
+def test_delete_finished_task_removes_events(client: TestClient, user_with_setting: dict, db_session: Session):
+    """完了タスクの削除でイベントも削除され、同じユーザーが次のタスクを作成できる"""
+    import uuid
+
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user_with_setting["user_id"], total_items=1)
+    crud_task.add_task_success(db_session, task_id, {"row_number": 2, "style_name": "s1"})
+
+    in_progress_res = client.delete("/api/v1/tasks/finished-task", headers=user_with_setting["headers"])
+    assert in_progress_res.status_code == 400
+
+    crud_task.update_task_status(db_session, task_id, "SUCCESS")
+    delete_res = client.delete("/api/v1/tasks/finished-task", headers=user_with_setting["headers"])
+    assert delete_res.status_code == 204
+
+    db_session.expire_all()
+    assert crud_task.get_task_by_id(db_session, task_id) is None
+    assert crud_task.get_task_events(db_session, task_id) == []
+    assert client.get("/api/v1/tasks/status", headers=user_with_setting["headers"]).status_code == 404
+
+
+def test_finished_task_history_reports_and_pruning(client: TestClient, user_with_setting: dict, db_session: Session):
+    """過去の完了タスクも一覧から task_id 指定でレポート取得・削除でき、上限を超えた古いものは削除される"""
+    import uuid
+    from datetime import datetime, timedelta
+
+    headers = user_with_setting["headers"]
+    task_ids = []
+    for index in range(3):
+        task_id = uuid.uuid4()
+        db_task = crud_task.create_task(db_session, task_id, user_id=user_with_setting["user_id"], total_items=1)
+        db_task.created_at = datetime(2024, 1, 1) + timedelta(hours=index)
+        db_session.commit()
+        crud_task.add_task_error(db_session, task_id, {
+            "row_number": 2, "style_name": f"s{index}", "image_name": f"s{index}.jpg", "reason": "中断",
+            "error_category": "IMAGE_UPLOAD_ABORTED"
+        })
+        crud_task.update_task_status(db_session, task_id, "SUCCESS")
+        task_ids.append(task_id)
+
+    history = client.get("/api/v1/tasks/history", headers=headers).json()
+    assert [task["task_id"] for task in history["tasks"]] == [str(task_id) for task_id in reversed(task_ids)]
+    assert history["max_size"] == settings.TASK_HISTORY_MAX_PER_USER
+
+    # 最新ではない完了タスクの手動画像登録も取得できる
+    report = client.get(f"/api/v1/tasks/error-report?task_id={task_ids[1]}", headers=headers).json()
+    assert report["task_id"] == str(task_ids[1])
+    assert report["manual_uploads"][0]["image_name"] == "s1.jpg"
+    assert client.get(f"/api/v1/tasks/error-report?task_id={uuid.uuid4()}", headers=headers).status_code == 404
+
+    assert client.delete(f"/api/v1/tasks/finished-task?task_id={task_ids[1]}", headers=headers).status_code == 204
+    history = client.get("/api/v1/tasks/history", headers=headers).json()
+    assert [task["task_id"] for task in history["tasks"]] == [str(task_ids[2]), str(task_ids[0])]
+
+    # 上限を超えた古い完了タスクはイベントごと削除する
+    assert crud_task.prune_finished_tasks(db_session, user_with_setting["user_id"], keep=1) == 1
+    db_session.expire_all()
+    assert crud_task.get_task_by_id(db_session, task_ids[0]) is None
+    assert crud_task.get_task_events(db_session, task_ids[0]) == []
+    assert crud_task.get_task_by_id(db_session, task_ids[2]) is not None
+
+
+def test_timing_report_summarizes_style_timings(client: TestClient, user_with_setting: dict, db_session: Session):
+    """タイミングレポートがSTYLE_TIMINGイベントをステージ別に集計するテスト"""
+    import uuid
+
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user_with_setting["user_id"], total_items=2)
+    for row_number, upload_ms in ((2, 4000), (3, 6000)):
+        db_session.add(crud_task.build_task_event(task_id, crud_task.EVENT_STYLE_TIMING, {
+            "row_number": row_number,
+            "style_name": f"s{row_number}",
+            "status": "completed",
+            "total_ms": upload_ms + 1000,
+            "stages": {
+                "IMAGE_UPLOADING": {"ms": upload_ms, "pause_ms": 3000},
+                "REGISTERING": {"ms": 1000, "pause_ms": 500},
+            },
+            "waits": {"human_pause": 3500, "loader_overlay": 200},
+        }))
+    db_session.commit()
+
+    res = client.get("/api/v1/tasks/timing-report?include_styles=true", headers=user_with_setting["headers"])
+    assert res.status_code == 200
+    report = res.json()
+    assert report["style_count"] == 2
+    assert report["total_ms"] == 12000
+    assert report["intentional_pause_ms"] == 7000
+    assert report["server_and_browser_ms"] == 5000
+    upload = report["stages"][0]
+    assert upload["stage"] == "IMAGE_UPLOADING"
+    assert upload["p50_ms"] == 4000
+    assert upload["p95_ms"] == 6000
+    assert len(report["styles"]) == 2
+    # 所要時間イベントはエラー件数に含めない
+    assert client.get("/api/v1/tasks/status", headers=user_with_setting["headers"]).json()["error_count"] == 0
+
+
+class FakePubSub:
+    """Redis Pub/Subの代替（事前に用意したメッセージを順に返す）"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        if self.messages:
+            return {"type": "message", "data": self.messages.pop(0)}
+        return None
+
+    async def unsubscribe(self):
+        self.channels = []
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_stream_pushes_snapshot_and_published_status(client: TestClient, user_with_setting: dict, db_session: Session):
+    """ストリームが初回スナップショットとPub/Sub経由のステータスを送信し、終了状態で閉じるテスト"""
+    import json
+    import uuid
+    from unittest.mock import MagicMock
+
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user_with_setting["user_id"], total_items=2)
+    token_res = client.post("/api/v1/tasks/stream-token", headers=user_with_setting["headers"])
+    assert token_res.status_code == 200
+    assert token_res.json()["expires_in"] == settings.TASK_STREAM_TOKEN_EXPIRE_SEC
+    token = token_res.json()["token"]
+
+    pubsub = FakePubSub([
+        json.dumps({"status": "PROCESSING", "completed_items": 1}),
+        json.dumps({"status": "SUCCESS", "completed_items": 2}),
+    ])
+    redis_client = MagicMock()
+    redis_client.pubsub.return_value = pubsub
+
+    with patch("app.api.v1.endpoints.tasks.get_async_redis", return_value=redis_client):
+        with client.stream("GET", f"/api/v1/tasks/stream?token={token}") as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = response.read().decode()
+
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert events[0]["task_id"] == str(task_id)
+    assert events[0]["status"] == "PROCESSING"
+    assert [event["completed_items"] for event in events[1:]] == [1, 2]
+    assert pubsub.closed is True
+
+
+def test_stream_requires_valid_token(client: TestClient):
+    """無効なトークンではストリームに接続できないテスト"""
+    response = client.get("/api/v1/tasks/stream?token=invalid")
+    assert response.status_code == 401
+
+
+def test_stream_token_is_single_purpose(client: TestClient, user_with_setting: dict):
+    """URLに載せるストリームトークンはAPIの認証に使えず、アクセストークンや期限切れのトークンではストリームに接続できない"""
+    from datetime import timedelta
+    from app.core.security import STREAM_TOKEN_SCOPE, create_access_token
+
+    access_token = user_with_setting["headers"]["Authorization"].split(" ", 1)[1]
+    stream_token = client.post("/api/v1/tasks/stream-token", headers=user_with_setting["headers"]).json()["token"]
+
+    assert client.get("/api/v1/tasks/status", headers={"Authorization": f"Bearer {stream_token}"}).status_code == 401
+    assert client.get(f"/api/v1/tasks/stream?token={access_token}").status_code == 401
+
+    expired_token = create_access_token(
+        {"sub": "taskuser@test.com", "scope": STREAM_TOKEN_SCOPE}, expires_delta=timedelta(seconds=-1)
+    )
+    assert client.get(f"/api/v1/tasks/stream?token={expired_token}").status_code == 401
+
+def test_web_import_path_excludes_worker_dependencies():
+    """APIの読み込みでワーカー専用の重い依存（pandas・ブラウザ自動化）を読み込まない"""
+    script = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('pandas', 'camoufox', 'playwright', 'app.services.tasks') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -1,16 +1,24 @@
+import tempfile
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.db.session import Base, get_db
+from app.db.session import Base, get_async_db, get_db
 from app.core.config import settings
+from app.core.rate_limit import limiter
 
 # --- テスト用データベース設定 ---
-# テストではSQLiteのインメモリデータベースを使用
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# テストではSQLiteを使用する。同期セッション（テストデータ作成・スレッドプールの処理）と
+# 非同期セッション（リクエスト処理）から同じデータを参照するため、一時ファイルに作成する
+TEST_DATABASE_PATH = Path(tempfile.mkdtemp()) / "test.db"
+TEST_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
+TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}"
 
 engine = create_engine(
     TEST_DATABASE_URL,
@@ -20,8 +28,23 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期セッションはリクエストごとに接続を作る（イベントループをまたいで接続を使い回さない）
+async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # --- テスト用フィクスチャ ---
 
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    """アップロードファイルをテストごとの一時ディレクトリに保存する（作業ツリーに残さない）"""
+    directory = tmp_path / "uploads"
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(directory))
+    return directory
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """
@@ -51,32 +74,23 @@ def client(db_session):
         finally:
             pass # セッションクローズはdb_sessionフィクスチャで行う
 
-    # アプリケーションのget_db依存性をオーバーライド
-    app.dependency_overrides[get_db] = override_get_db
+    async def override_get_async_db():
+        """テスト用の非同期DBセッションを返す依存関数"""
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
-    # 全てのレート制限を無効化
-    limiters = []
-    if hasattr(app.state, "limiter"):
-        limiters.append(app.state.limiter)
-    
-    try:
-        from app.api.v1.endpoints import auth, tasks
-        if hasattr(auth, "limiter"):
-            limiters.append(auth.limiter)
-        if hasattr(tasks, "limiter"):
-            limiters.append(tasks.limiter)
-    except ImportError:
-        pass
+    # アプリケーションのget_db / get_async_db依存性をオーバーライド
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
-    for l in limiters:
-        l.enabled = False
+    # レート制限を無効化（全エンドポイントで共有の Limiter）
+    limiter.enabled = False
 
     with TestClient(app) as c:
         yield c
 
     # レート制限を有効化（戻す）
-    for l in limiters:
-        l.enabled = True
+    limiter.enabled = True
 
     # テスト終了後にオーバーライドを元に戻す
     app.dependency_overrides.clear()
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import account_lease
+
+
+def test_account_key_ignores_case_and_whitespace():
+    """ログインIDの表記揺れは同じアカウントとして扱う"""
+    assert account_lease.account_key(" Salon-User ") == account_lease.account_key("salon-user")
+
+
+def test_acquire_parses_script_result():
+    """スクリプトの結果から順番と待機時間を返す"""
+    redis = MagicMock()
+    redis.eval.return_value = [0, 3, "holder-task", "1000.0"]
+
+    with patch.object(account_lease, "get_redis", return_value=redis), \
+            patch.object(account_lease.time, "time", return_value=1030.0):
+        attempt = account_lease.try_acquire("salon-user", "task-1")
+
+    assert attempt == account_lease.LeaseAttempt(acquired=False, position=3, holder="holder-task", waited_sec=30.0)
+    keys = redis.eval.call_args.args[2:5]
+    assert keys == ("sb_account_lease:salon-user", "sb_account_queue:salon-user", "sb_account_waiter:task-1")
+
+
+def test_acquire_fails_open_without_redis():
+    """Redisに接続できない場合はタスクを止めない"""
+    redis = MagicMock()
+    redis.eval.side_effect = ConnectionError("redis down")
+
+    with patch.object(account_lease, "get_redis", return_value=redis):
+        attempt = account_lease.try_acquire("salon-user", "task-1")
+
+    assert attempt.acquired is True
+
+
+def test_lease_keeper_renews_and_releases():
+    """保持中は期限を延長し、終了時に解放する"""
+    with patch.object(account_lease, "renew", return_value=True) as renew, \
+            patch.object(account_lease, "release") as release:
+        with account_lease.LeaseKeeper("salon-user", "task-1", interval_sec=0.01):
+            deadline = account_lease.time.monotonic() + 2
+            while renew.call_count < 2 and account_lease.time.monotonic() < deadline:
+                account_lease.time.sleep(0.01)
+
+    assert renew.call_count >= 2
+    renew.assert_called_with("salon-user", "task-1")
+    release.assert_called_once_with("salon-user", "task-1")
+
+
+def test_lease_keeper_flags_lost_lease_and_stops_renewing():
+    """延長できずにリースを失った場合は延長を止め、確認時に中断させる（Redis障害では止めない）"""
+    with patch.object(account_lease, "renew", return_value=None) as renew, \
+            patch.object(account_lease, "release"):
+        with account_lease.LeaseKeeper("salon-user", "task-1", interval_sec=0.01) as keeper:
+            deadline = account_lease.time.monotonic() + 2
+            while renew.call_count < 2 and account_lease.time.monotonic() < deadline:
+                account_lease.time.sleep(0.01)
+            assert keeper.lost is False
+            keeper.ensure_held()
+
+    with patch.object(account_lease, "renew", return_value=False) as renew, \
+            patch.object(account_lease, "release"):
+        with account_lease.LeaseKeeper("salon-user", "task-1", interval_sec=0.01) as keeper:
+            deadline = account_lease.time.monotonic() + 2
+            while not keeper.lost and account_lease.time.monotonic() < deadline:
+                account_lease.time.sleep(0.01)
+            account_lease.time.sleep(0.05)
+            assert keeper.lost is True
+            assert renew.call_count == 1
+            with pytest.raises(account_lease.AccountLeaseLostError):
+                keeper.ensure_held()
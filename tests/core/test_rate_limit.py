@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from starlette.requests import Request
+
+from app.core import security
+from app.core.rate_limit import rate_limit_key
+from app.core.security import create_access_token
+
+
+def _request(authorization: str = None, client_host: str = "203.0.113.10") -> Request:
+    headers = []
+    if authorization is not None:
+        headers.append((b"authorization", authorization.encode()))
+    return Request({"type": "http", "headers": headers, "client": (client_host, 12345)})
+
+
+def test_key_uses_token_subject():
+    """同じIPアドレスでもユーザーごとに別のカウンターになる"""
+    alice = _request(f"Bearer {create_access_token({'sub': 'Alice@example.com'})}")
+    bob = _request(f"Bearer {create_access_token({'sub': 'bob@example.com'})}")
+
+    assert rate_limit_key(alice) == "user:alice@example.com"
+    assert rate_limit_key(bob) == "user:bob@example.com"
+
+
+def test_key_falls_back_to_ip_address():
+    """トークンがない・無効な場合はIPアドレス単位"""
+    assert rate_limit_key(_request()) == "ip:203.0.113.10"
+    assert rate_limit_key(_request("Bearer invalid-token")) == "ip:203.0.113.10"
+    assert rate_limit_key(_request("Basic dXNlcjpwYXNz")) == "ip:203.0.113.10"
+
+
+def test_token_decoded_once_per_request():
+    """トークンのデコード結果はリクエスト内で共有される"""
+    request = _request(f"Bearer {create_access_token({'sub': 'carol@example.com'})}")
+
+    with patch.object(security, "decode_access_token", wraps=security.decode_access_token) as decode:
+        assert security.get_token_subject(request) == "carol@example.com"
+        assert rate_limit_key(request) == "user:carol@example.com"
+
+    assert decode.call_count == 1
@@ -0,0 +1,184 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from celery import Task, states
+from sqlalchemy.orm import Session
+
+from app.core import task_queue, task_scheduler
+from app.core.celery_task import MonitoredTask
+from app.core.security import get_password_hash
+from app.crud import current_task as crud_task
+from app.crud.user import create_user
+from app.schemas.user import UserCreate
+
+
+POST = "process_style_post"
+DELETE = "delete_styles"
+
+
+def _user_id(db_session: Session, email: str = "queue@example.com") -> int:
+    user_in = UserCreate(email=email, password="password", role="user")
+    return create_user(db_session, user_in, get_password_hash("password")).id
+
+
+def _enqueue(db_session: Session, user_id: int, message: str, task_name: str = DELETE) -> uuid.UUID:
+    task_id = uuid.uuid4()
+    crud_task.enqueue_task(db_session, task_id, user_id, 2, task_name, {"task_id": str(task_id), "user_id": user_id})
+    crud_task.update_task_detail(db_session, task_id, {"stage": "QUEUED", "message": message})
+    return task_id
+
+
+@pytest.fixture
+def scheduler_state(monkeypatch):
+    """スケジューラーの通過値をRedisの代わりに辞書へ保存する"""
+    state = {}
+
+    def load():
+        weights = task_scheduler.parse_weights(task_scheduler.settings.TASK_SCHEDULER_WEIGHTS)
+        return {lane: task_scheduler.StrideScheduler(state.get(lane), weights) for lane in task_scheduler.LANE_QUEUES}
+
+    def save(schedulers):
+        state.update({lane: scheduler.state() for lane, scheduler in schedulers.items()})
+
+    monkeypatch.setattr(task_scheduler, "load_schedulers", load)
+    monkeypatch.setattr(task_scheduler, "save_schedulers", save)
+    monkeypatch.setattr(task_scheduler.settings, "TASK_SCHEDULER_POST_SLOTS", 1)
+    monkeypatch.setattr(task_scheduler.settings, "TASK_SCHEDULER_DELETE_SLOTS", 1)
+    return state
+
+
+def test_dispatch_fills_free_lane_slots_in_user_order(db_session: Session, scheduler_state):
+    """レーンの空きスロットにのみ開始し、実行中のタスクがあるユーザーの後続は開始しない"""
+    busy_user = _user_id(db_session, "busy@example.com")
+    post_user = _user_id(db_session, "post@example.com")
+    delete_user = _user_id(db_session, "delete@example.com")
+    active_id = uuid.uuid4()
+    crud_task.create_task(db_session, active_id, user_id=busy_user, total_items=1, task_name=POST)
+    _enqueue(db_session, busy_user, "削除対象: 2件", task_name=DELETE)
+    post_id = _enqueue(db_session, post_user, "投稿", task_name=POST)
+    delete_id = _enqueue(db_session, delete_user, "削除対象: 3件", task_name=DELETE)
+
+    with patch.object(task_queue.celery_app, "send_task") as mock_send_task, \
+            patch.object(task_queue, "publish_task_status"):
+        # 投稿レーンは実行中のタスクで埋まっているため、削除タスクだけが開始する
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [delete_id]
+        mock_send_task.assert_called_once_with(
+            DELETE, kwargs={"task_id": str(delete_id), "user_id": delete_user}, task_id=str(delete_id), queue="style_delete"
+        )
+
+        crud_task.update_task_status(db_session, active_id, "SUCCESS")
+        started = task_queue.dispatch_queued_tasks(db_session)
+        # 削除レーンは埋まっているため、終了したユーザーの後続（削除）は待ち、投稿タスクが開始する
+        assert [db_task.id for db_task in started] == [post_id]
+        assert mock_send_task.call_args.kwargs["queue"] == "style_post"
+        assert task_queue.dispatch_queued_tasks(db_session) == []
+
+    db_session.expire_all()
+    started_task = crud_task.get_task_by_id(db_session, delete_id)
+    assert crud_task.get_task_detail(started_task)["stage"] == "INITIALIZING"
+    assert crud_task.get_task_detail(started_task)["message"] == "削除対象: 3件"
+    assert [db_task.queue_position for db_task in crud_task.get_queued_tasks(db_session, busy_user)] == [1]
+
+
+def test_dispatch_alternates_tenants_instead_of_submission_order(db_session: Session, scheduler_state):
+    """大量に登録したユーザーの後続より、後から登録した他のユーザーのタスクを先に開始する"""
+    heavy_user = _user_id(db_session, "heavy@example.com")
+    light_user = _user_id(db_session, "light@example.com")
+    heavy_ids = [_enqueue(db_session, heavy_user, f"投稿{index}", task_name=POST) for index in range(3)]
+
+    with patch.object(task_queue.celery_app, "send_task"), patch.object(task_queue, "publish_task_status"):
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [heavy_ids[0]]
+        light_id = _enqueue(db_session, light_user, "投稿", task_name=POST)
+
+        crud_task.update_task_status(db_session, heavy_ids[0], "SUCCESS")
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [light_id]
+
+        crud_task.update_task_status(db_session, light_id, "SUCCESS")
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [heavy_ids[1]]
+
+
+def test_reaper_fails_tasks_without_heartbeat_and_frees_slot(db_session: Session, scheduler_state):
+    """ハートビートが失効した実行中タスクを失敗にし、空いたスロットで順番待ちを開始する"""
+    dead_user = _user_id(db_session, "dead@example.com")
+    next_user = _user_id(db_session, "next@example.com")
+    dead_id = uuid.uuid4()
+    crud_task.create_task(db_session, dead_id, user_id=dead_user, total_items=3, task_name=POST)
+    next_id = _enqueue(db_session, next_user, "投稿", task_name=POST)
+
+    with patch.object(task_queue.celery_app, "send_task"), patch.object(task_queue, "publish_task_status"):
+        assert task_queue.dispatch_queued_tasks(db_session) == []
+
+        # Redisに接続できない場合は生存を判定できないため何もしない
+        with patch.object(task_queue.task_heartbeat, "alive_task_ids", return_value=None):
+            assert task_queue.reap_stale_tasks(db_session) == []
+        with patch.object(task_queue.task_heartbeat, "alive_task_ids", return_value={str(dead_id)}):
+            assert task_queue.reap_stale_tasks(db_session) == []
+
+        with patch.object(task_queue.task_heartbeat, "alive_task_ids", return_value=set()):
+            assert [db_task.id for db_task in task_queue.reap_stale_tasks(db_session)] == [dead_id]
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [next_id]
+
+    db_session.expire_all()
+    dead_task = crud_task.get_task_by_id(db_session, dead_id)
+    assert dead_task.status == "FAILURE"
+    assert crud_task.get_task_detail(dead_task)["stage"] == "FAILED"
+
+
+def test_account_waiting_tasks_do_not_hold_lane_slots(db_session: Session, scheduler_state):
+    """アカウントのリースを待っているタスクはレーンのスロットに数えない"""
+    waiting_user = _user_id(db_session, "waiting@example.com")
+    next_user = _user_id(db_session, "next@example.com")
+    waiting_id = uuid.uuid4()
+    crud_task.create_task(db_session, waiting_id, user_id=waiting_user, total_items=3, task_name=POST)
+    next_id = _enqueue(db_session, next_user, "投稿", task_name=POST)
+
+    with patch.object(task_queue.celery_app, "send_task"), patch.object(task_queue, "publish_task_status"), \
+            patch.object(task_queue.account_lease, "waiting_task_ids", return_value={str(waiting_id)}):
+        assert [db_task.id for db_task in task_queue.dispatch_queued_tasks(db_session)] == [next_id]
+
+
+def test_monitored_task_keeps_heartbeat_while_running():
+    """ワーカーでの実行中と終了時にハートビートを記録する"""
+    class HeartbeatTask(MonitoredTask):
+        name = "heartbeat_task"
+
+        def run(self, task_id):
+            return task_id
+
+    # Celeryアプリに登録せずに実行する
+    with patch.object(Task, "__call__", lambda self, *args, **kwargs: self.run(*args, **kwargs)), \
+            patch("app.core.task_heartbeat.beat") as mock_beat:
+        assert HeartbeatTask()(task_id="abc") == "abc"
+
+    assert [call.args for call in mock_beat.call_args_list] == [("abc",), ("abc",)]
+
+
+def test_next_task_marked_failed_when_broker_is_unavailable(db_session: Session, scheduler_state):
+    """Celeryへ送信できない場合は失敗として記録する"""
+    user_id = _user_id(db_session)
+    task_id = _enqueue(db_session, user_id, "削除対象: 2件")
+
+    with patch.object(task_queue.celery_app, "send_task", side_effect=OSError("broker down")), \
+            patch.object(task_queue, "publish_task_status"):
+        assert task_queue.dispatch_queued_tasks(db_session) == []
+
+    db_session.expire_all()
+    db_task = crud_task.get_task_by_id(db_session, task_id)
+    assert db_task.status == "FAILURE"
+    assert crud_task.get_task_detail(db_task)["stage"] == "FAILED"
+
+
+def test_after_return_starts_next_task_unless_retrying():
+    """ワーカーのタスク終了時は空いたスロットに順番待ちを開始し、アカウントの順番待ちでの再実行時は開始しない"""
+    task = MonitoredTask()
+    task._db = MagicMock()
+
+    with patch("app.core.celery_task.dispatch_queued_tasks") as mock_dispatch:
+        task.after_return(states.RETRY, None, "task", (), {"user_id": 7}, None)
+        mock_dispatch.assert_not_called()
+
+        task._db = MagicMock()
+        db = task._db
+        task.after_return(states.FAILURE, None, "task", (), {"user_id": 7}, None)
+        mock_dispatch.assert_called_once_with(db)
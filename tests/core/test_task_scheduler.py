@@ -0,0 +1,45 @@
+from app.core.task_scheduler import Candidate, StrideScheduler, parse_weights, plan_dispatch
+
+
+def _picks(scheduler: StrideScheduler, tenants, count: int):
+    candidates = [Candidate(tenant, "post", index) for index, tenant in enumerate(tenants)]
+    return [scheduler.pick(candidates).tenant for _ in range(count)]
+
+
+def test_weighted_round_robin_follows_weights():
+    """重み2のテナントは重み1のテナントの2倍の頻度で選ばれる"""
+    scheduler = StrideScheduler(weights={"user:1": 2})
+
+    picks = _picks(scheduler, ["user:1", "user:2"], 6)
+
+    assert picks.count("user:1") == 4
+    assert picks.count("user:2") == 2
+
+
+def test_new_tenant_starts_from_current_pass():
+    """待ちのなかったテナントは他のテナントと交互に選ばれ、休止中の分をまとめて優先されない"""
+    scheduler = StrideScheduler()
+    _picks(scheduler, ["user:1"], 10)
+
+    # 保存・復元しても状態が引き継がれる
+    restored = StrideScheduler(scheduler.state())
+    assert _picks(restored, ["user:1", "user:2"], 4) == ["user:2", "user:1", "user:2", "user:1"]
+
+
+def test_plan_dispatch_respects_lane_slots():
+    """レーンごとの空きスロット数だけ選ぶ"""
+    candidates = [
+        Candidate("user:1", "post", 1),
+        Candidate("user:2", "post", 2),
+        Candidate("user:3", "delete", 3),
+        Candidate("user:4", "delete", 4),
+    ]
+    schedulers = {"post": StrideScheduler(), "delete": StrideScheduler()}
+
+    chosen = plan_dispatch(candidates, {"post": 1, "delete": 0}, {"post": 2, "delete": 1}, schedulers)
+
+    assert [candidate.tenant for candidate in chosen] == ["user:1", "user:3"]
+
+
+def test_parse_weights_ignores_invalid_entries():
+    assert parse_weights("user:1=2, salon:abc=0.5,broken,user:2=x,user:3=0") == {"user:1": 2.0, "salon:abc": 0.5}
@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import user_cache
+from app.core.security import get_password_hash
+from app.crud.user import create_user, delete_user, update_user
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+
+
+class FakeRedis:
+    """user_cache が使うコマンドだけを辞書で再現する"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(user_cache, "get_async_redis", lambda: redis)
+    monkeypatch.setattr(user_cache, "get_redis", lambda: redis)
+    return redis
+
+
+def _login(client: TestClient, db_session: Session, email: str):
+    password = "password123"
+    user = create_user(db_session, UserCreate(email=email, password=password, role="user"), get_password_hash(password))
+    response = client.post("/api/v1/auth/token", data={"username": email, "password": password})
+    return user, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_me_served_from_cache(client: TestClient, db_session: Session, fake_redis: FakeRedis):
+    """2回目以降の認証はキャッシュから解決される"""
+    user, headers = _login(client, db_session, "cached@example.com")
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert user_cache.user_cache_key("Cached@Example.com") in fake_redis.store
+
+    # キャッシュを経由しない変更（DBを直接削除）はTTLまで反映されない
+    db_session.query(User).filter(User.id == user.id).delete()
+    db_session.commit()
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "cached@example.com"
+
+
+def test_user_changes_invalidate_cache(client: TestClient, db_session: Session, fake_redis: FakeRedis):
+    """CRUD経由の更新・削除はキャッシュを破棄し、次のリクエストから反映される"""
+    user, headers = _login(client, db_session, "invalidate@example.com")
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    update_user(db_session, user.id, UserUpdate(is_active=False))
+    assert fake_redis.store == {}
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+    delete_user(db_session, user.id)
+    assert fake_redis.store == {}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def test_email_change_invalidates_previous_subject(client: TestClient, db_session: Session, fake_redis: FakeRedis):
+    """メールアドレス変更後は旧アドレスのトークンが使えなくなる"""
+    user, headers = _login(client, db_session, "old@example.com")
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    update_user(db_session, user.id, UserUpdate(email="new@example.com"))
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def test_cache_disabled_when_ttl_is_zero(client: TestClient, db_session: Session, fake_redis: FakeRedis, monkeypatch):
+    """TTLが0の場合はキャッシュしない"""
+    monkeypatch.setattr(user_cache.settings, "AUTH_USER_CACHE_TTL_SEC", 0)
+    _, headers = _login(client, db_session, "nocache@example.com")
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert fake_redis.store == {}
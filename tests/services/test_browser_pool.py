@@ -0,0 +1,124 @@
+from app.services.salonboard.browser_pool import BrowserPool, read_process_tree_rss_mb
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+class FakeCamoufox:
+    def __init__(self):
+        self.exited = False
+
+    def __exit__(self, *args):
+        self.exited = True
+
+
+class Launcher:
+    """起動回数と起動したブラウザを記録するランチャー"""
+
+    def __init__(self):
+        self.launched = []
+
+    def __call__(self, headless, slow_mo):
+        camoufox, browser = FakeCamoufox(), FakeBrowser()
+        self.launched.append((camoufox, browser, headless, slow_mo))
+        return camoufox, browser
+
+
+def make_pool(**kwargs):
+    launcher = Launcher()
+    kwargs.setdefault("rss_reader", lambda: None)
+    return BrowserPool(launcher=launcher, **kwargs), launcher
+
+
+def test_browser_is_reused_between_contexts():
+    """ブラウザは1度だけ起動され、コンテキストはタスクごとに新規作成されること"""
+    pool, launcher = make_pool(max_contexts=10)
+
+    first = pool.acquire_context(headless=True, slow_mo=100)
+    pool.release_context(first)
+    second = pool.acquire_context(headless=True, slow_mo=100)
+
+    assert len(launcher.launched) == 1
+    assert first is not second
+    assert first.closed is True
+    assert first.browser is second.browser
+    assert pool.active_contexts == 1
+
+
+def test_browser_is_recycled_after_max_contexts():
+    """コンテキスト作成数の上限に達すると、返却後の次回取得時に再起動すること"""
+    pool, launcher = make_pool(max_contexts=2)
+
+    for _ in range(2):
+        pool.release_context(pool.acquire_context(headless=True, slow_mo=100))
+    pool.acquire_context(headless=True, slow_mo=100)
+
+    assert len(launcher.launched) == 2
+    assert launcher.launched[0][0].exited is True
+
+
+def test_disconnected_browser_is_relaunched():
+    """ヘルスチェックで切断を検出した場合は再起動すること"""
+    pool, launcher = make_pool()
+
+    pool.release_context(pool.acquire_context(headless=True, slow_mo=100))
+    launcher.launched[0][1].connected = False
+    context = pool.acquire_context(headless=True, slow_mo=100)
+
+    assert len(launcher.launched) == 2
+    assert context.browser is launcher.launched[1][1]
+
+
+def test_rss_limit_waits_for_active_contexts():
+    """RSS上限超過時も使用中のコンテキストがある間は再起動しないこと"""
+    rss = {"value": 100.0}
+    pool, launcher = make_pool(max_rss_mb=500, rss_reader=lambda: rss["value"])
+
+    active = pool.acquire_context(headless=True, slow_mo=100)
+    rss["value"] = 900.0
+    other = pool.acquire_context(headless=True, slow_mo=100)
+    assert len(launcher.launched) == 1
+    assert active.closed is False
+
+    pool.release_context(active)
+    pool.release_context(other)
+    pool.acquire_context(headless=True, slow_mo=100)
+    assert len(launcher.launched) == 2
+
+
+def test_launch_option_change_and_shutdown():
+    """起動オプションが変わった場合は再起動し、shutdownでブラウザを終了すること"""
+    pool, launcher = make_pool()
+
+    pool.release_context(pool.acquire_context(headless=True, slow_mo=100))
+    pool.release_context(pool.acquire_context(headless=False, slow_mo=100))
+    assert [entry[2] for entry in launcher.launched] == [True, False]
+
+    pool.shutdown()
+    assert launcher.launched[1][0].exited is True
+
+
+def test_read_process_tree_rss_mb():
+    """自プロセスのRSSが取得できること（/proc がない環境ではNone）"""
+    rss_mb = read_process_tree_rss_mb()
+    assert rss_mb is None or rss_mb > 0
@@ -0,0 +1,96 @@
+"""
+擬似SALON BOARDサーバー（scripts/fake_salonboard.py）のテスト
+ベンチマークの前提となる画面遷移とセレクタの整合性を確認する
+"""
+from fastapi.testclient import TestClient
+
+from scripts.fake_salonboard import FakeSalonBoardConfig, STYLE_LIST_PAGE_SIZE, create_fake_salonboard_app
+from scripts.benchmark_salonboard import StageRecorder, build_selectors
+
+
+def _login(client: TestClient, config: FakeSalonBoardConfig):
+    return client.post(
+        "/login/",
+        data={"userId": config.sb_user_id, "password": config.sb_password},
+        follow_redirects=False,
+    )
+
+
+def test_pages_require_login_and_render_selectors():
+    """未ログイン時はログイン画面へ戻され、ログイン後の画面にセレクタ対象の要素があること"""
+    config = FakeSalonBoardConfig()
+    client = TestClient(create_fake_salonboard_app(config))
+
+    response = client.get("/CNB/draft/styleList/", follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == "/login/"
+    assert 'id="idPasswordInputForm"' in client.get("/login/").text
+
+    login = _login(client, config)
+    assert login.status_code == 302
+    assert login.headers["location"] == "/KLP/top/"
+
+    top = client.get("/KLP/top/").text
+    assert 'id="headerNavigationBar"' in top
+    assert 'id="globalNavi"' in top
+
+    edit = client.get("/CNB/draft/styleEdit/").text
+    for marker in ('id="FRONT_IMG_ID_IMG"', 'id="formFile"', 'id="stylistCheckCd"', 'class="loader_overlay"',
+                   'jsc_SB_modal_single_coupon', 'id="hashTagTxt"', 'alt="登録"'):
+        assert marker in edit
+
+
+def test_multi_salon_account_shows_store_selection():
+    """複数店舗アカウントではログイン後に店舗選択画面を経由すること"""
+    config = FakeSalonBoardConfig(salons=[("H001", "A店"), ("H002", "B店")])
+    client = TestClient(create_fake_salonboard_app(config))
+
+    login = _login(client, config)
+    assert login.headers["location"] == "/CNC/storeSelect/"
+    assert 'id="biyouStoreInfoArea"' in client.get("/CNC/storeSelect/").text
+
+
+def test_upload_congestion_and_style_lifecycle():
+    """302の注入、スタイル登録・削除とページングが動作すること"""
+    config = FakeSalonBoardConfig(congestion_rate=1.0, initial_styles=STYLE_LIST_PAGE_SIZE, seed=1)
+    app = create_fake_salonboard_app(config)
+    client = TestClient(app)
+    _login(client, config)
+
+    upload = client.post(
+        "/CNB/imgreg/imgUpload/doUpload",
+        files={"formFile": ("a.jpg", b"\xff\xd8\xff", "image/jpeg")},
+        follow_redirects=False,
+    )
+    assert upload.status_code == 302
+    assert app.state.fake.stats["uploads_congested"] == 1
+
+    complete = client.post("/CNB/draft/styleEdit/", data={"style_name": "新規", "hashtags": ["a", "b"]})
+    assert "登録が完了しました。" in complete.text
+    assert app.state.fake.styles[0].name == "新規"
+    assert app.state.fake.styles[0].hashtags == ["a", "b"]
+
+    # 151件目は2ページ目に表示される
+    first_page = client.get("/CNB/draft/styleList/").text
+    assert 'class="pgNext"' in first_page
+    assert f'value="{STYLE_LIST_PAGE_SIZE + 1}"' in client.get("/CNB/draft/styleList/?pn=2").text
+
+    style_id = app.state.fake.styles[0].style_id
+    client.get(f"/CNB/draft/styleDelete/?id={style_id}")
+    assert app.state.fake.stats["styles_deleted"] == 1
+    assert len(app.state.fake.styles) == STYLE_LIST_PAGE_SIZE
+
+
+def test_benchmark_helpers():
+    """セレクタのURL置換とステージ時間の集計"""
+    selectors = build_selectors("http://127.0.0.1:9999")
+    assert selectors["login"]["url"] == "http://127.0.0.1:9999/login/"
+    assert selectors["login"]["session_probe_url"].startswith("http://127.0.0.1:9999/")
+
+    recorder = StageRecorder()
+    recorder(0, 1, detail={"stage": "LOGIN"})
+    recorder(0, 1, detail={"stage": "STYLE_PROCESSING"})
+    recorder(1, 1, detail={"stage": "STYLE_COMPLETED"}, success={"row_number": 2})
+    recorder.finish()
+    assert set(recorder.stages) == {"LOGIN", "STYLE_PROCESSING", "STYLE_COMPLETED"}
+    assert recorder.successes == 1
@@ -0,0 +1,67 @@
+"""
+ペース配分（PacingEngine）のテスト
+"""
+from app.services.salonboard.pacing import PacingEngine, PacingProfile
+
+
+def test_pacing_lengthens_on_congestion_and_shortens_on_clean_streak():
+    """異常シグナルで待機を延ばし、正常なアップロードの連続で下限まで縮める"""
+    pacing = PacingEngine(PacingProfile(min_scale=0.5, max_scale=3.0, clean_streak=2, relax_factor=0.5))
+
+    pacing.record_congestion()
+    assert pacing.scale == 1.5
+    assert pacing.scaled(700, 350, 250) == (1050, 525, 375)
+
+    pacing.record_clean_upload()
+    assert pacing.scale == 1.5
+    pacing.record_upload_aborted()
+    # 異常シグナルで連続件数はリセットされる
+    pacing.record_clean_upload()
+    assert pacing.scale == 1.875
+
+    for _ in range(20):
+        pacing.record_clean_upload()
+    assert pacing.scale == 0.5
+    # 縮小しても最小待機は floor_ms を下回らない
+    assert pacing.scaled(700, 350, 250) == (350, 175, 150)
+
+    pacing.record_robot_detection()
+    assert pacing.scale == 3.0
+    assert pacing.signals == {"congestion": 1, "clean_upload": 22, "upload_aborted": 1, "robot_detection": 1}
+
+
+def test_pacing_state_round_trip():
+    """保存した状態から再開し、範囲外・不正な値は丸める"""
+    pacing = PacingEngine()
+    pacing.record_congestion()
+    restored = PacingEngine.from_state(pacing.to_state())
+    assert restored.scale == pacing.scale
+
+    assert PacingEngine.from_state({"scale": 10}).scale == PacingProfile().max_scale
+    assert PacingEngine.from_state({"scale": "broken"}).scale == 1.0
+    assert PacingEngine.from_state(None).scale == 1.0
+
+
+def test_account_pacing_is_shared_by_settings_of_the_same_login_id():
+    """ペース配分はSALON BOARD設定ではなくログインID単位で保存し、同じアカウントの別設定でも引き継ぐ"""
+    from unittest.mock import patch
+
+    from app.core import account_lease, pacing_store
+    from app.services.tasks import account_pacing
+
+    store = {}
+
+    class FakeRedis:
+        def get(self, key):
+            return store.get(key)
+
+        def set(self, key, value, ex=None):
+            store[key] = value
+
+    with patch.object(pacing_store, "get_redis", return_value=FakeRedis()):
+        with account_pacing(account_lease.account_key("Salon-User")) as pacing:
+            pacing.record_congestion()
+        with account_pacing(account_lease.account_key(" salon-user ")) as pacing:
+            assert pacing.scale == 1.5
+
+    assert list(store) == ["sb_pacing:salon-user"]
@@ -0,0 +1,90 @@
+"""
+ロボット認証検出（_check_robot_detection）のテスト
+"""
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+from app.services.salonboard.exceptions import RobotDetectionError
+from app.services.salonboard.pacing import PacingEngine
+from app.services.salonboard.utils import BrowserUtilsMixin
+
+ROBOT_SELECTORS = {
+    "robot_detection": {
+        "selectors": ["div.g-recaptcha", "text=認証してください"],
+        "texts": ["画像認証"],
+    }
+}
+
+
+class FakeLocator:
+    def __init__(self, visible):
+        self.visible = visible
+
+    def count(self):
+        return 1 if self.visible else 0
+
+    @property
+    def first(self):
+        return self
+
+    def is_visible(self, timeout=None):
+        return self.visible
+
+
+class FakePage:
+    def __init__(self, probe=None, visible_selectors=()):
+        self.probe = probe
+        self.visible_selectors = set(visible_selectors)
+        self.evaluate_calls = 0
+        self.locator_calls = []
+
+    def evaluate(self, script, arg):
+        self.evaluate_calls += 1
+        if self.probe is None:
+            raise PlaywrightError("Execution context was destroyed")
+        return self.probe
+
+    def locator(self, selector):
+        self.locator_calls.append(selector)
+        return FakeLocator(selector in self.visible_selectors)
+
+
+class DummyUtils(BrowserUtilsMixin):
+    def __init__(self, page):
+        self.page = page
+        self.selectors = ROBOT_SELECTORS
+        self.pacing = PacingEngine()
+
+    def _take_screenshot(self, prefix="error"):
+        return f"/tmp/{prefix}.png"
+
+
+def test_robot_detection_uses_single_probe():
+    """一括確認が一致なしの場合、要素ごとの確認は行わない"""
+    page = FakePage(probe={"matches": [], "unsupported": []})
+    DummyUtils(page)._check_robot_detection()
+    assert page.evaluate_calls == 1
+    assert page.locator_calls == []
+
+    page = FakePage(probe={"matches": ["テキスト: 画像認証"], "unsupported": []})
+    utils = DummyUtils(page)
+    with pytest.raises(RobotDetectionError):
+        utils._check_robot_detection()
+    # 検出時は待機時間の倍率を上限まで引き上げる
+    assert utils.pacing.scale == utils.pacing.profile.max_scale
+
+
+def test_robot_detection_checks_unsupported_selectors_per_locator():
+    """CSSとして解釈できないセレクタは従来どおりLocatorで確認する"""
+    page = FakePage(probe={"matches": [], "unsupported": ["text=認証してください"]}, visible_selectors={"text=認証してください"})
+    with pytest.raises(RobotDetectionError):
+        DummyUtils(page)._check_robot_detection()
+    assert page.locator_calls == ["text=認証してください"]
+
+
+def test_robot_detection_falls_back_when_probe_fails():
+    """一括確認が失敗した場合は全セレクタ・テキストを個別に確認する"""
+    page = FakePage(probe=None, visible_selectors={"text=画像認証"})
+    with pytest.raises(RobotDetectionError):
+        DummyUtils(page)._check_robot_detection()
+    assert page.locator_calls == ["div.g-recaptcha", "text=認証してください", "text=画像認証"]
@@ -87,3 +87,408 @@ def test_handle_failure(db_session, mock_task_instance):
     progress_detail = json.loads(task.progress_detail_json)
     assert progress_detail["status"] == "error"
     assert progress_detail["error_reason"] == "Something wrong"
+
+def test_task_events_are_appended_and_counted(db_session, mock_task_instance):
+    """成功・エラー・手動画像登録イベントが1行ずつ追記され、種別ごとに集計されること"""
+    task_id = create_test_task(db_session)
+
+    mock_task_instance.record_success(task_uuid=task_id, row_number=2, style_name="Style A")
+    crud_task.add_task_error(db_session, task_id, {"row_number": 3, "style_name": "Style B", "reason": "失敗"})
+    crud_task.add_task_error(
+        db_session,
+        task_id,
+        {"row_number": 4, "style_name": "Style C", "error_category": "IMAGE_UPLOAD_ABORTED"}
+    )
+
+    counts = crud_task.count_task_events(db_session, task_id)
+    assert counts == {"SUCCESS": 1, "ERROR": 1, "MANUAL_UPLOAD": 1}
+
+    successes = crud_task.get_task_events(db_session, task_id, ["SUCCESS"])
+    assert [entry["style_name"] for entry in successes] == ["Style A"]
+
+    all_events = crud_task.get_task_events(db_session, task_id)
+    assert [entry["row_number"] for entry in all_events] == [2, 3, 4]
+
+def test_progress_writer_coalesces_until_threshold(db_session):
+    """進捗ライターが最新値のみを保持し、閾値到達時にまとめて書き込むこと"""
+    from app.core.progress_writer import TaskProgressWriter
+
+    task_id = create_test_task(db_session)
+    now = [100.0]
+    writer = TaskProgressWriter(
+        db_session, task_id, flush_interval=5.0, max_pending_events=3, clock=lambda: now[0]
+    )
+
+    # 初回は即時書き込み
+    writer.set_detail({"stage": "LOGIN"})
+    assert writer.maybe_flush() is True
+
+    # 閾値未満の更新はバッファされる
+    writer.set_detail({"stage": "STYLE_NAVIGATE"})
+    writer.set_completed(1)
+    writer.set_detail({"stage": "STYLE_FORM"})
+    writer.set_completed(2)
+    writer.add_success({"row_number": 2, "style_name": "Style A"})
+    now[0] += 1.0
+    assert writer.maybe_flush() is False
+
+    task = crud_task.get_task_by_id(db_session, task_id)
+    assert json.loads(task.progress_detail_json)["stage"] == "LOGIN"
+    assert task.completed_items == 0
+    assert crud_task.count_task_events(db_session, task_id)["SUCCESS"] == 0
+
+    # イベント件数の閾値到達でフラッシュ（最新の詳細・件数のみ反映）
+    writer.add_error({"row_number": 3, "reason": "失敗"})
+    writer.add_error({"row_number": 4, "error_category": "IMAGE_UPLOAD_ABORTED"})
+    assert writer.maybe_flush() is True
+
+    db_session.expire_all()
+    task = crud_task.get_task_by_id(db_session, task_id)
+    assert json.loads(task.progress_detail_json)["stage"] == "STYLE_FORM"
+    assert task.completed_items == 2
+    assert crud_task.count_task_events(db_session, task_id) == {"SUCCESS": 1, "ERROR": 1, "MANUAL_UPLOAD": 1}
+
+    # 経過時間による閾値
+    writer.set_completed(3)
+    now[0] += 5.0
+    assert writer.maybe_flush() is True
+    assert writer.has_pending is False
+
+    # 再開位置はバッファ中のイベントと同じフラッシュで書き込まれる
+    writer.add_success({"row_number": 5, "style_name": "Style B"})
+    writer.set_checkpoint(4)
+    task = crud_task.get_task_by_id(db_session, task_id)
+    assert task.checkpoint_index == 0
+    writer.flush()
+    db_session.expire_all()
+    assert crud_task.get_task_by_id(db_session, task_id).checkpoint_index == 4
+    assert crud_task.count_task_events(db_session, task_id)["SUCCESS"] == 2
+
+def test_buffered_progress_is_flushed_on_failure(db_session, mock_task_instance):
+    """バッファ中の進捗・イベントが終了処理で必ず書き込まれること"""
+    task_id = create_test_task(db_session)
+
+    mock_task_instance.record_detail(
+        task_uuid=task_id, stage="FIRST", stage_label="", message="", flush=False
+    )
+    mock_task_instance.record_progress(task_id, 4)
+    mock_task_instance.record_success(task_uuid=task_id, row_number=5, style_name="Style E", flush=False)
+    assert mock_task_instance.progress_writer(task_id).has_pending is True
+
+    mock_task_instance.handle_failure(
+        task_uuid=task_id,
+        task_id=str(task_id),
+        error=ValueError("boom"),
+        error_context={"row_number": 0, "reason": "boom"}
+    )
+
+    db_session.expire_all()
+    task = crud_task.get_task_by_id(db_session, task_id)
+    assert task.status == "FAILURE"
+    assert task.completed_items == 4
+    assert json.loads(task.progress_detail_json)["current_index"] == 4
+    assert crud_task.count_task_events(db_session, task_id) == {"SUCCESS": 1, "ERROR": 1, "MANUAL_UPLOAD": 0}
+
+def test_flush_publishes_task_status(db_session, mock_task_instance):
+    """進捗のフラッシュ時にユーザー単位のチャンネルへステータスが発行されること"""
+    task_id = create_test_task(db_session)
+    redis_client = MagicMock()
+
+    with patch("app.core.task_stream.get_redis", return_value=redis_client):
+        mock_task_instance.record_detail(
+            task_uuid=task_id, stage="STYLE_PROCESSING", stage_label="", message="", current_index=1
+        )
+
+    channel, message = redis_client.publish.call_args.args
+    assert channel == "task_progress:1"
+    payload = json.loads(message)
+    assert payload["task_id"] == str(task_id)
+    assert payload["detail"]["stage"] == "STYLE_PROCESSING"
+
+def test_later_flushes_publish_without_reading_task(db_session, mock_task_instance):
+    """2回目以降の発行はDBを読まず、フラッシュした値とワーカーが更新したステータスから組み立てること"""
+    from app.core import task_stream
+
+    task_id = create_test_task(db_session)
+    redis_client = MagicMock()
+
+    with patch("app.core.task_stream.get_redis", return_value=redis_client):
+        mock_task_instance.record_detail(task_uuid=task_id, stage="LOGIN", stage_label="", message="")
+        with patch.object(task_stream.crud_task, "get_task_by_id") as get_task, \
+                patch.object(task_stream.crud_task, "count_task_events") as count_events:
+            mock_task_instance.record_progress(task_id, 4)
+            mock_task_instance.record_error(task_id, {"row_number": 3, "reason": "失敗"})
+            mock_task_instance.record_error(task_id, {
+                "row_number": 4, "reason": "中断", "error_category": crud_task.MANUAL_UPLOAD_ERROR_CATEGORY
+            })
+            mock_task_instance.record_detail(
+                task_uuid=task_id, stage="STYLE_PROCESSING", stage_label="", message="", current_index=4
+            )
+            get_task.assert_not_called()
+            count_events.assert_not_called()
+        mock_task_instance.update_status(task_id, "SUCCESS")
+        mock_task_instance.record_detail(task_uuid=task_id, stage="COMPLETED", stage_label="", message="")
+
+    progress_payload = json.loads(redis_client.publish.call_args_list[1].args[1])
+    assert progress_payload["completed_items"] == 4
+    assert progress_payload["progress"] == 40.0
+    assert progress_payload["error_count"] == 1
+    assert progress_payload["manual_upload_count"] == 1
+    assert progress_payload["has_errors"] is True
+    assert progress_payload["detail"]["stage"] == "STYLE_PROCESSING"
+    final_payload = json.loads(redis_client.publish.call_args_list[-1].args[1])
+    assert final_payload["status"] == "SUCCESS"
+    assert final_payload["detail"]["stage"] == "COMPLETED"
+    # 配信内容は /tasks/status（DBから組み立てた値）と一致する
+    db_session.expire_all()
+    db_status = task_stream.build_task_status(db_session, crud_task.get_task_by_id(db_session, task_id))
+    assert final_payload == json.loads(task_stream.serialize_task_status(db_status))
+
+
+def test_ensure_not_cancelled_uses_redis_flag(db_session, mock_task_instance):
+    """Redisのキャンセルフラグを検出するとDBのステータスに関わらず中断すること"""
+    task_id = create_test_task(db_session, status="PROCESSING")
+    redis_client = MagicMock()
+    redis_client.exists.return_value = 1
+
+    with patch("app.core.cancellation.get_redis", return_value=redis_client):
+        with pytest.raises(TaskCancelledError):
+            mock_task_instance.ensure_not_cancelled(task_id)
+
+    redis_client.exists.assert_called_with(f"task_cancel:{task_id}")
+    task = crud_task.get_task_by_id(db_session, task_id)
+    assert json.loads(task.progress_detail_json)["stage"] == "CANCELLING"
+
+def test_cancel_check_throttles_db_reads(db_session, mock_task_instance):
+    """フラグ未設定の間はDBのステータス確認を一定間隔に抑えること"""
+    task_id = create_test_task(db_session, status="PROCESSING")
+    redis_client = MagicMock()
+    redis_client.exists.return_value = 0
+
+    with patch("app.core.cancellation.get_redis", return_value=redis_client), \
+            patch.object(crud_task, "get_task_by_id", wraps=crud_task.get_task_by_id) as get_task:
+        assert mock_task_instance.ensure_not_cancelled(task_id).id == task_id
+        assert mock_task_instance.ensure_not_cancelled(task_id) is None
+        assert mock_task_instance.is_cancel_requested(task_id) is False
+
+    assert get_task.call_count == 1
+    assert redis_client.exists.call_count == 3
+
+def test_request_cancel_sets_flag_with_ttl():
+    """キャンセル要求でTTL付きのフラグが設定されること"""
+    from app.core import cancellation
+
+    task_id = uuid.uuid4()
+    redis_client = MagicMock()
+    with patch("app.core.cancellation.get_redis", return_value=redis_client):
+        assert cancellation.request_cancel(task_id) is True
+
+    redis_client.set.assert_called_once()
+    args, kwargs = redis_client.set.call_args
+    assert args[0] == f"task_cancel:{task_id}"
+    assert kwargs["ex"] > 0
+
+
+def test_wait_for_account_turn_requeues_while_account_busy(db_session, mock_task_instance):
+    """同じアカウントのタスクが実行中なら順番待ちを記録して再実行する"""
+    from celery.exceptions import Retry
+    from app.core.account_lease import LeaseAttempt
+    from app.core.config import settings
+    from app.services.tasks import wait_for_account_turn
+
+    task_id = create_test_task(db_session)
+    attempt = LeaseAttempt(acquired=False, position=2, holder="other-task", waited_sec=42.4)
+
+    with patch("app.services.tasks.account_lease.try_acquire", return_value=attempt) as try_acquire, \
+            patch.object(mock_task_instance, "retry", side_effect=Retry()) as retry:
+        with pytest.raises(Retry):
+            wait_for_account_turn(mock_task_instance, task_id, "salon-user", total_items=10)
+
+    try_acquire.assert_called_once_with("salon-user", str(task_id))
+    retry.assert_called_once_with(countdown=settings.ACCOUNT_LEASE_RETRY_SEC, max_retries=None)
+    detail = json.loads(crud_task.get_task_by_id(db_session, task_id).progress_detail_json)
+    assert detail["stage"] == "ACCOUNT_WAITING"
+    assert detail["status"] == "waiting"
+    assert detail["queue_position"] == 2
+    assert detail["account_wait_sec"] == 42.4
+
+
+def test_wait_for_account_turn_records_wait_when_acquired(db_session, mock_task_instance):
+    """順番が来たら待機時間を記録して処理を続ける"""
+    from app.core.account_lease import LeaseAttempt
+    from app.services.tasks import wait_for_account_turn
+
+    task_id = create_test_task(db_session)
+    attempt = LeaseAttempt(acquired=True, waited_sec=75.0)
+
+    with patch("app.services.tasks.account_lease.try_acquire", return_value=attempt):
+        wait_for_account_turn(mock_task_instance, task_id, "salon-user", total_items=10)
+
+    detail = json.loads(crud_task.get_task_by_id(db_session, task_id).progress_detail_json)
+    assert detail["stage"] == "ACCOUNT_ACQUIRED"
+    assert detail["account_wait_sec"] == 75.0
+
+
+def test_wait_for_account_turn_leaves_queue_when_cancelled(db_session, mock_task_instance):
+    """待機中にキャンセルされた場合は待ち行列から外れる"""
+    from app.services.tasks import wait_for_account_turn
+
+    task_id = create_test_task(db_session, status="CANCELLING")
+
+    with patch("app.services.tasks.account_lease.leave_queue") as leave_queue, \
+            patch("app.services.tasks.account_lease.try_acquire") as try_acquire:
+        with pytest.raises(TaskCancelledError):
+            wait_for_account_turn(mock_task_instance, task_id, "salon-user", total_items=10)
+
+    leave_queue.assert_called_once_with("salon-user", str(task_id))
+    try_acquire.assert_not_called()
+
+
+def test_style_post_runs_in_chunks_and_resumes_from_checkpoint(db_session, tmp_path, monkeypatch):
+    """投稿は分割実行し、続きは処理済みの行から再投入する（再配信時も処理済みの行は飛ばす）"""
+    from celery.exceptions import Retry
+    from app.core.config import settings
+    from app.core.security import get_password_hash
+    from app.crud.salon_board_setting import create_setting
+    from app.crud.user import create_user
+    from app.schemas.salon_board_setting import SalonBoardSettingCreate
+    from app.schemas.user import UserCreate
+    from app.services import tasks
+
+    user = create_user(db_session, UserCreate(email="chunk@example.com", password="password", role="user"), get_password_hash("password"))
+    setting = create_setting(db_session, SalonBoardSettingCreate(setting_name="Salon", sb_user_id="sb", sb_password="pw"), user.id)
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user.id, total_items=5, task_name="process_style_post")
+    data_file = tmp_path / "styles.jsonl"
+    data_file.write_text("")
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+
+    calls = []
+
+    class FakePoster:
+        def __init__(self, **kwargs):
+            self.expected_total = 0
+
+        def run(self, *, start_index, max_items, checkpoint_callback, **kwargs):
+            self.expected_total = 5
+            calls.append(start_index)
+            processed = min(start_index + max_items, self.expected_total)
+            for index in range(start_index, processed):
+                checkpoint_callback(index + 1)
+            return processed
+
+    monkeypatch.setattr(settings, "STYLE_POST_CHUNK_SIZE", 2)
+    monkeypatch.setattr(tasks, "SalonBoardStylePoster", FakePoster)
+    monkeypatch.setattr(tasks, "load_selectors", lambda: {})
+    monkeypatch.setattr(tasks.process_style_post_task, "_db", db_session)
+    monkeypatch.setattr(tasks.process_style_post_task, "_progress_writer", None)
+    task_kwargs = {
+        "task_id": str(task_id),
+        "user_id": user.id,
+        "setting_id": setting.id,
+        "style_data_filepath": str(data_file),
+        "image_dir": str(image_dir),
+    }
+
+    with patch.object(tasks.process_style_post_task, "retry", side_effect=Retry()) as retry:
+        with pytest.raises(Retry):
+            tasks.process_style_post_task.run(**task_kwargs)
+        retry.assert_called_once_with(kwargs={**task_kwargs, "start_index": 2}, countdown=0, max_retries=None)
+        assert crud_task.get_task_by_id(db_session, task_id).checkpoint_index == 2
+        assert data_file.exists() and image_dir.exists()
+
+        # 最初の実行が再配信されても記録済みの行から再開する
+        with pytest.raises(Retry):
+            tasks.process_style_post_task.run(**task_kwargs)
+        assert retry.call_args.kwargs["kwargs"]["start_index"] == 4
+
+        tasks.process_style_post_task.run(**task_kwargs, start_index=4)
+
+    assert calls == [0, 2, 4]
+    db_session.expire_all()
+    assert crud_task.get_task_by_id(db_session, task_id).status == "SUCCESS"
+    assert not data_file.exists() and not image_dir.exists()
+
+    # 完了後に再配信されたメッセージは処理しない
+    tasks.process_style_post_task.run(**task_kwargs)
+    assert calls == [0, 2, 4]
+
+
+def test_style_post_stops_before_next_row_when_account_lease_is_lost(db_session, tmp_path, monkeypatch):
+    """アカウントのリースを延長できずに失った場合は、次の行に進む前に中断して失敗として記録する"""
+    import time
+    from app.core import account_lease
+    from app.core.security import get_password_hash
+    from app.crud.salon_board_setting import create_setting
+    from app.crud.user import create_user
+    from app.schemas.salon_board_setting import SalonBoardSettingCreate
+    from app.schemas.user import UserCreate
+    from app.services import tasks
+
+    user = create_user(db_session, UserCreate(email="lease@example.com", password="password", role="user"), get_password_hash("password"))
+    setting = create_setting(db_session, SalonBoardSettingCreate(setting_name="Salon", sb_user_id="sb", sb_password="pw"), user.id)
+    task_id = uuid.uuid4()
+    crud_task.create_task(db_session, task_id, user_id=user.id, total_items=3, task_name="process_style_post")
+    data_file = tmp_path / "styles.jsonl"
+    data_file.write_text("")
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+
+    started_rows = []
+
+    class FakePoster:
+        expected_total = 3
+
+        def __init__(self, **kwargs):
+            pass
+
+        def run(self, *, progress_callback, **kwargs):
+            for index in range(self.expected_total):
+                progress_callback(index, self.expected_total, detail={"stage": "STYLE_PROCESSING"})
+                started_rows.append(index)
+                # 1行目の処理中にリースを失う
+                deadline = time.monotonic() + 2
+                while keepers[0].lost is False and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            return self.expected_total
+
+    keepers = []
+
+    class FastLeaseKeeper(account_lease.LeaseKeeper):
+        def __init__(self, account, task_id):
+            super().__init__(account, task_id, interval_sec=0.01)
+            keepers.append(self)
+
+    monkeypatch.setattr(account_lease, "LeaseKeeper", FastLeaseKeeper)
+    monkeypatch.setattr(account_lease, "renew", lambda account, task_id: False)
+    monkeypatch.setattr(tasks, "SalonBoardStylePoster", FakePoster)
+    monkeypatch.setattr(tasks, "load_selectors", lambda: {})
+    monkeypatch.setattr(tasks.process_style_post_task, "_db", db_session)
+    monkeypatch.setattr(tasks.process_style_post_task, "_progress_writer", None)
+
+    with pytest.raises(account_lease.AccountLeaseLostError):
+        tasks.process_style_post_task.run(
+            task_id=str(task_id),
+            user_id=user.id,
+            setting_id=setting.id,
+            style_data_filepath=str(data_file),
+            image_dir=str(image_dir),
+        )
+
+    assert started_rows == [0]
+    db_session.expire_all()
+    assert crud_task.get_task_by_id(db_session, task_id).status == "FAILURE"
+    errors = crud_task.get_task_events(db_session, task_id, [crud_task.EVENT_ERROR])
+    assert errors[-1]["error_category"] == "ACCOUNT_LEASE_LOST"
+
+
+def test_style_post_message_is_redelivered_when_worker_is_lost():
+    """投稿タスクは処理後にACKし、ワーカー停止時はメッセージを再配信する"""
+    from app.core.celery_app import celery_app
+    from app.services import tasks
+
+    assert tasks.process_style_post_task.acks_late is True
+    assert tasks.process_style_post_task.reject_on_worker_lost is True
+    # 実行中のメッセージがタイムアウト前に再配信されない
+    assert celery_app.conf.broker_transport_options["visibility_timeout"] > celery_app.conf.task_time_limit
@@ -0,0 +1,149 @@
+"""
+スタイル削除処理（SalonBoardStyleDeleter）のテスト
+"""
+import pytest
+
+from app.services.salonboard import SalonBoardStyleDeleter
+from app.services.salonboard.exceptions import StyleDeleteError
+from app.services.salonboard.style_deleter import DeleteCandidate, StylePageIndex
+
+SELECTORS = {
+    "style_list": {
+        "rows": "#sortStyleForm > table > tbody > tr",
+        "style_number_input": "input[name*='.sortNo']",
+        "delete_button": "img[alt='削除する']",
+    }
+}
+
+
+class FakeLocator:
+    def __init__(self, path, scraped=None):
+        self.path = path
+        self.scraped = scraped
+        self.evaluate_calls = 0
+
+    def evaluate_all(self, script, arg):
+        self.evaluate_calls += 1
+        assert arg == [SELECTORS["style_list"]["style_number_input"], SELECTORS["style_list"]["delete_button"]]
+        return self.scraped
+
+    def nth(self, index):
+        return FakeLocator(f"{self.path}>>nth={index}")
+
+    def locator(self, selector):
+        return FakeLocator(f"{self.path}>>{selector}")
+
+    @property
+    def first(self):
+        return FakeLocator(f"{self.path}>>first")
+
+
+class FakePage:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def locator(self, selector):
+        return self.rows
+
+
+def test_collect_candidates_scrapes_rows_in_one_call():
+    """一覧の走査は evaluate_all 1回で行い、番号が数値でない行は除外する"""
+    rows = FakeLocator("rows", scraped=[[1, "150"], [2, "149"], [3, "abc"]])
+    deleter = SalonBoardStyleDeleter(selectors=SELECTORS, screenshot_dir="/tmp")
+    deleter.page = FakePage(rows)
+
+    candidates = deleter._collect_candidates()
+
+    assert rows.evaluate_calls == 1
+    assert [c.style_number for c in candidates] == [150, 149]
+    assert candidates[0].click_target.path == "rows>>nth=1>>img[alt='削除する']>>first"
+
+
+def test_page_index_estimates_and_locates_pages():
+    """未走査の番号はページ位置を推定し、走査済みの範囲にない番号は存在しないと判定する"""
+    index = StylePageIndex(page_size=10)
+    assert index.locate(35) == 4
+
+    index.record_page(4, range(31, 41))
+    assert index.locate(35) == 4
+    assert index.locate(12) == 2
+
+    # 欠番がある場合は走査結果のずれから推定し直す
+    index.record_page(2, [13, 14, 15, 16, 17, 18, 19, 20, 21, 22])
+    assert index.locate(12) == 1
+    assert index.locate(25) == 3
+    index.record_page(2, [11, 12, 14])
+    assert index.locate(13) is None
+
+    # 最終ページより後ろは存在しない
+    index.record_page(5, [])
+    assert index.locate(45) is None
+
+
+def test_page_index_shifts_numbers_after_removal():
+    """削除後は後続の番号を繰り上げ、後ろのページの走査結果を破棄する"""
+    index = StylePageIndex(page_size=3)
+    index.record_page(1, [1, 2, 3])
+    index.record_page(2, [4, 5, 6])
+
+    index.remove(2)
+
+    assert index.locate(2) == 1
+    assert index.locate(3) == 1
+    assert index.plan([1, 2, 3, 4, 5]) == {1: 3, 2: 2}
+
+
+class ClampingListDeleter(SalonBoardStyleDeleter):
+    """範囲外のページ番号を最終ページに置き換える一覧を再現する削除処理"""
+
+    def __init__(self, last_page, numbers):
+        super().__init__(selectors=SELECTORS, screenshot_dir="/tmp")
+        self.last_page = last_page
+        self.numbers = numbers
+        self.displayed = 1
+        self.navigations = []
+
+    def _start_browser(self):
+        pass
+
+    def _close_browser(self):
+        pass
+
+    def step_login_or_resume(self, *args, **kwargs):
+        pass
+
+    def step_navigate_to_style_list_page(self):
+        self.displayed = 1
+
+    def _go_to_style_list_page(self, page_number):
+        self.navigations.append(page_number)
+        self.displayed = min(page_number, self.last_page)
+
+    def _displayed_list_page(self):
+        return self.displayed
+
+    def _collect_candidates(self):
+        return [DeleteCandidate(style_number=n, click_target=None) for n in self.numbers]
+
+    def _take_screenshot(self, name):
+        return ""
+
+
+def test_run_delete_records_displayed_page_and_caps_navigations():
+    """移動後は実際に表示されたページで記録し、移動回数の上限に達したら見つからないものとする"""
+    deleter = ClampingListDeleter(last_page=1, numbers=list(range(1, 101)))
+    details = []
+
+    with pytest.raises(StyleDeleteError):
+        deleter.run_delete(
+            "user",
+            "password",
+            500,
+            500,
+            set(),
+            progress_callback=lambda completed, total, detail=None, error=None: details.append(detail),
+        )
+
+    # ページ1として記録するため推定先は変わらず、上限回数で打ち切る
+    assert deleter.navigations == [4] * SalonBoardStyleDeleter.MAX_LIST_NAVIGATIONS_PER_TARGET
+    assert details[-1]["stage"] == "DELETE_NOT_FOUND"
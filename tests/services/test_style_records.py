@@ -0,0 +1,63 @@
+"""
+スタイル情報の正規化（受付時）と逐次読み込み（ワーカー）のテスト
+"""
+import pandas as pd
+import pytest
+
+from app.services.salonboard.style_records import count_style_records, iter_style_records
+from app.services.style_data import StyleDataError, load_style_rows, style_records_path, write_style_records
+
+
+def test_style_rows_round_trip_through_records(tmp_path):
+    """受付時に正規化したレコードを、ワーカーがそのままの形で読み込める"""
+    data_path = tmp_path / "styles.xlsx"
+    pd.DataFrame({
+        "画像名": ["a.jpg", "b.jpg"],
+        "スタイル名": ["ボブ", "ショート"],
+        "ハッシュタグ": ["ゆるふわ,ボブ", None],
+        "コメント": [123, 4.5],
+    }).to_excel(data_path, index=False)
+
+    rows = load_style_rows(data_path)
+    records_path = write_style_records(rows, style_records_path(data_path))
+
+    assert records_path.name == "styles.jsonl"
+    assert count_style_records(str(records_path)) == 2
+    records = list(iter_style_records(str(records_path)))
+    assert records == rows
+    assert records[0] == {"画像名": "a.jpg", "スタイル名": "ボブ", "ハッシュタグ": "ゆるふわ,ボブ", "コメント": "123", "_row_number": 2}
+    # 空欄のセルは省略される
+    assert "ハッシュタグ" not in records[1]
+    assert records[1]["コメント"] == "4.5"
+
+
+def test_legacy_csv_is_read_in_the_same_shape(tmp_path):
+    """旧形式のCSVが渡された場合も同じ形のレコードとして読み込む"""
+    data_path = tmp_path / "styles.csv"
+    pd.DataFrame({"画像名": ["a.jpg"], "ハッシュタグ": [None]}).to_csv(data_path, index=False)
+
+    assert list(iter_style_records(str(data_path))) == [{"画像名": "a.jpg", "_row_number": 2}]
+
+
+def test_csv_keeps_cell_text_and_skips_blank_rows(tmp_path):
+    """CSVはセルの文字列をそのまま使い（先頭の0も保持）、空行は読み飛ばす"""
+    data_path = tmp_path / "styles.csv"
+    data_path.write_text("\ufeff画像名,クーポン名\n a.jpg ,001\n,\nb.jpg,\n", encoding="utf-8")
+
+    assert load_style_rows(data_path) == [
+        {"画像名": "a.jpg", "クーポン名": "001", "_row_number": 2},
+        {"画像名": "b.jpg", "_row_number": 3},
+    ]
+
+
+def test_unreadable_style_data_raises_style_data_error(tmp_path):
+    """UTF-8以外のCSVや壊れたExcelは StyleDataError になる"""
+    csv_path = tmp_path / "styles.csv"
+    csv_path.write_bytes("画像名\nボブ.jpg\n".encode("shift_jis"))
+    xlsx_path = tmp_path / "styles.xlsx"
+    xlsx_path.write_bytes(b"not a workbook")
+
+    with pytest.raises(StyleDataError):
+        load_style_rows(csv_path)
+    with pytest.raises(StyleDataError):
+        load_style_rows(xlsx_path)
@@ -0,0 +1,127 @@
+"""
+スタイル別所要時間計測（StyleTimer）のテスト
+"""
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from app.core.timing_report import percentile, summarize_style_timings
+from app.services.salonboard.timing import StyleTimer, WAIT_HUMAN_PAUSE, WAIT_LOADER_OVERLAY, timed
+from app.services.salonboard.utils import BrowserUtilsMixin
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class DummyAutomation:
+    """stage_timer を持つ自動化クラスの代替"""
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.stage_timer = StyleTimer(clock=clock)
+
+    @timed(WAIT_HUMAN_PAUSE)
+    def pause(self, seconds: float):
+        self.clock.advance(seconds)
+
+    @timed(WAIT_LOADER_OVERLAY)
+    def wait_overlay(self, seconds: float):
+        self.clock.advance(seconds)
+
+
+def test_style_timer_records_stages_and_waits():
+    """ステージ別の所要時間と、意図的な待機のステージ内訳を記録する"""
+    clock = FakeClock()
+    automation = DummyAutomation(clock)
+    timer = automation.stage_timer
+
+    # スタイル処理外の計測は記録しない
+    automation.pause(5)
+    timer.mark_stage("LOGIN_COMPLETED")
+
+    timer.start_style(2, "style-a")
+    timer.mark_stage("IMAGE_UPLOADING")
+    automation.pause(1.5)
+    automation.wait_overlay(0.5)
+    clock.advance(2)
+    timer.mark_stage("REGISTERING")
+    automation.pause(0.25)
+    clock.advance(0.75)
+    record = timer.finish_style("completed")
+
+    assert record["row_number"] == 2
+    assert record["status"] == "completed"
+    assert record["total_ms"] == 5000
+    assert record["stages"]["IMAGE_UPLOADING"] == {"ms": 4000, "pause_ms": 1500}
+    assert record["stages"]["REGISTERING"] == {"ms": 1000, "pause_ms": 250}
+    assert record["waits"] == {WAIT_HUMAN_PAUSE: 1750, WAIT_LOADER_OVERLAY: 500}
+    assert record["wait_counts"] == {WAIT_HUMAN_PAUSE: 2, WAIT_LOADER_OVERLAY: 1}
+    assert timer.finish_style("completed") is None
+
+
+def test_summarize_style_timings_percentiles_and_shares():
+    """p50/p95と意図的な待機の割合を集計する"""
+    records = [
+        {"total_ms": ms, "stages": {"IMAGE_UPLOADING": {"ms": ms, "pause_ms": ms // 2}}, "waits": {"human_pause": ms // 2}}
+        for ms in range(100, 2100, 100)
+    ]
+    summary = summarize_style_timings(records)
+
+    assert summary["style_count"] == 20
+    assert summary["style_p50_ms"] == 1000
+    assert summary["style_p95_ms"] == 1900
+    assert summary["intentional_pause_share"] == 0.5
+    assert summary["stages"][0]["pause_share"] == 0.5
+    assert percentile([], 0.95) == 0
+    assert summarize_style_timings([])["total_ms"] == 0
+
+
+class FakeOverlayPage:
+    """wait_for_selector(state="hidden") を指定回数タイムアウトさせるページ"""
+
+    def __init__(self, clock: FakeClock, timeouts: int):
+        self.clock = clock
+        self.timeouts = timeouts
+        self.calls = []
+
+    def wait_for_selector(self, selector, state, timeout):
+        self.calls.append((selector, state, timeout))
+        if self.timeouts:
+            self.timeouts -= 1
+            self.clock.advance(timeout / 1000)
+            raise PlaywrightTimeoutError("timeout")
+        self.clock.advance(0.1)
+
+
+class OverlayAutomation(BrowserUtilsMixin):
+    def __init__(self, page, clock: FakeClock):
+        self.page = page
+        self.selectors = {"style_form": {"loader_overlay": "div.loader_overlay"}}
+        self.stage_timer = StyleTimer(clock=clock)
+        self.cancel_checker = None
+
+
+def test_loader_overlay_wait_is_single_browser_side_wait():
+    """非表示待機はブラウザ側の1回の待機で完了し、回数と呼び出し数が計測に残る"""
+    clock = FakeClock()
+    page = FakeOverlayPage(clock, timeouts=0)
+    automation = OverlayAutomation(page, clock)
+    automation.stage_timer.start_style(2, "style-a")
+
+    assert automation._wait_for_loader_overlay_disappeared(timeout_ms=30000) is True
+    assert page.calls == [("div.loader_overlay", "hidden", 2000)]
+
+    # 表示が続く場合は区切りごとに待機を繰り返す
+    page.timeouts = 2
+    assert automation._wait_for_loader_overlay_disappeared(timeout_ms=30000) is True
+
+    record = automation.stage_timer.finish_style("completed")
+    assert record["wait_counts"][WAIT_LOADER_OVERLAY] == 2
+    assert record["browser_calls"][WAIT_LOADER_OVERLAY] == 4
+    assert record["waits"][WAIT_LOADER_OVERLAY] == 4200
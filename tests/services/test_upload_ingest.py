@@ -0,0 +1,72 @@
+"""
+アップロードファイルのチャンク保存・検証のテスト
+"""
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.upload_ingest import (
+    UPLOAD_KIND_CSV,
+    UPLOAD_KIND_IMAGE,
+    UPLOAD_KIND_XLSX,
+    UploadBudget,
+    UploadContentError,
+    UploadTooLargeError,
+    safe_filename,
+    save_upload,
+)
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def _upload(data: bytes, filename: str = "a.png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+async def test_save_upload_streams_in_chunks(tmp_path):
+    """チャンク単位で書き込み、内容とサイズがそのまま保存される"""
+    data = PNG_HEADER + b"x" * 100
+    dest = tmp_path / "a.png"
+
+    written = await save_upload(_upload(data), dest, kind=UPLOAD_KIND_IMAGE, max_bytes=1000, chunk_bytes=16)
+
+    assert written == len(data)
+    assert dest.read_bytes() == data
+
+
+@pytest.mark.parametrize("kind, data", [
+    (UPLOAD_KIND_IMAGE, b"GIF89a..."),
+    (UPLOAD_KIND_XLSX, b"not a zip"),
+    (UPLOAD_KIND_CSV, b"\x00\x01binary"),
+    (UPLOAD_KIND_IMAGE, b""),
+])
+async def test_save_upload_rejects_mismatched_content(tmp_path, kind, data):
+    """先頭のバイト列が種別と一致しない・空のファイルは拒否し、書きかけのファイルを残さない"""
+    dest = tmp_path / "upload"
+
+    with pytest.raises(UploadContentError):
+        await save_upload(_upload(data), dest, kind=kind, max_bytes=1000, chunk_bytes=16)
+    assert not dest.exists()
+
+
+async def test_save_upload_enforces_file_and_total_limits(tmp_path):
+    """ファイル単体の上限とリクエスト合計の上限を書き込み中に確認する"""
+    data = PNG_HEADER + b"x" * 40
+
+    with pytest.raises(UploadTooLargeError):
+        await save_upload(_upload(data), tmp_path / "big.png", kind=UPLOAD_KIND_IMAGE, max_bytes=32, chunk_bytes=8)
+    assert not (tmp_path / "big.png").exists()
+
+    budget = UploadBudget(max_total_bytes=len(data) + 10)
+    await save_upload(_upload(data), tmp_path / "first.png", kind=UPLOAD_KIND_IMAGE, max_bytes=1000, chunk_bytes=8, budget=budget)
+    with pytest.raises(UploadTooLargeError):
+        await save_upload(_upload(data), tmp_path / "second.png", kind=UPLOAD_KIND_IMAGE, max_bytes=1000, chunk_bytes=8, budget=budget)
+
+
+def test_safe_filename_strips_directories():
+    """クライアントのファイル名からディレクトリ部分を取り除く"""
+    assert safe_filename("../../etc/passwd.jpg") == "passwd.jpg"
+    assert safe_filename("C:\\photos\\style1.jpg") == "style1.jpg"
+    with pytest.raises(UploadContentError):
+        safe_filename("..")
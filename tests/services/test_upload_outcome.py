@@ -0,0 +1,172 @@
+"""
+画像アップロード応答待ち（_submit_image_upload）と結果分類のテスト
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from app.services.salonboard.exceptions import AutomationCancelledError
+from app.services.salonboard.form_handler import StyleFormHandlerMixin
+from app.services.salonboard.timing import StyleTimer, WAIT_UPLOAD_RESPONSE
+
+UPLOAD_URL = "https://salonboard.com/CNB/imgreg/imgUpload/doUpload"
+
+
+class FakeRequest:
+    def __init__(self, failure=None, url=UPLOAD_URL):
+        self.url = url
+        self.method = "POST"
+        self.failure = failure
+
+
+def upload_response(status, url=UPLOAD_URL):
+    return SimpleNamespace(status=status, url=url, request=FakeRequest(url=url))
+
+
+class FakePage:
+    """
+    on_send: 送信（クリック）直後に発生するイベント
+    later: 応答待ち（wait_for_event）の間に順に発生するイベント
+    """
+
+    def __init__(self, on_send=(), later=()):
+        self.on_send = list(on_send)
+        self.later = list(later)
+        self.listeners = {}
+        self.waits = []
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def _emit(self, event, payload):
+        for handler in list(self.listeners.get(event, [])):
+            handler(payload)
+
+    @contextmanager
+    def expect_request(self, predicate, timeout):
+        yield SimpleNamespace()
+        assert predicate(FakeRequest())
+        for event, payload in self.on_send:
+            self._emit(event, payload)
+
+    def wait_for_event(self, event, predicate, timeout):
+        self.waits.append((event, timeout))
+        while self.later:
+            name, payload = self.later.pop(0)
+            self._emit(name, payload)
+            if name == event and predicate(payload):
+                return payload
+        raise PlaywrightTimeoutError("timeout")
+
+
+class FakeButton:
+    def __init__(self):
+        self.clicks = 0
+
+    def scroll_into_view_if_needed(self, timeout):
+        pass
+
+    def click(self, timeout, force=False):
+        self.clicks += 1
+
+
+class DummyHandler(StyleFormHandlerMixin):
+    TIMEOUT_CLICK = 1000
+
+    def __init__(self, page, cancel_after=None):
+        self.page = page
+        self.stage_timer = StyleTimer()
+        self.cancel_checks = 0
+        self.cancel_after = cancel_after
+
+    def _raise_if_cancelled(self):
+        self.cancel_checks += 1
+        if self.cancel_after is not None and self.cancel_checks > self.cancel_after:
+            raise AutomationCancelledError()
+
+    def _human_pause(self, *args, **kwargs):
+        pass
+
+
+def test_submit_waits_for_response_and_classifies():
+    """1回の待機で応答を待ち、ステータスコードで分類する"""
+    other = upload_response(200, url="https://salonboard.com/CNB/img/thumb.jpg")
+    page = FakePage(later=[("response", other), ("response", upload_response(302))])
+    handler = DummyHandler(page)
+    button = FakeButton()
+
+    handler.stage_timer.start_style(2, "style")
+    response, failure = handler._submit_image_upload(button)
+    record = handler.stage_timer.finish_style("completed")
+
+    assert button.clicks == 1
+    assert failure is None
+    assert handler._classify_upload_outcome(response, failure) == handler.UPLOAD_OUTCOME_CONGESTION
+    assert page.waits == [("response", handler.TIMEOUT_UPLOAD_RESPONSE)]
+    # 待機前に1回、doUpload 以外の応答の述語で1回キャンセル要求を確認する
+    assert handler.cancel_checks == 2
+    assert WAIT_UPLOAD_RESPONSE in record["waits"]
+    assert page.listeners == {"response": [], "requestfailed": []}
+
+
+def test_response_received_while_submitting_needs_no_wait():
+    """クリック中に届いた応答はリスナーで受け取り、待機しない"""
+    page = FakePage(on_send=[("response", upload_response(200))])
+    handler = DummyHandler(page)
+
+    response, failure = handler._submit_image_upload(FakeButton())
+
+    assert handler._classify_upload_outcome(response, failure) == handler.UPLOAD_OUTCOME_SUCCESS
+    assert page.waits == []
+
+
+def test_request_failure_ends_wait_and_is_classified():
+    """リクエスト失敗は次の応答イベントで待機を終え、失敗理由で ABORTED とそれ以外を区別する"""
+    other = upload_response(200, url="https://salonboard.com/CNB/imgreg/imgUpload/")
+    page = FakePage(later=[("requestfailed", FakeRequest(failure="NS_BINDING_ABORTED")), ("response", other)])
+    handler = DummyHandler(page)
+
+    response, failure = handler._submit_image_upload(FakeButton())
+
+    assert response is None
+    assert handler._classify_upload_outcome(response, failure) == handler.UPLOAD_OUTCOME_ABORTED
+    assert handler.cancel_checks == 1
+
+    assert handler._classify_upload_outcome(None, "NS_ERROR_NET_RESET") == handler.UPLOAD_OUTCOME_FAILED
+    assert handler._classify_upload_outcome(SimpleNamespace(status=500), None) == handler.UPLOAD_OUTCOME_HTTP_ERROR
+    assert handler._classify_upload_outcome(SimpleNamespace(status=200), None) == handler.UPLOAD_OUTCOME_SUCCESS
+
+
+def test_failure_without_later_response_keeps_its_reason():
+    """失敗後に応答イベントがなく上限時間に達した場合も、記録した失敗理由を返す"""
+    page = FakePage(later=[("requestfailed", FakeRequest(failure="NS_ERROR_NET_RESET"))])
+    handler = DummyHandler(page)
+
+    response, failure = handler._submit_image_upload(FakeButton())
+
+    assert response is None
+    assert failure == "NS_ERROR_NET_RESET"
+
+
+def test_wait_is_bounded_and_cancellable():
+    """応答がない場合は上限時間で失敗とし、待機中のキャンセル要求は述語で検出して中断する"""
+    handler = DummyHandler(FakePage())
+
+    response, failure = handler._submit_image_upload(FakeButton())
+    assert response is None
+    assert "タイムアウト" in failure
+    assert handler._classify_upload_outcome(response, failure) == handler.UPLOAD_OUTCOME_FAILED
+
+    other = upload_response(200, url="https://salonboard.com/CNB/img/thumb.jpg")
+    page = FakePage(later=[("response", other), ("response", upload_response(200))])
+    handler = DummyHandler(page, cancel_after=1)
+    with pytest.raises(AutomationCancelledError):
+        handler._submit_image_upload(FakeButton())
+    # キャンセルを検出した時点で待機を終え、以降のイベントを待たない
+    assert len(page.later) == 1
+    assert page.listeners == {"response": [], "requestfailed": []}
@@ -32,5 +32,11 @@ fi
 export DISPLAY=:99
 
 # Celeryワーカーを起動
-echo "Starting Celery worker..."
-exec celery -A app.worker worker --loglevel=info
+# CELERY_WORKER_QUEUES: 受け取るキュー（投稿: style_post・削除: style_delete）
+# CELERY_WORKER_CONCURRENCY: 同時実行数（TASK_SCHEDULER_*_SLOTS と合わせる）
+QUEUES="${CELERY_WORKER_QUEUES:-style_post,style_delete,celery}"
+echo "Starting Celery worker (queues: ${QUEUES})..."
+if [ -n "${CELERY_WORKER_CONCURRENCY}" ]; then
+    exec celery -A app.worker worker --loglevel=info -Q "${QUEUES}" --concurrency "${CELERY_WORKER_CONCURRENCY}"
+fi
+exec celery -A app.worker worker --loglevel=info -Q "${QUEUES}"